@@ -326,6 +326,26 @@ class ExchangeAdapterRobust(ExchangeInterface):
             return float(str(v))
 
 
+_serial_locks_guard = threading.Lock()
+
+
+def ccxt_serial_lock(ccxt_exchange) -> threading.RLock:
+    """
+    Serialisierungs-Lock einer ccxt-Instanz (ccxt ist NICHT threadsicher).
+
+    Der Lock hängt an der Instanz selbst, damit ExchangeAdapter und
+    Hintergrund-Jobs ohne Adapter (z.B. Market-Metadaten-Refresh) dieselbe
+    Instanz nie parallel benutzen. Recording-Proxies leiten das Attribut an
+    den echten Exchange weiter.
+    """
+    with _serial_locks_guard:
+        lock = getattr(ccxt_exchange, "_serial_lock", None)
+        if lock is None:
+            lock = threading.RLock()
+            ccxt_exchange._serial_lock = lock
+        return lock
+
+
 class ExchangeAdapter(ExchangeInterface):
     def __init__(self, ccxt_exchange, max_retries=3, base_delay=1.0, enable_connection_recovery=True):
         """
@@ -343,7 +363,7 @@ class ExchangeAdapter(ExchangeInterface):
 
         # KRITISCH: HTTP-Lock für Thread-Safety - ccxt ist NICHT threadsicher!
         # Verhindert Access Violations bei parallelen HTTP-Calls
-        self._http_lock = threading.RLock()
+        self._http_lock = ccxt_serial_lock(ccxt_exchange)
         self._timeout_s = 10
         self._retry_backoff = (0.25, 0.5, 1.0, 2.0)
 
@@ -1139,10 +1159,12 @@ class MockExchange(ExchangeInterface):
     Simuliert Exchange-Verhalten ohne echte API-Calls.
     """
 
-    def __init__(self, initial_prices: Dict[str, float] = None):
+    def __init__(self, initial_prices: Dict[str, float] = None, markets: Dict[str, Any] = None):
         """
         Args:
             initial_prices: Initiale Preise für Symbole
+            markets: Markets statt der eingebauten Defaults (z.B. aus dem
+                Market-Metadaten-Cache, services.market_metadata.load_cached_markets)
         """
         self.prices = initial_prices or {
             "BTC/USDT": 50000.0,
@@ -1156,7 +1178,7 @@ class MockExchange(ExchangeInterface):
             "BTC": {"free": 0.0, "used": 0.0, "total": 0.0},
             "ETH": {"free": 0.0, "used": 0.0, "total": 0.0}
         }
-        self.markets = {
+        self.markets = markets or {
             "BTC/USDT": {
                 "id": "BTCUSDT",
                 "symbol": "BTC/USDT",
@@ -1401,17 +1423,24 @@ class MockExchange(ExchangeInterface):
         """Mock markets loading"""
         return self.markets
 
+    @staticmethod
+    def _round_precision(value: float, precision) -> float:
+        # Dezimalstellen (int) oder Schrittweite (float < 1, TICK_SIZE-Modus wie MEXC)
+        if isinstance(precision, float) and 0 < precision < 1:
+            return round(round(value / precision) * precision, 12)
+        return round(value, int(precision))
+
     def amount_to_precision(self, symbol: str, amount: float) -> Union[str, float]:
         """Mock amount precision"""
         market = self.markets.get(symbol, {})
         precision = market.get("precision", {}).get("amount", 6)
-        return round(amount, precision)
+        return self._round_precision(amount, precision)
 
     def price_to_precision(self, symbol: str, price: float) -> Union[str, float]:
         """Mock price precision"""
         market = self.markets.get(symbol, {})
         precision = market.get("precision", {}).get("price", 2)
-        return round(price, precision)
+        return self._round_precision(price, precision)
 
     def get_market_info(self, symbol: str) -> Dict[str, Any]:
         """Gets market information for symbol"""
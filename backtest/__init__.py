@@ -0,0 +1,30 @@
+"""
+Backtesting - replay recorded ticks through the FSM engine faster than real time.
+"""
+
+from .clock import SimulatedClock, simulated_time
+from .exchange import SimulatedExchange
+from .loadgen import LoadHarness, LoadProfile, LoadReport, SyntheticMarket
+from .runner import BacktestResult, BacktestRunner
+from .screener import anchor_series, screen_drop_triggers
+from .sweep import SweepRunner, expand_grid
+from .ticks import TICK_DTYPE, TickSource, convert_ticks_to_npy
+
+__all__ = [
+    "SimulatedClock",
+    "simulated_time",
+    "SimulatedExchange",
+    "LoadHarness",
+    "LoadProfile",
+    "LoadReport",
+    "SyntheticMarket",
+    "BacktestResult",
+    "BacktestRunner",
+    "anchor_series",
+    "screen_drop_triggers",
+    "SweepRunner",
+    "expand_grid",
+    "TICK_DTYPE",
+    "TickSource",
+    "convert_ticks_to_npy",
+]
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Simulated Clock for Backtests
+
+Clock-aware components (engine, FSM timeouts, cooldowns, market data) read
+the default core.clock; the remaining services still call time.time()/
+time.sleep(). simulated_time() installs the clock for both for the duration
+of a backtest so that recorded ticks drive time:
+
+- time.time() / time.monotonic() return virtual time
+- time.sleep() on the driver thread advances virtual time instantly
+- time.sleep() on any other thread (health monitors, loggers) stays real,
+  so background loops cannot race the virtual clock forward
+
+Usage:
+    clock = SimulatedClock(start=first_tick_ts)
+    with simulated_time(clock):
+        clock.advance_to(next_tick_ts)
+        engine.run_cycle()
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Tuple
+
+from core import clock as core_clock
+
+_real_sleep = time.sleep
+
+
+class SimulatedClock(core_clock.SimulatedClock):
+    """Virtual wall clock advanced by the backtest driver"""
+
+    def __init__(self, start: float = 0.0):
+        super().__init__(start)
+        self.driver_thread: Optional[int] = None
+
+    def sleep(self, seconds: float) -> None:
+        if threading.get_ident() == self.driver_thread:
+            self.advance(seconds)
+        else:
+            _real_sleep(seconds)
+
+
+@contextmanager
+def simulated_time(clock: SimulatedClock, modules: Iterable[Tuple[object, str]] = ()) -> Iterator[SimulatedClock]:
+    """
+    Install clock as the default core.clock and route time.time/
+    time.monotonic/time.sleep through it for code not yet clock-aware.
+
+    Args:
+        clock: Clock to install; the calling thread becomes its driver thread
+        modules: Extra (module, attribute) pairs bound via "from time import time"
+    """
+    patched = [(time, "time", clock.time), (time, "monotonic", clock.monotonic), (time, "sleep", clock.sleep)]
+    patched += [(module, attr, clock.time) for module, attr in modules]
+
+    saved = [(obj, attr, getattr(obj, attr)) for obj, attr, _ in patched]
+    previous_driver = clock.driver_thread
+    clock.driver_thread = threading.get_ident()
+    for obj, attr, value in patched:
+        setattr(obj, attr, value)
+    previous_clock = core_clock.set_clock(clock)
+    try:
+        yield clock
+    finally:
+        core_clock.set_clock(previous_clock)
+        for obj, attr, value in saved:
+            setattr(obj, attr, value)
+        clock.driver_thread = previous_driver
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Simulated Exchange for Backtests
+
+Extends MockExchange with the ccxt surface ExchangeAdapter calls
+(create_order(symbol, type, side, amount, price, params), enableRateLimit,
+timeout, options) and a fill model driven by replayed ticks:
+
+- Quotes come from recorded bid/ask (buys fill at ask, sells at bid)
+- Order latency: an order becomes matchable latency_s after placement
+- Partial fills: each matching pass fills partial_fill_ratio of the order
+  amount; IOC remainders are canceled, GTC remainders rest on the book
+- Fees: fee_rate of fill cost, charged in the quote currency
+- Balances are debited/credited on every fill
+
+Usage:
+    exchange = SimulatedExchange(initial_balance=1000.0, fee_rate=0.001, latency_s=0.2)
+    exchange.apply_ticks(frame_ticks)
+"""
+
+import logging
+import math
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from adapters.exchange import MockExchange
+from core.clock import Clock, get_clock
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientBalance(Exception):
+    """Order exceeds available balance (message matches ccxt's InsufficientFunds)"""
+
+
+class SimulatedExchange(MockExchange):
+    """MockExchange with bid/ask quotes, latency, partial fills, fees and balances"""
+
+    def __init__(
+        self,
+        initial_balance: float = 10000.0,
+        quote_currency: str = "USDT",
+        fee_rate: float = 0.001,
+        latency_s: float = 0.0,
+        partial_fill_ratio: float = 1.0,
+        default_spread_bps: float = 10.0,
+        clock: Optional[Clock] = None,
+        markets: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize simulated exchange.
+
+        Args:
+            initial_balance: Starting free balance in quote currency
+            quote_currency: Quote currency of all simulated markets
+            fee_rate: Fee as fraction of fill cost (0.001 = 10 bps)
+            latency_s: Delay between placement and first possible fill
+            partial_fill_ratio: Fraction of order amount filled per matching pass
+            default_spread_bps: Spread used when a tick has no bid/ask
+            clock: Time source (default: process-wide core.clock)
+            markets: Market metadata (e.g. from the market metadata cache);
+                symbols without an entry get synthetic markets
+        """
+        super().__init__(initial_prices={})
+        if not 0 < partial_fill_ratio <= 1:
+            raise ValueError("partial_fill_ratio must be in (0, 1]")
+
+        self.quote_currency = quote_currency
+        self.fee_rate = fee_rate
+        self.latency_s = latency_s
+        self.partial_fill_ratio = partial_fill_ratio
+        self.default_spread_bps = default_spread_bps
+        self._clock = clock
+
+        # ccxt attributes ExchangeAdapter configures/reads
+        self.enableRateLimit = False
+        self.timeout = 0
+        self.options: Dict[str, Any] = {}
+
+        self.quotes: Dict[str, Dict[str, float]] = {}
+        self.markets = dict(markets or {})
+        self.balance = {}
+        self._credit(quote_currency, initial_balance)
+        self.initial_balance = initial_balance
+
+        # Open orders per symbol awaiting matching
+        self._open: Dict[str, List[str]] = {}
+        self.fees_paid = 0.0
+
+    def _now(self) -> float:
+        return (self._clock or get_clock()).time()
+
+    # ========== Market data ==========
+
+    def _ensure_market(self, symbol: str) -> Dict[str, Any]:
+        market = self.markets.get(symbol)
+        if market is None:
+            base, _, quote = symbol.partition("/")
+            market = {
+                "id": symbol.replace("/", ""),
+                "symbol": symbol,
+                "base": base,
+                "quote": quote or self.quote_currency,
+                "active": True,
+                "limits": {
+                    "amount": {"min": 1e-8, "max": 1e12},
+                    "price": {"min": 1e-12, "max": 1e12},
+                    "cost": {"min": 5.0, "max": 1e12},
+                },
+                # ccxt TICK_SIZE precision mode (step sizes, not decimals)
+                "precision": {"amount": 1e-8, "price": 1e-8},
+                "info": {"filters": [
+                    {"filterType": "PRICE_FILTER", "tickSize": "0.00000001"},
+                    {"filterType": "LOT_SIZE", "stepSize": "0.00000001", "minQty": "0.00000001"},
+                ]},
+            }
+            self.markets[symbol] = market
+        return market
+
+    def market(self, symbol: str) -> Dict[str, Any]:
+        """ccxt market lookup"""
+        if symbol not in self.markets:
+            raise Exception(f"bad symbol {symbol}")
+        return self.markets[symbol]
+
+    def set_quote(self, symbol: str, last: float, bid: Optional[float] = None,
+                  ask: Optional[float] = None, volume: float = 0.0):
+        """Set the current quote for symbol and match resting orders against it"""
+        if not bid or not ask:
+            half_spread = last * self.default_spread_bps / 20000.0
+            bid, ask = last - half_spread, last + half_spread
+        self._ensure_market(symbol)
+        self.prices[symbol] = last
+        self.quotes[symbol] = {"last": last, "bid": bid, "ask": ask, "volume": volume}
+        self._match_symbol(symbol)
+
+    def set_price(self, symbol: str, price: float):
+        self.set_quote(symbol, price)
+
+    def apply_ticks(self, ticks: Iterable[Dict]):
+        """Apply recorded ticks (dicts with symbol/last/bid/ask/volume)"""
+        for tick in ticks:
+            self.set_quote(tick["symbol"], tick["last"], tick.get("bid"), tick.get("ask"),
+                           tick.get("volume") or 0.0)
+
+    def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        quote = self.quotes.get(symbol)
+        if quote is None:
+            raise Exception(f"bad symbol {symbol}: no recorded quote")
+        timestamp = int(self._now() * 1000)
+        last = quote["last"]
+        return {
+            "symbol": symbol,
+            "timestamp": timestamp,
+            "datetime": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(timestamp / 1000)),
+            "high": last,
+            "low": last,
+            "bid": quote["bid"],
+            "ask": quote["ask"],
+            "last": last,
+            "close": last,
+            "baseVolume": quote["volume"],
+            "quoteVolume": quote["volume"] * last,
+        }
+
+    def fetch_tickers(self, symbols: Optional[List[str]] = None) -> Dict[str, Any]:
+        if symbols is None:
+            symbols = list(self.quotes)
+        return {symbol: self.fetch_ticker(symbol) for symbol in symbols if symbol in self.quotes}
+
+    def fetch_order_book(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        quote = self.quotes.get(symbol, {"bid": 0.0, "ask": 0.0})
+        depth = min(limit, 20)
+        return {
+            "symbol": symbol,
+            "bids": [[quote["bid"], 1e9]] * depth,
+            "asks": [[quote["ask"], 1e9]] * depth,
+            "timestamp": int(self._now() * 1000),
+            "datetime": None,
+        }
+
+    def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        return self.markets
+
+    def amount_to_precision(self, symbol: str, amount: float) -> float:
+        step = self._ensure_market(symbol)["precision"]["amount"]
+        return round(math.floor(amount / step + 1e-9) * step, 12)
+
+    def price_to_precision(self, symbol: str, price: float) -> float:
+        tick = self._ensure_market(symbol)["precision"]["price"]
+        return round(round(price / tick) * tick, 12)
+
+    # ========== Balances ==========
+
+    def _asset(self, currency: str) -> Dict[str, float]:
+        return self.balance.setdefault(currency, {"free": 0.0, "used": 0.0, "total": 0.0})
+
+    def _credit(self, currency: str, amount: float):
+        asset = self._asset(currency)
+        asset["free"] += amount
+        asset["total"] = asset["free"] + asset["used"]
+
+    def fetch_balance(self) -> Dict[str, Any]:
+        result = {"info": {}, "free": {}, "used": {}, "total": {}}
+        for currency, asset in self.balance.items():
+            result[currency] = dict(asset)
+            for key in ("free", "used", "total"):
+                result[key][currency] = asset[key]
+        return result
+
+    def equity(self) -> float:
+        """Quote balance plus base holdings marked at the current bid"""
+        total = self._asset(self.quote_currency)["total"]
+        for symbol, market in self.markets.items():
+            qty = self.balance.get(market["base"], {}).get("total", 0.0)
+            if qty > 0 and symbol in self.quotes:
+                total += qty * self.quotes[symbol]["bid"]
+        return total
+
+    # ========== Orders ==========
+
+    def create_order(self, symbol: str, type: str, side: str, amount: float,
+                     price: Optional[float] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """ccxt-compatible order placement"""
+        params = params or {}
+        market = self._ensure_market(symbol)
+        quote = self.quotes.get(symbol)
+        if quote is None:
+            raise Exception(f"bad symbol {symbol}: no recorded quote")
+        if amount <= 0:
+            raise Exception(f"invalid order amount {amount}")
+
+        if side == "buy":
+            ref_price = price if type == "limit" and price else quote["ask"]
+            needed = amount * ref_price * (1 + self.fee_rate)
+            if needed > self._asset(market["quote"])["free"] + 1e-9:
+                raise InsufficientBalance(f"Account has insufficient balance for requested action ({needed:.4f} {market['quote']})")
+        elif amount > self._asset(market["base"])["free"] + 1e-12:
+            raise InsufficientBalance(f"Account has insufficient balance for requested action ({amount} {market['base']})")
+
+        now = self._now()
+        order_id = self._generate_order_id()
+        tif = params.get("timeInForce", "IOC" if type == "market" else "GTC")
+        order = {
+            "id": order_id,
+            "clientOrderId": params.get("clientOrderId"),
+            "symbol": symbol,
+            "type": type,
+            "side": side,
+            "timeInForce": tif,
+            "amount": amount,
+            "price": price,
+            "filled": 0.0,
+            "remaining": amount,
+            "cost": 0.0,
+            "average": None,
+            "status": "open",
+            "timestamp": int(now * 1000),
+            "fee": {"cost": 0.0, "currency": market["quote"]},
+            "trades": [],
+            "_matchable_at": now + self.latency_s,
+        }
+        self.orders[order_id] = order
+        self._open.setdefault(symbol, []).append(order_id)
+        self._match(order)
+        return self._public(order)
+
+    def create_limit_order(self, symbol: str, side: str, amount: float, price: float,
+                           time_in_force: str = "GTC", client_order_id: Optional[str] = None,
+                           post_only: bool = False) -> Dict[str, Any]:
+        return self.create_order(symbol, "limit", side, amount, price,
+                                 {"timeInForce": time_in_force, "clientOrderId": client_order_id})
+
+    def create_market_order(self, symbol: str, side: str, amount: float, time_in_force: str = "IOC",
+                            client_order_id: Optional[str] = None) -> Dict[str, Any]:
+        return self.create_order(symbol, "market", side, amount, None,
+                                 {"timeInForce": time_in_force, "clientOrderId": client_order_id})
+
+    def fetch_order(self, order_id: str, symbol: str = None) -> Dict[str, Any]:
+        order = self.orders.get(order_id)
+        if order is None:
+            raise Exception(f"Order {order_id} not found")
+        self._match(order)
+        return self._public(order)
+
+    def cancel_order(self, order_id: str, symbol: str = None) -> Dict[str, Any]:
+        order = self.orders.get(order_id)
+        if order is None:
+            raise Exception(f"Order {order_id} not found")
+        if order["status"] == "open":
+            self._close(order, "canceled")
+        return self._public(order)
+
+    def fetch_open_orders(self, symbol: str = None) -> List[Dict]:
+        return [self._public(o) for o in super().fetch_open_orders(symbol)]
+
+    def _public(self, order: Dict) -> Dict[str, Any]:
+        public = {k: v for k, v in order.items() if not k.startswith("_")}
+        public["trades"] = list(order["trades"])
+        public["fee"] = dict(order["fee"])
+        return public
+
+    def _match_symbol(self, symbol: str):
+        for order_id in list(self._open.get(symbol, ())):
+            self._match(self.orders[order_id])
+
+    def _match(self, order: Dict):
+        """One matching pass for an open order against the current quote"""
+        if order["status"] != "open" or self._now() < order["_matchable_at"]:
+            return
+
+        quote = self.quotes[order["symbol"]]
+        side = order["side"]
+        fill_price = quote["ask"] if side == "buy" else quote["bid"]
+        limit = order["price"]
+        marketable = (
+            order["type"] == "market" or limit is None
+            or (side == "buy" and limit >= fill_price)
+            or (side == "sell" and limit <= fill_price)
+        )
+        if marketable:
+            qty = min(order["remaining"], order["amount"] * self.partial_fill_ratio)
+            self._fill(order, qty, fill_price)
+
+        if order["remaining"] <= order["amount"] * 1e-9:
+            order["remaining"] = 0.0
+            self._close(order, "closed")
+        elif order["timeInForce"] in ("IOC", "FOK"):
+            self._close(order, "canceled")
+
+    def _fill(self, order: Dict, qty: float, fill_price: float):
+        market = self.markets[order["symbol"]]
+        cost = qty * fill_price
+        fee = cost * self.fee_rate
+        if order["side"] == "buy":
+            self._credit(market["quote"], -(cost + fee))
+            self._credit(market["base"], qty)
+        else:
+            self._credit(market["base"], -qty)
+            self._credit(market["quote"], cost - fee)
+        self.fees_paid += fee
+
+        timestamp = int(self._now() * 1000)
+        trade = {
+            "id": f"trade_{order['id']}_{len(order['trades']) + 1}",
+            "order": order["id"],
+            "symbol": order["symbol"],
+            "side": order["side"],
+            "amount": qty,
+            "price": fill_price,
+            "cost": cost,
+            "fee": {"cost": fee, "currency": market["quote"]},
+            "timestamp": timestamp,
+        }
+        order["trades"].append(trade)
+        self.trades.append(trade)
+
+        order["filled"] += qty
+        order["remaining"] = max(0.0, order["amount"] - order["filled"])
+        order["cost"] += cost
+        order["average"] = order["cost"] / order["filled"]
+        order["fee"]["cost"] += fee
+        order["lastTradeTimestamp"] = timestamp
+
+    def _close(self, order: Dict, status: str):
+        order["status"] = status
+        open_ids = self._open.get(order["symbol"], [])
+        if order["id"] in open_ids:
+            open_ids.remove(order["id"])
+
+    @property
+    def id(self) -> str:
+        return "backtest"
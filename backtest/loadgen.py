@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Synthetic Market Load Generator for Soak and Scaling Tests
+
+Runs the FSM engine stack against a synthetic exchange instead of MEXC, so
+1000 symbols, 5x tick rates or a flaky exchange can be tried locally:
+
+- SyntheticMarket: N symbols with geometric random-walk prices, per-symbol
+  bid/ask spreads and Poisson flash drops (fall, then recover) that cross
+  the drop trigger
+- LoadGenExchange: SimulatedExchange (MockExchange) quoting the synthetic
+  market, with lognormal per-call latency, 429 bursts and request timeouts
+- LoadHarness: builds portfolio + FSMTradingEngine + MarketDataProvider on
+  the exchange and runs them for a fixed duration, either on real threads
+  (engine.start(), as main.py does) or single-threaded on a simulated clock
+
+The report covers engine cycle times, MD_POLL_OVERRUN warnings, RSS growth,
+decision latency (flash-drop onset -> first buy order) and injected faults.
+
+Usage:
+    python -m backtest.loadgen --work-dir /tmp/soak --symbols 1000 --tick-hz 5 \\
+        --duration 600 --rate-limit-bursts 6 --timeout-rate 0.002
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from ccxt import RateLimitExceeded, RequestTimeout
+
+import config
+from backtest.clock import SimulatedClock, simulated_time
+from backtest.exchange import SimulatedExchange
+from backtest.runner import (
+    _PORTFOLIO_STATE_FILES,
+    BACKTEST_CONFIG,
+    _overrides,
+    _working_directory,
+    build_engine,
+    close_engine,
+)
+from core.clock import Clock, get_clock
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on process steps per advance (caps catch-up work after long stalls)
+MAX_STEPS_PER_ADVANCE = 10_000
+
+
+@dataclass
+class LoadProfile:
+    """Synthetic market and exchange behaviour"""
+    symbols: int = 50
+    tick_hz: float = 1.0                     # price process steps per second
+    price_range: Tuple[float, float] = (0.01, 100.0)
+    volatility_per_min: float = 0.002        # log-return stddev per minute
+    drift_per_min: float = 0.0
+    spread_bps: Tuple[float, float] = (5.0, 30.0)
+    flash_drops_per_hour: float = 0.5        # per symbol
+    flash_drop_pct: float = 4.0
+    flash_drop_s: float = 20.0
+    flash_recovery_s: float = 120.0
+    latency_ms: float = 50.0                 # median per-call latency
+    latency_sigma: float = 0.5               # lognormal shape
+    rate_limit_bursts_per_hour: float = 0.0
+    rate_limit_burst_s: float = 5.0
+    timeout_rate: float = 0.0                # fraction of calls timing out
+    timeout_s: float = 7.0
+    seed: int = 0
+
+
+class SyntheticMarket:
+    """Vectorized price processes for all synthetic symbols"""
+
+    def __init__(self, profile: LoadProfile, start_ts: float):
+        """
+        Initialize synthetic market.
+
+        Args:
+            profile: Market parameters
+            start_ts: Timestamp of the initial quotes
+        """
+        self.profile = profile
+        self.rng = np.random.default_rng(profile.seed)
+        n = profile.symbols
+        self.symbols = [f"S{i:04d}/USDT" for i in range(n)]
+        lo, hi = profile.price_range
+        self.log_base = self.rng.uniform(math.log(lo), math.log(hi), n)
+        self.spread = self.rng.uniform(*profile.spread_bps, n) / 10000.0
+        self.volume = self.rng.uniform(1e4, 1e6, n)
+        self.drop_onset = np.full(n, np.nan)
+        self.flash_drops: List[Tuple[str, float]] = []
+        self.ts = float(start_ts)
+        self.steps = 0
+        self._dt = 1.0 / profile.tick_hz
+
+    def advance_to(self, ts: float) -> int:
+        """Step all price processes up to ts; returns the number of steps taken"""
+        n_steps = int((ts - self.ts) / self._dt)
+        if n_steps <= 0:
+            return 0
+        n_steps = min(n_steps, MAX_STEPS_PER_ADVANCE)
+        p = self.profile
+        span = n_steps * self._dt
+        minutes = span / 60.0
+
+        # Sum of n_steps iid normal increments == one normal with scaled variance
+        self.log_base += self.rng.normal(p.drift_per_min * minutes,
+                                         p.volatility_per_min * math.sqrt(minutes), len(self.symbols))
+
+        # Poisson flash-drop onsets for symbols not currently dropping
+        idle = np.isnan(self.drop_onset)
+        rate = p.flash_drops_per_hour * span / 3600.0
+        starts = np.flatnonzero(idle & (self.rng.random(len(self.symbols)) < -np.expm1(-rate)))
+        if starts.size:
+            onsets = self.ts + self.rng.random(starts.size) * span
+            self.drop_onset[starts] = onsets
+            self.flash_drops.extend(zip((self.symbols[i] for i in starts), onsets.tolist()))
+
+        self.ts += span
+        self.steps += n_steps
+        age = self.ts - self.drop_onset
+        self.drop_onset[age >= p.flash_drop_s + p.flash_recovery_s] = np.nan
+        return n_steps
+
+    def overlay(self) -> np.ndarray:
+        """Flash-drop price factor per symbol (1.0 outside drops)"""
+        p = self.profile
+        age = self.ts - self.drop_onset
+        depth = p.flash_drop_pct / 100.0
+        falling = np.clip(age / p.flash_drop_s, 0.0, 1.0)
+        recovering = np.clip((age - p.flash_drop_s) / p.flash_recovery_s, 0.0, 1.0)
+        factor = 1.0 - depth * falling * (1.0 - recovering)
+        return np.where(np.isnan(age), 1.0, factor)
+
+    def active_drop(self, symbol: str) -> Optional[float]:
+        """Onset timestamp of the flash drop symbol is currently in, if any"""
+        onset = self.drop_onset[self.symbols.index(symbol)] if symbol in self.symbols else np.nan
+        return None if np.isnan(onset) else float(onset)
+
+    def ticks(self) -> List[Dict[str, Any]]:
+        """Current quotes in SimulatedExchange.apply_ticks format"""
+        last = np.exp(self.log_base) * self.overlay()
+        half = last * self.spread / 2.0
+        bid, ask = last - half, last + half
+        return [
+            {"symbol": symbol, "last": float(last[i]), "bid": float(bid[i]), "ask": float(ask[i]),
+             "volume": float(self.volume[i])}
+            for i, symbol in enumerate(self.symbols)
+        ]
+
+
+class LoadGenExchange(SimulatedExchange):
+    """SimulatedExchange quoting a SyntheticMarket with injected latency and faults"""
+
+    def __init__(self, market: SyntheticMarket, initial_balance: float = 10000.0,
+                 fee_rate: float = 0.001, clock: Optional[Clock] = None):
+        """
+        Initialize load-generator exchange.
+
+        Args:
+            market: Synthetic market providing quotes
+            initial_balance: Starting quote balance
+            fee_rate: Exchange fee as fraction of fill cost
+            clock: Time source for latency and price evolution
+        """
+        super().__init__(initial_balance=initial_balance, fee_rate=fee_rate, clock=clock)
+        self.synthetic = market
+        self.profile = market.profile
+        self.faults_enabled = False
+        self._lock = threading.RLock()
+        self._rng = np.random.default_rng(market.profile.seed + 1)
+        self._burst_until = 0.0
+        self._burst_checked = market.ts
+        self.fault_stats = {"calls": 0, "rate_limited": 0, "timeouts": 0, "latency_s": 0.0}
+        self.decisions: List[Dict[str, Any]] = []
+        self._acted: set = set()
+        self._local = threading.local()
+        self.apply_ticks(market.ticks())
+
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_clock()
+
+    def _refresh(self):
+        with self._lock:
+            if self.synthetic.advance_to(self._now()):
+                self.apply_ticks(self.synthetic.ticks())
+
+    def _inject(self, method: str):
+        """Latency, 429 bursts and timeouts for one request"""
+        if not self.faults_enabled:
+            return
+        p = self.profile
+        now = self._now()
+        with self._lock:
+            self.fault_stats["calls"] += 1
+            elapsed = max(0.0, now - self._burst_checked)
+            self._burst_checked = now
+            if now >= self._burst_until and elapsed > 0 and \
+                    self._rng.random() < -math.expm1(-p.rate_limit_bursts_per_hour * elapsed / 3600.0):
+                self._burst_until = now + p.rate_limit_burst_s
+            if now < self._burst_until:
+                self.fault_stats["rate_limited"] += 1
+                raise RateLimitExceeded(f"mexc 429 Too Many Requests ({method})")
+            timed_out = self._rng.random() < p.timeout_rate
+            latency = p.timeout_s if timed_out else \
+                p.latency_ms / 1000.0 * float(np.exp(p.latency_sigma * self._rng.standard_normal()))
+            self.fault_stats["latency_s"] += latency
+        # Simulated runs: market data pool workers must not sleep in real time
+        clock = self.clock
+        if not isinstance(clock, SimulatedClock) or threading.get_ident() == clock.driver_thread:
+            clock.sleep(latency)
+        if timed_out:
+            with self._lock:
+                self.fault_stats["timeouts"] += 1
+            raise RequestTimeout(f"mexc GET {method} timed out after {p.timeout_s:.0f}s")
+
+    def _call(self, method: str, fn, *args, **kwargs):
+        # Nested calls (fetch_tickers -> fetch_ticker) belong to one request
+        if getattr(self._local, "depth", 0):
+            return fn(*args, **kwargs)
+        self._inject(method)
+        self._refresh()
+        self._local.depth = 1
+        try:
+            with self._lock:
+                return fn(*args, **kwargs)
+        finally:
+            self._local.depth = 0
+
+    def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        return self._call("fetch_ticker", super().fetch_ticker, symbol)
+
+    def fetch_tickers(self, symbols: Optional[List[str]] = None) -> Dict[str, Any]:
+        return self._call("fetch_tickers", super().fetch_tickers, symbols)
+
+    def fetch_order_book(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        return self._call("fetch_order_book", super().fetch_order_book, symbol, limit)
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = "1m", limit: int = 100, since: Optional[int] = None):
+        return self._call("fetch_ohlcv", super().fetch_ohlcv, symbol, timeframe, limit, since)
+
+    def fetch_balance(self) -> Dict[str, Any]:
+        return self._call("fetch_balance", super().fetch_balance)
+
+    def fetch_order(self, order_id: str, symbol: str = None) -> Dict[str, Any]:
+        return self._call("fetch_order", super().fetch_order, order_id, symbol)
+
+    def cancel_order(self, order_id: str, symbol: str = None) -> Dict[str, Any]:
+        return self._call("cancel_order", super().cancel_order, order_id, symbol)
+
+    def fetch_open_orders(self, symbol: str = None) -> List[Dict]:
+        return self._call("fetch_open_orders", super().fetch_open_orders, symbol)
+
+    def create_order(self, symbol: str, type: str, side: str, amount: float,
+                     price: Optional[float] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
+        order = self._call("create_order", super().create_order, symbol, type, side, amount, price, params)
+        if side == "buy":
+            self._record_decision(symbol)
+        return order
+
+    def _record_decision(self, symbol: str):
+        onset = self.synthetic.active_drop(symbol)
+        with self._lock:
+            if onset is None or (symbol, onset) in self._acted:
+                return
+            self._acted.add((symbol, onset))
+            self.decisions.append({"symbol": symbol, "onset_ts": onset,
+                                   "latency_s": self._now() - onset})
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    arr = np.asarray(values, dtype=float)
+    return {
+        "count": int(arr.size),
+        "mean": float(arr.mean()),
+        "p50": float(np.percentile(arr, 50)),
+        "p95": float(np.percentile(arr, 95)),
+        "max": float(arr.max()),
+    }
+
+
+class _EventCounter(logging.Handler):
+    """Counts log records by their event_type extra"""
+
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.counts: Dict[str, int] = {}
+
+    def emit(self, record: logging.LogRecord):
+        event_type = getattr(record, "event_type", None)
+        if event_type:
+            self.counts[event_type] = self.counts.get(event_type, 0) + 1
+
+
+@dataclass
+class LoadReport:
+    """Outcome of one load run"""
+    profile: Dict[str, Any]
+    realtime: bool
+    duration_s: float
+    wall_time_s: float
+    cycles: int
+    cycle_ms: Dict[str, float]
+    md_poll_ms: Dict[str, float]
+    md_poll_overruns: int
+    rss_start_mb: float
+    rss_end_mb: float
+    rss_peak_mb: float
+    flash_drops: int
+    decision_latency_s: Dict[str, float]
+    faults: Dict[str, Any]
+    events: Dict[str, int] = field(default_factory=dict)
+    engine_stats: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def memory_growth_mb(self) -> float:
+        return self.rss_end_mb - self.rss_start_mb
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["memory_growth_mb"] = self.memory_growth_mb
+        return data
+
+
+class LoadHarness:
+    """
+    Run the engine stack against LoadGenExchange for a fixed duration.
+
+    realtime=True starts the engine threads exactly like main.py (market data
+    poller + FSM main loop, 10s warmup) on the real clock. realtime=False
+    drives market data polls and engine cycles from the calling thread on a
+    simulated clock, so long soaks finish in minutes.
+    """
+
+    def __init__(
+        self,
+        profile: LoadProfile,
+        work_dir: str,
+        duration_s: float = 300.0,
+        realtime: bool = True,
+        initial_balance: float = 10000.0,
+        fee_rate: float = 0.001,
+        cycle_s: float = 0.5,
+        sample_s: float = 5.0,
+        config_overrides: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize load harness.
+
+        Args:
+            profile: Synthetic market and fault parameters
+            work_dir: Directory receiving all engine output of this run
+            duration_s: Run time after warmup (real or simulated seconds)
+            realtime: Real threads on the real clock vs. single-threaded simulation
+            initial_balance: Starting quote balance
+            fee_rate: Exchange fee as fraction of fill cost
+            cycle_s: Engine cycle interval in simulated mode
+            sample_s: Memory sampling interval (wall seconds)
+            config_overrides: config attributes to override for this run
+        """
+        self.profile = profile
+        self.work_dir = os.path.abspath(work_dir)
+        self.duration_s = duration_s
+        self.realtime = realtime
+        self.initial_balance = initial_balance
+        self.fee_rate = fee_rate
+        self.cycle_s = cycle_s
+        self.sample_s = sample_s
+        self.config_overrides = dict(config_overrides or {})
+
+    def _config_values(self) -> Dict[str, Any]:
+        values = dict(BACKTEST_CONFIG)
+        values["WINDOW_STORE"] = os.path.join(self.work_dir, "windows")
+        values["PHASE_LOG_FILE"] = os.path.join(self.work_dir, "phase_events.jsonl")
+        values.update(self.config_overrides)
+        return values
+
+    def run(self) -> LoadReport:
+        """Run the load and return the report"""
+        import core.portfolio.portfolio as portfolio_module
+        from telemetry.mem import rss_mb
+
+        os.makedirs(self.work_dir, exist_ok=True)
+        state_files = {
+            name: os.path.join(self.work_dir, filename)
+            for name, filename in _PORTFOLIO_STATE_FILES.items()
+        }
+        clock = None if self.realtime else SimulatedClock(start=time.time())
+        market = SyntheticMarket(self.profile, start_ts=(clock or time).time())
+        exchange = LoadGenExchange(market, self.initial_balance, self.fee_rate, clock=clock)
+
+        counter = _EventCounter()
+        md_logger = logging.getLogger("services.market_data")
+        md_logger.addHandler(counter)
+        cycle_times: List[float] = []
+        md_times: List[float] = []
+        rss = [rss_mb()]
+
+        wall_start = time.perf_counter()
+        try:
+            with _working_directory(self.work_dir), \
+                    _overrides(config, self._config_values()), \
+                    _overrides(portfolio_module, state_files):
+                if self.realtime:
+                    engine = build_engine(exchange, market.symbols, None)
+                    self._time_calls(engine, cycle_times, md_times)
+                    self._run_threaded(engine, exchange, rss)
+                else:
+                    with simulated_time(clock):
+                        engine = build_engine(exchange, market.symbols, clock)
+                        self._time_calls(engine, cycle_times, md_times)
+                        self._run_simulated(engine, exchange, clock, market.symbols, rss)
+        finally:
+            md_logger.removeHandler(counter)
+        wall_time = time.perf_counter() - wall_start
+        rss.append(rss_mb())
+
+        report = LoadReport(
+            profile=asdict(self.profile),
+            realtime=self.realtime,
+            duration_s=self.duration_s,
+            wall_time_s=wall_time,
+            cycles=len(cycle_times),
+            cycle_ms=_distribution([t * 1000.0 for t in cycle_times]),
+            md_poll_ms=_distribution([t * 1000.0 for t in md_times]),
+            md_poll_overruns=counter.counts.get("MD_POLL_OVERRUN", 0),
+            rss_start_mb=rss[0],
+            rss_end_mb=rss[-1],
+            rss_peak_mb=max(rss),
+            flash_drops=len(market.flash_drops),
+            decision_latency_s=_distribution([d["latency_s"] for d in exchange.decisions]),
+            faults=dict(exchange.fault_stats),
+            events=dict(counter.counts),
+            engine_stats=dict(engine.stats),
+        )
+        logger.info(
+            f"Load run done: {len(market.symbols)} symbols, {report.cycles} cycles, "
+            f"p95 cycle {report.cycle_ms.get('p95', 0.0):.1f}ms, {report.md_poll_overruns} overruns, "
+            f"RSS {report.memory_growth_mb:+.1f}MB, {len(exchange.decisions)}/{report.flash_drops} drops acted on"
+        )
+        return report
+
+    @staticmethod
+    def _time_calls(engine, cycle_times: List[float], md_times: List[float]):
+        """Wrap engine.run_cycle and market data polls with wall-clock timers"""
+        def timed(fn, sink):
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    sink.append(time.perf_counter() - start)
+            return wrapper
+
+        engine.run_cycle = timed(engine.run_cycle, cycle_times)
+        engine.market_data.update_market_data = timed(engine.market_data.update_market_data, md_times)
+
+    def _run_threaded(self, engine, exchange: LoadGenExchange, rss: List[float]):
+        from telemetry.mem import rss_mb
+
+        exchange.faults_enabled = True
+        try:
+            engine.start()
+            deadline = time.monotonic() + self.duration_s
+            while time.monotonic() < deadline:
+                time.sleep(min(self.sample_s, max(0.0, deadline - time.monotonic())))
+                rss.append(rss_mb())
+        finally:
+            engine.stop()
+            engine.market_data.stop()
+            close_engine(engine)
+
+    def _run_simulated(self, engine, exchange: LoadGenExchange, clock: SimulatedClock,
+                       symbols: List[str], rss: List[float]):
+        from telemetry.mem import rss_mb
+
+        poll_s = getattr(config, "MD_POLL_MS", 1000) / 1000.0
+        exchange.faults_enabled = True
+        end_ts = clock.time() + self.duration_s
+        next_poll = clock.time()
+        next_sample = time.perf_counter() + self.sample_s
+        try:
+            while clock.time() < end_ts:
+                if clock.time() >= next_poll:
+                    try:
+                        engine.market_data.update_market_data(symbols)
+                    except Exception as e:
+                        logger.debug(f"Market data poll failed: {e}")
+                    next_poll += poll_s
+                engine.run_cycle()
+                clock.advance(self.cycle_s)
+                if time.perf_counter() >= next_sample:
+                    rss.append(rss_mb())
+                    next_sample += self.sample_s
+        finally:
+            close_engine(engine)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the engine against a synthetic market")
+    parser.add_argument("--work-dir", required=True, help="Output directory for this run")
+    parser.add_argument("--duration", type=float, default=300.0, help="Run time in seconds")
+    parser.add_argument("--simulated", action="store_true", help="Single-threaded on a simulated clock")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--tick-hz", type=float, default=1.0)
+    parser.add_argument("--volatility", type=float, default=0.002, help="Log-return stddev per minute")
+    parser.add_argument("--flash-drops", type=float, default=0.5, help="Flash drops per symbol-hour")
+    parser.add_argument("--flash-drop-pct", type=float, default=4.0)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--rate-limit-bursts", type=float, default=0.0, help="429 bursts per hour")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Fraction of calls timing out")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    profile = LoadProfile(
+        symbols=args.symbols, tick_hz=args.tick_hz, volatility_per_min=args.volatility,
+        flash_drops_per_hour=args.flash_drops, flash_drop_pct=args.flash_drop_pct,
+        latency_ms=args.latency_ms, rate_limit_bursts_per_hour=args.rate_limit_bursts,
+        timeout_rate=args.timeout_rate, seed=args.seed,
+    )
+    harness = LoadHarness(profile, args.work_dir, duration_s=args.duration, realtime=not args.simulated)
+    print(json.dumps(harness.run().to_dict(), indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Backtest Runner - Replays Recorded Ticks Through the FSM Engine
+
+Drives the production FSMTradingEngine single-threaded on a simulated clock:
+
+    for each tick frame (one recorded market-data cycle):
+        clock -> frame timestamp
+        SimulatedExchange quotes <- frame ticks
+        MarketDataProvider.update_market_data()   (snapshots -> EventBus -> engine)
+        engine.run_cycle() every cycle_s until the next frame
+
+No wall-clock sleeping happens on the driver thread, so a backtest runs as
+fast as the engine can process cycles.
+
+Usage:
+    python -m backtest.runner state/drop_windows --work-dir /tmp/bt \\
+        --set DROP_TRIGGER_VALUE=0.98 --latency 0.2 --fee 0.001
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+import config
+from backtest.clock import SimulatedClock, simulated_time
+from backtest.exchange import SimulatedExchange
+from backtest.ticks import TickSource
+from services.market_metadata import load_cached_markets
+
+logger = logging.getLogger(__name__)
+
+# Config overrides every backtest needs: no persistence into live state,
+# no servers, no pacing delays, pipeline enabled
+BACKTEST_CONFIG = {
+    "FSM_SNAPSHOT_ENABLED": False,
+    "ENABLE_PROMETHEUS": False,
+    "ENGINE_DEBUG_TRACE": False,
+    "USE_NEW_PIPELINE": True,
+    "MARKET_DATA_BATCH_DELAY_S": 0.0,
+    "PERSIST_TICKS": False,
+    "PERSIST_SNAPSHOTS": False,
+    "FEATURE_PERSIST_STREAMS": False,
+    "PERSIST_WINDOWS": False,
+    "FEATURE_WARMSTART_TICKS": False,
+}
+
+# Portfolio state files are bound at import time (from config import ...)
+_PORTFOLIO_STATE_FILES = {
+    "STATE_FILE_HELD": "held_assets.json",
+    "STATE_FILE_OPEN_BUYS": "open_buy_orders.json",
+    "DROP_ANCHORS_FILE": "drop_anchors.json",
+}
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of one backtest run"""
+    symbols: List[str]
+    start_ts: float
+    end_ts: float
+    frames: int
+    cycles: int
+    trades: List[Dict[str, Any]]
+    initial_balance: float
+    final_equity: float
+    fees_paid: float
+    realized_pnl: Dict[str, float]
+    wall_time_s: float
+    max_drawdown_pct: float = 0.0
+    engine_stats: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def simulated_s(self) -> float:
+        return max(0.0, self.end_ts - self.start_ts)
+
+    @property
+    def speedup(self) -> float:
+        """Simulated seconds per wall-clock second"""
+        return self.simulated_s / self.wall_time_s if self.wall_time_s > 0 else 0.0
+
+    @property
+    def pnl(self) -> float:
+        return self.final_equity - self.initial_balance
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(simulated_s=self.simulated_s, speedup=self.speedup, pnl=self.pnl)
+        return data
+
+
+def realized_pnl_by_symbol(trades: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Average-cost realized PnL per symbol (fees included)"""
+    books: Dict[str, List[float]] = {}  # symbol -> [qty, cost]
+    realized: Dict[str, float] = {}
+    for trade in trades:
+        symbol = trade["symbol"]
+        qty_cost = books.setdefault(symbol, [0.0, 0.0])
+        fee = trade["fee"]["cost"]
+        if trade["side"] == "buy":
+            qty_cost[0] += trade["amount"]
+            qty_cost[1] += trade["cost"] + fee
+            realized.setdefault(symbol, 0.0)
+        else:
+            avg = qty_cost[1] / qty_cost[0] if qty_cost[0] > 0 else 0.0
+            sold = min(trade["amount"], qty_cost[0])
+            realized[symbol] = realized.get(symbol, 0.0) + trade["cost"] - fee - avg * sold
+            qty_cost[0] -= sold
+            qty_cost[1] -= avg * sold
+    return realized
+
+
+def round_trips(trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Group fills into closed round trips (flat -> position -> flat) per symbol.
+
+    Records use the trade journal fields consumed by services.rollup:
+    realized_pnl (before fees), fees_paid, realized_pnl_pct, duration_m.
+    Positions still open at the end of the replay are not included.
+    """
+    open_trips: Dict[str, Dict[str, Any]] = {}
+    closed = []
+    for trade in trades:
+        symbol = trade["symbol"]
+        trip = open_trips.get(symbol)
+        if trip is None:
+            if trade["side"] != "buy":
+                continue
+            trip = open_trips[symbol] = {
+                "symbol": symbol, "qty": 0.0, "buy_cost": 0.0, "sell_cost": 0.0,
+                "sold_qty": 0.0, "fees_paid": 0.0, "opened_ms": trade["timestamp"],
+            }
+        trip["fees_paid"] += trade["fee"]["cost"]
+        if trade["side"] == "buy":
+            trip["qty"] += trade["amount"]
+            trip["buy_cost"] += trade["cost"]
+            continue
+
+        trip["qty"] -= trade["amount"]
+        trip["sold_qty"] += trade["amount"]
+        trip["sell_cost"] += trade["cost"]
+        if trip["qty"] > 1e-12 * max(1.0, trip["sold_qty"]):
+            continue
+
+        del open_trips[symbol]
+        pnl = trip["sell_cost"] - trip["buy_cost"]
+        closed.append({
+            "symbol": symbol,
+            "realized_pnl": pnl,
+            "realized_pnl_pct": pnl / trip["buy_cost"] * 100.0 if trip["buy_cost"] > 0 else 0.0,
+            "fees_paid": trip["fees_paid"],
+            "duration_m": (trade["timestamp"] - trip["opened_ms"]) / 60000.0,
+        })
+    return closed
+
+
+@contextmanager
+def _overrides(obj: Any, values: Dict[str, Any]) -> Iterator[None]:
+    missing = object()
+    saved = {name: getattr(obj, name, missing) for name in values}
+    for name, value in values.items():
+        setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is missing:
+                delattr(obj, name)
+            else:
+                setattr(obj, name, value)
+
+
+@contextmanager
+def _working_directory(path: str) -> Iterator[None]:
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def build_engine(exchange, symbols: List[str], clock):
+    """Build the FSM engine stack (portfolio, engine, market data) on exchange"""
+    from core.portfolio.portfolio import PortfolioManager
+    from core.utils import SettlementManager
+    from engine.engine_config import MockOrderbookProvider
+    from engine.fsm_engine import FSMTradingEngine
+
+    portfolio = PortfolioManager(exchange, SettlementManager(None), None)
+    engine = FSMTradingEngine(
+        exchange, portfolio, MockOrderbookProvider(),
+        watchlist={symbol: {} for symbol in symbols},
+        clock=clock,
+    )
+    # Client-side request pacing is pointless against a simulated exchange
+    engine.exchange_adapter._min_request_interval = 0.0
+    return engine
+
+
+def close_engine(engine):
+    """Detach engine from process-wide services so the next run starts clean"""
+    from services.cooldown import get_cooldown_manager
+    from services.shutdown_coordinator import reset_shutdown_coordinator
+
+    try:
+        engine.event_bus.unsubscribe("market.snapshots", engine._on_market_snapshots)
+        engine.phase_logger.close()
+        engine.reconciler.shutdown()
+        engine.portfolio.close_state()
+        if engine.exchange_adapter._connection_recovery:
+            engine.exchange_adapter._connection_recovery.stop_monitoring()
+    except Exception as e:
+        logger.debug(f"Backtest engine cleanup failed: {e}")
+    get_cooldown_manager().clear_all()
+    reset_shutdown_coordinator()
+
+
+class BacktestRunner:
+    """
+    Replay recorded ticks through FSMTradingEngine on a simulated clock.
+
+    All relative files the engine writes (logs, sessions, state) go to work_dir.
+    """
+
+    def __init__(
+        self,
+        tick_path: str,
+        work_dir: str,
+        symbols: Optional[List[str]] = None,
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+        initial_balance: float = 10000.0,
+        fee_rate: float = 0.001,
+        latency_s: float = 0.0,
+        partial_fill_ratio: float = 1.0,
+        cycle_s: float = 0.5,
+        max_cycles_per_frame: int = 20,
+        config_overrides: Optional[Dict[str, Any]] = None,
+        markets_file: Optional[str] = None,
+    ):
+        """
+        Initialize backtest runner.
+
+        Args:
+            tick_path: Tick directory, base path containing ticks/, or .npy directory
+            work_dir: Directory receiving all engine output of this run
+            symbols: Restrict to these symbols (default: all recorded)
+            start_ts: First timestamp to replay
+            end_ts: Last timestamp to replay
+            initial_balance: Starting quote balance
+            fee_rate: Exchange fee as fraction of fill cost
+            latency_s: Order latency before first possible fill
+            partial_fill_ratio: Fraction of order amount filled per matching pass
+            cycle_s: Simulated engine cycle interval (live engine: 0.5s)
+            max_cycles_per_frame: Cap on engine cycles across recording gaps
+            config_overrides: config attributes to override for this run
+            markets_file: Market metadata cache (real precision/limits for recorded symbols)
+        """
+        self.source = TickSource(tick_path, symbols=symbols, start_ts=start_ts, end_ts=end_ts)
+        self.work_dir = os.path.abspath(work_dir)
+        self.initial_balance = initial_balance
+        self.fee_rate = fee_rate
+        self.latency_s = latency_s
+        self.partial_fill_ratio = partial_fill_ratio
+        self.cycle_s = cycle_s
+        self.max_cycles_per_frame = max_cycles_per_frame
+        self.config_overrides = dict(config_overrides or {})
+        self.markets_file = markets_file
+
+    def _config_values(self) -> Dict[str, Any]:
+        values = dict(BACKTEST_CONFIG)
+        values["WINDOW_STORE"] = os.path.join(self.work_dir, "windows")
+        values["PHASE_LOG_FILE"] = os.path.join(self.work_dir, "phase_events.jsonl")
+        values.update(self.config_overrides)
+        return values
+
+    def run(self) -> BacktestResult:
+        """Replay all frames and return the result"""
+        symbols = self.source.symbols
+        if not symbols:
+            raise ValueError(f"No recorded ticks found in {self.source.path}")
+        frames = self.source.frames()
+        first = next(frames, None)
+        if first is None:
+            raise ValueError(f"No ticks in the requested range in {self.source.path}")
+
+        os.makedirs(self.work_dir, exist_ok=True)
+        import core.portfolio.portfolio as portfolio_module
+
+        state_files = {
+            name: os.path.join(self.work_dir, filename)
+            for name, filename in _PORTFOLIO_STATE_FILES.items()
+        }
+        clock = SimulatedClock(start=first[0])
+        exchange = SimulatedExchange(
+            initial_balance=self.initial_balance,
+            fee_rate=self.fee_rate,
+            latency_s=self.latency_s,
+            partial_fill_ratio=self.partial_fill_ratio,
+            clock=clock,
+            markets=load_cached_markets(self.markets_file) if self.markets_file else None,
+        )
+        exchange.apply_ticks(first[1])
+
+        wall_start = time.perf_counter()
+        with _working_directory(self.work_dir), \
+                _overrides(config, self._config_values()), \
+                _overrides(portfolio_module, state_files), \
+                simulated_time(clock):
+            engine = self._build_engine(exchange, symbols, clock)
+            try:
+                frame_count, cycles, max_drawdown = self._replay(
+                    engine, exchange, clock, symbols, first, frames
+                )
+            finally:
+                self._close(engine)
+            end_ts = clock.time()
+        wall_time = time.perf_counter() - wall_start
+
+        result = BacktestResult(
+            symbols=symbols,
+            start_ts=first[0],
+            end_ts=end_ts,
+            frames=frame_count,
+            cycles=cycles,
+            trades=list(exchange.trades),
+            initial_balance=self.initial_balance,
+            final_equity=exchange.equity(),
+            fees_paid=exchange.fees_paid,
+            realized_pnl=realized_pnl_by_symbol(exchange.trades),
+            wall_time_s=wall_time,
+            max_drawdown_pct=max_drawdown,
+            engine_stats=dict(engine.stats),
+        )
+        logger.info(
+            f"Backtest done: {frame_count} frames, {cycles} cycles, {len(result.trades)} fills, "
+            f"PnL {result.pnl:+.2f}, {result.simulated_s:.0f}s simulated in {wall_time:.1f}s "
+            f"({result.speedup:.0f}x)"
+        )
+        return result
+
+    def _build_engine(self, exchange: SimulatedExchange, symbols: List[str], clock: SimulatedClock):
+        return build_engine(exchange, symbols, clock)
+
+    def _replay(self, engine, exchange: SimulatedExchange, clock: SimulatedClock,
+                symbols: List[str], first, frames) -> tuple:
+        frame_count = 0
+        cycles = 0
+        peak_equity = exchange.equity()
+        max_drawdown = 0.0
+        frame = first
+        while frame is not None:
+            frame_ts, ticks = frame
+            clock.advance_to(frame_ts)
+            exchange.apply_ticks(ticks)
+            engine.market_data.update_market_data(symbols)
+            frame_count += 1
+
+            # Drawdown on frame marks (equity at the recorded quotes)
+            equity = exchange.equity()
+            peak_equity = max(peak_equity, equity)
+            if peak_equity > 0:
+                max_drawdown = max(max_drawdown, (peak_equity - equity) / peak_equity * 100.0)
+
+            frame = next(frames, None)
+            next_ts = frame[0] if frame is not None else frame_ts + self.cycle_s
+            n = max(1, min(self.max_cycles_per_frame, math.ceil((next_ts - clock.time()) / self.cycle_s)))
+            for _ in range(n):
+                engine.run_cycle()
+                cycles += 1
+                clock.advance(self.cycle_s)
+        return frame_count, cycles, max_drawdown
+
+    def _close(self, engine):
+        close_engine(engine)
+
+
+def _parse_override(item: str):
+    name, _, raw = item.partition("=")
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError:
+        value = raw
+    return name.strip(), value
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded ticks through the FSM engine")
+    parser.add_argument("tick_path", help="Tick directory, base path with ticks/, or .npy directory")
+    parser.add_argument("--work-dir", required=True, help="Output directory for this run")
+    parser.add_argument("--symbols", nargs="*", help="Restrict to these symbols")
+    parser.add_argument("--start", type=float, help="Start timestamp")
+    parser.add_argument("--end", type=float, help="End timestamp")
+    parser.add_argument("--balance", type=float, default=10000.0)
+    parser.add_argument("--fee", type=float, default=0.001)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--partial-fill", type=float, default=1.0)
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="Config override (JSON value), repeatable")
+    parser.add_argument("--markets", help="Market metadata cache file (state/market_metadata.json)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    runner = BacktestRunner(
+        args.tick_path, args.work_dir, symbols=args.symbols, start_ts=args.start, end_ts=args.end,
+        initial_balance=args.balance, fee_rate=args.fee, latency_s=args.latency,
+        partial_fill_ratio=args.partial_fill,
+        config_overrides=dict(_parse_override(item) for item in args.set),
+        markets_file=args.markets,
+    )
+    result = runner.run()
+    summary = result.to_dict()
+    summary.pop("trades")
+    summary["fills"] = len(result.trades)
+    print(json.dumps(summary, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Drop-Trigger Screener - Vectorized Anchor Modes over Recorded Ticks
+
+NumPy re-implementation of the anchor/trigger path used live:
+
+    RollingWindow (WINDOW_LOOKBACK_S)  -> rolling_peak
+    AnchorManager.compute_anchor()     -> anchor   (modes 1-4, clamps, stale reset)
+    BuySignalService.evaluate_buy_signal() -> last <= anchor * DROP_TRIGGER_VALUE [* PREDICTIVE_BUY_ZONE_PCT]
+
+Whole per-symbol tick arrays are processed at once, and many trigger values
+are tested in one broadcast, so "how many triggers would mode X with value Y
+have produced last week" takes seconds instead of an engine replay.
+
+Key Features:
+- rolling_max(): time-window maximum via a sparse table (O(n log w))
+- anchor_series(): anchors for all four modes, matching the scalar path
+  tick-for-tick (see scalar_screen(), used by the tests and --validate)
+- trigger_hits(): hit matrix for many trigger values at once
+- screen_drop_triggers(): hit ticks and trigger events per (mode, value)
+
+Scope: one anchor evaluation per recorded tick, starting from a fresh
+AnchorManager (no persisted anchors, no warm-start). Post-fill anchor resets
+and position limits are engine behaviour and not modelled; use
+backtest.runner for that.
+
+Usage:
+    python -m backtest.screener state/drop_windows --modes 1 2 3 4 \\
+        --values 0.98 0.985 0.99 --days 7
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+import config
+from backtest.ticks import TickSource
+
+logger = logging.getLogger(__name__)
+
+
+def _param(value, name: str, default):
+    return getattr(config, name, default) if value is None else value
+
+
+def rolling_max(ts: np.ndarray, values: np.ndarray, lookback_s: float) -> np.ndarray:
+    """
+    Maximum of values over [ts - lookback_s, ts] for every element.
+
+    Same window as RollingWindow (entries with ts < now - lookback are trimmed).
+
+    Args:
+        ts: Non-decreasing timestamps
+        values: Values aligned with ts
+        lookback_s: Window length in seconds
+
+    Returns:
+        Array of window maxima
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return values.copy()
+    idx = np.arange(n)
+    start = np.searchsorted(ts, ts - lookback_s, side="left")
+    length = idx - start + 1
+
+    # Sparse table: levels[k][i] = max(values[i : i + 2**k])
+    levels = [values]
+    width = 1
+    while width * 2 <= length.max():
+        prev = levels[-1]
+        cur = prev.copy()
+        cur[:n - width] = np.maximum(prev[:n - width], prev[width:])
+        levels.append(cur)
+        width *= 2
+
+    level = np.zeros(n, dtype=np.int64)
+    for k in range(1, len(levels)):
+        level[length >= (1 << k)] = k
+
+    result = np.empty(n)
+    for k, table in enumerate(levels):
+        mask = level == k
+        if mask.any():
+            result[mask] = np.maximum(table[start[mask]], table[idx[mask] - (1 << k) + 1])
+    return result
+
+
+def anchor_series(
+    ts: np.ndarray,
+    last: np.ndarray,
+    mode: int,
+    lookback_s: Optional[float] = None,
+    stale_minutes: Optional[float] = None,
+    clamp_above_peak_pct: Optional[float] = None,
+    max_start_drop_pct: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Anchor price at every tick of one symbol (AnchorManager.compute_anchor).
+
+    Args:
+        ts: Non-decreasing tick timestamps
+        last: Last prices aligned with ts
+        mode: 1=session-high, 2=rolling-high, 3=hybrid, 4=persistent
+        lookback_s: Rolling window (default: config.WINDOW_LOOKBACK_S)
+        stale_minutes: Mode 4 stale reset (default: config.ANCHOR_STALE_MINUTES)
+        clamp_above_peak_pct: Over-peak clamp (default: config.ANCHOR_CLAMP_MAX_ABOVE_PEAK_PCT)
+        max_start_drop_pct: Start-drop clamp (default: config.ANCHOR_MAX_START_DROP_PCT)
+
+    Returns:
+        Array of anchors aligned with ts
+    """
+    ts = np.asarray(ts, dtype=np.float64)
+    last = np.asarray(last, dtype=np.float64)
+    if len(last) == 0:
+        return last.copy()
+    lookback_s = _param(lookback_s, "WINDOW_LOOKBACK_S", 300)
+    stale_minutes = _param(stale_minutes, "ANCHOR_STALE_MINUTES", 60)
+    clamp_pct = _param(clamp_above_peak_pct, "ANCHOR_CLAMP_MAX_ABOVE_PEAK_PCT", 0.5) / 100.0
+    max_drop_pct = _param(max_start_drop_pct, "ANCHOR_MAX_START_DROP_PCT", 8.0) / 100.0
+
+    session_peak = np.maximum.accumulate(last)
+    if mode == 1:
+        anchor = session_peak
+    elif mode == 2:
+        anchor = rolling_max(ts, last, lookback_s)
+    elif mode == 3:
+        anchor = np.maximum(session_peak, rolling_max(ts, last, lookback_s))
+    else:
+        # Persistent: anchor only rises, except when the previous evaluation
+        # is older than the stale limit (reset to base)
+        base = np.maximum(session_peak, rolling_max(ts, last, lookback_s))
+        resets = np.flatnonzero(np.diff(ts) > stale_minutes * 60) + 1
+        bounds = [0, *resets.tolist(), len(base)]
+        anchor = np.empty_like(base)
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            anchor[lo:hi] = np.maximum.accumulate(base[lo:hi])
+
+    anchor = np.minimum(anchor, session_peak * (1.0 + clamp_pct))
+    return np.maximum(anchor, last[0] * (1.0 - max_drop_pct))
+
+
+def trigger_hits(
+    last: np.ndarray,
+    anchor: np.ndarray,
+    trigger_values: Iterable[float],
+    buy_mode: Optional[str] = None,
+    predictive_pct: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Buy-trigger hit matrix (BuySignalService.evaluate_buy_signal).
+
+    Args:
+        last: Last prices
+        anchor: Anchors aligned with last
+        trigger_values: DROP_TRIGGER_VALUE candidates
+        buy_mode: "RAW" or "PREDICTIVE" (default: config.BUY_MODE)
+        predictive_pct: Buy zone factor (default: config.PREDICTIVE_BUY_ZONE_PCT)
+
+    Returns:
+        Bool array of shape (len(trigger_values), len(last))
+    """
+    buy_mode = _param(buy_mode, "BUY_MODE", "PREDICTIVE")
+    values = np.asarray(list(trigger_values), dtype=np.float64)[:, None]
+    threshold = np.asarray(anchor, dtype=np.float64)[None, :] * values
+    if buy_mode == "PREDICTIVE":
+        threshold = threshold * _param(predictive_pct, "PREDICTIVE_BUY_ZONE_PCT", 0.995)
+    return (np.asarray(last)[None, :] <= threshold) & (np.asarray(anchor)[None, :] > 0)
+
+
+def trigger_events(hits: np.ndarray) -> np.ndarray:
+    """Rising edges of a hit matrix (first tick of each run of hits)"""
+    events = hits.copy()
+    events[..., 1:] &= ~hits[..., :-1]
+    return events
+
+
+def screen_drop_triggers(
+    arrays: Dict[str, np.ndarray],
+    modes: Iterable[int],
+    trigger_values: Iterable[float],
+    **params,
+) -> List[Dict[str, Any]]:
+    """
+    Count trigger hits for every (mode, trigger value) over all symbols.
+
+    Args:
+        arrays: Symbol -> TICK_DTYPE array (see TickSource.arrays)
+        modes: Anchor modes to evaluate
+        trigger_values: DROP_TRIGGER_VALUE candidates
+        **params: anchor_series() / trigger_hits() parameter overrides
+
+    Returns:
+        One row per (mode, value): hit_ticks, triggers (entries into the
+        buy zone), symbols_triggered and per-symbol trigger counts
+    """
+    values = list(trigger_values)
+    anchor_keys = ("lookback_s", "stale_minutes", "clamp_above_peak_pct", "max_start_drop_pct")
+    anchor_params = {k: v for k, v in params.items() if k in anchor_keys}
+    hit_params = {k: v for k, v in params.items() if k not in anchor_keys}
+
+    rows = []
+    for mode in modes:
+        hit_ticks = np.zeros(len(values), dtype=np.int64)
+        by_symbol: List[Dict[str, int]] = [{} for _ in values]
+        for symbol, arr in arrays.items():
+            if len(arr) == 0:
+                continue
+            last = np.asarray(arr["last"])
+            anchor = anchor_series(arr["ts"], last, mode, **anchor_params)
+            hits = trigger_hits(last, anchor, values, **hit_params)
+            hit_ticks += hits.sum(axis=1)
+            for i, count in enumerate(trigger_events(hits).sum(axis=1).tolist()):
+                if count:
+                    by_symbol[i][symbol] = count
+        for i, value in enumerate(values):
+            rows.append({
+                "mode": mode,
+                "trigger_value": value,
+                "hit_ticks": int(hit_ticks[i]),
+                "triggers": sum(by_symbol[i].values()),
+                "symbols_triggered": len(by_symbol[i]),
+                "by_symbol": by_symbol[i],
+            })
+    return rows
+
+
+def scalar_screen(
+    symbol: str,
+    ts: np.ndarray,
+    last: np.ndarray,
+    mode: int,
+    trigger_value: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reference path: drive RollingWindow, AnchorManager and
+    BuySignalService tick by tick, exactly as MarketDataProvider and the
+    engine do. Parameters come from config (mode is overridden).
+
+    Returns:
+        (anchors, hits) arrays aligned with ts
+    """
+    from backtest.runner import _overrides
+    from core.rolling_windows import RollingWindow
+    from market.anchor_manager import AnchorManager
+    from services.buy_signals import BuySignalService
+
+    anchors = np.empty(len(last))
+    hits = np.zeros(len(last), dtype=bool)
+    with tempfile.TemporaryDirectory() as tmpdir, _overrides(config, {"DROP_TRIGGER_MODE": mode}):
+        window = RollingWindow(getattr(config, "WINDOW_LOOKBACK_S", 300))
+        anchor_manager = AnchorManager(base_path=tmpdir, load_on_start=False)
+        signals = BuySignalService(drop_trigger_value=trigger_value, drop_trigger_mode=mode,
+                                   enable_minutely_audit=False)
+        signal_logger = logging.getLogger("services.buy_signals")
+        level = signal_logger.level
+        signal_logger.setLevel(logging.WARNING)
+        try:
+            for i, (now, price) in enumerate(zip(ts.tolist(), last.tolist())):
+                window.add(now, price)
+                anchor_manager.note_price(symbol, price, now)
+                anchors[i] = anchor_manager.compute_anchor(symbol, price, now, window.peak() or price)
+                store = {symbol: {"windows": {"anchor": anchors[i]}}}
+                hits[i], _ = signals.evaluate_buy_signal(symbol, price, store)
+        finally:
+            signal_logger.setLevel(level)
+    return anchors, hits
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Vectorized drop-trigger screener over recorded ticks")
+    parser.add_argument("tick_path", help="Tick directory, base path with ticks/, or .npy directory")
+    parser.add_argument("--modes", type=int, nargs="+", default=[1, 2, 3, 4])
+    parser.add_argument("--values", type=float, nargs="+",
+                        default=[getattr(config, "DROP_TRIGGER_VALUE", 0.985)])
+    parser.add_argument("--symbols", nargs="*", help="Restrict to these symbols")
+    parser.add_argument("--start", type=float, help="Start timestamp")
+    parser.add_argument("--end", type=float, help="End timestamp")
+    parser.add_argument("--days", type=float, help="Only the last N days (relative to --end or now)")
+    parser.add_argument("--buy-mode", choices=["RAW", "PREDICTIVE"], help="Override config.BUY_MODE")
+    parser.add_argument("--validate", action="store_true",
+                        help="Cross-check every symbol against the scalar path (slow)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    start_ts = args.start
+    if args.days is not None:
+        start_ts = (args.end or time.time()) - args.days * 86400
+    source = TickSource(args.tick_path, symbols=args.symbols, start_ts=start_ts, end_ts=args.end)
+
+    t0 = time.perf_counter()
+    arrays = source.arrays()
+    rows = screen_drop_triggers(arrays, args.modes, args.values, buy_mode=args.buy_mode)
+    elapsed = time.perf_counter() - t0
+
+    for row in rows:
+        print(json.dumps({k: v for k, v in row.items() if k != "by_symbol"}))
+    print(f"{sum(len(a) for a in arrays.values())} ticks, {len(arrays)} symbols "
+          f"from {os.path.abspath(source.path)} in {elapsed:.2f}s")
+
+    if args.validate:
+        with _buy_mode(args.buy_mode):
+            mismatches = 0
+            for mode in args.modes:
+                for value in args.values:
+                    for symbol, arr in arrays.items():
+                        ts, last = np.asarray(arr["ts"]), np.asarray(arr["last"])
+                        anchors, hits = scalar_screen(symbol, ts, last, mode, value)
+                        vec_anchors = anchor_series(ts, last, mode)
+                        vec_hits = trigger_hits(last, vec_anchors, [value])[0]
+                        if not (np.array_equal(anchors, vec_anchors) and np.array_equal(hits, vec_hits)):
+                            mismatches += 1
+                            print(f"MISMATCH mode={mode} value={value} {symbol}")
+        print("validation: " + ("OK" if not mismatches else f"{mismatches} mismatches"))
+        return 1 if mismatches else 0
+    return 0
+
+
+def _buy_mode(buy_mode: Optional[str]):
+    from backtest.runner import _overrides
+    return _overrides(config, {"BUY_MODE": buy_mode} if buy_mode else {})
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
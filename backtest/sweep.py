@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Backtest Sweep - Parameter Grid Search Across All Cores
+
+Runs one BacktestRunner per configuration in a ProcessPoolExecutor:
+
+Key Features:
+- Recorded ticks are converted to .npy once; workers memory-map the arrays,
+  so every process shares the same page-cache copy instead of re-parsing JSONL
+- Each configuration runs in a fresh interpreter (spawn, one task per child),
+  so module-level singletons cannot leak state between configurations
+- Config overrides are plain config.py attribute names (same as --set on
+  backtest.runner); deprecated aliases are kept in sync
+- Results are checkpointed to results.jsonl as each run finishes; a rerun
+  skips configurations already completed
+- KPIs come from services.rollup.compute_trade_kpis over closed round trips,
+  plus equity PnL and max drawdown from the simulated exchange
+
+Usage:
+    python -m backtest.sweep state/drop_windows --out /tmp/sweep \\
+        --grid DROP_TRIGGER_VALUE=0.98,0.985,0.99 \\
+        --grid DROP_TRIGGER_MODE=1,4 --grid ANCHOR_STALE_MINUTES=30,60 \\
+        --grid TAKE_PROFIT_THRESHOLD=1.005,1.01 --grid MAX_TRADES=3,5
+"""
+
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+import config
+from backtest.ticks import TickSource, convert_ticks_to_npy, load_tick_array, symbol_to_safe
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "results.jsonl"
+RESULTS_TABLE = "results.csv"
+# Written after the last .npy array; a ticks_npy/ without it is incomplete
+TICKS_MANIFEST_FILE = "ticks_npy.manifest.json"
+
+# Deprecated config names the engine still reads next to their replacement
+CONFIG_ALIASES = {
+    "MAX_TRADES": "MAX_CONCURRENT_POSITIONS",
+    "MAX_CONCURRENT_POSITIONS": "MAX_TRADES",
+    "DROP_TRIGGER_MODE": "MODE",
+    "MODE": "DROP_TRIGGER_MODE",
+}
+
+RESULT_COLUMNS = [
+    "config_id", "net_pnl", "equity_pnl", "max_drawdown_pct", "total_trades", "wins",
+    "losses", "win_rate_pct", "total_fees", "avg_pnl_per_trade", "avg_duration_minutes",
+    "fills", "open_positions", "wall_time_s", "speedup",
+]
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of a parameter grid.
+
+    Args:
+        grid: Config name -> list of values
+
+    Returns:
+        List of override dicts, one per combination
+    """
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def config_id(overrides: Dict[str, Any]) -> str:
+    """Stable short id for an override dict (checkpoint key and run directory)"""
+    payload = json.dumps(overrides, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def with_aliases(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply deprecated alias names so both spellings carry the swept value"""
+    values = dict(overrides)
+    for name, value in overrides.items():
+        alias = CONFIG_ALIASES.get(name)
+        if alias and alias not in overrides:
+            values[alias] = value
+    return values
+
+
+def summarize(result, overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build one results-table row from a BacktestResult.
+
+    Args:
+        result: BacktestResult of the run
+        overrides: Config overrides the run used
+
+    Returns:
+        Flat dict with config_id, overrides and KPIs
+    """
+    from backtest.runner import round_trips
+    from services.rollup import compute_trade_kpis
+
+    trips = round_trips(result.trades)
+    kpis = compute_trade_kpis(trips) if trips else {}
+    return {
+        "config_id": config_id(overrides),
+        "overrides": overrides,
+        "net_pnl": kpis.get("net_pnl", 0.0),
+        "equity_pnl": round(result.pnl, 2),
+        "max_drawdown_pct": round(result.max_drawdown_pct, 3),
+        "total_trades": kpis.get("total_trades", 0),
+        "wins": kpis.get("wins", 0),
+        "losses": kpis.get("losses", 0),
+        "win_rate_pct": kpis.get("win_rate_pct", 0.0),
+        "total_fees": round(result.fees_paid, 2),
+        "avg_pnl_per_trade": kpis.get("avg_pnl_per_trade", 0.0),
+        "avg_duration_minutes": kpis.get("avg_duration_minutes", 0.0),
+        "fills": len(result.trades),
+        "open_positions": sum(1 for qty in _open_quantities(result.trades).values() if qty > 0),
+        "wall_time_s": round(result.wall_time_s, 3),
+        "speedup": round(result.speedup, 1),
+    }
+
+
+def _open_quantities(trades: List[Dict[str, Any]]) -> Dict[str, float]:
+    qty: Dict[str, float] = {}
+    for trade in trades:
+        sign = 1.0 if trade["side"] == "buy" else -1.0
+        qty[trade["symbol"]] = qty.get(trade["symbol"], 0.0) + sign * trade["amount"]
+    return {symbol: q if q > 1e-12 else 0.0 for symbol, q in qty.items()}
+
+
+def _run_config(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker entry point: run one configuration and return its result row"""
+    logging.basicConfig(level=task.get("log_level", logging.WARNING))
+    from backtest.runner import BacktestRunner
+
+    overrides = task["overrides"]
+    runner = BacktestRunner(
+        task["tick_path"],
+        os.path.join(task["out_dir"], "runs", config_id(overrides)),
+        config_overrides=with_aliases(overrides),
+        **task["runner_kwargs"],
+    )
+    return summarize(runner.run(), overrides)
+
+
+class SweepRunner:
+    """
+    Grid search over config overrides with resumable checkpointing.
+
+    out_dir layout:
+        ticks_npy/       memory-mapped tick arrays shared by all workers
+        ticks_npy.manifest.json  source path and tick counts of a finished conversion
+        runs/<id>/       engine output of each configuration
+        results.jsonl    checkpoint, one row per finished configuration
+        results.csv      results table sorted by net PnL
+    """
+
+    def __init__(
+        self,
+        tick_path: str,
+        out_dir: str,
+        configs: List[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        symbols: Optional[List[str]] = None,
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+        **runner_kwargs,
+    ):
+        """
+        Initialize sweep runner.
+
+        Args:
+            tick_path: Tick directory (JSONL or .npy) or base path containing ticks/
+            out_dir: Sweep output directory (checkpoint, tables, run directories)
+            configs: Override dicts to evaluate (see expand_grid)
+            max_workers: Worker processes (default: all cores)
+            symbols: Restrict to these symbols (default: all recorded)
+            start_ts: First timestamp to replay
+            end_ts: Last timestamp to replay
+            **runner_kwargs: Further BacktestRunner arguments shared by all runs
+                (initial_balance, fee_rate, latency_s, ...)
+
+        Raises:
+            ValueError: If a config name does not exist in config.py
+        """
+        unknown = sorted({name for c in configs for name in c if not hasattr(config, name)})
+        if unknown:
+            raise ValueError(f"Unknown config names in sweep: {', '.join(unknown)}")
+
+        self.tick_path = tick_path
+        self.out_dir = os.path.abspath(out_dir)
+        self.configs = configs
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.runner_kwargs = dict(runner_kwargs, symbols=symbols, start_ts=start_ts, end_ts=end_ts)
+        self.checkpoint_path = os.path.join(self.out_dir, CHECKPOINT_FILE)
+        self.executed = 0
+
+    def prepare_ticks(self) -> str:
+        """
+        Ensure the tick data is available as .npy arrays.
+
+        Returns:
+            Path workers replay from
+        """
+        source = TickSource(self.tick_path, symbols=self.runner_kwargs["symbols"])
+        if source.format == "npy":
+            return source.path
+
+        npy_dir = os.path.join(self.out_dir, "ticks_npy")
+        manifest_path = os.path.join(self.out_dir, TICKS_MANIFEST_FILE)
+        symbols = self.runner_kwargs["symbols"]
+        expected = {"source": os.path.abspath(source.path), "symbols": sorted(symbols) if symbols else None}
+        if self._ticks_complete(npy_dir, manifest_path, expected):
+            return npy_dir
+
+        # Missing, partial (crash during conversion) or from another source: rebuild
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        shutil.rmtree(npy_dir, ignore_errors=True)
+        counts = convert_ticks_to_npy(source.path, npy_dir, symbols=symbols)
+        tmp = f"{manifest_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dict(expected, ticks=counts), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, manifest_path)
+        return npy_dir
+
+    @staticmethod
+    def _ticks_complete(npy_dir: str, manifest_path: str, expected: Dict[str, Any]) -> bool:
+        """True if the manifest matches the source and every array holds its recorded tick count"""
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return False
+        if any(manifest.get(key) != value for key, value in expected.items()):
+            return False
+        try:
+            for symbol, count in manifest.get("ticks", {}).items():
+                if len(load_tick_array(os.path.join(npy_dir, f"{symbol_to_safe(symbol)}.npy"))) != count:
+                    return False
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def load_checkpoint(self) -> Dict[str, Dict[str, Any]]:
+        """Completed rows by config_id (a torn last line is ignored)"""
+        done: Dict[str, Dict[str, Any]] = {}
+        if not os.path.exists(self.checkpoint_path):
+            return done
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "error" not in row:
+                    done[row["config_id"]] = row
+        return done
+
+    def _append_checkpoint(self, row: Dict[str, Any]):
+        with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(row, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def run(self) -> List[Dict[str, Any]]:
+        """
+        Run all configurations not yet in the checkpoint.
+
+        Returns:
+            Result rows for all configurations, sorted by net PnL (best first)
+        """
+        os.makedirs(self.out_dir, exist_ok=True)
+        tick_path = self.prepare_ticks()
+        done = self.load_checkpoint()
+
+        pending = {}
+        for overrides in self.configs:
+            cid = config_id(overrides)
+            if cid not in done:
+                pending[cid] = overrides
+        logger.info(
+            f"Sweep: {len(self.configs)} configs, {len(done)} checkpointed, "
+            f"{len(pending)} to run on {self.max_workers} workers"
+        )
+
+        self.executed = 0
+        if pending:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(pending)), mp_context=ctx, max_tasks_per_child=1
+            ) as pool:
+                futures = {
+                    pool.submit(_run_config, {
+                        "tick_path": tick_path,
+                        "out_dir": self.out_dir,
+                        "overrides": overrides,
+                        "runner_kwargs": self.runner_kwargs,
+                        "log_level": logging.WARNING,
+                    }): cid
+                    for cid, overrides in pending.items()
+                }
+                for future in as_completed(futures):
+                    cid = futures[future]
+                    try:
+                        row = future.result()
+                    except Exception as e:
+                        logger.error(f"Sweep config {cid} failed: {e}")
+                        self._append_checkpoint({"config_id": cid, "overrides": pending[cid], "error": str(e)})
+                        continue
+                    self._append_checkpoint(row)
+                    done[cid] = row
+                    self.executed += 1
+                    logger.info(
+                        f"Sweep {len(done)}/{len(self.configs)}: {cid} net={row['net_pnl']:+.2f} "
+                        f"trades={row['total_trades']} dd={row['max_drawdown_pct']:.2f}%"
+                    )
+
+        wanted = {config_id(c) for c in self.configs}
+        rows = sorted((r for cid, r in done.items() if cid in wanted), key=lambda r: r["net_pnl"], reverse=True)
+        self.write_table(rows)
+        return rows
+
+    def write_table(self, rows: List[Dict[str, Any]]) -> str:
+        """
+        Write the results table as CSV (one column per swept config name).
+
+        Returns:
+            Path of the CSV file
+        """
+        params = sorted({name for row in rows for name in row["overrides"]})
+        path = os.path.join(self.out_dir, RESULTS_TABLE)
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(params + RESULT_COLUMNS)
+            for row in rows:
+                writer.writerow(
+                    [row["overrides"].get(name) for name in params] + [row.get(col) for col in RESULT_COLUMNS]
+                )
+        return path
+
+
+def _parse_grid_item(item: str):
+    name, _, raw = item.partition("=")
+    values = []
+    for part in raw.split(","):
+        try:
+            values.append(json.loads(part))
+        except json.JSONDecodeError:
+            values.append(part)
+    return name.strip(), values
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep over recorded ticks")
+    parser.add_argument("tick_path", help="Tick directory, base path with ticks/, or .npy directory")
+    parser.add_argument("--out", required=True, help="Sweep output directory (resumable)")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+                        help="Config values to sweep (JSON values), repeatable")
+    parser.add_argument("--grid-file", help="JSON file mapping config names to value lists")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--symbols", nargs="*", help="Restrict to these symbols")
+    parser.add_argument("--start", type=float, help="Start timestamp")
+    parser.add_argument("--end", type=float, help="End timestamp")
+    parser.add_argument("--balance", type=float, default=10000.0)
+    parser.add_argument("--fee", type=float, default=0.001)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--partial-fill", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    grid: Dict[str, List[Any]] = {}
+    if args.grid_file:
+        with open(args.grid_file, "r", encoding="utf-8") as f:
+            grid.update(json.load(f))
+    grid.update(dict(_parse_grid_item(item) for item in args.grid))
+    if not grid:
+        parser.error("no parameters to sweep (use --grid or --grid-file)")
+
+    sweep = SweepRunner(
+        args.tick_path, args.out, expand_grid(grid), max_workers=args.workers,
+        symbols=args.symbols, start_ts=args.start, end_ts=args.end,
+        initial_balance=args.balance, fee_rate=args.fee, latency_s=args.latency,
+        partial_fill_ratio=args.partial_fill,
+    )
+    rows = sweep.run()
+    for row in rows[:10]:
+        print(json.dumps({k: row[k] for k in ["config_id", "overrides", "net_pnl", "max_drawdown_pct",
+                                              "total_trades", "win_rate_pct"]}, default=str))
+    print(f"Results: {os.path.join(sweep.out_dir, RESULTS_TABLE)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
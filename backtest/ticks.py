@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Recorded Tick Sources for Backtests
+
+MarketDataProvider persists one JSONL stream per symbol:
+
+    <WINDOW_STORE>/ticks/tick_<BASE>_<QUOTE>_<YYYYMMDD>[_NNN].jsonl
+    {"ts": ..., "symbol": ..., "last": ..., "bid": ..., "ask": ..., "volume": ..., "spread_bps": ...}
+
+The binary equivalent is one NumPy structured array per symbol
+(<dir>/<BASE>_<QUOTE>.npy, dtype TICK_DTYPE), loadable memory-mapped.
+convert_ticks_to_npy() builds it from the JSONL streams.
+
+TickSource merges the per-symbol streams (k-way heap merge by timestamp) into
+frames: all ticks stamped with the same market-data cycle time.
+"""
+
+import gzip
+import heapq
+import json
+import logging
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TICK_DTYPE = np.dtype([
+    ("ts", "f8"),
+    ("last", "f8"),
+    ("bid", "f8"),
+    ("ask", "f8"),
+    ("volume", "f8"),
+])
+
+_TICK_FILE_RE = re.compile(r"^tick_(?P<sym>.+)_(?P<date>\d{8})(?:_(?P<seq>\d{3}))?\.jsonl(?:\.gz)?$")
+
+
+def symbol_to_safe(symbol: str) -> str:
+    return symbol.replace("/", "_")
+
+
+def safe_to_symbol(safe: str) -> str:
+    """BTC_USDT -> BTC/USDT (quote is the last underscore-separated part)"""
+    base, _, quote = safe.rpartition("_")
+    return f"{base}/{quote}" if base else safe
+
+
+def discover_tick_files(ticks_dir: str, symbols: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+    """
+    Find persisted tick JSONL files grouped by symbol.
+
+    Returns:
+        Dict symbol -> file paths in chronological order (date, then sequence)
+    """
+    wanted = {symbol_to_safe(s) for s in symbols} if symbols else None
+    found: Dict[str, List[Tuple[str, int, str]]] = {}
+    try:
+        names = os.listdir(ticks_dir)
+    except FileNotFoundError:
+        return {}
+    for name in names:
+        match = _TICK_FILE_RE.match(name)
+        if not match:
+            continue
+        safe = match.group("sym")
+        if wanted is not None and safe not in wanted:
+            continue
+        seq = int(match.group("seq") or 0)
+        found.setdefault(safe, []).append((match.group("date"), seq, os.path.join(ticks_dir, name)))
+    return {
+        safe_to_symbol(safe): [path for _, _, path in sorted(entries)]
+        for safe, entries in sorted(found.items())
+    }
+
+
+def iter_jsonl_ticks(paths: Sequence[str], symbol: str) -> Iterator[Dict]:
+    """Yield tick dicts from a symbol's JSONL files (malformed lines skipped)"""
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    tick = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                ts = tick.get("ts")
+                last = tick.get("last")
+                if not ts or not last or last <= 0:
+                    continue
+                tick.setdefault("symbol", symbol)
+                yield tick
+
+
+def ticks_to_array(ticks: Iterable[Dict]) -> np.ndarray:
+    """Build a TICK_DTYPE array sorted by ts from tick dicts"""
+    rows = [
+        (float(t["ts"]), float(t["last"]), float(t.get("bid") or t["last"]),
+         float(t.get("ask") or t["last"]), float(t.get("volume") or 0.0))
+        for t in ticks
+    ]
+    arr = np.array(rows, dtype=TICK_DTYPE)
+    arr.sort(order="ts", kind="stable")
+    return arr
+
+
+def save_tick_array(path: str, ticks: Iterable[Dict]) -> int:
+    """Write ticks as a TICK_DTYPE .npy file (sorted by ts); returns row count"""
+    arr = ticks_to_array(ticks)
+    tmp = f"{path}.tmp.npy"
+    np.save(tmp, arr)
+    os.replace(tmp, path)
+    return len(arr)
+
+
+def load_tick_array(path: str, mmap: bool = True) -> np.ndarray:
+    """Load a TICK_DTYPE array (memory-mapped by default)"""
+    arr = np.load(path, mmap_mode="r" if mmap else None)
+    if arr.dtype != TICK_DTYPE:
+        raise ValueError(f"{path}: unexpected tick dtype {arr.dtype}")
+    return arr
+
+
+def iter_array_ticks(arr: np.ndarray, symbol: str) -> Iterator[Dict]:
+    for ts, last, bid, ask, volume in arr.tolist():
+        yield {"ts": ts, "symbol": symbol, "last": last, "bid": bid, "ask": ask, "volume": volume}
+
+
+def convert_ticks_to_npy(ticks_dir: str, out_dir: str, symbols: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """
+    Convert persisted tick JSONL streams into per-symbol .npy arrays.
+
+    Returns:
+        Dict symbol -> number of ticks written
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    written = {}
+    for symbol, paths in discover_tick_files(ticks_dir, symbols).items():
+        out_path = os.path.join(out_dir, f"{symbol_to_safe(symbol)}.npy")
+        written[symbol] = save_tick_array(out_path, iter_jsonl_ticks(paths, symbol))
+    logger.info(f"Converted {len(written)} tick streams to {out_dir}")
+    return written
+
+
+class TickSource:
+    """
+    Time-ordered frames of recorded ticks across symbols.
+
+    path may be a tick JSONL directory (base_path/ticks), a base_path containing
+    ticks/, or a directory of .npy arrays written by convert_ticks_to_npy().
+    """
+
+    def __init__(
+        self,
+        path: str,
+        symbols: Optional[Iterable[str]] = None,
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+        frame_interval_s: float = 0.0,
+    ):
+        """
+        Initialize tick source.
+
+        Args:
+            path: Tick directory (JSONL or .npy) or base_path containing ticks/
+            symbols: Restrict to these symbols (default: all recorded)
+            start_ts: Skip ticks before this timestamp
+            end_ts: Stop at ticks after this timestamp
+            frame_interval_s: 0 groups ticks with identical ts (one market data
+                cycle); > 0 buckets ticks into fixed intervals
+        """
+        if os.path.isdir(os.path.join(path, "ticks")):
+            path = os.path.join(path, "ticks")
+        self.path = path
+        self.start_ts = start_ts
+        self.end_ts = end_ts
+        self.frame_interval_s = frame_interval_s
+
+        wanted = set(symbols) if symbols else None
+        self._arrays: Dict[str, str] = {}
+        self._jsonl: Dict[str, List[str]] = {}
+        for name in sorted(os.listdir(path)) if os.path.isdir(path) else []:
+            if name.endswith(".npy"):
+                symbol = safe_to_symbol(name[:-4])
+                if wanted is None or symbol in wanted:
+                    self._arrays[symbol] = os.path.join(path, name)
+        if not self._arrays:
+            self._jsonl = discover_tick_files(path, wanted)
+
+    @property
+    def format(self) -> str:
+        return "npy" if self._arrays else "jsonl"
+
+    @property
+    def symbols(self) -> List[str]:
+        return sorted(self._arrays or self._jsonl)
+
+    def _range(self, arr: np.ndarray) -> np.ndarray:
+        if self.start_ts is not None:
+            arr = arr[np.searchsorted(arr["ts"], self.start_ts, side="left"):]
+        if self.end_ts is not None:
+            arr = arr[:np.searchsorted(arr["ts"], self.end_ts, side="right")]
+        return arr
+
+    def _symbol_iter(self, symbol: str) -> Iterator[Dict]:
+        if self._arrays:
+            return iter_array_ticks(self._range(load_tick_array(self._arrays[symbol])), symbol)
+
+        ticks = iter_jsonl_ticks(self._jsonl[symbol], symbol)
+        if self.start_ts is None and self.end_ts is None:
+            return ticks
+        return (
+            t for t in ticks
+            if (self.start_ts is None or t["ts"] >= self.start_ts)
+            and (self.end_ts is None or t["ts"] <= self.end_ts)
+        )
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Per-symbol TICK_DTYPE arrays restricted to [start_ts, end_ts].
+
+        .npy sources are returned as memory-mapped slices; JSONL sources are
+        parsed into memory.
+        """
+        if self._arrays:
+            return {s: self._range(load_tick_array(p)) for s, p in self._arrays.items()}
+        return {s: ticks_to_array(self._symbol_iter(s)) for s in self.symbols}
+
+    def ticks(self) -> Iterator[Dict]:
+        """All ticks in timestamp order (k-way merge over symbols)"""
+        return heapq.merge(*(self._symbol_iter(s) for s in self.symbols), key=lambda t: t["ts"])
+
+    def frames(self) -> Iterator[Tuple[float, List[Dict]]]:
+        """Yield (frame_ts, ticks) with at most one tick per symbol per frame"""
+        frame_ts = None
+        frame: Dict[str, Dict] = {}
+        interval = self.frame_interval_s
+        for tick in self.ticks():
+            ts = tick["ts"]
+            key = (ts // interval) * interval if interval > 0 else ts
+            if frame_ts is not None and key != frame_ts:
+                yield frame_ts, list(frame.values())
+                frame = {}
+            frame_ts = key
+            # Latest tick wins within a frame
+            frame[tick["symbol"]] = tick
+        if frame:
+            yield frame_ts, list(frame.values())
@@ -0,0 +1,13 @@
+"""
+Benchmarks - micro-benchmarks of the trading hot paths with regression tracking.
+
+The runner is not re-exported: `python -m bench.runner` must import it fresh.
+"""
+
+from .hotpaths import BENCHMARKS, Benchmark, benchmark
+
+__all__ = [
+    "BENCHMARKS",
+    "Benchmark",
+    "benchmark",
+]
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Hot-Path Benchmarks - The Project's Real Classes Under Load
+
+Each benchmark is a setup function registered with @benchmark. Setup runs
+once inside the run's working directory and returns a zero-argument
+callable; one call of that callable is one sample unit and performs `ops`
+operations of the measured hot path. A `close` attribute on the callable
+is called after the measurement, while the working directory still exists.
+
+Benchmarks:
+    market_data.update_market_data   MarketDataProvider pipeline over MockExchange
+    rolling_window.add               core.rolling_windows.RollingWindow.add
+    anchor_manager.compute_anchor    AnchorManager.compute_anchor (mode 4)
+    snapshot_builder.build           market.snapshot_builder.build
+    event_bus.publish                EventBus.publish to 4 subscribers
+    fsm.process_event                FSMachine.process_event (IDLE tick)
+    fsm_snapshot.save_snapshot       SnapshotManager.save_snapshot
+    jsonl_writer.append              RotatingJSONLWriter.append
+    portfolio.apply_fills            PortfolioManager.apply_fills (buy + sell)
+    buy_signals.evaluate_buy_signal  BuySignalService.evaluate_buy_signal
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict
+
+# Symbols polled per update_market_data call
+MD_SYMBOLS = 50
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """One registered hot-path benchmark"""
+    name: str
+    setup: Callable[[Path], Callable[[], None]]
+    ops: int = 1
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, ops: int = 1):
+    """Register a setup function as benchmark `name`"""
+    def register(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, ops)
+        return setup
+    return register
+
+
+def _counter():
+    n = 0
+
+    def next_value() -> int:
+        nonlocal n
+        n += 1
+        return n
+    return next_value
+
+
+@benchmark("market_data.update_market_data", ops=MD_SYMBOLS)
+def _market_data(work_dir: Path):
+    from adapters.exchange import ExchangeAdapter, MockExchange
+    from core.clock import SimulatedClock
+    from core.events import EventBus
+    from services.market_data import MarketDataProvider
+
+    symbols = [f"S{i:03d}/USDT" for i in range(MD_SYMBOLS)]
+    exchange = MockExchange({symbol: 1.0 + i for i, symbol in enumerate(symbols)})
+    adapter = ExchangeAdapter(exchange, max_retries=1, enable_connection_recovery=False)
+    adapter._min_request_interval = 0.0
+    clock = SimulatedClock(start=1_760_000_000.0)
+    provider = MarketDataProvider(
+        adapter, ticker_cache_ttl=0.5, enable_rate_limiting=False,
+        event_bus=EventBus(), clock=clock,
+    )
+
+    def run():
+        # Past the ticker TTL so every poll fetches and rebuilds snapshots
+        clock.advance(1.0)
+        provider.update_market_data(symbols)
+    return run
+
+
+@benchmark("rolling_window.add", ops=1000)
+def _rolling_window(work_dir: Path):
+    from core.rolling_windows import RollingWindow
+
+    window = RollingWindow(lookback_s=300)
+    tick = _counter()
+
+    def run():
+        for _ in range(1000):
+            i = tick()
+            window.add(i * 0.5, 100.0 + (i * 7919 % 1000) / 100.0)
+    return run
+
+
+@benchmark("anchor_manager.compute_anchor", ops=1000)
+def _anchor_manager(work_dir: Path):
+    from market.anchor_manager import AnchorManager
+
+    manager = AnchorManager(base_path=str(work_dir / "anchors"), load_on_start=False)
+    symbols = [f"S{i:03d}/USDT" for i in range(10)]
+    for symbol in symbols:
+        manager.note_price(symbol, 100.0, 0.0)
+    tick = _counter()
+
+    def run():
+        for _ in range(100):
+            i = tick()
+            for symbol in symbols:
+                manager.compute_anchor(symbol, 100.0 - (i % 50) / 10.0, float(i), 101.0)
+    return run
+
+
+@benchmark("snapshot_builder.build", ops=1000)
+def _snapshot_builder(work_dir: Path):
+    from market import snapshot_builder
+
+    windows = {"anchor": 101.0, "peak": 102.0, "trough": 97.0}
+    features = {"atr": 0.5, "volatility": 0.01}
+
+    def run():
+        for i in range(1000):
+            snapshot_builder.build("BTC/USDT", float(i), 100.0, 99.99, 100.01, windows, features, 2.0, 0.02)
+    return run
+
+
+@benchmark("event_bus.publish", ops=1000)
+def _event_bus(work_dir: Path):
+    from core.events import EventBus
+
+    bus = EventBus()
+    received = []
+    for _ in range(4):
+        bus.subscribe("market.snapshots", received.append)
+    payload = [{"symbol": "BTC/USDT"}]
+
+    def run():
+        for _ in range(1000):
+            bus.publish("market.snapshots", payload)
+        received.clear()
+    return run
+
+
+@benchmark("fsm.process_event", ops=100)
+def _fsm_process_event(work_dir: Path):
+    from core.fsm.fsm_events import EventContext, FSMEvent
+    from core.fsm.fsm_machine import FSMachine
+    from core.fsm.phases import Phase
+    from core.fsm.state import CoinState
+
+    machine = FSMachine()
+    state = CoinState(symbol="BTC/USDT", phase=Phase.IDLE)
+    tick = _counter()
+
+    def run():
+        for _ in range(100):
+            # Distinct 1s buckets so the idempotency store never short-circuits
+            ctx = EventContext(FSMEvent.TICK_RECEIVED, "BTC/USDT", timestamp=float(tick()),
+                               data={"price": 100.0})
+            machine.process_event(state, ctx)
+    return run
+
+
+@benchmark("fsm_snapshot.save_snapshot", ops=100)
+def _fsm_snapshot(work_dir: Path):
+    from core.fsm.phases import Phase
+    from core.fsm.snapshot import SnapshotManager
+    from core.fsm.state import CoinState
+
+    manager = SnapshotManager(work_dir / "fsm_snapshots")
+    states = [CoinState(symbol=f"S{i:03d}/USDT", phase=Phase.POSITION) for i in range(10)]
+
+    def run():
+        for _ in range(10):
+            for state in states:
+                manager.save_snapshot(state.symbol, state)
+    return run
+
+
+@benchmark("jsonl_writer.append", ops=1000)
+def _jsonl_writer(work_dir: Path):
+    from persistence.jsonl import RotatingJSONLWriter
+
+    writer = RotatingJSONLWriter(str(work_dir / "jsonl"), "ticks", max_mb=1024)
+    record = {"ts": 1_760_000_000.0, "symbol": "BTC/USDT", "last": 100.0, "bid": 99.99,
+              "ask": 100.01, "volume": 1e6, "spread_bps": 2.0}
+
+    def run():
+        for _ in range(1000):
+            writer.append(record)
+    return run
+
+
+@benchmark("portfolio.apply_fills", ops=200)
+def _portfolio_apply_fills(work_dir: Path):
+    from adapters.exchange import MockExchange
+    from core.portfolio.portfolio import PortfolioManager
+    from core.utils import SettlementManager
+
+    portfolio = PortfolioManager(MockExchange(), SettlementManager(None), None)
+    buy = [{"side": "buy", "amount": 0.001, "price": 50000.0, "cost": 50.0,
+            "fee": {"cost": 0.05, "currency": "USDT"}}]
+    sell = [{"side": "sell", "amount": 0.001, "price": 50100.0, "cost": 50.1,
+             "fee": {"cost": 0.05, "currency": "USDT"}}]
+
+    def run():
+        for _ in range(100):
+            portfolio.apply_fills("BTC/USDT", buy)
+            portfolio.apply_fills("BTC/USDT", sell)
+    run.close = portfolio.close_state
+    return run
+
+
+@benchmark("buy_signals.evaluate_buy_signal", ops=1000)
+def _buy_signals(work_dir: Path):
+    from core.clock import SimulatedClock
+    from market import snapshot_builder
+    from services.buy_signals import BuySignalService
+
+    clock = SimulatedClock(start=1_760_000_000.0)
+    service = BuySignalService(enable_minutely_audit=False, clock=clock)
+    store = {}
+    for i in range(10):
+        symbol = f"S{i:03d}/USDT"
+        snapshot = snapshot_builder.build(symbol, clock.time(), 100.0, 99.99, 100.01,
+                                          {"anchor": 101.0, "peak": 101.0, "trough": 99.0}, {}, 2.0)
+        store[symbol] = {"snapshot": snapshot, "ts": clock.time()}
+    symbols = list(store)
+
+    def run():
+        for _ in range(100):
+            for symbol in symbols:
+                service.evaluate_buy_signal(symbol, 100.0, store)
+    return run
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Hot-Path Benchmark Runner - JSON Artifacts and Regression Compare
+
+run:      time every registered benchmark (bench/hotpaths.py) and store the
+          result as artifacts/<YYYY-MM-DD>_bench/hotpaths.json
+compare:  diff two result files; exits 1 when any benchmark's median
+          ns/op got slower than the threshold
+
+Each benchmark is calibrated so one sample takes at least min_time_s, then
+sampled `repeat` times; the median is the tracked value, min/max show noise.
+All files the benchmarked classes write (state, logs) go to a temporary directory.
+
+Usage:
+    python -m bench.runner run
+    python -m bench.runner run --only fsm.process_event jsonl_writer.append --repeat 9
+    python -m bench.runner compare artifacts/2025-10-20_bench/hotpaths.json \\
+        artifacts/2025-10-27_bench/hotpaths.json --threshold 0.15
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import config
+from backtest.runner import _PORTFOLIO_STATE_FILES, BACKTEST_CONFIG, _overrides, _working_directory
+from bench.hotpaths import BENCHMARKS
+
+logger = logging.getLogger(__name__)
+
+ARTIFACTS_DIR = Path(__file__).resolve().parent.parent / "artifacts"
+RESULT_FILE = "hotpaths.json"
+
+
+@dataclass
+class BenchResult:
+    """Timing of one benchmark"""
+    name: str
+    ops: int
+    loops: int
+    samples_ns: List[float]  # ns per op, one entry per sample
+
+    @property
+    def median_ns(self) -> float:
+        return statistics.median(self.samples_ns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(median_ns=self.median_ns, min_ns=min(self.samples_ns), max_ns=max(self.samples_ns))
+        return data
+
+
+@dataclass
+class Regression:
+    """Benchmark slower than baseline beyond the threshold"""
+    name: str
+    baseline_ns: float
+    current_ns: float
+
+    @property
+    def change(self) -> float:
+        return self.current_ns / self.baseline_ns - 1.0
+
+
+def _time_once(fn, loops: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(loops):
+        fn()
+    return time.perf_counter_ns() - start
+
+
+def measure(name: str, fn, ops: int, repeat: int = 5, min_time_s: float = 0.2) -> BenchResult:
+    """Calibrate loops so a sample takes >= min_time_s, then take `repeat` samples"""
+    fn()  # warm caches, lazy imports and first-write paths
+    loops = 1
+    while True:
+        elapsed = _time_once(fn, loops)
+        if elapsed >= min_time_s * 1e9:
+            break
+        loops = loops * 2 if elapsed <= 0 else max(loops * 2, int(loops * min_time_s * 1e9 / elapsed) + 1)
+    samples = [_time_once(fn, loops) / (loops * ops) for _ in range(repeat)]
+    return BenchResult(name=name, ops=ops, loops=loops, samples_ns=samples)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ARTIFACTS_DIR.parent,
+            capture_output=True, text=True, timeout=10, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+@contextmanager
+def _bot_log_in(log_dir: str) -> Iterator[None]:
+    """Point the bot log file handlers (opened at import time) at log_dir"""
+    from core.logging import logger_setup
+
+    handlers = list(logging.getLogger(logger_setup.__name__).handlers)
+    if logger_setup._queue_listener is not None:
+        handlers.extend(logger_setup._queue_listener.handlers)
+    saved = {h: h.baseFilename for h in handlers if isinstance(h, logging.FileHandler)}
+
+    def retarget(paths):
+        for handler, path in paths.items():
+            with handler.lock:
+                handler.close()  # reopens lazily on the next record
+                handler.baseFilename = path
+
+    os.makedirs(log_dir, exist_ok=True)
+    retarget({h: os.path.join(log_dir, os.path.basename(path)) for h, path in saved.items()})
+    try:
+        yield
+    finally:
+        retarget(saved)
+
+
+def run_suite(names: Optional[List[str]] = None, repeat: int = 5,
+              min_time_s: float = 0.2) -> Dict[str, Any]:
+    """Run the selected benchmarks (default: all) and return the result document"""
+    names = names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {unknown} (available: {sorted(BENCHMARKS)})")
+
+    import core.logging.logger as jsonl_logger_module
+    import core.portfolio.portfolio as portfolio_module
+    from services.shutdown_coordinator import reset_shutdown_coordinator
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bench_") as tmpdir:
+        log_dir = os.path.join(tmpdir, "logs")
+        config_values = dict(BACKTEST_CONFIG, BASE_DIR=tmpdir, LOG_DIR=log_dir,
+                             LOG_FILE=os.path.join(log_dir, "bot_log.jsonl"),
+                             STATE_STORE_FILE=os.path.join(tmpdir, "state", "state.db"))
+        state_files = {
+            name: os.path.join(tmpdir, filename)
+            for name, filename in _PORTFOLIO_STATE_FILES.items()
+        }
+        try:
+            with _working_directory(tmpdir), \
+                    _overrides(config, config_values), \
+                    _overrides(portfolio_module, state_files), \
+                    _overrides(jsonl_logger_module, {"_DEFAULT_BASE_DIR": os.path.join(log_dir, "jsonl")}), \
+                    _bot_log_in(log_dir):
+                for name in names:
+                    bench = BENCHMARKS[name]
+                    work_dir = Path(tmpdir) / name
+                    work_dir.mkdir()
+                    fn = bench.setup(work_dir)
+                    try:
+                        result = measure(name, fn, bench.ops, repeat, min_time_s)
+                    finally:
+                        if hasattr(fn, "close"):
+                            fn.close()
+                    results[name] = result.to_dict()
+                    logger.info(f"{name}: {result.median_ns:,.0f} ns/op ({result.loops} loops x {bench.ops} ops)")
+        finally:
+            # MarketDataProvider starts the non-daemon shutdown heartbeat thread
+            reset_shutdown_coordinator()
+
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "min_time_s": min_time_s,
+        "results": results,
+    }
+
+
+def save(document: Dict[str, Any], out: Optional[str] = None) -> Path:
+    """Write the result document; default artifacts/<date>_bench/hotpaths.json"""
+    if out is None:
+        path = ARTIFACTS_DIR / f"{datetime.date.today().isoformat()}_bench" / RESULT_FILE
+    else:
+        path = Path(out)
+        if path.suffix != ".json":
+            path = path / RESULT_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def load(path: str) -> Dict[str, Any]:
+    """Load a result document (file or artifact directory)"""
+    p = Path(path)
+    if p.is_dir():
+        p = p / RESULT_FILE
+    with open(p, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10) -> List[Regression]:
+    """Benchmarks present in both documents whose median got slower by more than threshold"""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base or base["median_ns"] <= 0:
+            continue
+        if result["median_ns"] > base["median_ns"] * (1.0 + threshold):
+            regressions.append(Regression(name, base["median_ns"], result["median_ns"]))
+    return regressions
+
+
+def _print_table(baseline: Dict[str, Any], current: Dict[str, Any], regressed: set):
+    print(f"{'benchmark':<36} {'baseline ns/op':>15} {'current ns/op':>15} {'change':>8}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<36} {'-':>15} {result['median_ns']:>15,.0f} {'new':>8}")
+            continue
+        change = result["median_ns"] / base["median_ns"] - 1.0 if base["median_ns"] > 0 else 0.0
+        flag = "  REGRESSION" if name in regressed else ""
+        print(f"{name:<36} {base['median_ns']:>15,.0f} {result['median_ns']:>15,.0f} {change:>+8.1%}{flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks with regression tracking")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run benchmarks and store a JSON artifact")
+    run_p.add_argument("--only", nargs="*", help="Benchmark names (default: all)")
+    run_p.add_argument("--repeat", type=int, default=5)
+    run_p.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per sample")
+    run_p.add_argument("--out", help="Output file or directory (default: artifacts/<date>_bench/)")
+    run_p.add_argument("--baseline", help="Compare against this result after the run")
+    run_p.add_argument("--threshold", type=float, default=0.10)
+
+    cmp_p = sub.add_parser("compare", help="Flag regressions between two results")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--threshold", type=float, default=0.10,
+                       help="Allowed slowdown as fraction of baseline median (default 0.10)")
+
+    sub.add_parser("list", help="List registered benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name, bench in BENCHMARKS.items():
+            print(f"{name:<36} {bench.ops:>6} ops/call")
+        return 0
+
+    # Benchmarked classes log per call; keep their output out of the timings
+    logging.basicConfig(level=logging.WARNING)
+    logger.setLevel(logging.INFO)
+    if args.command == "run":
+        current = run_suite(args.only, args.repeat, args.min_time)
+        path = save(current, args.out)
+        print(f"Results written to {path}")
+        if not args.baseline:
+            return 0
+        baseline = load(args.baseline)
+    else:
+        baseline, current = load(args.baseline), load(args.current)
+
+    regressions = compare(baseline, current, args.threshold)
+    _print_table(baseline, current, {r.name for r in regressions})
+    for r in regressions:
+        print(f"REGRESSION {r.name}: {r.baseline_ns:,.0f} -> {r.current_ns:,.0f} ns/op ({r.change:+.1%})",
+              file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -328,6 +328,9 @@ ROUTER_FETCH_ORDER_ON_FILL = False  # P2: Fetch full order details on fill (slow
 # Reconciliation & Position Lifecycle (NEW - Exchange-Truth-Based Position Management)
 USE_RECONCILER = True  # Enable reconciler for position lifecycle management
 TAKER_FEE_RATE = 0.001  # Default taker fee (0.1%) if not provided by exchange per-trade
+RECONCILE_MAX_WORKERS = 4  # Worker pool for batch reconciliation (symbols fetched concurrently)
+RECONCILE_TRADE_WINDOW_S = 300  # fetch_my_trades window before the oldest order of a symbol batch
+RECONCILE_TRADE_LIMIT = 200  # Trades per fetch_my_trades call (more → per-order fallback)
 
 # Exit Engine - Prioritized Exit Rules (NEW - Signal-Based Exit Flow)
 EXIT_HARD_SL_PCT = 2.0  # Max loss before forced exit (%)
@@ -581,7 +584,12 @@ EXCLUDE_SYMBOL_PREFIXES = ["BULL/", "BEAR/", "3L/", "3S/", "UP/", "DOWN/"]
 
 # Exchange Recording (API Trace)
 ENABLE_EXCHANGE_RECORDING = _env_flag("ENABLE_EXCHANGE_RECORDING", False)
-EXCHANGE_RECORDING_FILENAME = os.getenv("EXCHANGE_RECORDING_FILENAME", "mexc_api_calls.jsonl")
+EXCHANGE_RECORDING_FILENAME = os.getenv("EXCHANGE_RECORDING_FILENAME", "mexc_api_calls.jsonl.gz")
+
+# Market-Metadaten-Cache (Markets, Precision, Filter auf Disk; Refresh im Hintergrund)
+MARKET_METADATA_CACHE = True
+MARKET_METADATA_FILE = "state/market_metadata.json"
+MARKET_METADATA_MAX_AGE_S = 7 * 24 * 3600  # Älterer Cache → blockierendes load_markets beim Start
 
 # LIQUIDITY FIX: Blacklist for known illiquid coins (manual maintenance)
 LIQUIDITY_BLACKLIST = [
@@ -677,6 +685,7 @@ DEBUG_MARKET_DATA_SAMPLING = 10
 DEBUG_PERFORMANCE_AGGREGATION_SECONDS = 60
 DEBUG_ENABLE_LOG_COMPRESSION = True
 DEBUG_LOG_RETENTION_DAYS = 30
+LOG_COMPRESSION_WORKERS = 1  # Worker processes for background gzip of rotated logs
 # CRITICAL FIX (C-CONFIG-01): SNAPSHOTS_PARQUET, RUN_SUMMARY_JSON, RECONCILE_REPORT now initialized in init_runtime_config()
 
 # Monitoring
@@ -743,6 +752,19 @@ STATE_FILE_HELD = os.path.join(BASE_DIR, "held_assets.json")
 STATE_FILE_OPEN_BUYS = os.path.join(BASE_DIR, "open_buy_orders.json")
 HISTORY_FILE = os.path.join(BASE_DIR, "trade_history.csv")
 DROP_ANCHORS_FILE = os.path.join(BASE_DIR, "drop_anchors.json")
+# Portfolio-State: nur geänderte Keys ins Journal (portfolio_state.journal), periodisch in die Snapshots kompaktiert
+PORTFOLIO_STATE_JOURNAL = True  # False = alter Modus (alle drei Dateien bei jedem save_state komplett schreiben)
+PORTFOLIO_STATE_FLUSH_INTERVAL_S = 0.5  # Debounce-Fenster des Hintergrund-Writers
+PORTFOLIO_STATE_COMPACT_RECORDS = 2000  # Journal-Einträge bis zur Kompaktierung in die Snapshots
+PORTFOLIO_STATE_FSYNC = False  # fsync nach jedem Journal-Append (langsamer, übersteht Stromausfall)
+# Unified State Store: Portfolio-Sektionen, FSM-Snapshots, COIDs, Engine/Router-State, Anchors und
+# Rolling Windows in einer SQLite-Datei; alle Änderungen eines Engine-Zyklus werden atomar committet
+STATE_STORE_ENABLED = False  # True = state/state.db statt der einzelnen JSON-Dateien (Altbestand wird einmalig importiert)
+STATE_STORE_FILE = os.path.join(BASE_DIR, "state", "state.db")
+STATE_STORE_HISTORY_CYCLES = 5000  # Zyklen für Point-in-Time-Recovery (0 = unbegrenzt)
+STATE_STORE_AUTOCOMMIT_S = 1.0  # Änderungen außerhalb des Engine-Zyklus spätestens nach dieser Zeit committen
+STATE_STORE_SYNC = False  # synchronous=FULL für jeden Zyklus (langsamer, übersteht Stromausfall)
+STATE_STORE_CYCLE_TIMEOUT_S = 60.0  # offener Engine-Zyklus: Timer committet erst nach dieser Zeit (Loop hängt/scheitert vor dem Commit)
 # CRITICAL FIX (C-CONFIG-01): CONFIG_BACKUP_PATH now initialized in init_runtime_config()
 
 # Intent System & Order Router State Management (P1)
@@ -753,6 +775,10 @@ STATE_PERSIST_ON_SHUTDOWN = True  # Always persist on clean shutdown
 INTENT_STALE_THRESHOLD_S = 60  # Intent considered stale after 60s
 ORDER_META_MAX_AGE_S = 86400  # Clean up metadata older than 24h
 
+# SQLite Ledger & Idempotency Store: Group-Commit Writer Thread
+SQLITE_GROUP_COMMIT_MS = 2.0  # Writes arriving within this window share one transaction
+SQLITE_STRICT_SYNC = False  # True = commit every write immediately with synchronous=FULL (no batching)
+
 # P4: Stale Intent Monitoring & Alerts
 STALE_INTENT_CHECK_ENABLED = True  # Enable periodic stale intent cleanup
 STALE_INTENT_TELEGRAM_ALERTS = False  # Send Telegram alerts for stale intents (disable in dev/test)
@@ -776,6 +802,8 @@ SYMBOL_MIN_COST_OVERRIDE = {"OKB/USDT": 10.0}
 MAX_POSITION_SIZE_USD = 1000
 MAX_PORTFOLIO_RISK_PCT = 0.05
 MAX_SYMBOL_EXPOSURE_PCT = 0.30  # Maximum portfolio exposure per symbol (30%)
+RISK_EXPOSURE_SELF_CHECK = True  # Verify incremental exposure aggregates against a full rescan (repairs direct held_assets writes)
+RISK_EXPOSURE_SELF_CHECK_INTERVAL_S = 30.0  # Minimum seconds between self-checks (0 = on every risk check)
 SESSION_GRANULARITY = "minute"
 BUY_ESCALATION_EXTRA_BPS = 20
 ALLOW_MARKET_FALLBACK = True
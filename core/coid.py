@@ -7,7 +7,8 @@ Ensures no duplicate orders on retries/crashes by reusing COIDs until terminal s
 
 Features:
 - Deterministic COID generation: f"{decision_id}_{leg_idx}_{side}_{timestamp}"
-- Persistent KV store with atomic writes
+- Persistent KV store with atomic writes (JSON file or namespace "coid" of
+  the state store; changed entries only, committed before the order is sent)
 - Status tracking: PENDING → TERMINAL (FILLED/CANCELED/REJECTED)
 - Reconciliation against exchange on startup
 - Thread-safe operations
@@ -25,11 +26,15 @@ import threading
 import time
 from dataclasses import asdict, dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 
 logger = logging.getLogger(__name__)
 
 
+if TYPE_CHECKING:
+    from core.state_store import StateStore
+
+
 class COIDStatus(Enum):
     """COID lifecycle status"""
     PENDING = "pending"  # Order submitted, waiting for terminal state
@@ -114,12 +119,15 @@ class COIDManager:
     Thread-safe operations with file-based KV store.
     """
 
-    def __init__(self, store_path: Optional[str] = None):
+    STORE_NAMESPACE = "coid"
+
+    def __init__(self, store_path: Optional[str] = None, state_store: Optional["StateStore"] = None):
         """
         Initialize COID manager.
 
         Args:
             store_path: Path to COID KV store JSON file (defaults to state/coid_kv.json)
+            state_store: Unified state store (replaces the JSON file, which is imported once)
         """
         if store_path is None:
             # Default: state/coid_kv.json in BASE_DIR
@@ -130,6 +138,7 @@ class COIDManager:
             store_path = os.path.join(state_dir, "coid_kv.json")
 
         self.store_path = store_path
+        self.state_store = state_store
         self._lock = threading.RLock()
         self._store: Dict[str, COIDEntry] = {}
         self._load_store()
@@ -170,7 +179,7 @@ class COIDManager:
                     )
                     existing.attempt_count += 1
                     existing.updated_ts = time.time()
-                    self._save_store()
+                    self._save_store([existing.coid])
                     return existing.coid
 
             # Generate new COID
@@ -191,7 +200,7 @@ class COIDManager:
             )
 
             self._store[coid] = entry
-            self._save_store()
+            self._save_store([coid])
 
             logger.info(f"Generated new COID: {coid} for {symbol} {side}")
             return coid
@@ -230,7 +239,7 @@ class COIDManager:
             if metadata:
                 entry.metadata.update(metadata)
 
-            self._save_store()
+            self._save_store([coid])
 
             logger.info(
                 f"COID status updated: {coid} → {status.value}"
@@ -243,6 +252,14 @@ class COIDManager:
         with self._lock:
             return self._store.get(coid)
 
+    def pending_entries(self, symbols: Optional[List[str]] = None) -> List[COIDEntry]:
+        """Get PENDING entries, optionally restricted to symbols"""
+        with self._lock:
+            return [
+                entry for entry in self._store.values()
+                if entry.status == COIDStatus.PENDING.value and (not symbols or entry.symbol in symbols)
+            ]
+
     def reconcile_with_exchange(self, exchange, symbols: Optional[List[str]] = None) -> int:
         """
         Reconcile pending COIDs against exchange state.
@@ -258,10 +275,7 @@ class COIDManager:
             Number of COIDs reconciled
         """
         with self._lock:
-            pending_entries = [
-                entry for entry in self._store.values()
-                if entry.status == COIDStatus.PENDING.value
-            ]
+            pending_entries = self.pending_entries(symbols)
 
             if not pending_entries:
                 logger.info("No pending COIDs to reconcile")
@@ -271,9 +285,6 @@ class COIDManager:
 
             reconciled_count = 0
             for entry in pending_entries:
-                if symbols and entry.symbol not in symbols:
-                    continue
-
                 try:
                     # Query exchange for order status
                     if entry.order_id:
@@ -341,7 +352,7 @@ class COIDManager:
                 del self._store[coid]
 
             if to_remove:
-                self._save_store()
+                self._save_store(to_remove)
                 logger.info(f"Cleaned up {len(to_remove)} old COID entries")
 
             return len(to_remove)
@@ -379,6 +390,17 @@ class COIDManager:
 
     def _load_store(self):
         """Load COID store from disk (atomic read)"""
+        if self.state_store is not None:
+            data = self.state_store.load(self.STORE_NAMESPACE, legacy=self._read_store_file)
+            self._store = {}
+            for coid, entry_dict in data.items():
+                try:
+                    self._store[coid] = COIDEntry.from_dict(entry_dict)
+                except Exception as e:
+                    logger.error(f"Failed to load COID entry {coid}: {e}")
+            logger.info(f"Loaded {len(self._store)} COID entries from {self.state_store.path}")
+            return
+
         if not os.path.exists(self.store_path):
             logger.info(f"COID store not found, creating new: {self.store_path}")
             self._store = {}
@@ -402,8 +424,39 @@ class COIDManager:
             logger.error(f"Failed to load COID store: {e}")
             self._store = {}
 
-    def _save_store(self):
-        """Save COID store to disk (atomic write)"""
+    def _read_store_file(self) -> Dict[str, dict]:
+        """Raw JSON store file (legacy import into the state store)"""
+        if not os.path.exists(self.store_path):
+            return {}
+        with open(self.store_path, 'r') as f:
+            return json.load(f)
+
+    def _save_store(self, changed: Optional[Iterable[str]] = None):
+        """
+        Save COID store to disk (atomic write).
+
+        Args:
+            changed: COIDs added, updated or removed (state store: only these
+                are written, and committed before returning so the COID is
+                durable before the order is placed)
+        """
+        if self.state_store is not None:
+            try:
+                if changed is None:
+                    self.state_store.sync(self.STORE_NAMESPACE,
+                                          {coid: entry.to_dict() for coid, entry in self._store.items()})
+                else:
+                    for coid in changed:
+                        entry = self._store.get(coid)
+                        if entry is None:
+                            self.state_store.delete(self.STORE_NAMESPACE, coid)
+                        else:
+                            self.state_store.put(self.STORE_NAMESPACE, coid, entry.to_dict())
+                self.state_store.commit(wait=True, namespaces=(self.STORE_NAMESPACE,))
+            except Exception as e:
+                logger.error(f"Failed to save COID store: {e}")
+            return
+
         try:
             # Serialize store
             data = {coid: entry.to_dict() for coid, entry in self._store.items()}
@@ -456,7 +509,8 @@ def get_coid_manager() -> COIDManager:
     if _coid_manager is None:
         with _manager_lock:
             if _coid_manager is None:
-                _coid_manager = COIDManager()
+                from core.state_store import get_state_store
+                _coid_manager = COIDManager(state_store=get_state_store())
                 logger.info("Global COIDManager initialized")
     return _coid_manager
 
@@ -66,9 +66,7 @@ def action_prepare_buy(ctx: EventContext, coin_state: CoinState) -> None:
     # CRITICAL FIX (Punkt 2): Preflight validation before placing order
     # This ensures FSM parity with Legacy buy flow for min_notional auto-bump
     try:
-        from services.exchange_filters import get_filters
-        from services.order_validation import preflight
-        from services.quantize import q_price, q_amount
+        from services.order_templates import resolve_template
 
         # Get exchange instance from context or config
         exchange = ctx.data.get('exchange')
@@ -82,8 +80,8 @@ def action_prepare_buy(ctx: EventContext, coin_state: CoinState) -> None:
                 exchange = None
 
         if exchange:
-            # 1. Load exchange filters
-            filters = get_filters(exchange, ctx.symbol)
+            # 1. Load compiled order template (filters + precision)
+            template = resolve_template(exchange, ctx.symbol)
 
             # 2. Get raw price/amount from context
             raw_price = ctx.data.get('order_price')
@@ -91,7 +89,7 @@ def action_prepare_buy(ctx: EventContext, coin_state: CoinState) -> None:
 
             if raw_price and raw_amount:
                 # 3. Run preflight (quantize + min_notional auto-bump)
-                ok, result = preflight(ctx.symbol, raw_price, raw_amount, filters)
+                ok, result = template.preflight(raw_price, raw_amount)
 
                 if not ok:
                     # CRITICAL FIX (P1 Issue #3): Abort transition properly
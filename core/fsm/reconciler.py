@@ -7,6 +7,8 @@ Ensures local FSM state matches exchange reality by:
 - Detecting desyncs between local and exchange state
 - Correcting local state to match exchange
 - Logging all reconciliation events
+- Pending orders are fetched in bulk: one fetch_orders per symbol on a
+  bounded worker pool, most recently placed orders first
 
 Guarantees:
 - After sync(), local positions match exchange positions
@@ -16,11 +18,18 @@ Guarantees:
 
 import logging
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
 
 logger = logging.getLogger(__name__)
 
+# Marks orders whose fetch raised (unknown state) as opposed to None (not on exchange)
+FETCH_FAILED = object()
+
 
 @dataclass
 class ReconcileReport:
@@ -53,17 +62,21 @@ class FSMReconciler:
     - Position management logic
     """
 
-    def __init__(self, exchange_adapter, order_service=None):
+    def __init__(self, exchange_adapter, order_service=None, max_workers: Optional[int] = None):
         """
         Initialize reconciler.
 
         Args:
             exchange_adapter: Exchange adapter for fetching trades/orders
             order_service: Optional OrderService for order status checks
+            max_workers: Symbols fetched concurrently (config RECONCILE_MAX_WORKERS)
         """
         self.exchange = exchange_adapter
         self.order_service = order_service
         self.logger = logger
+        self.max_workers = max_workers or getattr(config, 'RECONCILE_MAX_WORKERS', 4)
+        self.window_s = getattr(config, 'RECONCILE_TRADE_WINDOW_S', 300)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="FSMReconcile")
 
         # Tracking
         self._last_sync = 0.0
@@ -152,6 +165,7 @@ class FSMReconciler:
 
         self.logger.info(f"Starting reconciliation sync for {len(coin_states)} symbols")
 
+        pending = []
         for symbol, coin_state in coin_states.items():
             try:
                 # Check if there's anything to reconcile
@@ -165,14 +179,26 @@ class FSMReconciler:
                 if has_position:
                     self._reconcile_position(symbol, coin_state, report)
 
-                # Reconcile pending order if exists
+                # Pending orders are fetched in one batch below
                 if has_order:
-                    self._reconcile_pending_order(symbol, coin_state, report)
+                    pending.append((symbol, coin_state))
 
             except Exception as e:
                 self.logger.error(f"Error reconciling {symbol}: {e}")
                 report.details.append(f"{symbol}: Error - {e}")
 
+        if pending:
+            orders = self._fetch_orders_batch(pending)
+            for symbol, coin_state in pending:
+                order = orders.get(str(coin_state.order_id), FETCH_FAILED)
+                if order is FETCH_FAILED:
+                    # Exchange state unknown - no orphan verdict until a fetch succeeds
+                    continue
+                try:
+                    self._check_pending_order(symbol, coin_state, order, report)
+                except Exception as e:
+                    self.logger.debug(f"Order reconcile for {symbol}: {e}")
+
         # Update tracking
         self._last_sync = time.time()
         self._sync_count += 1
@@ -199,6 +225,58 @@ class FSMReconciler:
         except Exception as e:
             self.logger.debug(f"Position reconcile for {symbol}: {e}")
 
+    def _fetch_orders_batch(self, pending: List[Tuple[str, Any]]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Fetch the orders of all pending coin states.
+
+        One fetch_orders per symbol (since the oldest placement minus the
+        reconcile window), symbols with the newest orders submitted first;
+        orders missing from the bulk result fall back to fetch_order.
+
+        Returns:
+            order_id -> exchange order (None if not found, FETCH_FAILED if
+            every fetch for it raised)
+        """
+        by_symbol: Dict[str, List[Any]] = defaultdict(list)
+        for symbol, coin_state in pending:
+            by_symbol[symbol].append(coin_state)
+
+        ordered = sorted(by_symbol.items(),
+                         key=lambda item: max(getattr(st, 'order_placed_ts', 0.0) or 0.0 for st in item[1]),
+                         reverse=True)
+        futures = [self._pool.submit(self._fetch_symbol_orders, symbol, states) for symbol, states in ordered]
+
+        orders: Dict[str, Any] = {}
+        for (symbol, states), future in zip(ordered, futures):
+            try:
+                orders.update(future.result())
+            except Exception as e:
+                self.logger.debug(f"Order batch fetch for {symbol}: {e}")
+                orders.update((str(st.order_id), FETCH_FAILED) for st in states)
+        return orders
+
+    def _fetch_symbol_orders(self, symbol: str, states: List[Any]) -> Dict[str, Any]:
+        wanted = {str(st.order_id) for st in states}
+        found: Dict[str, Any] = {}
+
+        placed = [st.order_placed_ts for st in states if getattr(st, 'order_placed_ts', 0.0)]
+        since = int((min(placed) - self.window_s) * 1000) if placed else None
+        try:
+            for order in self.exchange.fetch_orders(symbol, since) or []:
+                order_id = str(order.get("id"))
+                if order_id in wanted:
+                    found[order_id] = order
+        except Exception as e:
+            self.logger.debug(f"fetch_orders failed for {symbol}, falling back per order: {e}")
+
+        for order_id in wanted - found.keys():
+            try:
+                found[order_id] = self.exchange.fetch_order(order_id, symbol)
+            except Exception as e:
+                self.logger.debug(f"Order reconcile for {symbol}: {e}")
+                found[order_id] = FETCH_FAILED
+        return found
+
     def _reconcile_pending_order(self, symbol: str, coin_state, report: ReconcileReport):
         """
         Reconcile a pending order with exchange.
@@ -212,29 +290,34 @@ class FSMReconciler:
 
             # Fetch order status
             order = self.exchange.fetch_order(order_id, symbol)
-
-            if not order:
-                # Order doesn't exist on exchange but exists locally → Desync
-                report.desyncs_found += 1
-                report.orphaned_orders += 1
-                report.details.append(f"{symbol}: Orphaned order {order_id}")
-                self.logger.warning(f"Orphaned order detected: {order_id} for {symbol}")
-                return
-
-            # Check if filled
-            status = order.get("status", "unknown")
-            if status == "closed" or status == "filled":
-                filled_qty = order.get("filled", 0.0)
-                if filled_qty > 0 and coin_state.amount == 0:
-                    # Order filled on exchange but not reflected locally → Desync
-                    report.desyncs_found += 1
-                    report.missing_fills += 1
-                    report.details.append(f"{symbol}: Missing fill for {order_id}")
-                    self.logger.warning(f"Missing fill detected: {order_id} filled {filled_qty} {symbol}")
+            self._check_pending_order(symbol, coin_state, order, report)
 
         except Exception as e:
             self.logger.debug(f"Order reconcile for {symbol}: {e}")
 
+    def _check_pending_order(self, symbol: str, coin_state, order: Optional[Dict[str, Any]],
+                             report: ReconcileReport):
+        """Compare a fetched order with the local coin state and record desyncs."""
+        order_id = coin_state.order_id
+        if not order:
+            # Order doesn't exist on exchange but exists locally → Desync
+            report.desyncs_found += 1
+            report.orphaned_orders += 1
+            report.details.append(f"{symbol}: Orphaned order {order_id}")
+            self.logger.warning(f"Orphaned order detected: {order_id} for {symbol}")
+            return
+
+        # Check if filled
+        status = order.get("status", "unknown")
+        if status == "closed" or status == "filled":
+            filled_qty = order.get("filled", 0.0)
+            if filled_qty > 0 and coin_state.amount == 0:
+                # Order filled on exchange but not reflected locally → Desync
+                report.desyncs_found += 1
+                report.missing_fills += 1
+                report.details.append(f"{symbol}: Missing fill for {order_id}")
+                self.logger.warning(f"Missing fill detected: {order_id} filled {filled_qty} {symbol}")
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get reconciler statistics.
@@ -248,6 +331,10 @@ class FSMReconciler:
             "time_since_last_sync": time.time() - self._last_sync if self._last_sync > 0 else None
         }
 
+    def shutdown(self):
+        """Stop the worker pool (waits for running symbol fetches)"""
+        self._pool.shutdown(wait=True)
+
 
 # Global instance for convenience
 _global_reconciler: Optional[FSMReconciler] = None
@@ -4,6 +4,10 @@ FSM Snapshot System - Crash Recovery
 
 Persists FSM state to disk after every transition.
 Enables recovery from crashes without losing positions.
+
+With a StateStore (STATE_STORE_ENABLED) snapshots are records of the
+"fsm_snapshots" namespace and become durable with the engine cycle commit
+instead of one file write per transition.
 """
 
 import json
@@ -11,12 +15,15 @@ import logging
 import os
 import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 from core.fsm.phases import Phase
 from core.fsm.state import CoinState
 from core.fsm.state_data import OrderContext, StateData
 
+if TYPE_CHECKING:
+    from core.state_store import StateStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +33,7 @@ class SnapshotManager:
 
     Snapshots are written to:
     - sessions/current/fsm_snapshots/{symbol}.json
+    - or namespace "fsm_snapshots" of the state store (if given)
 
     Format:
     {
@@ -37,7 +45,9 @@ class SnapshotManager:
     }
     """
 
-    def __init__(self, snapshot_dir: Optional[Path] = None):
+    STORE_NAMESPACE = "fsm_snapshots"
+
+    def __init__(self, snapshot_dir: Optional[Path] = None, store: Optional["StateStore"] = None):
         if snapshot_dir is None:
             # Default: sessions/current/fsm_snapshots/
             snapshot_dir = Path("sessions") / "current" / "fsm_snapshots"
@@ -48,7 +58,12 @@ class SnapshotManager:
         self._lock = threading.RLock()
         self._write_count = 0
 
-        logger.info(f"Snapshot manager initialized: {self.snapshot_dir}")
+        self.store = store
+        if store is not None:
+            # Snapshot files of earlier runs are imported once
+            store.load(self.STORE_NAMESPACE, legacy=self._read_snapshot_files)
+
+        logger.info(f"Snapshot manager initialized: {store.path if store else self.snapshot_dir}")
 
     def save_snapshot(self, symbol: str, coin_state: CoinState) -> bool:
         """
@@ -60,6 +75,12 @@ class SnapshotManager:
         with self._lock:
             try:
                 snapshot = self._serialize_state(symbol, coin_state)
+                if self.store is not None:
+                    self.store.put(self.STORE_NAMESPACE, symbol, snapshot)
+                    self._write_count += 1
+                    logger.debug(f"Snapshot staged: {symbol} @ {coin_state.phase.name}")
+                    return True
+
                 snapshot_path = self._get_snapshot_path(symbol)
 
                 # Write atomically (write to temp, then rename)
@@ -88,6 +109,12 @@ class SnapshotManager:
             Snapshot dict or None if not found
         """
         with self._lock:
+            if self.store is not None:
+                snapshot = self.store.get(self.STORE_NAMESPACE, symbol)
+                if snapshot:
+                    logger.info(f"Snapshot loaded: {symbol} @ {snapshot['phase']}")
+                return snapshot
+
             snapshot_path = self._get_snapshot_path(symbol)
 
             if not snapshot_path.exists():
@@ -151,6 +178,12 @@ class SnapshotManager:
     def delete_snapshot(self, symbol: str) -> bool:
         """Delete snapshot (after position closed)"""
         with self._lock:
+            if self.store is not None:
+                deleted = self.store.delete(self.STORE_NAMESPACE, symbol)
+                if deleted:
+                    logger.debug(f"Snapshot deleted: {symbol}")
+                return deleted
+
             snapshot_path = self._get_snapshot_path(symbol)
 
             if snapshot_path.exists():
@@ -292,6 +325,12 @@ class SnapshotManager:
     def get_stats(self) -> Dict:
         """Get snapshot statistics"""
         with self._lock:
+            if self.store is not None:
+                return {
+                    'snapshot_count': len(self.store.keys(self.STORE_NAMESPACE)),
+                    'write_count': self._write_count,
+                    'snapshot_dir': self.store.path
+                }
             snapshots = list(self.snapshot_dir.glob("*.json"))
             return {
                 'snapshot_count': len(snapshots),
@@ -302,6 +341,14 @@ class SnapshotManager:
     def list_all_snapshots(self) -> list:
         """List all snapshot files"""
         with self._lock:
+            if self.store is not None:
+                return [{
+                    'symbol': symbol,
+                    'phase': snapshot.get('phase'),
+                    'timestamp': snapshot.get('timestamp'),
+                    'file': self.store.path
+                } for symbol, snapshot in self.store.load(self.STORE_NAMESPACE).items()]
+
             snapshots = []
             for snapshot_path in self.snapshot_dir.glob("*.json"):
                 try:
@@ -320,6 +367,18 @@ class SnapshotManager:
 
             return snapshots
 
+    def _read_snapshot_files(self) -> Dict[str, Dict]:
+        """All snapshot files by symbol (legacy import into the store)"""
+        snapshots = {}
+        for snapshot_path in self.snapshot_dir.glob("*.json"):
+            try:
+                with open(snapshot_path) as f:
+                    snapshot = json.load(f)
+                snapshots[snapshot.get('symbol') or snapshot_path.stem.replace('_', '/')] = snapshot
+            except Exception as e:
+                logger.debug(f"Failed to read snapshot {snapshot_path}: {e}")
+        return snapshots
+
 
 # Global singleton
 _snapshot_manager: Optional[SnapshotManager] = None
@@ -329,5 +388,6 @@ def get_snapshot_manager() -> SnapshotManager:
     """Get global snapshot manager singleton"""
     global _snapshot_manager
     if _snapshot_manager is None:
-        _snapshot_manager = SnapshotManager()
+        from core.state_store import get_state_store
+        _snapshot_manager = SnapshotManager(store=get_state_store())
     return _snapshot_manager
@@ -6,9 +6,10 @@ set_phase: Transition helper with logging and metrics
 """
 
 from dataclasses import dataclass, field
-from time import time
 from typing import Any, Dict, List, Optional
 
+from core.clock import get_clock
+
 from .phases import Phase
 
 
@@ -124,13 +125,13 @@ class CoinState:
         """Returns seconds since last phase change."""
         if self.ts_ms == 0:
             return 0.0
-        return time() - (self.ts_ms / 1000.0)
+        return get_clock().time() - (self.ts_ms / 1000.0)
 
     def in_cooldown(self) -> bool:
         """Returns True if symbol is in cooldown."""
         if self.cooldown_until == 0.0:
             return False
-        return time() < self.cooldown_until
+        return get_clock().time() < self.cooldown_until
 
     def has_position(self) -> bool:
         """Returns True if holding a position (amount > 0)."""
@@ -190,7 +191,7 @@ def set_phase(
 
     # Update state
     st.phase = to
-    st.ts_ms = int(time() * 1000)
+    st.ts_ms = int(get_clock().time() * 1000)
     st.note = note
 
     if decision_id is not None:
@@ -4,9 +4,9 @@ Centralized timeout handling for orders
 """
 
 import logging
-import time
 from typing import List, Optional
 
+from core.clock import Clock, get_clock
 from core.fsm.fsm_events import EventContext, FSMEvent
 from core.fsm.phases import Phase
 from core.fsm.state_data import StateData
@@ -24,7 +24,13 @@ class TimeoutManager:
     - Cooldown: 15min (config.COOLDOWN_MIN converted to seconds)
     """
 
-    def __init__(self):
+    def __init__(self, clock: Optional[Clock] = None):
+        """
+        Args:
+            clock: Time source (default: process-wide core.clock)
+        """
+        self._clock = clock
+
         # Import config here to avoid circular imports
         try:
             import config
@@ -50,6 +56,10 @@ class TimeoutManager:
             f"position_ttl={self.position_ttl_min}min"
         )
 
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_clock()
+
     def check_buy_timeout(
         self,
         symbol: str,
@@ -64,7 +74,7 @@ class TimeoutManager:
         if not state_data or not state_data.buy_order or not state_data.buy_order.placed_at:
             return None
 
-        elapsed = time.time() - state_data.buy_order.placed_at
+        elapsed = self.clock.time() - state_data.buy_order.placed_at
         if elapsed > self.buy_timeout_secs:
             logger.info(
                 f"Buy order timeout detected: {symbol} "
@@ -74,7 +84,7 @@ class TimeoutManager:
             return EventContext(
                 event=FSMEvent.BUY_ORDER_TIMEOUT,
                 symbol=symbol,
-                timestamp=time.time(),
+                timestamp=self.clock.time(),
                 order_id=state_data.buy_order.order_id,
                 data={'elapsed_seconds': elapsed, 'timeout_threshold': self.buy_timeout_secs}
             )
@@ -90,7 +100,7 @@ class TimeoutManager:
         if not state_data or not state_data.sell_order or not state_data.sell_order.placed_at:
             return None
 
-        elapsed = time.time() - state_data.sell_order.placed_at
+        elapsed = self.clock.time() - state_data.sell_order.placed_at
         if elapsed > self.sell_timeout_secs:
             logger.info(
                 f"Sell order timeout detected: {symbol} "
@@ -100,7 +110,7 @@ class TimeoutManager:
             return EventContext(
                 event=FSMEvent.SELL_ORDER_TIMEOUT,
                 symbol=symbol,
-                timestamp=time.time(),
+                timestamp=self.clock.time(),
                 order_id=state_data.sell_order.order_id,
                 data={'elapsed_seconds': elapsed, 'timeout_threshold': self.sell_timeout_secs}
             )
@@ -116,7 +126,7 @@ class TimeoutManager:
         if not state_data or not state_data.cooldown_started_at:
             return None
 
-        elapsed = time.time() - state_data.cooldown_started_at
+        elapsed = self.clock.time() - state_data.cooldown_started_at
         if elapsed > self.cooldown_secs:
             logger.debug(
                 f"Cooldown expired: {symbol} "
@@ -126,7 +136,7 @@ class TimeoutManager:
             return EventContext(
                 event=FSMEvent.COOLDOWN_EXPIRED,
                 symbol=symbol,
-                timestamp=time.time(),
+                timestamp=self.clock.time(),
                 data={'cooldown_duration': elapsed}
             )
 
@@ -151,7 +161,7 @@ class TimeoutManager:
             return None
 
         # Calculate position age in minutes
-        position_age_secs = time.time() - coin_state.entry_ts
+        position_age_secs = self.clock.time() - coin_state.entry_ts
         position_age_min = position_age_secs / 60.0
 
         # Check if position exceeded TTL
@@ -164,7 +174,7 @@ class TimeoutManager:
             return EventContext(
                 event=FSMEvent.EXIT_SIGNAL_TIMEOUT,
                 symbol=symbol,
-                timestamp=time.time(),
+                timestamp=self.clock.time(),
                 data={
                     'position_age_minutes': position_age_min,
                     'ttl_threshold_minutes': self.position_ttl_min,
@@ -232,7 +242,7 @@ class TimeoutManager:
         if not state_data:
             return None
 
-        now = time.time()
+        now = self.clock.time()
 
         # Buy order timeout
         if coin_state.phase == Phase.WAIT_FILL and state_data.buy_order and state_data.buy_order.placed_at:
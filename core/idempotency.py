@@ -11,6 +11,11 @@ Key Features:
 - Automatic duplicate detection
 - Order status tracking
 - Cleanup of old entries
+- Group-commit writes on a dedicated writer thread (core/sqlite_writer.py):
+  writes within a few milliseconds share one transaction. register_order
+  waits for a synchronous=FULL commit by default, so the key is durable
+  before the order is placed; status updates queue their write and return
+  immediately (sync=True waits)
 
 Usage:
     from core.idempotency import get_idempotency_store
@@ -45,14 +50,51 @@ import logging
 import sqlite3
 import threading
 import time
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 from core.logger_factory import AUDIT_LOG, log_event
+from core.sqlite_writer import GroupCommitWriter
 from core.trace_context import Trace
 
 logger = logging.getLogger(__name__)
 
+IDEMPOTENCY_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS idempotency_keys (
+        order_req_id TEXT PRIMARY KEY,
+        symbol TEXT NOT NULL,
+        side TEXT NOT NULL,
+        amount REAL NOT NULL,
+        price REAL,
+        exchange_order_id TEXT,
+        status TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        completed_at REAL,
+        client_order_id TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_exchange_order_id ON idempotency_keys(exchange_order_id)",
+    "CREATE INDEX IF NOT EXISTS idx_created_at ON idempotency_keys(created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_status ON idempotency_keys(status)",
+)
+
+_INSERT_ORDER = """
+    INSERT INTO idempotency_keys
+    (order_req_id, symbol, side, amount, price, exchange_order_id, status, created_at, updated_at, completed_at, client_order_id)
+    VALUES (?, ?, ?, ?, ?, NULL, 'pending', ?, ?, NULL, ?)
+"""
+
+_UPDATE_STATUS = """
+    UPDATE idempotency_keys
+    SET exchange_order_id = ?, status = ?, updated_at = ?, completed_at = ?
+    WHERE order_req_id = ?
+"""
+
+_COMPLETED_STATUSES = {'filled', 'canceled', 'cancelled', 'expired', 'rejected', 'failed'}
+
 
 class IdempotencyStore:
     """
@@ -61,15 +103,18 @@ class IdempotencyStore:
     Prevents duplicate orders by tracking order_req_id → exchange_order_id mappings.
     """
 
-    def __init__(self, db_path: str = "state/idempotency.db"):
+    def __init__(self, db_path: str = "state/idempotency.db", commit_interval_s: float = 0.002,
+                 strict_sync: bool = False):
         """
         Initialize idempotency store with SQLite backend.
 
         CRITICAL FIX (C-INFRA-02): Use thread-local connections to prevent corruption.
-        Each thread gets its own connection with check_same_thread=True (safe default).
+        Each thread gets its own read connection with check_same_thread=True (safe default).
 
         Args:
             db_path: Path to SQLite database file
+            commit_interval_s: Group-commit window of the writer thread
+            strict_sync: Commit every write immediately with synchronous=FULL
         """
         self.db_path = db_path
         self._lock = threading.RLock()
@@ -78,8 +123,13 @@ class IdempotencyStore:
         # Ensure directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        # Create schema on initial connection
-        self._create_table()
+        # Writer thread creates the schema on its connection
+        self._writer = GroupCommitWriter(
+            db_path, name="idempotency", commit_interval_s=commit_interval_s,
+            strict_sync=strict_sync, init_statements=IDEMPOTENCY_SCHEMA,
+        )
+        # Queued but not yet committed fields per order_req_id: (future, fields)
+        self._pending: Dict[str, Tuple[Future, Dict]] = {}
 
         logger.info(f"Idempotency store initialized with thread-local connections: {db_path}")
 
@@ -99,41 +149,39 @@ class IdempotencyStore:
             logger.debug(f"Created new SQLite connection for thread {threading.current_thread().name}")
         return self._local.db
 
-    def _create_table(self):
-        """Create idempotency_keys table if not exists"""
-        with self._lock:
-            db = self._get_connection()
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS idempotency_keys (
-                    order_req_id TEXT PRIMARY KEY,
-                    symbol TEXT NOT NULL,
-                    side TEXT NOT NULL,
-                    amount REAL NOT NULL,
-                    price REAL,
-                    exchange_order_id TEXT,
-                    status TEXT NOT NULL,
-                    created_at REAL NOT NULL,
-                    updated_at REAL NOT NULL,
-                    completed_at REAL,
-                    client_order_id TEXT
-                )
-            """)
-            db.commit()
-
-            # Create indexes for fast lookups
-            db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_exchange_order_id
-                ON idempotency_keys(exchange_order_id)
-            """)
-            db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_created_at
-                ON idempotency_keys(created_at)
-            """)
-            db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status
-                ON idempotency_keys(status)
-            """)
-            db.commit()
+    def _track(self, order_req_id: str, future: Future, fields: Dict):
+        """Overlay fields until the write is committed (caller holds _lock)"""
+        previous = self._pending.get(order_req_id)
+        merged = dict(previous[1]) if previous else {}
+        merged.update(fields)
+        self._pending[order_req_id] = (future, merged)
+
+        def settle(done: Future):
+            with self._lock:
+                entry = self._pending.get(order_req_id)
+                if entry is not None and entry[0] is done:
+                    del self._pending[order_req_id]
+            if done.exception() is not None:
+                logger.error(f"Idempotency write failed for {order_req_id}: {done.exception()}")
+
+        future.add_done_callback(settle)
+
+    def _lookup(self, order_req_id: str) -> Optional[Dict]:
+        """exchange_order_id/status/created_at of a known order, pending writes included"""
+        entry = self._pending.get(order_req_id)
+        fields = entry[1] if entry else {}
+        if 'created_at' in fields:
+            return fields
+
+        row = self._get_connection().execute(
+            "SELECT exchange_order_id, status, created_at FROM idempotency_keys WHERE order_req_id = ?",
+            (order_req_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        known = {'exchange_order_id': row[0], 'status': row[1], 'created_at': row[2]}
+        known.update(fields)
+        return known
 
     def register_order(
         self,
@@ -142,7 +190,8 @@ class IdempotencyStore:
         side: str,
         amount: float,
         price: Optional[float] = None,
-        client_order_id: Optional[str] = None
+        client_order_id: Optional[str] = None,
+        sync: bool = True
     ) -> Optional[str]:
         """
         Register order attempt - returns existing exchange_order_id if duplicate.
@@ -154,23 +203,44 @@ class IdempotencyStore:
             amount: Order quantity
             price: Order price (optional for market orders)
             client_order_id: Client order ID for additional tracking
+            sync: Commit with synchronous=FULL (default); False still waits for
+                the group commit, only without the full fsync
 
         Returns:
             None if new order (proceed with placement)
             exchange_order_id (str) if duplicate (skip placement, return existing)
         """
-        with self._lock:
-            db = self._get_connection()
+        existing_order_id, future = self.register_order_async(
+            order_req_id, symbol, side, amount, price, client_order_id, sync
+        )
+        # The key must be committed before the caller places the order
+        if future is not None:
+            future.result()
+        return existing_order_id
+
+    def register_order_async(
+        self,
+        order_req_id: str,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        client_order_id: Optional[str] = None,
+        sync: bool = False
+    ) -> Tuple[Optional[str], Optional[Future]]:
+        """
+        register_order() returning the write Future instead of waiting.
 
-            # Check for existing order
-            cursor = db.execute(
-                "SELECT exchange_order_id, status, created_at FROM idempotency_keys WHERE order_req_id = ?",
-                (order_req_id,)
-            )
-            existing = cursor.fetchone()
+        Returns:
+            (existing exchange_order_id or None, Future resolving on durability or None if duplicate)
+        """
+        with self._lock:
+            existing = self._lookup(order_req_id)
 
             if existing:
-                exchange_order_id, status, created_at = existing
+                exchange_order_id = existing['exchange_order_id']
+                status = existing['status']
+                created_at = existing['created_at']
                 age_seconds = time.time() - created_at
 
                 logger.warning(
@@ -201,30 +271,26 @@ class IdempotencyStore:
                 except Exception as e:
                     logger.debug(f"Failed to log duplicate_order_blocked: {e}")
 
-                return exchange_order_id  # Return existing order ID
+                return exchange_order_id, None  # Return existing order ID
 
             # Register new order (pending state)
             now = time.time()
-            db.execute(
-                """
-                INSERT INTO idempotency_keys
-                (order_req_id, symbol, side, amount, price, exchange_order_id, status, created_at, updated_at, completed_at, client_order_id)
-                VALUES (?, ?, ?, ?, ?, NULL, 'pending', ?, ?, NULL, ?)
-                """,
-                (order_req_id, symbol, side, amount, price, now, now, client_order_id)
+            future = self._writer.execute(
+                _INSERT_ORDER, (order_req_id, symbol, side, amount, price, now, now, client_order_id), sync
             )
-            db.commit()
+            self._track(order_req_id, future, {'exchange_order_id': None, 'status': 'pending', 'created_at': now})
 
             logger.debug(f"Registered new order request: {order_req_id} ({symbol} {side})")
 
-            return None  # No duplicate, proceed with order placement
+            return None, future  # No duplicate, proceed with order placement
 
     def update_order_status(
         self,
         order_req_id: str,
         exchange_order_id: str,
-        status: str
-    ):
+        status: str,
+        sync: bool = False
+    ) -> Future:
         """
         Update order status after exchange response.
 
@@ -232,30 +298,35 @@ class IdempotencyStore:
             order_req_id: Order request ID
             exchange_order_id: Exchange-assigned order ID
             status: Order status ("open", "filled", "canceled", "expired", "rejected", "failed")
+            sync: Strict-sync - return only after a synchronous=FULL commit
+
+        Returns:
+            Future resolving once the update is committed
         """
         with self._lock:
-            db = self._get_connection()
             now = time.time()
 
             # Determine if order is completed
-            completed_statuses = {'filled', 'canceled', 'cancelled', 'expired', 'rejected', 'failed'}
-            completed_at = now if status.lower() in completed_statuses else None
-
-            db.execute(
-                """
-                UPDATE idempotency_keys
-                SET exchange_order_id = ?, status = ?, updated_at = ?, completed_at = ?
-                WHERE order_req_id = ?
-                """,
-                (exchange_order_id, status, now, completed_at, order_req_id)
+            completed_at = now if status.lower() in _COMPLETED_STATUSES else None
+
+            future = self._writer.execute(
+                _UPDATE_STATUS, (exchange_order_id, status, now, completed_at, order_req_id), sync
             )
-            db.commit()
+            self._track(order_req_id, future, {'exchange_order_id': exchange_order_id, 'status': status})
 
             logger.debug(
                 f"Updated order status: {order_req_id} → {exchange_order_id} "
                 f"(status: {status}, completed: {completed_at is not None})"
             )
 
+        if sync:
+            future.result()
+        return future
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until all queued writes are committed"""
+        self._writer.flush(timeout)
+
     def get_order_by_req_id(self, order_req_id: str) -> Optional[Dict]:
         """
         Get order details by order_req_id.
@@ -266,6 +337,7 @@ class IdempotencyStore:
         Returns:
             Dict with order details or None if not found
         """
+        self.flush()
         with self._lock:
             db = self._get_connection()
             cursor = db.execute(
@@ -301,6 +373,7 @@ class IdempotencyStore:
         Returns:
             Dict with order details or None if not found
         """
+        self.flush()
         with self._lock:
             db = self._get_connection()
             cursor = db.execute(
@@ -336,24 +409,19 @@ class IdempotencyStore:
         Returns:
             Number of records deleted
         """
-        with self._lock:
-            db = self._get_connection()
-            cutoff_time = time.time() - (max_age_days * 86400)
+        cutoff_time = time.time() - (max_age_days * 86400)
+        deleted = self._writer.execute(
+            """
+            DELETE FROM idempotency_keys
+            WHERE completed_at IS NOT NULL AND completed_at < ?
+            """,
+            (cutoff_time,)
+        ).result()
 
-            deleted = db.execute(
-                """
-                DELETE FROM idempotency_keys
-                WHERE completed_at IS NOT NULL AND completed_at < ?
-                """,
-                (cutoff_time,)
-            ).rowcount
+        if deleted > 0:
+            logger.info(f"Cleaned up {deleted} old idempotency records (older than {max_age_days}d)")
 
-            db.commit()
-
-            if deleted > 0:
-                logger.info(f"Cleaned up {deleted} old idempotency records (older than {max_age_days}d)")
-
-            return deleted
+        return deleted
 
     def get_stats(self) -> Dict:
         """
@@ -362,6 +430,7 @@ class IdempotencyStore:
         Returns:
             Dict with counts by status
         """
+        self.flush()
         with self._lock:
             db = self._get_connection()
             cursor = db.execute(
@@ -377,14 +446,19 @@ class IdempotencyStore:
 
             return stats
 
+    def get_writer_stats(self) -> Dict:
+        """Group-commit statistics of the writer thread"""
+        return self._writer.get_stats()
+
     def close(self):
         """
-        Close all thread-local database connections.
+        Commit pending writes, stop the writer and close the caller's connection.
 
         CRITICAL FIX (C-INFRA-02): Close connections for all threads.
-        Note: This only closes the connection for the calling thread.
+        Note: This only closes the read connection for the calling thread.
         Other thread connections will be closed when those threads exit.
         """
+        self._writer.close()
         with self._lock:
             if hasattr(self._local, 'db'):
                 self._local.db.close()
@@ -416,7 +490,12 @@ def get_idempotency_store(db_path: str = "state/idempotency.db") -> IdempotencyS
         with _store_lock:
             # Double-check locking pattern
             if _idempotency_store is None:
-                _idempotency_store = IdempotencyStore(db_path)
+                import config
+                _idempotency_store = IdempotencyStore(
+                    db_path,
+                    commit_interval_s=getattr(config, 'SQLITE_GROUP_COMMIT_MS', 2.0) / 1000.0,
+                    strict_sync=getattr(config, 'SQLITE_STRICT_SYNC', False),
+                )
 
     return _idempotency_store
 
@@ -11,22 +11,28 @@ Every trade creates balanced debit/credit entries ensuring accurate portfolio tr
 and enabling balance verification at any point in time.
 
 CRITICAL FIX (C-LEDGER-01): Thread-Safe SQLite Implementation
-- Uses thread-local connections (one per thread)
+- Uses thread-local connections (one per thread) for reads
 - WAL mode for better concurrency
 - Retry logic for database locks
 - No more check_same_thread=False (was causing memory corruption!)
 
+Writes go through a GroupCommitWriter (core/sqlite_writer.py): record_trade
+returns a Future that resolves once the entries are committed; trades
+arriving within a few milliseconds share one transaction. Reads flush
+pending writes first (read-your-writes).
+
 Usage:
     from core.ledger import DoubleEntryLedger
 
     ledger = DoubleEntryLedger()
-    ledger.record_trade(
+    fut = ledger.record_trade(
         symbol="BTC/USDT",
         side="buy",
         qty=0.1,
         price=50000.0,
         fee=5.0
     )
+    fut.result()  # optional: wait for durability
 """
 
 import logging
@@ -34,14 +40,56 @@ import sqlite3
 import threading
 import time
 import uuid
+from concurrent.futures import Future
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from core.logger_factory import AUDIT_LOG, log_event
+from core.sqlite_writer import GroupCommitWriter
 from core.trace_context import Trace
 
 logger = logging.getLogger(__name__)
 
+LEDGER_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS ledger_entries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        transaction_id TEXT NOT NULL,
+        account TEXT NOT NULL,
+        debit REAL NOT NULL,
+        credit REAL NOT NULL,
+        balance_after REAL NOT NULL,
+        symbol TEXT,
+        side TEXT,
+        qty REAL,
+        price REAL,
+        metadata TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS account_balances (
+        account TEXT PRIMARY KEY,
+        balance REAL NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_transaction_id ON ledger_entries(transaction_id)",
+    "CREATE INDEX IF NOT EXISTS idx_timestamp ON ledger_entries(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_account ON ledger_entries(account)",
+)
+
+_INSERT_ENTRY = """
+    INSERT INTO ledger_entries
+    (timestamp, transaction_id, account, debit, credit, balance_after, symbol, side, qty, price, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_BALANCE = """
+    INSERT OR REPLACE INTO account_balances (account, balance, updated_at)
+    VALUES (?, ?, ?)
+"""
+
 
 class DoubleEntryLedger:
     """
@@ -75,7 +123,8 @@ class DoubleEntryLedger:
     VS Code crashes after ~33 hours due to race conditions.
     """
 
-    def __init__(self, db_path: str = "state/ledger.db"):
+    def __init__(self, db_path: str = "state/ledger.db", commit_interval_s: float = 0.002,
+                 strict_sync: bool = False):
         """
         Initialize ledger with SQLite backend.
 
@@ -83,6 +132,8 @@ class DoubleEntryLedger:
 
         Args:
             db_path: Path to SQLite database file
+            commit_interval_s: Group-commit window of the writer thread
+            strict_sync: Commit every trade immediately with synchronous=FULL
         """
         self.db_path = db_path
         self._lock = threading.RLock()
@@ -91,8 +142,13 @@ class DoubleEntryLedger:
         # Ensure directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        # Create schema on initial connection
-        self._create_tables()
+        # Writer thread creates the schema on its connection
+        self._writer = GroupCommitWriter(
+            db_path, name="ledger", commit_interval_s=commit_interval_s,
+            strict_sync=strict_sync, init_statements=LEDGER_SCHEMA,
+        )
+        # Account balances as seen by the writer thread (owned by it, lazily loaded)
+        self._balances: Dict[str, float] = {}
 
         logger.info(
             f"Ledger initialized with thread-local connections: {db_path}",
@@ -128,46 +184,6 @@ class DoubleEntryLedger:
 
         return self._local.db
 
-    def _create_tables(self):
-        """Create ledger tables with indexes and WAL mode"""
-        with self._lock:
-            db = self._get_connection()
-
-            # Ledger entries - the complete transaction log
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS ledger_entries (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp REAL NOT NULL,
-                    transaction_id TEXT NOT NULL,
-                    account TEXT NOT NULL,
-                    debit REAL NOT NULL,
-                    credit REAL NOT NULL,
-                    balance_after REAL NOT NULL,
-                    symbol TEXT,
-                    side TEXT,
-                    qty REAL,
-                    price REAL,
-                    metadata TEXT
-                )
-            """)
-
-            # Account balances - current state snapshot
-            db.execute("""
-                CREATE TABLE IF NOT EXISTS account_balances (
-                    account TEXT PRIMARY KEY,
-                    balance REAL NOT NULL,
-                    updated_at REAL NOT NULL
-                )
-            """)
-
-            db.commit()
-
-            # Create indexes for fast lookups
-            db.execute("CREATE INDEX IF NOT EXISTS idx_transaction_id ON ledger_entries(transaction_id)")
-            db.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON ledger_entries(timestamp)")
-            db.execute("CREATE INDEX IF NOT EXISTS idx_account ON ledger_entries(account)")
-            db.commit()
-
     def _execute_with_retry(
         self,
         query: str,
@@ -236,8 +252,9 @@ class DoubleEntryLedger:
         qty: float,
         price: float,
         fee: float,
-        timestamp: Optional[float] = None
-    ):
+        timestamp: Optional[float] = None,
+        sync: bool = False
+    ) -> Future:
         """
         Record trade as double-entry ledger transaction.
 
@@ -258,6 +275,10 @@ class DoubleEntryLedger:
             price: Price per unit
             fee: Fee in quote currency (USDT)
             timestamp: Trade timestamp (defaults to now)
+            sync: Strict-sync - commit immediately with synchronous=FULL
+
+        Returns:
+            Future resolving once the entries are committed
         """
         timestamp = timestamp or time.time()
         transaction_id = f"trade_{uuid.uuid4().hex[:12]}"
@@ -320,70 +341,87 @@ class DoubleEntryLedger:
                 f"Difference: {abs(total_debit - total_credit)}"
             )
 
-        # Write entries to database atomically
-        with self._lock:
-            db = self._get_connection()
-
-            for entry in entries:
-                # Get current balance
-                balance = self._get_account_balance(entry['account'])
-
-                # Calculate new balance (Assets increase with debit, decrease with credit)
-                new_balance = balance + entry['debit'] - entry['credit']
-
-                # Insert ledger entry with retry logic
-                self._execute_with_retry(
-                    """
-                    INSERT INTO ledger_entries
-                    (timestamp, transaction_id, account, debit, credit, balance_after, symbol, side, qty, price, metadata)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        timestamp, transaction_id, entry['account'],
+        def write(db) -> List[tuple]:
+            # Runs on the writer thread; balances chain through the batch
+            rows = []
+            try:
+                for entry in entries:
+                    account = entry['account']
+                    balance = self._balances.get(account)
+                    if balance is None:
+                        row = db.execute(
+                            "SELECT balance FROM account_balances WHERE account = ?", (account,)
+                        ).fetchone()
+                        balance = row[0] if row else 0.0
+
+                    # Assets increase with debit, decrease with credit
+                    new_balance = balance + entry['debit'] - entry['credit']
+                    self._balances[account] = new_balance
+                    rows.append((
+                        timestamp, transaction_id, account,
                         entry['debit'], entry['credit'], new_balance,
                         symbol, side, qty, price,
                         entry['description']
-                    )
-                )
-
-                # Update account balance
-                self._set_account_balance(entry['account'], new_balance, timestamp)
-
-                # Phase 4: Log ledger_entry event
-                try:
-                    from core.event_schemas import LedgerEntry
-
-                    ledger_event = LedgerEntry(
-                        timestamp=timestamp,
-                        transaction_id=transaction_id,
-                        account=entry['account'],
-                        debit=entry['debit'],
-                        credit=entry['credit'],
-                        balance_after=new_balance,
-                        symbol=symbol,
-                        side=side,
-                        qty=qty,
-                        price=price
-                    )
-
-                    with Trace():
-                        log_event(AUDIT_LOG(), "ledger_entry", **ledger_event.model_dump())
-
-                except Exception as e:
-                    logger.debug(f"Failed to log ledger_entry event: {e}")
+                    ))
+                db.executemany(_INSERT_ENTRY, rows)
+                db.executemany(_UPSERT_BALANCE, [(r[2], r[5], timestamp) for r in rows])
+            except Exception:
+                self._balances.clear()  # savepoint rolled back: reload from disk
+                raise
+            return rows
 
-            db.commit()
+        future = self._writer.submit(write, sync=sync)
+        future.add_done_callback(self._on_trade_committed)
 
         logger.debug(
             f"Ledger: {side.upper()} {qty} {symbol} @ {price} "
             f"(tx: {transaction_id}, fee: {fee})"
         )
+        return future
+
+    def _on_trade_committed(self, future: Future):
+        """Audit-log committed entries (writer thread)"""
+        error = future.exception()
+        if error is not None:
+            self._balances.clear()  # batch rolled back: cached balances are ahead of disk
+            logger.error(f"Ledger write failed: {error}",
+                         extra={'event_type': 'LEDGER_WRITE_FAILED', 'error': str(error)})
+            return
+
+        # Phase 4: Log ledger_entry events
+        try:
+            from core.event_schemas import LedgerEntry
+
+            for (timestamp, transaction_id, account, debit, credit, balance_after,
+                 symbol, side, qty, price, _) in future.result():
+                ledger_event = LedgerEntry(
+                    timestamp=timestamp,
+                    transaction_id=transaction_id,
+                    account=account,
+                    debit=debit,
+                    credit=credit,
+                    balance_after=balance_after,
+                    symbol=symbol,
+                    side=side,
+                    qty=qty,
+                    price=price
+                )
+
+                with Trace():
+                    log_event(AUDIT_LOG(), "ledger_entry", **ledger_event.model_dump())
+
+        except Exception as e:
+            logger.debug(f"Failed to log ledger_entry event: {e}")
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until all recorded trades are committed"""
+        self._writer.flush(timeout)
 
     def _get_account_balance(self, account: str) -> float:
         """
         Get current balance for account.
 
-        Thread-safe lookup of account balance.
+        Thread-safe lookup of account balance (committed state).
         Returns 0.0 if account doesn't exist.
         """
         cursor = self._execute_with_retry(
@@ -393,20 +431,6 @@ class DoubleEntryLedger:
         row = cursor.fetchone()
         return row[0] if row else 0.0
 
-    def _set_account_balance(self, account: str, balance: float, timestamp: float):
-        """
-        Set account balance.
-
-        Thread-safe update of account balance with timestamp.
-        """
-        self._execute_with_retry(
-            """
-            INSERT OR REPLACE INTO account_balances (account, balance, updated_at)
-            VALUES (?, ?, ?)
-            """,
-            (account, balance, timestamp)
-        )
-
     def get_all_balances(self) -> Dict[str, float]:
         """
         Get all account balances.
@@ -414,6 +438,7 @@ class DoubleEntryLedger:
         Returns:
             Dict mapping account names to balances
         """
+        self.flush()
         with self._lock:
             cursor = self._execute_with_retry(
                 "SELECT account, balance FROM account_balances"
@@ -422,14 +447,17 @@ class DoubleEntryLedger:
 
     def get_cash_balance(self) -> float:
         """Get current USDT cash balance"""
+        self.flush()
         return self._get_account_balance("cash:USDT")
 
     def get_asset_balance(self, symbol: str) -> float:
         """Get current notional value of asset"""
+        self.flush()
         return self._get_account_balance(f"asset:{symbol}")
 
     def get_total_fees(self) -> float:
         """Get total trading fees paid"""
+        self.flush()
         return abs(self._get_account_balance("fees:trading"))
 
     def verify_balance(self, account: str, expected_balance: float, tolerance: float = 0.01) -> bool:
@@ -444,6 +472,7 @@ class DoubleEntryLedger:
         Returns:
             True if balance matches within tolerance
         """
+        self.flush()
         with self._lock:
             actual_balance = self._get_account_balance(account)
             diff = abs(actual_balance - expected_balance)
@@ -467,6 +496,7 @@ class DoubleEntryLedger:
         Returns:
             List of transaction dicts
         """
+        self.flush()
         with self._lock:
             cursor = self._execute_with_retry(
                 """
@@ -484,14 +514,19 @@ class DoubleEntryLedger:
 
             return [dict(zip(columns, row)) for row in cursor.fetchall()]
 
+    def get_writer_stats(self) -> Dict:
+        """Group-commit statistics of the writer thread"""
+        return self._writer.get_stats()
+
     def close(self):
         """
-        Close all thread-local database connections.
+        Commit pending writes, stop the writer and close the caller's connection.
 
         CRITICAL FIX (C-LEDGER-01): Close connections for all threads.
-        Note: This only closes the connection for the calling thread.
+        Note: This only closes the read connection for the calling thread.
         Other thread connections will be closed when those threads exit.
         """
+        self._writer.close()
         with self._lock:
             if hasattr(self._local, 'db'):
                 self._local.db.close()
@@ -512,5 +547,9 @@ def get_ledger() -> DoubleEntryLedger:
     global _ledger
     with _ledger_lock:
         if _ledger is None:
-            _ledger = DoubleEntryLedger()
+            import config
+            _ledger = DoubleEntryLedger(
+                commit_interval_s=getattr(config, 'SQLITE_GROUP_COMMIT_MS', 2.0) / 1000.0,
+                strict_sync=getattr(config, 'SQLITE_STRICT_SYNC', False),
+            )
         return _ledger
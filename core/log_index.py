@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Session Log Index - Incremental SQLite Index over JSONL Session Logs
+
+Post-hoc tools (scripts/query_logs.py, tools/log_analysis.py,
+scripts/extract_exchange_slice_configured.py) used to rescan and re-parse
+every JSONL/gz file of a session for every single query. This module ingests
+the session logs once into a local SQLite store and remembers per-file read
+offsets, so re-runs only parse lines appended since the last run.
+
+Key Features:
+- Incremental ingestion (byte offsets per file, rotation/truncation aware)
+- Transparent support for rotated *.jsonl.gz files (indexed once, immutable)
+- Indexed columns: event, event_type, symbol, decision_id, order_id,
+  intent_id, method, ts
+- Raw line stored alongside, so queries never touch the source files
+
+Usage:
+    from core.log_index import SessionLogIndex
+
+    index = SessionLogIndex("sessions/session_20250112_123456/logs")
+    index.refresh()
+
+    for event in index.query(stream="decision", event_type="position_opened"):
+        print(event["symbol"])
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+INDEX_DB_NAME = ".log_index.sqlite"
+DEFAULT_PATTERNS = ("**/*.jsonl", "**/*.jsonl.gz")
+
+# Bump when the extracted columns change - forces a full re-ingest
+SCHEMA_VERSION = 2
+
+_ROTATION_SUFFIX_RE = re.compile(r"_\d{4}-?\d{2}-?\d{2}.*$")
+_INSERT_BATCH = 5000
+
+
+def stream_name(path: Union[str, Path]) -> str:
+    """
+    Derive the logical stream name of a log file.
+
+    decision.jsonl -> "decision", exchange_trace_20250928_1021.jsonl.gz -> "exchange_trace"
+    """
+    stem = Path(path).name.split(".", 1)[0]
+    return _ROTATION_SUFFIX_RE.sub("", stem) or stem
+
+
+def _parse_ts(value: Any) -> Optional[float]:
+    """Parse epoch seconds/ms/ns or ISO-8601 strings into epoch seconds"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        v = float(value)
+        if v > 1e17:
+            return v / 1e9
+        if v > 1e12:
+            return v / 1e3
+        return v
+    s = str(value).strip()
+    if not s:
+        return None
+    try:
+        return _parse_ts(float(s))
+    except ValueError:
+        pass
+    try:
+        if s.endswith("Z"):
+            s = s[:-1] + "+00:00"
+        return datetime.fromisoformat(s).timestamp()
+    except ValueError:
+        return None
+
+
+def extract_fields(obj: Dict[str, Any]) -> Tuple:
+    """
+    Extract indexed columns from a parsed log record.
+
+    Returns:
+        (ts, event, event_type, symbol, decision_id, order_id, intent_id, method)
+    """
+    ts = None
+    # Same priority as pick_ts() of scripts/extract_exchange_slice_configured.py
+    for key in ("ts", "ts_ms", "timestamp", "time", "datetime", "ts_ns"):
+        if key in obj:
+            ts = _parse_ts(obj[key])
+            if ts is not None:
+                break
+
+    args = obj.get("args") if isinstance(obj.get("args"), dict) else {}
+    params = obj.get("params") if isinstance(obj.get("params"), dict) else {}
+    resp = obj.get("resp") if isinstance(obj.get("resp"), dict) else {}
+
+    symbol = (
+        obj.get("symbol") or args.get("symbol") or params.get("symbol")
+        or obj.get("market") or obj.get("pair")
+    )
+    order_id = (
+        obj.get("order_id") or obj.get("exchange_order_id")
+        or resp.get("id") or args.get("id") or args.get("order_id")
+    )
+    method = obj.get("fn") or obj.get("method") or obj.get("call")
+    if isinstance(method, str):
+        method = method.strip().lower().replace("-", "_") or None
+
+    def _s(v):
+        return None if v is None or isinstance(v, (dict, list)) else str(v)
+
+    return (
+        ts,
+        _s(obj.get("event")),
+        _s(obj.get("event_type") or obj.get("event_name")),
+        _s(symbol),
+        _s(obj.get("decision_id")),
+        _s(order_id),
+        _s(obj.get("intent_id")),
+        _s(method),
+    )
+
+
+def _as_list(value: Union[None, str, Sequence[str]]) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+class SessionLogIndex:
+    """
+    Incrementally maintained SQLite index over a directory of JSONL logs.
+
+    One index database lives inside the indexed directory. Plain *.jsonl files
+    are tailed by byte offset (only complete lines are ingested); *.jsonl.gz
+    files are treated as immutable rotation output and ingested exactly once.
+    A file that shrinks or changes inode is considered rotated and re-indexed.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        db_path: Optional[Union[str, Path]] = None,
+        patterns: Sequence[str] = DEFAULT_PATTERNS,
+    ):
+        """
+        Initialize index for a log directory.
+
+        Args:
+            root: Directory containing the JSONL logs (e.g. sessions/<id>/logs)
+            db_path: Optional index database path (default: <root>/.log_index.sqlite)
+            patterns: Glob patterns (relative to root) of files to index
+        """
+        self.root = Path(root)
+        self.db_path = Path(db_path) if db_path else self.root / INDEX_DB_NAME
+        self.patterns = tuple(patterns)
+        self._lock = threading.RLock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA temp_store=MEMORY")
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create index schema, dropping it if the schema version changed"""
+        with self._lock:
+            db = self._db
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS events")
+                db.execute("DROP TABLE IF EXISTS files")
+
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    file_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    path TEXT UNIQUE NOT NULL,
+                    stream TEXT NOT NULL,
+                    inode INTEGER,
+                    offset INTEGER NOT NULL DEFAULT 0,
+                    complete INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_id INTEGER NOT NULL,
+                    line_offset INTEGER NOT NULL,
+                    stream TEXT NOT NULL,
+                    ts REAL,
+                    event TEXT,
+                    event_type TEXT,
+                    symbol TEXT,
+                    decision_id TEXT,
+                    order_id TEXT,
+                    intent_id TEXT,
+                    method TEXT,
+                    raw TEXT NOT NULL
+                )
+            """)
+            for column in ("ts", "event", "event_type", "symbol", "decision_id",
+                           "order_id", "intent_id", "method", "file_id"):
+                db.execute(f"CREATE INDEX IF NOT EXISTS idx_events_{column} ON events({column})")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_events_stream_ts ON events(stream, ts)")
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            db.commit()
+
+    def close(self):
+        """Close the underlying database connection"""
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def discover_files(self) -> List[Path]:
+        """Return log files matching the index patterns, oldest first"""
+        seen = set()
+        files = []
+        for pattern in self.patterns:
+            for path in self.root.glob(pattern):
+                if path.is_file() and path not in seen and path != self.db_path:
+                    seen.add(path)
+                    files.append(path)
+        files.sort(key=lambda p: (p.stat().st_mtime, str(p)))
+        return files
+
+    def refresh(self) -> int:
+        """
+        Ingest lines appended since the last refresh.
+
+        Returns:
+            Number of newly indexed lines
+        """
+        total = 0
+        for path in self.discover_files():
+            try:
+                total += self._ingest_file(path)
+            except (OSError, EOFError) as e:
+                # Truncated gz (still being compressed) - rolled back, retried on the next refresh
+                logger.warning(f"Log index: failed to ingest {path}: {e}")
+        return total
+
+    def _ingest_file(self, path: Path) -> int:
+        key = str(path.resolve())
+        is_gz = path.name.endswith(".gz")
+        st = path.stat()
+
+        with self._lock:
+            db = self._db
+            row = db.execute(
+                "SELECT file_id, inode, offset, complete FROM files WHERE path = ?", (key,)
+            ).fetchone()
+
+            if row:
+                file_id, inode, offset, complete = row
+                if complete:
+                    return 0
+                if inode != st.st_ino or (not is_gz and st.st_size < offset):
+                    # Rotated or truncated in place - drop stale rows and start over
+                    db.execute("DELETE FROM events WHERE file_id = ?", (file_id,))
+                    offset = 0
+                elif not is_gz and st.st_size == offset:
+                    return 0
+            else:
+                cur = db.execute(
+                    "INSERT INTO files (path, stream, inode, offset) VALUES (?, ?, ?, 0)",
+                    (key, stream_name(path), st.st_ino)
+                )
+                file_id, offset = cur.lastrowid, 0
+
+            try:
+                count, pos = self._read_new_lines(path, file_id, offset, is_gz)
+            except Exception:
+                db.rollback()
+                raise
+
+            db.execute(
+                "UPDATE files SET inode = ?, offset = ?, complete = ? WHERE file_id = ?",
+                (st.st_ino, pos, 1 if is_gz else 0, file_id)
+            )
+            db.commit()
+
+        if count:
+            logger.debug(f"Log index: {count} new lines from {path.name}")
+        return count
+
+    def _read_new_lines(self, path: Path, file_id: int, offset: int, is_gz: bool) -> Tuple[int, int]:
+        """Parse and insert complete lines after offset; returns (count, new_offset)"""
+        stream = stream_name(path)
+        opener = gzip.open if is_gz else open
+        batch = []
+        count = 0
+        pos = offset
+        with opener(path, "rb") as f:
+            if offset:
+                f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n") and not is_gz:
+                    # Partial line still being written - pick it up next time
+                    break
+                line_offset = pos
+                pos += len(raw)
+                text = raw.decode("utf-8", errors="replace").strip()
+                if not text:
+                    continue
+                try:
+                    obj = json.loads(text)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(obj, dict):
+                    continue
+                batch.append((file_id, line_offset, stream, *extract_fields(obj), text))
+                if len(batch) >= _INSERT_BATCH:
+                    self._insert(batch)
+                    count += len(batch)
+                    batch = []
+
+        if batch:
+            self._insert(batch)
+            count += len(batch)
+        return count, pos
+
+    def _insert(self, batch: List[Tuple]):
+        self._db.executemany(
+            "INSERT INTO events (file_id, line_offset, stream, ts, event, event_type, symbol, "
+            "decision_id, order_id, intent_id, method, raw) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            batch
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _where(
+        self,
+        stream=None,
+        event_type=None,
+        symbol=None,
+        decision_id=None,
+        order_id=None,
+        intent_id=None,
+        method=None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        path=None,
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+
+        def _in(column: str, values):
+            values = _as_list(values)
+            if values is None:
+                return
+            clauses.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+
+        _in("stream", stream)
+        types = _as_list(event_type)
+        if types is not None:
+            marks = ",".join("?" * len(types))
+            clauses.append(f"(event IN ({marks}) OR event_type IN ({marks}))")
+            params.extend(types)
+            params.extend(types)
+        _in("symbol", symbol)
+        _in("decision_id", decision_id)
+        _in("order_id", order_id)
+        _in("intent_id", intent_id)
+        _in("method", method)
+        paths = _as_list(path)
+        if paths is not None:
+            paths = [str(Path(p).resolve()) for p in paths]
+            clauses.append(f"file_id IN (SELECT file_id FROM files WHERE path IN ({','.join('?' * len(paths))}))")
+            params.extend(paths)
+        # Records without a timestamp cannot be placed in time - keep them
+        if since is not None:
+            clauses.append("(ts IS NULL OR ts >= ?)")
+            params.append(since)
+        if until is not None:
+            clauses.append("(ts IS NULL OR ts <= ?)")
+            params.append(until)
+
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        return where, params
+
+    def query(
+        self,
+        stream=None,
+        event_type=None,
+        symbol=None,
+        decision_id=None,
+        order_id=None,
+        intent_id=None,
+        method=None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        path=None,
+        order_by: str = "ts",
+        descending: bool = False,
+        limit: Optional[int] = None,
+        raw: bool = False,
+    ) -> Iterator[Union[Dict[str, Any], str]]:
+        """
+        Query indexed events.
+
+        Every filter accepts a single value or a list of values (IN match).
+        event_type matches either the "event" or the "event_type"/"event_name"
+        field of the record.
+
+        Args:
+            stream: Log stream(s), e.g. "decision", "order", "exchange_trace"
+            event_type: Event name(s)
+            symbol / decision_id / order_id / intent_id / method: Column filters
+            since / until: Epoch-seconds window (inclusive, records without
+                a timestamp always match)
+            path: Source log file(s); restricts results to lines from these files
+            order_by: "ts" (chronological) or "ingest" (file order)
+            descending: Reverse the ordering
+            limit: Maximum number of rows
+            raw: Yield raw JSON lines instead of parsed dicts
+
+        Yields:
+            Parsed event dicts (or raw lines if raw=True)
+        """
+        where, params = self._where(stream, event_type, symbol, decision_id, order_id,
+                                    intent_id, method, since, until, path)
+        direction = "DESC" if descending else "ASC"
+        order = f"ts {direction}, id {direction}" if order_by == "ts" else f"id {direction}"
+        sql = f"SELECT raw FROM events{where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for (text,) in rows:
+                yield text if raw else json.loads(text)
+
+    def count(self, **filters) -> int:
+        """Count indexed events matching the given query filters"""
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM events{where}", params).fetchone()[0]
+
+    def time_range(self, **filters) -> Tuple[Optional[float], Optional[float]]:
+        """Return (min_ts, max_ts) of indexed events matching the filters"""
+        where, params = self._where(**filters)
+        with self._lock:
+            return self._db.execute(f"SELECT MIN(ts), MAX(ts) FROM events{where}", params).fetchone()
+
+    def indexed_files(self) -> List[str]:
+        """Return paths of all indexed files in ingestion order"""
+        with self._lock:
+            return [r[0] for r in self._db.execute("SELECT path FROM files ORDER BY file_id")]
+
+
+def open_index(root: Union[str, Path], refresh: bool = True, **kwargs) -> SessionLogIndex:
+    """
+    Open (and by default refresh) the log index for a directory.
+
+    Args:
+        root: Log directory to index
+        refresh: Ingest new lines before returning
+        **kwargs: Passed to SessionLogIndex
+
+    Returns:
+        SessionLogIndex instance
+    """
+    index = SessionLogIndex(root, **kwargs)
+    if refresh:
+        index.refresh()
+    return index
+
+
+def main():
+    """CLI entry point: python -m core.log_index <log_dir>"""
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build/refresh the session log index")
+    parser.add_argument("log_dir", help="Session log directory (e.g. sessions/<id>/logs)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.log_dir):
+        print(f"Error: not a directory: {args.log_dir}")
+        raise SystemExit(1)
+
+    t0 = time.perf_counter()
+    with SessionLogIndex(args.log_dir) as index:
+        added = index.refresh()
+        total = index.count()
+    print(f"Indexed {added} new lines ({total} total) in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
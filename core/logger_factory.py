@@ -39,6 +39,13 @@ from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
 from typing import Any, Dict
 
+from core.logging.critical_index import (
+    SIDECAR_SUFFIX,
+    CriticalIndexMixin,
+    get_compression_pool,
+    move_with_sidecar,
+    sidecar_path,
+)
 from core.trace_context import (
     client_order_id_var,
     decision_id_var,
@@ -110,15 +117,50 @@ class GzTimedHandler(TimedRotatingFileHandler):
         return default_name + ".gz"
 
     def rotate(self, source: str, dest: str) -> None:
-        """Rotate and compress the log file."""
-        # Close the source file
-        if os.path.exists(source):
-            # Compress to destination
-            with open(source, 'rb') as f_in:
+        """Rotate the log file and compress it in the background pool."""
+        if not os.path.exists(source):
+            return
+
+        # Rename is cheap; gzip runs in a worker process off the logging path.
+        # The critical-event sidecar travels with the file (and on to the .gz)
+        rotated = dest[:-3] if dest.endswith(".gz") else dest
+        move_with_sidecar(source, rotated)
+        try:
+            get_compression_pool().submit(rotated)
+        except Exception:
+            # Pool unavailable (e.g. interpreter shutdown) - compress inline
+            with open(rotated, 'rb') as f_in:
                 with gzip.open(dest, 'wb') as f_out:
                     f_out.writelines(f_in)
-            # Remove uncompressed source
-            os.remove(source)
+            os.remove(rotated)
+            if os.path.exists(sidecar_path(rotated)):
+                os.replace(sidecar_path(rotated), sidecar_path(dest))
+
+
+class CriticalIndexingGzTimedHandler(CriticalIndexMixin, GzTimedHandler):
+    """
+    GzTimedHandler that maintains the critical event sidecar while writing.
+
+    Used for the decision, order and audit streams so retention can keep
+    their files without scanning them.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        self._init_index()
+        super().__init__(filename, *args, **kwargs)
+
+    def doRollover(self):
+        self._close_sidecar()
+        super().doRollover()
+        # Backup pruning only knows the log files - drop sidecars left behind
+        log_dir, base = os.path.split(self.baseFilename)
+        for name in os.listdir(log_dir):
+            if name.startswith(base + ".") and name.endswith(SIDECAR_SUFFIX):
+                if not os.path.exists(os.path.join(log_dir, name[:-len(SIDECAR_SUFFIX)])):
+                    try:
+                        os.remove(os.path.join(log_dir, name))
+                    except OSError:
+                        pass
 
 
 # Global logger cache
@@ -127,13 +169,14 @@ _logger_cache: Dict[tuple, logging.Logger] = {}
 _logger_cache_lock = threading.Lock()
 
 
-def _make_handler(file_path: str, backup_count: int = 14) -> logging.Handler:
+def _make_handler(file_path: str, backup_count: int = 14, indexed: bool = False) -> logging.Handler:
     """
     Create rotating file handler with JSONL formatter.
 
     Args:
         file_path: Path to log file
         backup_count: Number of daily backups to keep
+        indexed: Maintain the critical event sidecar index
 
     Returns:
         Configured handler
@@ -142,7 +185,8 @@ def _make_handler(file_path: str, backup_count: int = 14) -> logging.Handler:
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
     # Create rotating handler (daily rotation at midnight UTC)
-    handler = GzTimedHandler(
+    handler_cls = CriticalIndexingGzTimedHandler if indexed else GzTimedHandler
+    handler = handler_cls(
         filename=file_path,
         when='midnight',
         interval=1,
@@ -158,7 +202,7 @@ def _make_handler(file_path: str, backup_count: int = 14) -> logging.Handler:
     return handler
 
 
-def get_logger(name: str, file_path: str, backup_count: int = 14) -> logging.Logger:
+def get_logger(name: str, file_path: str, backup_count: int = 14, indexed: bool = False) -> logging.Logger:
     """
     Get or create a logger with JSONL output.
 
@@ -166,6 +210,7 @@ def get_logger(name: str, file_path: str, backup_count: int = 14) -> logging.Log
         name: Logger name (e.g., "decision", "order")
         file_path: Path to log file
         backup_count: Number of daily backups to keep
+        indexed: Maintain the critical event sidecar index
 
     Returns:
         Configured logger
@@ -184,7 +229,7 @@ def get_logger(name: str, file_path: str, backup_count: int = 14) -> logging.Log
         logger.propagate = False  # Don't propagate to root logger
 
         # Add handler
-        handler = _make_handler(file_path, backup_count)
+        handler = _make_handler(file_path, backup_count, indexed)
         logger.addHandler(handler)
 
         # Cache and return
@@ -195,12 +240,12 @@ def get_logger(name: str, file_path: str, backup_count: int = 14) -> logging.Log
 # Convenience logger getters (lazy initialization)
 def DECISION_LOG() -> logging.Logger:
     """Get decision logger (drop triggers, guards, sizing)."""
-    return get_logger("decision", "logs/decisions/decision.jsonl")
+    return get_logger("decision", "logs/decisions/decision.jsonl", indexed=True)
 
 
 def ORDER_LOG() -> logging.Logger:
     """Get order logger (attempt, ack, fill, cancel)."""
-    return get_logger("order", "logs/orders/order.jsonl")
+    return get_logger("order", "logs/orders/order.jsonl", indexed=True)
 
 
 def TRACER_LOG() -> logging.Logger:
@@ -210,7 +255,7 @@ def TRACER_LOG() -> logging.Logger:
 
 def AUDIT_LOG() -> logging.Logger:
     """Get audit logger (state changes, config, exceptions)."""
-    return get_logger("audit", "logs/audit/audit.jsonl")
+    return get_logger("audit", "logs/audit/audit.jsonl", indexed=True)
 
 
 def HEALTH_LOG() -> logging.Logger:
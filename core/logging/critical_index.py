@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Critical Event Sidecar Index and Background Log Compression
+
+Log retention must never delete files containing critical events. Instead of
+re-opening and re-parsing candidate files during cleanup, the log pipeline
+records critical events while writing: every JSONL log file written through a
+handler using CriticalIndexMixin (the size-rotated bot log and the daily
+decision/order/audit streams) gets a sidecar "<file>.crit" holding one line
+per critical record ({"o": byte_offset, "t": event_type}).
+
+- Sidecar exists and is empty  -> file has no critical events
+- Sidecar exists and non-empty -> preserve file (offsets allow direct seeks)
+- No sidecar                   -> legacy file, caller falls back to scanning
+
+Rotated files are gzip-compressed in a bounded ProcessPoolExecutor so
+compression never competes with trading threads for the GIL.
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from logging.handlers import RotatingFileHandler
+from typing import Callable, Iterator, List, Optional, Tuple
+
+SIDECAR_SUFFIX = ".crit"
+# Timestamp seek index written by core.replay; travels with its log file too
+TS_INDEX_SUFFIX = ".tsidx"
+
+# Critical event patterns - never compressed away or deleted by retention
+CRITICAL_PATTERNS = (
+    "TRADE_OPEN", "TRADE_CLOSE", "ORDER_FILLED", "ORDER_PLACED",
+    "BUY_TRIGGERED", "SELL_TRIGGERED", "ERROR", "WARNING",
+    "CONFIG_CHANGE", "ENGINE_START", "ENGINE_STOP",
+    "SESSION_START", "SESSION_END", "DECISION_START", "DECISION_END"
+)
+
+
+def sidecar_path(log_path: str) -> str:
+    """Sidecar index path for a log file"""
+    return f"{log_path}{SIDECAR_SUFFIX}"
+
+
+def is_sidecar(path: str) -> bool:
+    return path.endswith((SIDECAR_SUFFIX, TS_INDEX_SUFFIX))
+
+
+def match_critical(event_type: str, message: str, patterns=CRITICAL_PATTERNS) -> Optional[str]:
+    """Return the first matching critical pattern, or None
+
+    Event types match case-insensitively (structured streams use lowercase
+    names such as "order_filled"); messages match case-sensitively.
+    """
+    event_upper = event_type.upper()
+    for pattern in patterns:
+        if pattern in event_upper or pattern in message:
+            return pattern
+    return None
+
+
+def has_critical_events(log_path: str) -> Optional[bool]:
+    """
+    Decide from the sidecar whether a log file holds critical events.
+
+    Returns:
+        True/False if the file is indexed, None if no sidecar exists
+    """
+    try:
+        return os.path.getsize(sidecar_path(log_path)) > 0
+    except OSError:
+        return None
+
+
+def read_sidecar(log_path: str) -> List[Tuple[int, str]]:
+    """Read (offset, event_type) entries of a log file's sidecar"""
+    entries = []
+    try:
+        with open(sidecar_path(log_path), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                    entries.append((int(item['o']), item.get('t', '')))
+                except (json.JSONDecodeError, KeyError, ValueError):
+                    continue
+    except OSError:
+        pass
+    return entries
+
+
+def iter_indexed_lines(log_path: str) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (offset, raw_line) for every critical record using sidecar offsets.
+
+    Works for plain and gzip files (offsets are uncompressed byte offsets).
+    """
+    entries = read_sidecar(log_path)
+    if not entries:
+        return
+    opener = gzip.open if log_path.endswith('.gz') else open
+    with opener(log_path, 'rb') as f:
+        for offset, _ in sorted(entries):
+            f.seek(offset)
+            raw = f.readline()
+            if raw:
+                yield offset, raw.decode('utf-8', errors='replace')
+
+
+def move_with_sidecar(src: str, dst: str):
+    """Move a log file together with its sidecar (if present)"""
+    shutil.move(src, dst)
+    if os.path.exists(sidecar_path(src)):
+        os.replace(sidecar_path(src), sidecar_path(dst))
+    try:
+        os.remove(src + TS_INDEX_SUFFIX)  # rebuilt on demand for the new path
+    except FileNotFoundError:
+        pass
+
+
+def remove_with_sidecar(path: str):
+    """Delete a log file and its sidecar (if present)"""
+    os.remove(path)
+    for suffix in (SIDECAR_SUFFIX, TS_INDEX_SUFFIX):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def rebuild_sidecar(log_path: str, patterns=CRITICAL_PATTERNS) -> int:
+    """
+    Build the sidecar of an existing (un-indexed) plain log file by scanning it.
+
+    Returns:
+        Number of critical records indexed
+    """
+    count = 0
+    tmp = sidecar_path(log_path) + ".tmp"
+    with open(log_path, 'rb') as f, open(tmp, 'w', encoding='utf-8') as out:
+        offset = 0
+        for raw in f:
+            line = raw.decode('utf-8', errors='replace')
+            try:
+                data = json.loads(line) if line.strip() else {}
+                event_type = str(data.get('event_type') or data.get('event') or '')
+                matched = match_critical(event_type, str(data.get('message', '')), patterns)
+            except (json.JSONDecodeError, AttributeError):
+                event_type = ''
+                matched = match_critical('', line, patterns)
+            if matched is not None:
+                out.write(json.dumps({"o": offset, "t": event_type or matched}, separators=(",", ":")) + "\n")
+                count += 1
+            offset += len(raw)
+    os.replace(tmp, sidecar_path(log_path))
+    return count
+
+
+class SidecarWriter:
+    """Append-only writer of one sidecar index file"""
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+        self._fh = open(sidecar_path(log_path), 'a', encoding='utf-8')
+
+    def record(self, offset: int, event_type: str):
+        self._fh.write(json.dumps({"o": offset, "t": event_type}, separators=(",", ":")) + "\n")
+        self._fh.flush()
+
+    def close(self):
+        try:
+            self._fh.close()
+        except Exception:
+            pass
+
+
+class CriticalIndexMixin:
+    """
+    Maintains the critical event sidecar of a logging.FileHandler subclass.
+
+    The critical check runs on LogRecord attributes (event_type/event and the
+    message) - no JSON parsing. Subclasses rotate the sidecar with the file
+    and must call _close_sidecar() before the file is renamed.
+    """
+
+    def _init_index(self, patterns=CRITICAL_PATTERNS):
+        self.patterns = tuple(patterns)
+        self._sidecar: Optional[SidecarWriter] = None
+
+    def _get_sidecar(self) -> SidecarWriter:
+        if self._sidecar is None:
+            self._sidecar = SidecarWriter(self.baseFilename)
+        return self._sidecar
+
+    def _close_sidecar(self):
+        if self._sidecar is not None:
+            self._sidecar.close()
+            self._sidecar = None
+
+    def _open(self):
+        # An empty sidecar would claim "no critical events" for a file that
+        # already holds unindexed records - index those first
+        has_content = os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0
+        if has_content and has_critical_events(self.baseFilename) is None:
+            try:
+                rebuild_sidecar(self.baseFilename, self.patterns)
+            except OSError as e:
+                logging.getLogger(__name__).warning(
+                    f"Sidecar rebuild failed for {self.baseFilename}: {e}",
+                    extra={'event_type': 'LOG_SIDECAR_REBUILD_FAILED'}
+                )
+                return super()._open()
+        stream = super()._open()
+        # Empty sidecar marks the file as indexed (no critical events yet)
+        self._get_sidecar()
+        return stream
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            event_type = str(getattr(record, 'event_type', '') or getattr(record, 'event', '') or '')
+            matched = match_critical(event_type, record.getMessage(), self.patterns)
+            if matched is None:
+                super().emit(record)
+                return
+
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.flush()
+            offset = self.stream.tell()
+            logging.FileHandler.emit(self, record)
+            if self._sidecar is not None:
+                self._sidecar.record(offset, event_type or matched)
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.acquire()
+        try:
+            self._close_sidecar()
+        finally:
+            self.release()
+        super().close()
+
+
+class CriticalIndexingRotatingFileHandler(CriticalIndexMixin, RotatingFileHandler):
+    """
+    RotatingFileHandler that maintains the critical event sidecar while writing.
+
+    Rollover rotates sidecars alongside backups.
+    """
+
+    def __init__(self, filename, *args, patterns=CRITICAL_PATTERNS, **kwargs):
+        self._init_index(patterns)
+        super().__init__(filename, *args, **kwargs)
+
+    def doRollover(self):
+        self._close_sidecar()
+        super().doRollover()
+        if self.backupCount > 0:
+            for i in range(self.backupCount - 1, 0, -1):
+                src = sidecar_path(self.rotation_filename(f"{self.baseFilename}.{i}"))
+                dst = sidecar_path(self.rotation_filename(f"{self.baseFilename}.{i + 1}"))
+                if os.path.exists(src):
+                    os.replace(src, dst)
+            base_sidecar = sidecar_path(self.baseFilename)
+            if os.path.exists(base_sidecar):
+                os.replace(base_sidecar, sidecar_path(self.rotation_filename(f"{self.baseFilename}.1")))
+
+
+# ---------------------------------------------------------------------------
+# Background compression
+# ---------------------------------------------------------------------------
+
+def _gzip_file(src: str, dst: str) -> str:
+    """Worker-process entry point: gzip src into dst (atomic via temp file)"""
+    tmp = dst + ".tmp"
+    with open(src, 'rb') as f_in:
+        with gzip.open(tmp, 'wb') as f_out:
+            shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+    os.replace(tmp, dst)
+    return dst
+
+
+class CompressionPool:
+    """
+    Bounded background gzip compression in worker processes.
+
+    At most max_workers files compress concurrently. Submissions beyond
+    max_pending never block: rotation may run inside a logging handler on a
+    trading thread, so an overflowing file is compressed inline instead.
+    """
+
+    def __init__(self, max_workers: int = 1, max_pending: int = 8):
+        self.max_workers = max_workers
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def submit(
+        self,
+        src: str,
+        remove_source: bool = True,
+        on_done: Optional[Callable[[str, Optional[str]], None]] = None,
+    ) -> Future:
+        """
+        Compress src to src.gz in the background.
+
+        On success the sidecar is moved to the .gz name and (by default) the
+        source removed. on_done(src, compressed_path_or_None) is invoked from
+        the pool's result thread (or the caller's thread when the queue is full).
+        """
+        dst = f"{src}.gz"
+
+        def _finish(fut: Future):
+            compressed = None
+            try:
+                compressed = fut.result()
+                if os.path.exists(sidecar_path(src)):
+                    os.replace(sidecar_path(src), sidecar_path(compressed))
+                if remove_source:
+                    os.remove(src)
+            except Exception as e:
+                self.logger.error(f"Log compression failed for {src}: {e}")
+            if on_done is not None:
+                try:
+                    on_done(src, compressed)
+                except Exception as e:
+                    self.logger.debug(f"Compression callback failed for {src}: {e}")
+
+        if not self._slots.acquire(blocking=False):
+            self.logger.warning(
+                f"Compression queue full, compressing {src} inline",
+                extra={'event_type': 'LOG_COMPRESSION_INLINE'}
+            )
+            future: Future = Future()
+            try:
+                future.set_result(_gzip_file(src, dst))
+            except Exception as e:
+                future.set_exception(e)
+            _finish(future)
+            return future
+
+        try:
+            future = self._get_executor().submit(_gzip_file, src, dst)
+        except Exception:
+            self._slots.release()
+            raise
+
+        def _release(fut: Future):
+            self._slots.release()
+            _finish(fut)
+
+        future.add_done_callback(_release)
+        return future
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+_compression_pool: Optional[CompressionPool] = None
+_compression_pool_lock = threading.Lock()
+
+
+def get_compression_pool() -> CompressionPool:
+    """Get the shared background compression pool"""
+    global _compression_pool
+    with _compression_pool_lock:
+        if _compression_pool is None:
+            try:
+                import config
+                workers = int(getattr(config, 'LOG_COMPRESSION_WORKERS', 1))
+            except Exception:
+                workers = 1
+            _compression_pool = CompressionPool(max_workers=max(1, workers))
+        return _compression_pool
+
+
+def shutdown_compression_pool(wait: bool = True):
+    """Shut down the shared compression pool (waits for queued files by default)"""
+    global _compression_pool
+    with _compression_pool_lock:
+        pool, _compression_pool = _compression_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
@@ -9,19 +9,34 @@ Features:
 - Retention policy with automatic cleanup
 - Session-based organization
 - Critical event preservation
+
+Critical events are indexed at write time (sidecar "<file>.crit", see
+core/logging/critical_index.py), so retention only stats the sidecar instead
+of re-parsing candidate files. Compression of rotated files runs in a bounded
+background process pool.
 """
 
 import gzip
 import json
 import logging
 import os
-import shutil
 import threading
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from core.logging.critical_index import (
+    CRITICAL_PATTERNS,
+    get_compression_pool,
+    has_critical_events,
+    is_sidecar,
+    iter_indexed_lines,
+    move_with_sidecar,
+    remove_with_sidecar,
+    shutdown_compression_pool,
+)
+
 try:
     from config import DEBUG_ENABLE_LOG_COMPRESSION, DEBUG_LOG_RETENTION_DAYS, LOG_DIR, SESSION_DIR, run_timestamp
 except ImportError:
@@ -49,12 +64,7 @@ class LogManager:
         self.max_age_hours = 6      # Rotate every 6 hours
 
         # Critical event patterns - never compressed or deleted
-        self.critical_patterns = [
-            "TRADE_OPEN", "TRADE_CLOSE", "ORDER_FILLED", "ORDER_PLACED",
-            "BUY_TRIGGERED", "SELL_TRIGGERED", "ERROR", "WARNING",
-            "CONFIG_CHANGE", "ENGINE_START", "ENGINE_STOP",
-            "SESSION_START", "SESSION_END", "DECISION_START", "DECISION_END"
-        ]
+        self.critical_patterns = list(CRITICAL_PATTERNS)
 
         # Thread safety
         self._lock = threading.RLock()
@@ -110,6 +120,9 @@ class LogManager:
             if self._rotation_thread:
                 self._rotation_thread.join(timeout=5.0)
 
+            # Let queued compressions finish so no half-written .gz remains
+            shutdown_compression_pool(wait=True)
+
             self.logger.info("Log manager stopped")
 
     def _rotation_worker(self):
@@ -171,37 +184,24 @@ class LogManager:
                 rotated_name = f"{base_name}_{timestamp}.jsonl"
                 rotated_path = os.path.join(os.path.dirname(filepath), rotated_name)
 
-                # Move current file to rotated name
-                shutil.move(filepath, rotated_path)
+                # Move current file (and its critical-event sidecar) to rotated name
+                move_with_sidecar(filepath, rotated_path)
 
-                # Compress if enabled
-                if self.compression_enabled:
-                    compressed_path = self._compress_file(rotated_path)
-                    if compressed_path:
-                        os.remove(rotated_path)  # Remove uncompressed version
-                        self.logger.info(f"Log rotated and compressed: {filepath} -> {compressed_path}")
-                    else:
-                        self.logger.warning(f"Log rotated but compression failed: {filepath} -> {rotated_path}")
-                else:
-                    self.logger.info(f"Log rotated: {filepath} -> {rotated_path}")
+            # Compress in background worker process (outside the lock, off the GIL)
+            if self.compression_enabled:
+                get_compression_pool().submit(rotated_path, on_done=self._on_compressed)
+            else:
+                self.logger.info(f"Log rotated: {filepath} -> {rotated_path}")
 
         except Exception as e:
             self.logger.error(f"Log rotation failed for {filepath}: {e}")
 
-    def _compress_file(self, filepath: str) -> Optional[str]:
-        """Compress a log file using gzip"""
-        try:
-            compressed_path = f"{filepath}.gz"
-
-            with open(filepath, 'rb') as f_in:
-                with gzip.open(compressed_path, 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-
-            return compressed_path
-
-        except Exception as e:
-            self.logger.error(f"Log compression failed for {filepath}: {e}")
-            return None
+    def _on_compressed(self, rotated_path: str, compressed_path: Optional[str]):
+        """Completion callback of background compression"""
+        if compressed_path:
+            self.logger.info(f"Log rotated and compressed: {rotated_path} -> {compressed_path}")
+        else:
+            self.logger.warning(f"Log rotated but compression failed: {rotated_path}")
 
     def _cleanup_old_logs(self):
         """Clean up old log files based on retention policy"""
@@ -243,6 +243,8 @@ class LogManager:
 
         for filename in os.listdir(session_log_dir):
             filepath = os.path.join(session_log_dir, filename)
+            if is_sidecar(filepath) or filename.endswith('.tmp'):
+                continue  # Sidecars live and die with their log file
 
             try:
                 stat = os.stat(filepath)
@@ -255,7 +257,7 @@ class LogManager:
                     continue
 
                 # Delete old non-critical files
-                os.remove(filepath)
+                remove_with_sidecar(filepath)
                 deleted_files.append(filename)
 
             except OSError as e:
@@ -269,6 +271,12 @@ class LogManager:
 
     def _contains_critical_events(self, filepath: str) -> bool:
         """Check if a log file contains critical events that should be preserved"""
+        # Indexed at write time: decide from the sidecar without reading the file
+        indexed = has_critical_events(filepath)
+        if indexed is not None:
+            return indexed
+
+        # Legacy file without sidecar - scan its head
         try:
             # For compressed files
             if filepath.endswith('.gz'):
@@ -401,6 +409,8 @@ class LogManager:
 
                 for filename in os.listdir(session_log_dir):
                     filepath = os.path.join(session_log_dir, filename)
+                    if is_sidecar(filepath):
+                        continue
 
                     try:
                         stat = os.stat(filepath)
@@ -432,6 +442,20 @@ class LogManager:
         """Extract critical events from a single log file"""
         events = []
 
+        # Indexed file: seek straight to the recorded offsets
+        if has_critical_events(filepath) is not None:
+            try:
+                for offset, line in iter_indexed_lines(filepath):
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    data['_source_offset'] = offset
+                    events.append(data)
+            except Exception as e:
+                self.logger.error(f"Error extracting events from {filepath}: {e}")
+            return events
+
         try:
             # Handle compressed files
             if filepath.endswith('.gz'):
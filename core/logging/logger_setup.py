@@ -8,10 +8,12 @@ import time
 import traceback
 from collections import deque
 from datetime import datetime, timezone
-from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener
 
 from pythonjsonlogger import jsonlogger
 
+from core.logging.critical_index import CriticalIndexingRotatingFileHandler
+
 # CRITICAL FIX (C-CONFIG-01): Handle lazy initialization from config
 try:
     from config import LOG_FILE, USE_STATUS_LINE, run_id, run_timestamp
@@ -394,7 +396,7 @@ def setup_logger(use_queue=True):
         log_queue = queue.Queue(maxsize=10000)  # Prevent memory exhaustion
 
         # Create actual file handler (will run in background thread)
-        rotating_handler = RotatingFileHandler(
+        rotating_handler = CriticalIndexingRotatingFileHandler(
             LOG_FILE, maxBytes=10_000_000, backupCount=5,
             encoding='utf-8', delay=True
         )
@@ -414,7 +416,7 @@ def setup_logger(use_queue=True):
         logger.addHandler(queue_handler)
     else:
         # Direct file handler (original behavior, may block)
-        rotating_handler = RotatingFileHandler(
+        rotating_handler = CriticalIndexingRotatingFileHandler(
             LOG_FILE, maxBytes=10_000_000, backupCount=5,
             encoding='utf-8', delay=True
         )
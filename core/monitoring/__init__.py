@@ -5,5 +5,22 @@ Provides metrics collection and export for trading bot observability.
 """
 
 from .metrics import MetricsCollector, get_metrics, init_metrics
+from .registry import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    WindowedCounter,
+    WindowedHistogram,
+    exponential_buckets,
+    get_registry,
+    linear_buckets,
+    signed_buckets,
+)
 
-__all__ = ['MetricsCollector', 'init_metrics', 'get_metrics']
+__all__ = [
+    'MetricsCollector', 'init_metrics', 'get_metrics',
+    'MetricsRegistry', 'get_registry', 'Counter', 'Gauge', 'Histogram',
+    'WindowedCounter', 'WindowedHistogram',
+    'linear_buckets', 'exponential_buckets', 'signed_buckets',
+]
@@ -7,6 +7,10 @@ Provides lightweight metrics collection with optional export to:
 - StatsD (via statsd client)
 - Local JSON files (always enabled)
 
+Local values live in the shared MetricsRegistry (core.monitoring.registry),
+so histogram summaries are computed from fixed buckets instead of growing
+lists of raw samples.
+
 This module tracks key trading metrics identified in the bug fixes:
 - Order execution metrics (sent, filled, failed, fill rate)
 - Intent lifecycle (pending, cleared, stale)
@@ -18,11 +22,22 @@ import json
 import logging
 import os
 import time
-from collections import defaultdict
 from typing import Any, Dict, Optional
 
+from .registry import DURATION_S_BUCKETS, LATENCY_MS_BUCKETS, MetricsRegistry, get_registry
+
 logger = logging.getLogger(__name__)
 
+# Metrics owned by the collector (name -> histogram bounds for histograms)
+COUNTER_NAMES = ('orders_sent', 'orders_filled', 'orders_failed', 'intents_cleared',
+                 'intents_stale', 'logging_timeouts', 'budget_refresh_timeouts')
+GAUGE_NAMES = ('fill_rate', 'intents_pending')
+HISTOGRAM_BOUNDS = {
+    'order_latency_ms': LATENCY_MS_BUCKETS,
+    'budget_refresh_ms': LATENCY_MS_BUCKETS,
+    'stale_intent_age_s': DURATION_S_BUCKETS,
+}
+
 # Optional dependencies
 try:
     from prometheus_client import Counter, Gauge, Histogram, Summary
@@ -46,7 +61,7 @@ class MetricsCollector:
 
     def __init__(self, session_dir: str, enable_prometheus: bool = False,
                  enable_statsd: bool = False, statsd_host: str = "localhost",
-                 statsd_port: int = 8125):
+                 statsd_port: int = 8125, registry: Optional[MetricsRegistry] = None):
         """
         Initialize metrics collector.
 
@@ -56,15 +71,14 @@ class MetricsCollector:
             enable_statsd: Enable StatsD metrics
             statsd_host: StatsD server host
             statsd_port: StatsD server port
+            registry: Metrics registry for local values (default: global registry)
         """
         self.session_dir = session_dir
         self.metrics_file = os.path.join(session_dir, "metrics", "summary.json")
         os.makedirs(os.path.dirname(self.metrics_file), exist_ok=True)
 
         # Local metrics storage
-        self.counters: Dict[str, int] = defaultdict(int)
-        self.gauges: Dict[str, float] = defaultdict(float)
-        self.histograms: Dict[str, list] = defaultdict(list)
+        self.registry = registry or get_registry()
 
         # Prometheus setup
         self.prometheus_enabled = enable_prometheus and PROMETHEUS_AVAILABLE
@@ -114,13 +128,30 @@ class MetricsCollector:
 
         logger.info("Prometheus metrics registered")
 
+    def _inc(self, name: str, amount: float = 1):
+        self.registry.counter(name).inc(amount)
+
+    def _set(self, name: str, value: float):
+        self.registry.gauge(name).set(value)
+
+    def _observe(self, name: str, value: float):
+        self.registry.histogram(name, HISTOGRAM_BOUNDS[name]).observe(value)
+
+    def counter_value(self, name: str) -> int:
+        """Current value of a collector counter"""
+        return int(self.registry.counter(name).value)
+
+    def gauge_value(self, name: str) -> float:
+        """Current value of a collector gauge"""
+        return self.registry.gauge(name).value
+
     # =========================================================================
     # Order Execution Metrics
     # =========================================================================
 
     def record_order_sent(self, symbol: str, side: str):
         """Record an order being sent to the exchange"""
-        self.counters['orders_sent'] += 1
+        self._inc('orders_sent')
         if self.prometheus_enabled:
             self.prom_orders_sent.inc()
         if self.statsd_enabled:
@@ -128,8 +159,8 @@ class MetricsCollector:
 
     def record_order_filled(self, symbol: str, side: str, latency_ms: float):
         """Record a successful order fill"""
-        self.counters['orders_filled'] += 1
-        self.histograms['order_latency_ms'].append(latency_ms)
+        self._inc('orders_filled')
+        self._observe('order_latency_ms', latency_ms)
 
         if self.prometheus_enabled:
             self.prom_orders_filled.inc()
@@ -144,7 +175,7 @@ class MetricsCollector:
 
     def record_order_failed(self, symbol: str, side: str, error_code: Optional[str] = None):
         """Record an order failure"""
-        self.counters['orders_failed'] += 1
+        self._inc('orders_failed')
 
         if self.prometheus_enabled:
             self.prom_orders_failed.inc()
@@ -157,12 +188,12 @@ class MetricsCollector:
 
     def _update_fill_rate(self):
         """Calculate and update fill rate metric"""
-        sent = self.counters['orders_sent']
-        filled = self.counters['orders_filled']
+        sent = self.counter_value('orders_sent')
+        filled = self.counter_value('orders_filled')
 
         if sent > 0:
             fill_rate = filled / sent
-            self.gauges['fill_rate'] = fill_rate
+            self._set('fill_rate', fill_rate)
 
             if self.prometheus_enabled:
                 self.prom_fill_rate.set(fill_rate)
@@ -176,7 +207,7 @@ class MetricsCollector:
 
     def record_intent_pending(self, count: int):
         """Update count of pending intents"""
-        self.gauges['intents_pending'] = count
+        self._set('intents_pending', count)
 
         if self.prometheus_enabled:
             self.prom_intents_pending.set(count)
@@ -186,7 +217,7 @@ class MetricsCollector:
 
     def record_intent_cleared(self, reason: str):
         """Record an intent being cleared"""
-        self.counters['intents_cleared'] += 1
+        self._inc('intents_cleared')
 
         if self.prometheus_enabled:
             self.prom_intents_cleared.inc()
@@ -196,8 +227,8 @@ class MetricsCollector:
 
     def record_stale_intent(self, age_seconds: float):
         """Record detection of a stale intent"""
-        self.counters['intents_stale'] += 1
-        self.histograms['stale_intent_age_s'].append(age_seconds)
+        self._inc('intents_stale')
+        self._observe('stale_intent_age_s', age_seconds)
 
         if self.prometheus_enabled:
             self.prom_intents_stale.inc()
@@ -211,7 +242,9 @@ class MetricsCollector:
 
     def record_budget_refresh(self, duration_ms: float, timed_out: bool = False):
         """Record budget refresh performance"""
-        self.histograms['budget_refresh_ms'].append(duration_ms)
+        self._observe('budget_refresh_ms', duration_ms)
+        if timed_out:
+            self._inc('budget_refresh_timeouts')
 
         if self.prometheus_enabled:
             self.prom_budget_refresh_duration.observe(duration_ms / 1000.0)
@@ -225,7 +258,7 @@ class MetricsCollector:
 
     def record_logging_timeout(self):
         """Record a logging formatter timeout"""
-        self.counters['logging_timeouts'] += 1
+        self._inc('logging_timeouts')
 
         if self.prometheus_enabled:
             self.prom_logging_timeouts.inc()
@@ -241,19 +274,26 @@ class MetricsCollector:
         """Get current metrics summary"""
         return {
             'timestamp': time.time(),
-            'counters': dict(self.counters),
-            'gauges': dict(self.gauges),
+            'counters': {name: self.counter_value(name) for name in COUNTER_NAMES},
+            'gauges': {name: self.gauge_value(name) for name in GAUGE_NAMES},
             'histograms': {
-                key: {
-                    'count': len(values),
-                    'min': min(values) if values else 0,
-                    'max': max(values) if values else 0,
-                    'avg': sum(values) / len(values) if values else 0
-                }
-                for key, values in self.histograms.items()
+                name: self._histogram_summary(name) for name in HISTOGRAM_BOUNDS
             }
         }
 
+    def _histogram_summary(self, name: str) -> Dict[str, float]:
+        hist = self.registry.histogram(name, HISTOGRAM_BOUNDS[name])
+        if hist.count == 0:
+            return {'count': 0, 'min': 0, 'max': 0, 'avg': 0}
+        return {
+            'count': hist.count,
+            'min': hist.min,
+            'max': hist.max,
+            'avg': hist.mean,
+            'p50': hist.quantile(0.5),
+            'p95': hist.quantile(0.95)
+        }
+
     def export_json(self):
         """Export metrics to local JSON file"""
         try:
@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Metrics Registry - Unified Low-Overhead Counters, Gauges and Histograms
+
+Single in-process home for the bot's metrics. MetricsCollector, the FSM phase
+metrics, the heartbeat RollingStats and the FillTracker all report through
+one MetricsRegistry instead of keeping their own dicts, lists and deques.
+
+Key Features:
+- Counter / Gauge: one float and an uncontended per-metric lock
+- Histogram: fixed bucket bounds (linear, exponential or signed log-scale),
+  exact count/sum/min/max, quantiles estimated from buckets
+- WindowedHistogram / WindowedCounter: time-sliced rings of the above, kept
+  incrementally; a window query merges at most window_s/slot_s slots
+- Statistics queries are O(slots * buckets), independent of how many
+  observations were recorded
+- Labelled families with a prometheus-style .labels(**kwargs) API
+
+Usage:
+    from core.monitoring import get_registry
+
+    registry = get_registry()
+    registry.counter("orders_sent").inc()
+    latency = registry.histogram("order_latency_ms", bounds=exponential_buckets(1, 1.25, 50))
+    latency.observe(42.0)
+    latency.quantile(0.95)
+
+    window = registry.windowed_histogram("api_latency_ms", window_s=3600, slot_s=10)
+    window.observe(12.5)
+    window.stats(600)   # count/mean/std/min/max/median/p90/p95 of the last 10 minutes
+"""
+
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# ---------------------------------------------------------------------------
+# Bucket layouts
+# ---------------------------------------------------------------------------
+
+
+def linear_buckets(start: float, width: float, count: int) -> Tuple[float, ...]:
+    """Upper bounds start, start+width, ... (count bounds)"""
+    return tuple(start + width * i for i in range(count))
+
+
+def exponential_buckets(start: float, factor: float, count: int) -> Tuple[float, ...]:
+    """Upper bounds start, start*factor, ... (count bounds, HDR-style relative precision)"""
+    if start <= 0 or factor <= 1:
+        raise ValueError("exponential_buckets requires start > 0 and factor > 1")
+    return tuple(start * factor ** i for i in range(count))
+
+
+def signed_buckets(positive_bounds: Sequence[float]) -> Tuple[float, ...]:
+    """Mirror positive bounds around zero for metrics that can be negative (e.g. slippage)"""
+    positive = sorted(b for b in positive_bounds if b > 0)
+    return tuple([-b for b in reversed(positive)] + [0.0] + positive)
+
+
+# Default layouts used across the bot
+LATENCY_MS_BUCKETS = exponential_buckets(0.5, 1.25, 60)          # 0.5ms .. ~340s
+DURATION_S_BUCKETS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+BPS_BUCKETS = signed_buckets(exponential_buckets(0.25, 1.4, 28))  # +-0.25bp .. +-2800bp
+DEFAULT_BUCKETS = signed_buckets(exponential_buckets(0.001, 1.5, 50))
+
+
+# ---------------------------------------------------------------------------
+# Metric types
+# ---------------------------------------------------------------------------
+
+class Counter:
+    """Monotonic counter"""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counter can only increase")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._value = 0.0
+
+    def snapshot(self) -> float:
+        return self._value
+
+
+class Gauge:
+    """Value that can go up and down"""
+
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def reset(self) -> None:
+        self._value = 0.0
+
+    def snapshot(self) -> float:
+        return self._value
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram.
+
+    bounds are bucket upper bounds (inclusive); one overflow bucket catches
+    everything above the last bound. count/sum/sum of squares/min/max are
+    exact, quantiles are interpolated within the matching bucket and clamped
+    to the observed min/max.
+    """
+
+    __slots__ = ("bounds", "_counts", "count", "sum", "sum_sq", "min", "max", "_lock")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(bounds))
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self._counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        idx = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self._counts[idx] += 1
+            self.count += 1
+            self.sum += value
+            self.sum_sq += value * value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def merge(self, other: "Histogram") -> None:
+        """Add another histogram with identical bounds into this one"""
+        if other.bounds != self.bounds:
+            raise ValueError("Cannot merge histograms with different bounds")
+        if other.count == 0:
+            return
+        with self._lock:
+            for i, c in enumerate(other._counts):
+                if c:
+                    self._counts[i] += c
+            self.count += other.count
+            self.sum += other.sum
+            self.sum_sq += other.sum_sq
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._clear()
+
+    @property
+    def bucket_counts(self) -> List[int]:
+        return list(self._counts)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (0 for fewer than two observations)"""
+        if self.count < 2:
+            return 0.0
+        variance = (self.sum_sq - self.sum * self.sum / self.count) / (self.count - 1)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile (0..1) from bucket counts.
+
+        Returns:
+            Estimated value, 0.0 for an empty histogram
+        """
+        if self.count == 0:
+            return 0.0
+        q = min(max(q, 0.0), 1.0)
+        rank = q * self.count
+        cumulative = 0
+        for idx, c in enumerate(self._counts):
+            if c == 0:
+                continue
+            if cumulative + c >= rank:
+                lower = self.bounds[idx - 1] if idx > 0 else self.min
+                upper = self.bounds[idx] if idx < len(self.bounds) else self.max
+                lower = max(lower, self.min)
+                upper = min(upper, self.max)
+                fraction = (rank - cumulative) / c
+                return lower + (upper - lower) * fraction
+            cumulative += c
+        return self.max
+
+    def stats(self) -> Dict[str, float]:
+        """count/sum/mean/std/min/max/median/p90/p95/p99 ({"count": 0} if empty)"""
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.min,
+            "max": self.max,
+            "median": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+    def snapshot(self) -> Dict[str, float]:
+        return self.stats()
+
+
+class _Slotted(ABC):
+    """Shared slot-ring bookkeeping of the windowed metrics"""
+
+    def __init__(self, window_s: float, slot_s: float, clock: Callable[[], float]):
+        if slot_s <= 0 or window_s < slot_s:
+            raise ValueError("window_s must be >= slot_s > 0")
+        self.window_s = window_s
+        self.slot_s = slot_s
+        self._clock = clock
+        self._max_slots = int(math.ceil(window_s / slot_s)) + 1
+        self._slots: "OrderedDict[int, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_slot(self):
+        """Create an empty slot object"""
+
+    def _slot_for(self, timestamp: Optional[float]):
+        """Return the slot object for timestamp (caller holds the lock)"""
+        ts = self._clock() if timestamp is None else timestamp
+        key = int(ts // self.slot_s)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._new_slot()
+            self._slots[key] = slot
+            # Evict expired slots (ordered by insertion, mostly chronological)
+            oldest_allowed = int(self._clock() // self.slot_s) - self._max_slots
+            while self._slots:
+                first = next(iter(self._slots))
+                if first >= oldest_allowed:
+                    break
+                self._slots.popitem(last=False)
+        return slot
+
+    def _slots_within(self, seconds: Optional[float]) -> List[Any]:
+        """Slots overlapping the last `seconds` (None = whole retention)"""
+        seconds = self.window_s if seconds is None else min(seconds, self.window_s)
+        cutoff = int((self._clock() - seconds) // self.slot_s)
+        with self._lock:
+            return [slot for key, slot in self._slots.items() if key >= cutoff]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._slots.clear()
+
+
+class WindowedHistogram(_Slotted):
+    """
+    Histogram over a sliding time window.
+
+    Observations land in per-slot histograms (slot_s wide); queries merge the
+    slots overlapping the requested window, so results have slot granularity.
+    """
+
+    def __init__(
+        self,
+        window_s: float = 3600.0,
+        slot_s: float = 10.0,
+        bounds: Sequence[float] = DEFAULT_BUCKETS,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(window_s, slot_s, clock)
+        self.bounds = tuple(sorted(bounds))
+
+    def _new_slot(self) -> Histogram:
+        return Histogram(self.bounds)
+
+    def observe(self, value: float, timestamp: Optional[float] = None) -> None:
+        with self._lock:
+            slot = self._slot_for(timestamp)
+        slot.observe(value)
+
+    def window(self, seconds: Optional[float] = None) -> Histogram:
+        """Merged histogram of the last `seconds` (None = whole window)"""
+        merged = Histogram(self.bounds)
+        for slot in self._slots_within(seconds):
+            merged.merge(slot)
+        return merged
+
+    def count(self, seconds: Optional[float] = None) -> int:
+        return sum(slot.count for slot in self._slots_within(seconds))
+
+    def stats(self, seconds: Optional[float] = None) -> Dict[str, float]:
+        return self.window(seconds).stats()
+
+    def snapshot(self) -> Dict[str, float]:
+        return self.stats()
+
+
+class WindowedCounter(_Slotted):
+    """
+    Keyed event counts over a sliding time window.
+
+    inc("full_fill") / inc("buy") ... ; counts(300) returns the per-key totals
+    of the last 5 minutes.
+    """
+
+    def __init__(self, window_s: float = 3600.0, slot_s: float = 10.0, clock: Callable[[], float] = time.time):
+        super().__init__(window_s, slot_s, clock)
+
+    def _new_slot(self) -> Dict[str, float]:
+        return {}
+
+    def inc(self, key: str = "total", amount: float = 1.0, timestamp: Optional[float] = None) -> None:
+        with self._lock:
+            slot = self._slot_for(timestamp)
+            slot[key] = slot.get(key, 0) + amount
+
+    def counts(self, seconds: Optional[float] = None) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        slots = self._slots_within(seconds)
+        with self._lock:
+            for slot in slots:
+                for key, value in slot.items():
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def total(self, key: str = "total", seconds: Optional[float] = None) -> float:
+        return self.counts(seconds).get(key, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        return self.counts()
+
+
+# ---------------------------------------------------------------------------
+# Labelled families and registry
+# ---------------------------------------------------------------------------
+
+class MetricFamily:
+    """Metric with label dimensions (prometheus-style .labels(**kwargs))"""
+
+    def __init__(self, name: str, labelnames: Sequence[str], factory: Callable[[], Any]):
+        self.name = name
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **kwargs):
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    def children(self) -> Dict[Tuple[str, ...], Any]:
+        with self._lock:
+            return dict(self._children)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._children.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            ",".join(f"{n}={v}" for n, v in zip(self.labelnames, key)): child.snapshot()
+            for key, child in self.children().items()
+        }
+
+
+class MetricsRegistry:
+    """
+    Get-or-create registry of named metrics.
+
+    Asking twice for the same name returns the same object; asking for an
+    existing name with a different metric type raises ValueError.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def _get_or_create(self, name: str, kind: type, factory: Callable[[], Any], labelnames: Optional[Sequence[str]]):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = MetricFamily(name, labelnames, factory) if labelnames else factory()
+                    self._metrics[name] = metric
+        expected = MetricFamily if labelnames else kind
+        if not isinstance(metric, expected):
+            raise ValueError(f"Metric {name} already registered as {type(metric).__name__}")
+        return metric
+
+    def counter(self, name: str, labelnames: Optional[Sequence[str]] = None):
+        return self._get_or_create(name, Counter, Counter, labelnames)
+
+    def gauge(self, name: str, labelnames: Optional[Sequence[str]] = None):
+        return self._get_or_create(name, Gauge, Gauge, labelnames)
+
+    def histogram(self, name: str, bounds: Sequence[float] = DEFAULT_BUCKETS,
+                  labelnames: Optional[Sequence[str]] = None):
+        return self._get_or_create(name, Histogram, lambda: Histogram(bounds), labelnames)
+
+    def windowed_histogram(self, name: str, window_s: float = 3600.0, slot_s: float = 10.0,
+                           bounds: Sequence[float] = DEFAULT_BUCKETS,
+                           labelnames: Optional[Sequence[str]] = None):
+        factory = lambda: WindowedHistogram(window_s, slot_s, bounds, clock=self._clock)  # noqa: E731
+        return self._get_or_create(name, WindowedHistogram, factory, labelnames)
+
+    def windowed_counter(self, name: str, window_s: float = 3600.0, slot_s: float = 10.0,
+                         labelnames: Optional[Sequence[str]] = None):
+        factory = lambda: WindowedCounter(window_s, slot_s, clock=self._clock)  # noqa: E731
+        return self._get_or_create(name, WindowedCounter, factory, labelnames)
+
+    def get(self, name: str) -> Optional[Any]:
+        return self._metrics.get(name)
+
+    def names(self, prefix: str = "") -> List[str]:
+        with self._lock:
+            return sorted(n for n in self._metrics if n.startswith(prefix))
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def unregister_prefix(self, prefix: str) -> None:
+        """Drop all metrics whose name starts with prefix (owner-scoped cleanup)"""
+        with self._lock:
+            for name in [n for n in self._metrics if n.startswith(prefix)]:
+                del self._metrics[name]
+
+    def snapshot(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Plain-dict view of the given metrics (all if None)"""
+        with self._lock:
+            items = [(n, self._metrics[n]) for n in (names or list(self._metrics)) if n in self._metrics]
+        return {name: metric.snapshot() for name, metric in items}
+
+
+# Global registry
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+def reset_registry() -> None:
+    """Reset the global registry (for testing)"""
+    global _registry
+    with _registry_lock:
+        _registry = None
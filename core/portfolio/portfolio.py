@@ -1,13 +1,15 @@
 # portfolio.py - Portfolio und State Management
+import copy
 import functools
-import json
 import os
 import threading
 import time
+import weakref
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 # =================================================================================
 # Position Data Model
@@ -46,6 +48,38 @@ class Position:
     meta: dict = field(default_factory=dict)
 
 
+@dataclass
+class PortfolioTransaction:
+    """
+    Offene Batch-Transaktion von PortfolioManager.transaction().
+
+    Hält den Zustand berührter Symbole vor ihrer ersten Änderung (Rollback)
+    und die bis zum Commit zurückgestellten Seiteneffekte.
+    """
+    my_budget: float
+    reserved_budget: float
+    # symbol -> (position, held_asset, reserved_quote, reserved_base, reservation)
+    undo: Dict[str, tuple] = field(default_factory=dict)
+    events: List[dict] = field(default_factory=list)
+    ledger: List[Tuple[str, dict]] = field(default_factory=list)
+    persist: bool = False
+    flush: bool = False
+    full_diff: bool = False  # save_state() ohne markierte Keys in der Transaktion
+    sync_budget: bool = False
+    fills: int = 0
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.undo)
+
+
+def _restore(mapping: dict, key: str, value) -> None:
+    if value is None:
+        mapping.pop(key, None)
+    else:
+        mapping[key] = value
+
+
 # =================================================================================
 # Thread Safety Decorator
 # =================================================================================
@@ -89,10 +123,25 @@ from config import (
 )
 from core.logging.logger_setup import logger
 from core.logging.loggingx import log_audit_event, log_event
+from core.portfolio.position_book import PositionBook, Valuation
+from core.portfolio.state_journal import PortfolioStateJournal
+from core.state_store import StoreSections, get_state_store
 from core.utils import SettlementManager, load_state, save_state_safe
 from trading import full_portfolio_reset, refresh_budget_from_exchange_safe
 from trading.helpers import _base_currency, _get_free
 
+# Lebende PortfolioManager: die Legacy-Helfer in trading/ bekommen nur das
+# held_assets-Dict und schreiben über den Besitzer, damit die Aggregate stimmen
+_managers: "weakref.WeakSet[PortfolioManager]" = weakref.WeakSet()
+
+
+def portfolio_owning(held_assets: Dict) -> Optional["PortfolioManager"]:
+    """PortfolioManager, dem das übergebene held_assets-Dict gehört (sonst None)"""
+    for manager in list(_managers):
+        if manager.held_assets is held_assets:
+            return manager
+    return None
+
 
 class DustLedger:
     """Kleinstmengen sammeln und bei Erreichen der Börsen-Minima verkaufen."""
@@ -233,20 +282,16 @@ class PortfolioManager:
         self._lock = threading.RLock()  # Main portfolio lock
         self._budget_lock = threading.RLock()  # Dedicated budget operations lock
         self._state_lock = threading.RLock()  # State persistence lock
+        self._exposure_lock = threading.RLock()  # Exposure aggregates (leaf lock)
 
         # State
         self.held_assets: Dict[str, Dict] = {}
         self.open_buy_orders: Dict[str, Dict] = {}
         self.my_budget: float = 0.0
+        _managers.add(self)
 
-        # Drop Anchors
+        # Drop Anchors (geladen in load_state)
         self.drop_anchors = {}
-        try:
-            if os.path.exists(DROP_ANCHORS_FILE):
-                with open(DROP_ANCHORS_FILE, "r", encoding="utf-8") as fh:
-                    self.drop_anchors = json.load(fh) or {}
-        except Exception:
-            self.drop_anchors = {}
 
         # Cooldown tracking
         self.last_buy_time: Dict[str, float] = {}
@@ -266,9 +311,40 @@ class PortfolioManager:
         # Position Lifecycle & PnL Management (NEW - Reconciliation System)
         self.positions: Dict[str, Position] = {}  # symbol -> Position
         self.last_prices: Dict[str, float] = {}  # symbol -> last_price for marking
+        self.position_book = PositionBook()  # qty/avg/last als Arrays für Bulk-Bewertung
         self.fee_rate: float = getattr(__import__('config'), 'TAKER_FEE_RATE', 0.001)
         self.events: List[dict] = []  # Position events for audit trail
 
+        # Exposure aggregates for risk checks: symbol -> (exposure_usdt, counted in total)
+        # Total covers held symbols only (same scope as RiskLimitChecker)
+        self._exposure: Dict[str, Tuple[float, bool]] = {}
+        self._exposure_total: float = 0.0
+
+        # Offene Batch-Transaktion (nur für den Thread, der _lock hält)
+        self._tx: Optional[PortfolioTransaction] = None
+        self._tx_thread: Optional[int] = None
+
+        # State-Persistenz: Unified State Store (ein Commit pro Engine-Zyklus) oder
+        # Snapshot + Journal geänderter Keys (Hintergrund-Thread)
+        _cfg = __import__('config')
+        _sections = {"held": STATE_FILE_HELD, "open_buys": STATE_FILE_OPEN_BUYS, "anchors": DROP_ANCHORS_FILE}
+        self._state_journal: Optional[PortfolioStateJournal] = None
+        store = get_state_store()
+        if store is not None:
+            self._state_journal = StoreSections(store, _sections)
+        elif getattr(_cfg, 'PORTFOLIO_STATE_JOURNAL', True):
+            self._state_journal = PortfolioStateJournal(
+                _sections,
+                os.path.join(os.path.dirname(STATE_FILE_HELD), "portfolio_state.journal"),
+                interval_s=getattr(_cfg, 'PORTFOLIO_STATE_FLUSH_INTERVAL_S', 0.5),
+                compact_records=getattr(_cfg, 'PORTFOLIO_STATE_COMPACT_RECORDS', 2000),
+                fsync=getattr(_cfg, 'PORTFOLIO_STATE_FSYNC', False),
+            )
+
+        # Seit dem letzten save_state() geänderte Keys je Sektion (von den Mutatoren markiert)
+        self._dirty_keys: Dict[str, Set[str]] = {section: set() for section in _sections}
+        self._dirty_lock = threading.Lock()
+
         # Initialize state (includes dust ledger)
         self.load_state()
 
@@ -276,8 +352,16 @@ class PortfolioManager:
         self.initialize_budget()
 
     def load_state(self):
-        """Lädt gespeicherten State von Disk (mit Spezialkeys)"""
-        state = load_state(STATE_FILE_HELD) or {}
+        """Lädt gespeicherten State von Disk (mit Spezialkeys, Journal-Tail wird nachgespielt)"""
+        if self._state_journal is not None:
+            sections = self._state_journal.load()
+            state = sections["held"]
+            open_buy_orders = sections["open_buys"]
+            self.drop_anchors = sections["anchors"]
+        else:
+            state = load_state(STATE_FILE_HELD) or {}
+            open_buy_orders = load_state(STATE_FILE_OPEN_BUYS)
+            self.drop_anchors = load_state(DROP_ANCHORS_FILE) or {}
         dust_ledger = state.pop("__dust_ledger__", None)
         lbt = state.pop("__last_buy_time__", {}) or {}
         self.held_assets = state
@@ -286,16 +370,39 @@ class PortfolioManager:
             self.last_buy_time = {s: float(ts) for s, ts in lbt.items()}
         except Exception:
             self.last_buy_time = {}
-        self.open_buy_orders = load_state(STATE_FILE_OPEN_BUYS)
+        self.open_buy_orders = open_buy_orders
         # Dust-Ledger Instanz aktualisieren (falls du self.dust verwendest)
         try:
             self.dust = DustLedger(dust_ledger)
         except Exception:
             self.dust = DustLedger()
+        self._rebuild_exposure()
+
+    def _mark_dirty(self, section: str, key: str) -> None:
+        """Markiert einen Key einer State-Sektion als geändert (für save_state(dirty_only=True))"""
+        with self._dirty_lock:
+            self._dirty_keys[section].add(key)
 
     @synchronized('_state_lock')
-    def save_state(self):
-        """Speichert aktuellen State auf Disk (inkl. Spezialkeys)"""
+    def save_state(self, flush: bool = False, dirty_only: bool = False):
+        """
+        Speichert aktuellen State (inkl. Spezialkeys).
+
+        Mit Journal werden nur geänderte Keys übergeben und im Hintergrund
+        gebündelt geschrieben; flush=True schreibt sie sofort ins Journal.
+        dirty_only=True vergleicht nur die per _mark_dirty() markierten Keys
+        (plus Spezialkeys); ohne werden alle Keys verglichen - Fallback für
+        Aufrufer, die held_assets & Co. direkt verändern.
+        In einer Transaktion wird einmal beim Commit gespeichert.
+        """
+        tx = self._active_tx()
+        if tx is not None:
+            tx.persist = True
+            tx.flush = tx.flush or flush
+            tx.full_diff = tx.full_diff or not dirty_only
+            return
+        with self._dirty_lock:
+            dirty, self._dirty_keys = self._dirty_keys, {section: set() for section in self._dirty_keys}
         held_with_meta = dict(self.held_assets or {})
         # Dust-Ledger anhängen
         try:
@@ -307,6 +414,16 @@ class PortfolioManager:
             held_with_meta["__last_buy_time__"] = {s: int(ts) for s, ts in (self.last_buy_time or {}).items()}
         except Exception:
             pass
+        if self._state_journal is not None:
+            if dirty_only:
+                dirty["held"].update(("__dust_ledger__", "__last_buy_time__"))
+            sections = {"held": held_with_meta, "open_buys": self.open_buy_orders or {},
+                        "anchors": self.drop_anchors or {}}
+            for section, entries in sections.items():
+                self._state_journal.stage(section, entries, keys=dirty[section] if dirty_only else None)
+            if flush:
+                self._state_journal.flush()
+            return
         save_state_safe(held_with_meta, STATE_FILE_HELD)
         save_state_safe(self.open_buy_orders, STATE_FILE_OPEN_BUYS)
         # NEU: Drop-Anker separat persistieren
@@ -315,6 +432,12 @@ class PortfolioManager:
         except Exception:
             pass
 
+    def close_state(self):
+        """Schreibt ausstehende Änderungen, kompaktiert das Journal und stoppt den Writer"""
+        self.save_state()
+        if self._state_journal is not None:
+            self._state_journal.close()
+
     def initialize_budget(self):
         """Initialisiert Budget von Exchange"""
         if self.exchange:
@@ -400,6 +523,7 @@ class PortfolioManager:
             for symbol in assets_to_prune:
                 if symbol in self.held_assets:
                     del self.held_assets[symbol]
+                    self._refresh_exposure(symbol)
 
             logger.info(f"Sanity-Check abgeschlossen. Stats: {reconciliation_stats}",
                        extra={'event_type': 'STATE_SANITY_CHECK_COMPLETE', **reconciliation_stats})
@@ -466,6 +590,7 @@ class PortfolioManager:
             # State clearen - IMMER nach Reset
             self.held_assets.clear()
             self.open_buy_orders.clear()
+            self._rebuild_exposure()
             self.save_state()
 
             # Finale Sanity-Check zur Sicherheit
@@ -607,13 +732,17 @@ class PortfolioManager:
     def add_buy_order(self, symbol: str, order_data: Dict):
         """Fügt neue Buy-Order hinzu"""
         self.open_buy_orders[symbol] = order_data
-        self.save_state()
+        self._refresh_exposure(symbol)
+        self._mark_dirty("open_buys", symbol)
+        self.save_state(dirty_only=True)
 
     def remove_buy_order(self, symbol: str) -> Optional[Dict]:
         """Entfernt Buy-Order und gibt sie zurück"""
         if symbol in self.open_buy_orders:
             order = self.open_buy_orders.pop(symbol)
-            self.save_state()
+            self._refresh_exposure(symbol)
+            self._mark_dirty("open_buys", symbol)
+            self.save_state(dirty_only=True)
             return order
         return None
 
@@ -623,6 +752,7 @@ class PortfolioManager:
 
         Phase 5: Tracks first_fill_ts for accurate TTL calculation.
         """
+        self._tx_touch(symbol)
         data = dict(asset_data)
         # Stelle sicher dass beide Felder existieren
         if 'buy_price' not in data and 'buying_price' in data:
@@ -660,7 +790,9 @@ class PortfolioManager:
             data["buy_fee_quote_per_unit"] = wac_fee
 
         self.held_assets[symbol] = data
-        self.save_state()
+        self._refresh_exposure(symbol)
+        self._mark_dirty("held", symbol)
+        self.save_state(dirty_only=True)
 
     def on_partial_fill(self, symbol: str, client_order_id: str,
                         filled_quote: float, orig_quote: float):
@@ -688,6 +820,7 @@ class PortfolioManager:
 
             if release > 0:
                 self.reserved_quote[symbol] = max(0.0, reserved - release)
+                self._refresh_exposure(symbol)
                 self.my_budget += release  # Return to available budget
                 need_save = True
 
@@ -701,7 +834,7 @@ class PortfolioManager:
 
         # CRITICAL: Persist state OUTSIDE budget lock to prevent lock hierarchy violation
         if need_save:
-            self.save_state()
+            self.save_state(dirty_only=True)
 
     @synchronized_budget
     def reserve_budget(self, quote_amount: float, symbol: str | None = None, order_info: Dict = None):
@@ -734,6 +867,7 @@ class PortfolioManager:
                 'order_info': order_info or {}
             })
             self.active_reservations[symbol] = reservation
+            self._refresh_exposure(symbol)
 
         log_event("BUDGET_RESERVED", context={
             "reserved": float(quote_amount),
@@ -758,6 +892,7 @@ class PortfolioManager:
             symbol: Optional - Symbol für das Budget freigegeben wird
             reason: Grund für die Freigabe (für Audit Trail)
         """
+        self._tx_touch(symbol)
         self.reserved_budget = max(0.0, self.reserved_budget - quote_amount)
         if symbol and symbol in self.reserved_quote:
             self.reserved_quote[symbol] = max(0.0, self.reserved_quote[symbol] - quote_amount)
@@ -774,6 +909,7 @@ class PortfolioManager:
                     reservation['amount'] = remaining
                     reservation['timestamp'] = time.time()
                     self.active_reservations[symbol] = reservation
+            self._refresh_exposure(symbol)
 
         context = {
             "released": float(quote_amount),
@@ -785,7 +921,7 @@ class PortfolioManager:
         if intent_id:
             context["intent_id"] = intent_id
 
-        log_event("BUDGET_RELEASED", context=context)
+        self._ledger_event("BUDGET_RELEASED", context)
 
     @synchronized_budget
     def set_budget(self, amount: float, reason: str = "manual_set"):
@@ -855,6 +991,7 @@ class PortfolioManager:
             symbol: Optional - Symbol für das Budget committed wird
             order_id: Optional - Order ID für Audit Trail
         """
+        self._tx_touch(symbol)
         self.reserved_budget = max(0.0, self.reserved_budget - quote_amount)
         self.my_budget = max(0.0, self.my_budget - quote_amount)
         if symbol and symbol in self.reserved_quote:
@@ -872,6 +1009,7 @@ class PortfolioManager:
                     reservation['amount'] = remaining
                     reservation['timestamp'] = time.time()
                     self.active_reservations[symbol] = reservation
+            self._refresh_exposure(symbol)
 
         commit_context = {
             "committed": float(quote_amount),
@@ -883,7 +1021,7 @@ class PortfolioManager:
         if intent_id:
             commit_context["intent_id"] = intent_id
 
-        log_event("BUDGET_COMMITTED", context=commit_context)
+        self._ledger_event("BUDGET_COMMITTED", commit_context)
 
     @synchronized('_budget_lock')
     def get_free_usdt(self) -> float:
@@ -1110,8 +1248,11 @@ class PortfolioManager:
     def remove_held_asset(self, symbol: str) -> Optional[Dict]:
         """Entfernt gehaltenes Asset und gibt es zurück"""
         if symbol in self.held_assets:
+            self._tx_touch(symbol)
             asset = self.held_assets.pop(symbol)
-            self.save_state()
+            self._refresh_exposure(symbol)
+            self._mark_dirty("held", symbol)
+            self.save_state(dirty_only=True)
             return asset
         return None
 
@@ -1146,7 +1287,8 @@ class PortfolioManager:
                 logger.debug(f"Failed to log anchor_update for {symbol}: {e}")
 
         self.drop_anchors[symbol] = {"price": new_anchor, "ts": ts_iso}
-        self.save_state()
+        self._mark_dirty("anchors", symbol)
+        self.save_state(dirty_only=True)
 
     @synchronized()
     def get_drop_anchor(self, symbol: str) -> float:
@@ -1175,7 +1317,9 @@ class PortfolioManager:
             if 'buy_price' in u and 'buying_price' not in u:
                 u['buying_price'] = u['buy_price']
             self.held_assets[symbol].update(u)
-            self.save_state()
+            self._refresh_exposure(symbol)
+            self._mark_dirty("held", symbol)
+            self.save_state(dirty_only=True)
 
     def get_portfolio_value(self, preise: Dict[str, float]) -> float:
         """Berechnet Gesamtwert des Portfolios"""
@@ -1201,13 +1345,22 @@ class PortfolioManager:
         return symbol in self.open_buy_orders
 
     def get_symbol_exposure_usdt(self, symbol: str) -> float:
-        """Berechnet die gesamte Exposition für ein Symbol in USDT.
+        """Gesamte Exposition für ein Symbol in USDT (inkrementell gepflegt, O(1)).
 
         Inkludiert:
         - Gehaltene Assets (amount * buy_price)
         - Reserviertes Budget für das Symbol
         - Offene Buy-Orders für das Symbol
         """
+        entry = self._exposure.get(symbol)
+        return entry[0] if entry else 0.0
+
+    def get_total_exposure_usdt(self) -> float:
+        """Summe der Exposition aller gehaltenen Symbole in USDT (O(1))"""
+        return self._exposure_total
+
+    def _compute_symbol_exposure(self, symbol: str) -> float:
+        """Berechnet die Exposition eines Symbols vollständig aus held/reserved/open-buy"""
         # Gehaltene Position
         held = self.held_assets.get(symbol) or {}
         amt = float(held.get("amount", 0.0))
@@ -1223,6 +1376,67 @@ class PortfolioManager:
 
         return held_cost + reserved + pending
 
+    def _refresh_exposure(self, symbol: Optional[str]) -> None:
+        """Aktualisiert die Aggregate nach einer Mutation von symbol (O(1))"""
+        if not symbol:
+            return
+        value = self._compute_symbol_exposure(symbol)
+        counted = symbol in self.held_assets
+        with self._exposure_lock:
+            old_value, old_counted = self._exposure.pop(symbol, (0.0, False))
+            self._exposure_total += (value if counted else 0.0) - (old_value if old_counted else 0.0)
+            if value or counted:
+                self._exposure[symbol] = (value, counted)
+
+    def _rebuild_exposure(self) -> None:
+        """Baut die Aggregate komplett neu auf (Startup, Reset, Drift-Reparatur)"""
+        symbols = set(self.held_assets) | set(self.reserved_quote) | set(self.open_buy_orders)
+        exposure = {}
+        for symbol in symbols:
+            value = self._compute_symbol_exposure(symbol)
+            counted = symbol in self.held_assets
+            if value or counted:
+                exposure[symbol] = (value, counted)
+        with self._exposure_lock:
+            self._exposure = exposure
+            self._exposure_total = sum(value for value, counted in exposure.values() if counted)
+
+    def verify_exposure_aggregates(self, tolerance: float = 1e-6) -> bool:
+        """
+        Prüft die inkrementellen Aggregate gegen einen vollständigen Rescan.
+
+        Bei Abweichung (z.B. direkte Mutation von held_assets außerhalb der
+        Portfolio-API) wird EXPOSURE_AGGREGATE_DRIFT geloggt und neu aufgebaut.
+
+        Returns:
+            True wenn konsistent
+        """
+        with self._exposure_lock:
+            cached = dict(self._exposure)
+            cached_total = self._exposure_total
+        symbols = set(cached) | set(self.held_assets) | set(self.reserved_quote) | set(self.open_buy_orders)
+        drifted = {}
+        expected_total = 0.0
+        for symbol in symbols:
+            value = self._compute_symbol_exposure(symbol)
+            if symbol in self.held_assets:
+                expected_total += value
+            cached_value = cached.get(symbol, (0.0, False))[0]
+            if abs(cached_value - value) > tolerance * max(1.0, abs(value)):
+                drifted[symbol] = {"cached": cached_value, "actual": value}
+
+        if not drifted and abs(cached_total - expected_total) <= tolerance * max(1.0, abs(expected_total)):
+            return True
+
+        logger.warning(
+            f"Exposure aggregates drifted: total {cached_total:.4f} vs {expected_total:.4f} USDT, "
+            f"{len(drifted)} symbols",
+            extra={'event_type': 'EXPOSURE_AGGREGATE_DRIFT', 'cached_total': cached_total,
+                   'actual_total': expected_total, 'symbols': drifted}
+        )
+        self._rebuild_exposure()
+        return False
+
     # ==================================================================================
     # OrderRouter Integration - Reserve/Release/Reconcile API
     # ==================================================================================
@@ -1368,12 +1582,20 @@ class PortfolioManager:
 
         Returns:
             Summary dict with qty_delta, notional, fees, state
+
+        Inside transaction() errors are raised (the batch is rolled back)
+        and persistence, ledger writes and events are deferred to commit.
         """
+        tx = self._active_tx()
         try:
             if not trades:
                 logger.warning(f"apply_fills called with no trades for {symbol}")
                 return {}
 
+            if tx is not None:
+                self._tx_touch(symbol)
+                tx.fills += len(trades)
+
             # Get or create position
             pos = self.positions.get(symbol)
             if pos is None:
@@ -1449,6 +1671,7 @@ class PortfolioManager:
                 pos.state = "OPEN"
             elif pos.state == "OPEN" and self._is_reducing(trades):
                 pos.state = "PARTIAL_EXIT"
+            self.position_book.set_position(symbol, pos.qty, pos.avg_price)
 
             # CRITICAL FIX (C-PORT-03): Partial fill budget leak fixed
             # Only commit what was actually spent (cost + fees), not the full reservation
@@ -1506,10 +1729,10 @@ class PortfolioManager:
                 self.active_reservations.pop(symbol, None)
 
             # Keep settlement manager in sync with latest cash balance
-            try:
-                self.settlement_manager.update_verified_budget(self.my_budget)
-            except Exception as settlement_error:
-                logger.debug(f"Failed to update settlement manager after fills: {settlement_error}")
+            if tx is not None:
+                tx.sync_budget = True
+            else:
+                self._sync_settlement_budget()
 
             # Emit position event
             self._emit_event({
@@ -1548,9 +1771,143 @@ class PortfolioManager:
             }
 
         except Exception as e:
+            if tx is not None:
+                raise
             logger.error(f"Error applying fills for {symbol}: {e}", exc_info=True)
             return {}
 
+    def apply_fills_batch(self, fills_by_symbol: Dict[str, list]) -> Dict[str, dict]:
+        """
+        Apply fills of many symbols atomically in one transaction.
+
+        Args:
+            fills_by_symbol: symbol -> trade list (as for apply_fills)
+
+        Returns:
+            symbol -> apply_fills summary
+
+        Raises:
+            Exception of the failing fill (nothing of the batch is applied)
+        """
+        with self.transaction():
+            return {symbol: self.apply_fills(symbol, trades) for symbol, trades in fills_by_symbol.items()}
+
+    # =================================================================================
+    # Batch-Transaktionen
+    # =================================================================================
+
+    @contextmanager
+    def transaction(self):
+        """
+        Batch-Transaktion über beliebig viele Symbole.
+
+        Hält Portfolio- und Budget-Lock für die Dauer des Blocks, so dass
+        parallele reserve/release/commit_budget-Aufrufe warten, statt von
+        einem Rollback überschrieben zu werden. save_state,
+        Budget-Ledger-Einträge, Position-Events und der Settlement-Sync
+        werden bis zum Commit zurückgestellt und dann je einmal ausgeführt
+        (nach Freigabe des Budget-Locks, siehe Lock-Hierarchie in
+        on_partial_fill). Bei einer Exception werden alle berührten Symbole
+        und das Budget auf den Stand vor der Transaktion zurückgesetzt und
+        die Exception weitergereicht. Verschachtelte Aufrufe laufen in der
+        äußeren Transaktion.
+
+        Usage:
+            with portfolio.transaction():
+                portfolio.apply_fills("BTC/USDT", btc_trades)
+                portfolio.apply_fills("ETH/USDT", eth_trades)
+        """
+        with self._lock:
+            if self._tx is not None:
+                # _lock ist reentrant: eine offene Transaktion gehört diesem Thread
+                yield self._tx
+                return
+
+            # Lock-Reihenfolge _lock -> _budget_lock
+            with self._budget_lock:
+                tx = PortfolioTransaction(my_budget=self.my_budget, reserved_budget=self.reserved_budget)
+                self._tx, self._tx_thread = tx, threading.get_ident()
+                try:
+                    yield tx
+                except BaseException as e:
+                    self._tx, self._tx_thread = None, None
+                    self._rollback(tx, e)
+                    raise
+                self._tx, self._tx_thread = None, None
+            self._commit(tx)
+
+    def _active_tx(self) -> Optional[PortfolioTransaction]:
+        """Offene Transaktion des aktuellen Threads"""
+        tx = self._tx
+        if tx is not None and self._tx_thread == threading.get_ident():
+            return tx
+        return None
+
+    def _tx_touch(self, symbol: Optional[str]) -> None:
+        """Merkt den Zustand von symbol vor seiner ersten Änderung in der Transaktion"""
+        tx = self._active_tx()
+        if tx is None or not symbol or symbol in tx.undo:
+            return
+        tx.undo[symbol] = (
+            copy.deepcopy(self.positions.get(symbol)),
+            copy.deepcopy(self.held_assets.get(symbol)),
+            self.reserved_quote.get(symbol),
+            self.reserved_base.get(symbol),
+            copy.deepcopy(self.active_reservations.get(symbol)),
+        )
+
+    def _ledger_event(self, event_type: str, context: dict) -> None:
+        """Budget-Ledger-Eintrag (in einer Transaktion erst beim Commit)"""
+        tx = self._active_tx()
+        if tx is not None:
+            tx.ledger.append((event_type, context))
+        else:
+            log_event(event_type, context=context)
+
+    def _sync_settlement_budget(self) -> None:
+        try:
+            self.settlement_manager.update_verified_budget(self.my_budget)
+        except Exception as settlement_error:
+            logger.debug(f"Failed to update settlement manager after fills: {settlement_error}")
+
+    def _commit(self, tx: PortfolioTransaction) -> None:
+        """Führt die zurückgestellten Seiteneffekte als ein Batch aus"""
+        self.events.extend(tx.events)
+        for event_type, context in tx.ledger:
+            log_event(event_type, context=context)
+        if tx.sync_budget:
+            self._sync_settlement_budget()
+        if tx.persist:
+            for symbol in tx.undo:
+                self._mark_dirty("held", symbol)
+            self.save_state(flush=tx.flush, dirty_only=not tx.full_diff)
+        if tx.undo:
+            logger.info(
+                f"Portfolio transaction committed: {len(tx.undo)} symbols, {tx.fills} fills",
+                extra={'event_type': 'PORTFOLIO_TX_COMMITTED', 'symbols': tx.symbols, 'fills': tx.fills}
+            )
+
+    def _rollback(self, tx: PortfolioTransaction, error: BaseException) -> None:
+        """Setzt berührte Symbole und Budget zurück; Seiteneffekte entfallen"""
+        for symbol, (pos, held, quote, base, reservation) in tx.undo.items():
+            current = self.positions.get(symbol)
+            if pos is not None and current is not None:
+                current.__dict__.update(pos.__dict__)  # Referenzen von Aufrufern bleiben gültig
+            else:
+                _restore(self.positions, symbol, pos)
+            _restore(self.held_assets, symbol, held)
+            _restore(self.reserved_quote, symbol, quote)
+            _restore(self.reserved_base, symbol, base)
+            _restore(self.active_reservations, symbol, reservation)
+            self.position_book.set_position(symbol, pos.qty if pos else 0.0, pos.avg_price if pos else 0.0)
+            self._refresh_exposure(symbol)
+        self.my_budget = tx.my_budget
+        self.reserved_budget = tx.reserved_budget
+        logger.error(
+            f"Portfolio transaction rolled back ({len(tx.undo)} symbols): {error}",
+            extra={'event_type': 'PORTFOLIO_TX_ROLLBACK', 'symbols': tx.symbols, 'error': str(error)}
+        )
+
     def _is_reducing(self, trades: List[dict]) -> bool:
         """
         Check if trades contain both buy and sell sides (position reduction).
@@ -1619,6 +1976,30 @@ class PortfolioManager:
             last: Current market price
         """
         self.last_prices[symbol] = last
+        self.position_book.mark_price(symbol, last)
+
+    def mark_prices(self, symbols: List[str], prices: List[float]) -> Valuation:
+        """
+        Mark a whole snapshot batch and revalue all positions in one pass.
+
+        Args:
+            symbols: Trading pairs of the market-data cycle
+            prices: Last prices, same order as symbols
+
+        Returns:
+            Valuation of this cycle (equity, unrealized PnL, per-position PnL)
+        """
+        self.last_prices.update(zip(symbols, prices))
+        return self.position_book.mark_prices(symbols, prices, cash=self.my_budget)
+
+    def valuation(self) -> Valuation:
+        """
+        Latest consistent valuation of all positions (lock-free for readers).
+
+        Returns:
+            Valuation with equity, unrealized_pnl and per-position arrays
+        """
+        return self.position_book.valuation()
 
     def unrealized_pnl(self, symbol: str) -> float:
         """
@@ -1690,7 +2071,9 @@ class PortfolioManager:
         """
         with self._lock:
             self.open_buy_orders[symbol] = order_data
-            self.save_state()  # Persist to disk immediately
+            self._refresh_exposure(symbol)
+            self._mark_dirty("open_buys", symbol)
+            self.save_state(flush=True, dirty_only=True)  # Persist to disk immediately
             logger.debug(f"Persisted buy order for {symbol}: order_id={order_data.get('order_id')}")
 
     def get_open_buy_order(self, symbol: str) -> Optional[dict]:
@@ -1713,7 +2096,8 @@ class PortfolioManager:
         Args:
             ev: Event dict to append to events list
         """
-        self.events.append(ev)
+        tx = self._active_tx()
+        (tx.events if tx is not None else self.events).append(ev)
 
     def get_positions_with_ghosts(self, engine=None) -> List[Dict]:
         """
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Position Book - Array-Backed Mark-to-Market for All Positions
+
+Holds qty, avg price and last price of every position in contiguous numpy
+arrays (one slot per symbol). mark_prices() takes the whole snapshot batch of
+a market-data cycle and revalues every position in one vectorized pass.
+
+The result is published as an immutable Valuation; readers (PnL service,
+dashboards, status tables) take the current reference without locking and
+always see the positions and prices of one cycle together.
+
+Usage:
+    book = PositionBook()
+    book.set_position("BTC/USDT", qty=0.01, avg_price=60000.0)
+    valuation = book.mark_prices(["BTC/USDT", "ETH/USDT"], [61000.0, 3000.0])
+    valuation.unrealized_pnl      # portfolio total
+    valuation.position("BTC/USDT")
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from core.clock import get_clock
+
+_INITIAL_CAPACITY = 64
+
+
+@dataclass(frozen=True)
+class Valuation:
+    """Valuation of all positions for one market-data cycle (read-only)"""
+    cycle: int
+    ts: float
+    symbols: Tuple[str, ...]
+    qty: np.ndarray
+    avg_price: np.ndarray
+    last_price: np.ndarray       # NaN = never marked
+    market_value: np.ndarray     # qty * last (avg price while unmarked)
+    upnl: np.ndarray             # (last - avg) * qty, 0 while unmarked
+    total_market_value: float
+    unrealized_pnl: float
+    cash: float = 0.0
+
+    @property
+    def equity(self) -> float:
+        """Cash plus market value of all positions"""
+        return self.cash + self.total_market_value
+
+    def position(self, symbol: str) -> Optional[Dict[str, float]]:
+        """qty/avg/last/value/upnl of one position, None if not in the book"""
+        try:
+            i = self.symbols.index(symbol)
+        except ValueError:
+            return None
+        last = float(self.last_price[i])
+        return {
+            "qty": float(self.qty[i]),
+            "avg": float(self.avg_price[i]),
+            "last": None if last != last else last,
+            "value": float(self.market_value[i]),
+            "upnl": float(self.upnl[i]),
+        }
+
+    def per_position(self) -> Dict[str, float]:
+        """symbol -> unrealized PnL"""
+        return dict(zip(self.symbols, self.upnl.tolist()))
+
+
+def _empty_valuation() -> Valuation:
+    empty = np.zeros(0)
+    return Valuation(0, 0.0, (), empty, empty, empty, empty, empty, 0.0, 0.0)
+
+
+class PositionBook:
+    """
+    Contiguous position arrays with bulk marking.
+
+    Writers (fills, marks) serialize on an internal lock; readers use
+    valuation(), which returns the last published snapshot.
+    """
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._symbols: list = []
+        self._qty = np.zeros(capacity)
+        self._avg = np.zeros(capacity)
+        self._last = np.full(capacity, np.nan)
+        # Prices of symbols without a position, applied when one opens
+        self._unbooked_prices: Dict[str, float] = {}
+        self._cycle = 0
+        self._cash = 0.0
+        self._stale = False
+        self._valuation = _empty_valuation()
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def _grow(self):
+        capacity = len(self._qty) * 2
+        for name, fill in (("_qty", 0.0), ("_avg", 0.0), ("_last", np.nan)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def set_position(self, symbol: str, qty: float, avg_price: float) -> None:
+        """Create/update a position; qty == 0 removes it"""
+        with self._lock:
+            i = self._index.get(symbol)
+            if qty == 0:
+                if i is not None:
+                    self._remove(symbol, i)
+                    self._stale = True
+                return
+            if i is None:
+                i = len(self._symbols)
+                if i == len(self._qty):
+                    self._grow()
+                self._index[symbol] = i
+                self._symbols.append(symbol)
+                self._last[i] = self._unbooked_prices.pop(symbol, np.nan)
+            self._qty[i] = qty
+            self._avg[i] = avg_price
+            self._stale = True
+
+    def _remove(self, symbol: str, i: int):
+        """Swap-remove slot i (assumes lock is held)"""
+        price = float(self._last[i])
+        last_slot = len(self._symbols) - 1
+        if i != last_slot:
+            moved = self._symbols[last_slot]
+            self._symbols[i] = moved
+            self._index[moved] = i
+            self._qty[i] = self._qty[last_slot]
+            self._avg[i] = self._avg[last_slot]
+            self._last[i] = self._last[last_slot]
+        self._symbols.pop()
+        del self._index[symbol]
+        if price == price:  # keep the mark for a re-opened position
+            self._unbooked_prices[symbol] = price
+        self._qty[last_slot] = 0.0
+        self._avg[last_slot] = 0.0
+        self._last[last_slot] = np.nan
+
+    def mark_price(self, symbol: str, last: float) -> None:
+        """Mark a single symbol; revaluation happens on the next valuation()"""
+        with self._lock:
+            i = self._index.get(symbol)
+            if i is None:
+                self._unbooked_prices[symbol] = last
+            else:
+                self._last[i] = last
+                self._stale = True
+
+    def mark_prices(self, symbols: Iterable[str], prices: Iterable[float],
+                    cash: Optional[float] = None) -> Valuation:
+        """Mark a snapshot batch and publish the valuation of this cycle"""
+        with self._lock:
+            index = self._index
+            slots, values = [], []
+            for symbol, price in zip(symbols, prices):
+                if price is None:
+                    continue
+                i = index.get(symbol)
+                if i is None:
+                    self._unbooked_prices[symbol] = price
+                else:
+                    slots.append(i)
+                    values.append(price)
+            if slots:
+                self._last[slots] = values
+            if cash is not None:
+                self._cash = cash
+            return self._revalue()
+
+    def valuation(self) -> Valuation:
+        """Latest published valuation (revalued first if positions changed since)"""
+        if self._stale:
+            with self._lock:
+                if self._stale:
+                    return self._revalue()
+        return self._valuation
+
+    def _revalue(self) -> Valuation:
+        """One vectorized pass over all slots (assumes lock is held)"""
+        n = len(self._symbols)
+        qty = self._qty[:n].copy()
+        avg = self._avg[:n].copy()
+        last = self._last[:n].copy()
+        marked = ~np.isnan(last)
+        mark = np.where(marked, last, avg)
+        market_value = qty * mark
+        upnl = np.where(marked, (mark - avg) * qty, 0.0)
+        for array in (qty, avg, last, market_value, upnl):
+            array.flags.writeable = False
+
+        self._cycle += 1
+        self._stale = False
+        self._valuation = Valuation(
+            cycle=self._cycle,
+            ts=get_clock().time(),
+            symbols=tuple(self._symbols),
+            qty=qty,
+            avg_price=avg,
+            last_price=last,
+            market_value=market_value,
+            upnl=upnl,
+            total_market_value=float(market_value.sum()),
+            unrealized_pnl=float(upnl.sum()),
+            cash=self._cash,
+        )
+        return self._valuation
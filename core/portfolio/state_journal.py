@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Portfolio State Journal - Dirty-Key Persistence for PortfolioManager
+
+Replaces the full rewrite of held_assets / open_buy_orders / drop_anchors on
+every save_state() call. Each section is kept as encoded JSON per key; stage()
+compares the keys the caller marked dirty (or, as a fallback for in-place
+mutation, every key) against it and queues only changed or removed keys. A background thread coalesces bursts and appends them to an
+append-only journal, which is periodically compacted into the snapshot files.
+
+Files:
+    <section>.json            Snapshot per section (same layout as before,
+                              written compact)
+    portfolio_state.journal   JSONL, first line is a header with the
+                              (size, mtime_ns) of every snapshot it extends,
+                              then one record per mutation:
+                              {"s": "held", "k": "BTC/USDT", "v": {...}}
+                              {"s": "held", "k": "BTC/USDT", "d": 1}
+
+Crash recovery:
+    load() reads the snapshots and replays the journal tail. Records of a
+    section are only replayed when its snapshot still matches the header,
+    so a snapshot replaced by compaction (or by a cleanup script) is never
+    overwritten with stale records. A truncated last line is ignored.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from core.utils import load_state
+
+logger = logging.getLogger(__name__)
+
+_SEPARATORS = (",", ":")
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, separators=_SEPARATORS)
+
+
+def _file_stat(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+class PortfolioStateJournal:
+    """
+    Snapshot + journal persistence for the portfolio state sections.
+
+    Usage:
+        journal = PortfolioStateJournal({"held": "held_assets.json", ...},
+                                        "portfolio_state.journal")
+        state = journal.load()               # {"held": {...}, ...}
+        journal.stage("held", held_assets, keys={"BTC/USDT"})  # queues changed keys only
+        journal.flush()                      # journal write now (optional)
+        journal.close()                      # flush + compact
+    """
+
+    def __init__(
+        self,
+        files: Dict[str, str],
+        journal_path: str,
+        interval_s: float = 0.5,
+        compact_records: int = 2000,
+        fsync: bool = False,
+    ):
+        """
+        Args:
+            files: Section name -> snapshot file path
+            journal_path: Path of the journal file
+            interval_s: Debounce window; changes within it share one append
+            compact_records: Compact after this many journal records
+            fsync: fsync the journal after every append
+        """
+        self.files = dict(files)
+        self.journal_path = journal_path
+        self.interval_s = interval_s
+        self.compact_records = compact_records
+        self.fsync = fsync
+
+        self._lock = threading.Lock()       # _encoded / _pending
+        self._io_lock = threading.Lock()    # journal + snapshot files
+        self._encoded: Dict[str, Dict[str, str]] = {section: {} for section in self.files}
+        self._pending: Dict[Tuple[str, str], Optional[str]] = {}
+        self._journal_fh = None
+        self._journal_records = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._closed = False
+        self._stats = {"staged_keys": 0, "appends": 0, "records": 0, "compactions": 0, "errors": 0}
+
+        os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="PortfolioStateJournal", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Load / recovery
+    # ------------------------------------------------------------------
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Read snapshots, replay the journal tail and compact if it had records"""
+        state = {section: load_state(path) or {} for section, path in self.files.items()}
+        replayed, skipped = self._replay(state)
+
+        with self._lock:
+            self._pending.clear()
+            for section, entries in state.items():
+                encoded = self._encoded[section]
+                encoded.clear()
+                for key, value in entries.items():
+                    encoded[key] = _encode(value)
+
+        if replayed or skipped or not os.path.exists(self.journal_path):
+            if replayed:
+                logger.info(f"Portfolio state journal replayed: {replayed} records",
+                            extra={'event_type': 'PORTFOLIO_JOURNAL_REPLAYED', 'records': replayed,
+                                   'skipped': skipped})
+            self.compact()
+        return state
+
+    def _replay(self, state: Dict[str, Dict[str, Any]]) -> Tuple[int, int]:
+        if not os.path.exists(self.journal_path):
+            return 0, 0
+        replayed = skipped = 0
+        valid_sections = set()
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line_no, line in enumerate(f):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn write at crash time: nothing after it was acknowledged
+                        logger.warning(f"Portfolio state journal: unreadable line {line_no + 1}, stopping replay",
+                                       extra={'event_type': 'PORTFOLIO_JOURNAL_TRUNCATED', 'line': line_no + 1})
+                        break
+                    if line_no == 0 and "base" in record:
+                        for section, base in record["base"].items():
+                            current = _file_stat(self.files[section]) if section in self.files else None
+                            if (tuple(base) if base else None) == current:
+                                valid_sections.add(section)
+                        continue
+                    section = record.get("s")
+                    if section not in valid_sections:
+                        skipped += 1
+                        continue
+                    if record.get("d"):
+                        state[section].pop(record["k"], None)
+                    else:
+                        state[section][record["k"]] = record["v"]
+                    replayed += 1
+        except OSError as e:
+            logger.error(f"Portfolio state journal could not be read: {e}",
+                         extra={'event_type': 'PORTFOLIO_JOURNAL_READ_ERROR', 'error': str(e)})
+        if skipped:
+            logger.warning(f"Portfolio state journal: {skipped} records skipped (snapshot newer than journal)",
+                           extra={'event_type': 'PORTFOLIO_JOURNAL_STALE', 'skipped': skipped})
+        return replayed, skipped
+
+    # ------------------------------------------------------------------
+    # Staging (caller thread)
+    # ------------------------------------------------------------------
+
+    def stage(self, section: str, entries: Dict[str, Any], keys: Optional[Iterable[str]] = None) -> int:
+        """
+        Queue keys of section whose value changed or that were removed; returns their count.
+
+        Args:
+            section: Section name
+            entries: Current content of the section
+            keys: Keys marked dirty by the caller; only these are compared.
+                  None compares the whole section (callers that mutate in place)
+        """
+        changed = 0
+        with self._lock:
+            encoded = self._encoded[section]
+            for key in (entries if keys is None else keys):
+                if key not in entries:
+                    if encoded.pop(key, None) is not None:
+                        self._pending[(section, key)] = None
+                        changed += 1
+                    continue
+                try:
+                    text = _encode(entries[key])
+                except (TypeError, ValueError) as e:
+                    self._stats["errors"] += 1
+                    logger.error(f"Portfolio state {section}/{key} not JSON-serializable: {e}",
+                                 extra={'event_type': 'STATE_SAVE_ERROR', 'section': section,
+                                        'key': key, 'error': str(e)})
+                    continue
+                if encoded.get(key) != text:
+                    encoded[key] = text
+                    self._pending[(section, key)] = text
+                    changed += 1
+            if keys is None:
+                for key in [k for k in encoded if k not in entries]:
+                    del encoded[key]
+                    self._pending[(section, key)] = None
+                    changed += 1
+            self._stats["staged_keys"] += changed
+        if changed:
+            self._wake.set()
+        return changed
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def flush(self):
+        """Append all staged changes to the journal now"""
+        with self._io_lock:
+            self._append_pending()
+            needs_compaction = self._journal_records >= self.compact_records
+        if needs_compaction:
+            self.compact()
+
+    def _append_pending(self):
+        """Assumes _io_lock is held"""
+        with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+        lines = []
+        for (section, key), text in batch.items():
+            if text is None:
+                lines.append('{"s":%s,"k":%s,"d":1}\n' % (_encode(section), _encode(key)))
+            else:
+                lines.append('{"s":%s,"k":%s,"v":%s}\n' % (_encode(section), _encode(key), text))
+        try:
+            if self._journal_fh is None:
+                self._journal_fh = open(self.journal_path, "a", encoding="utf-8")
+            self._journal_fh.write("".join(lines))
+            self._journal_fh.flush()
+            if self.fsync:
+                os.fsync(self._journal_fh.fileno())
+            self._journal_records += len(lines)
+            self._stats["appends"] += 1
+            self._stats["records"] += len(lines)
+        except OSError as e:
+            self._stats["errors"] += 1
+            logger.error(f"Portfolio state journal append failed: {e}",
+                         extra={'event_type': 'STATE_SAVE_ERROR', 'file_path': self.journal_path,
+                                'records': len(lines), 'error': str(e)})
+            # Keep the changes for the next attempt unless newer values were staged meanwhile
+            with self._lock:
+                for item, text in batch.items():
+                    self._pending.setdefault(item, text)
+
+    def compact(self):
+        """Write all sections as snapshots and restart the journal"""
+        with self._io_lock:
+            with self._lock:
+                self._pending.clear()  # snapshot below contains every staged value
+                texts = {
+                    section: "{" + ",".join(f"{_encode(k)}:{v}" for k, v in encoded.items()) + "}"
+                    for section, encoded in self._encoded.items()
+                }
+            try:
+                for section, text in texts.items():
+                    path = self.files[section]
+                    tmp = f"{path}.tmp"
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        f.write(text)
+                        if self.fsync:
+                            f.flush()
+                            os.fsync(f.fileno())
+                    os.replace(tmp, path)
+
+                header = {"base": {section: _file_stat(path) for section, path in self.files.items()},
+                          "ts": time.time()}
+                if self._journal_fh is not None:
+                    self._journal_fh.close()
+                    self._journal_fh = None
+                tmp = f"{self.journal_path}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(_encode(header) + "\n")
+                    if self.fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp, self.journal_path)
+                self._journal_records = 0
+                self._stats["compactions"] += 1
+            except OSError as e:
+                self._stats["errors"] += 1
+                logger.error(f"Portfolio state compaction failed: {e}",
+                             extra={'event_type': 'STATE_SAVE_ERROR', 'file_path': self.journal_path,
+                                    'error': str(e)})
+                # Fall back to journaling everything again
+                with self._lock:
+                    for section, encoded in self._encoded.items():
+                        for key, text in encoded.items():
+                            self._pending.setdefault((section, key), text)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            if self._stop.is_set():
+                break
+            # Debounce: let a burst of save_state() calls collapse into one append
+            self._stop.wait(self.interval_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Portfolio state journal writer error: {e}", exc_info=True)
+
+    def close(self):
+        """Flush staged changes, compact and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        self.compact()
+        with self._io_lock:
+            if self._journal_fh is not None:
+                self._journal_fh.close()
+                self._journal_fh = None
+        try:
+            atexit.unregister(self.close)
+        except Exception:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Journal statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending_keys"] = len(self._pending)
+        stats["journal_records"] = self._journal_records
+        return stats
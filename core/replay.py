@@ -24,15 +24,165 @@ Usage:
     comparison = replay.compare_with_live_state(live_portfolio, live_cash)
     if not comparison['matches']:
         print(f"State mismatch detected: {comparison}")
+
+    # Window, checkpoint and resume (CLI: python -m core.replay <logs_dir> ...)
+    replay = SessionReplay(..., since=1736640000, checkpoint_path="replay.ckpt")
+    state = replay.replay(resume=True)
+
+Streaming:
+    Each log file (active file plus rotated "<name>.<date>[.gz]" parts) is
+    already time-ordered, so events are streamed through a heap-based k-way
+    merge on (ts_ns, file, offset) instead of being loaded and sorted. Memory
+    stays constant in the number of events; ties keep the decision -> order
+    -> audit order of the former stable sort.
+
+    A sparse timestamp index "<file>.tsidx" (one (ts_ns, byte offset) entry
+    per 64 KiB) lets since= seek close to the window start without parsing
+    the file from the beginning. It is built on first use and extended
+    incrementally for growing files.
 """
 
+import argparse
+import bisect
+import glob
+import gzip
+import heapq
 import json
 import logging
-from pathlib import Path
-from typing import Dict, List, Optional
+import os
+import re
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.logging.critical_index import SIDECAR_SUFFIX, TS_INDEX_SUFFIX
 
 logger = logging.getLogger(__name__)
 
+TS_INDEX_BLOCK_BYTES = 64 * 1024
+CHECKPOINT_VERSION = 1
+
+_TS_NS_RE = re.compile(rb'"ts_ns"\s*:\s*(\d+)')
+
+
+def stream_files(path: str) -> List[str]:
+    """
+    Files of one log stream: rotated parts (oldest first), then the active file.
+
+    Args:
+        path: Active log file path (e.g. logs/decisions/decision.jsonl)
+
+    Returns:
+        Existing file paths
+    """
+    parts = sorted(
+        p for p in glob.glob(glob.escape(path) + ".*")
+        if not p.endswith((TS_INDEX_SUFFIX, SIDECAR_SUFFIX, ".tmp"))
+    )
+    if os.path.isfile(path):
+        parts.append(path)
+    return parts
+
+
+def _open_log(path: str):
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def _line_ts_ns(raw: bytes) -> Optional[int]:
+    match = _TS_NS_RE.search(raw)
+    return int(match.group(1)) if match else None
+
+
+def iter_log_lines(path: str, offset: int = 0) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Yield (offset, next_offset, raw_line) of complete lines from offset on.
+
+    Offsets are uncompressed byte offsets (gz files seek by decompressing).
+    A trailing line without newline (still being written) is not yielded.
+    """
+    with _open_log(path) as f:
+        if offset:
+            f.seek(offset)
+        for raw in iter(f.readline, b""):
+            if not raw.endswith(b"\n"):
+                break
+            yield offset, offset + len(raw), raw
+            offset += len(raw)
+
+
+def load_ts_index(path: str) -> List[Tuple[int, int]]:
+    """
+    Sparse (ts_ns, offset) index of a log file, built or extended on demand.
+
+    Stored as "<path>.tsidx". Plain files are indexed incrementally from the
+    last indexed offset; gz files are immutable and indexed once.
+
+    Returns:
+        Entries sorted by offset (and, for time-ordered files, by ts_ns)
+    """
+    index_path = path + TS_INDEX_SUFFIX
+    source_size = os.path.getsize(path)
+    data = None
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    if data and data.get("block") == TS_INDEX_BLOCK_BYTES:
+        if path.endswith(".gz"):
+            if data.get("source_size") == source_size:
+                return [tuple(e) for e in data["entries"]]
+            data = None
+        elif data.get("end", 0) > source_size or data.get("first_ts") != _first_ts(path):
+            data = None  # truncated or rotated
+    else:
+        data = None
+
+    entries = [tuple(e) for e in data["entries"]] if data else []
+    end = data["end"] if data else 0
+    if not path.endswith(".gz") and end == source_size:
+        return entries
+
+    last_entry_offset = entries[-1][1] if entries else -TS_INDEX_BLOCK_BYTES
+    for offset, next_offset, raw in iter_log_lines(path, end):
+        end = next_offset
+        if offset - last_entry_offset >= TS_INDEX_BLOCK_BYTES:
+            ts = _line_ts_ns(raw)
+            if ts is not None:
+                entries.append((ts, offset))
+                last_entry_offset = offset
+
+    payload = {
+        "block": TS_INDEX_BLOCK_BYTES,
+        "source_size": source_size,
+        "end": end,
+        "first_ts": entries[0][0] if entries else None,
+        "entries": entries,
+    }
+    try:
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.debug(f"Could not write timestamp index {index_path}: {e}")
+    return entries
+
+
+def _first_ts(path: str) -> Optional[int]:
+    for _, _, raw in iter_log_lines(path):
+        ts = _line_ts_ns(raw)
+        if ts is not None:
+            return ts
+    return None
+
+
+def seek_offset(path: str, since_ns: int) -> int:
+    """Byte offset at or before the first event with ts_ns >= since_ns"""
+    entries = load_ts_index(path)
+    i = bisect.bisect_left([ts for ts, _ in entries], since_ns)
+    return entries[i - 1][1] if i > 0 else 0
+
 
 class SessionReplay:
     """
@@ -49,7 +199,11 @@ class SessionReplay:
         self,
         decision_log_path: str,
         order_log_path: str,
-        audit_log_path: Optional[str] = None
+        audit_log_path: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: int = 10000
     ):
         """
         Initialize replay from log file paths.
@@ -58,17 +212,85 @@ class SessionReplay:
             decision_log_path: Path to decision.jsonl (position events)
             order_log_path: Path to order.jsonl (order lifecycle events)
             audit_log_path: Path to audit.jsonl (ledger entries, reconciliation)
+            since: Only replay events at or after this epoch second
+            until: Only replay events at or before this epoch second
+            checkpoint_path: File receiving periodic replay checkpoints
+            checkpoint_every: Events between checkpoints
         """
         self.decision_log_path = decision_log_path
         self.order_log_path = order_log_path
         self.audit_log_path = audit_log_path
+        self.since = since
+        self.until = until
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.event_offset = 0
+
+    def log_files(self) -> List[str]:
+        """All files replayed, in merge tie-break order (decision, order, audit)"""
+        files = []
+        for path in (self.decision_log_path, self.order_log_path, self.audit_log_path):
+            if path:
+                files.extend(stream_files(path))
+        return files
+
+    def iter_events(self, positions: Optional[Dict[str, int]] = None) -> Iterator[Tuple[Dict, str, int]]:
+        """
+        Stream events of all log files in timestamp order (k-way merge).
 
-    def replay(self) -> Dict:
+        Args:
+            positions: Start byte offset per file (checkpoint resume); files
+                not listed start at the since= window (or the beginning)
+
+        Yields:
+            (event, file_path, next_offset) - next_offset is where the file
+            continues after this event
+        """
+        since_ns = int(self.since * 1e9) if self.since is not None else None
+        until_ns = int(self.until * 1e9) if self.until is not None else None
+
+        streams = []
+        for file_idx, path in enumerate(self.log_files()):
+            if positions and path in positions:
+                offset = positions[path]
+            elif since_ns is not None:
+                offset = seek_offset(path, since_ns)
+            else:
+                offset = 0
+            streams.append(self._iter_file(file_idx, path, offset, since_ns, until_ns))
+
+        for _, _, _, path, next_offset, event in heapq.merge(*streams):
+            yield event, path, next_offset
+
+    def _iter_file(self, file_idx: int, path: str, offset: int,
+                   since_ns: Optional[int], until_ns: Optional[int]) -> Iterator[Tuple]:
+        try:
+            for line_offset, next_offset, raw in iter_log_lines(path, offset):
+                if since_ns is not None:
+                    ts = _line_ts_ns(raw)
+                    if ts is not None and ts < since_ns:
+                        continue
+                try:
+                    event = json.loads(raw)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"Failed to parse line at offset {line_offset} in {path}: {e}")
+                    continue
+                ts_ns = event.get('ts_ns') or 0
+                if until_ns is not None and ts_ns > until_ns:
+                    return
+                yield ts_ns, file_idx, line_offset, path, next_offset, event
+        except OSError as e:
+            logger.error(f"Failed to read log file {path}: {e}")
+
+    def replay(self, resume: bool = False) -> Dict:
         """
         Replay session and reconstruct final state.
 
         Processes all events chronologically and builds up the portfolio state.
 
+        Args:
+            resume: Continue from checkpoint_path if it exists
+
         Returns:
             {
                 'portfolio': {symbol: {'qty': float, 'avg_entry': float, 'opened_at': str}},
@@ -79,31 +301,42 @@ class SessionReplay:
                 'config_hash': str (optional)
             }
         """
-        # Load all events from log files
-        events = self._load_all_events()
-
-        # Sort chronologically by timestamp
-        events.sort(key=lambda e: e.get('ts_ns', 0))
-
-        # Initialize empty state
-        state = {
-            'portfolio': {},
-            'cash_usdt': 0.0,
-            'realized_pnl': 0.0,
-            'total_fees': 0.0,
-            'trades': [],
-            'config_hash': None,
-            'events_processed': 0
-        }
+        checkpoint = self.load_checkpoint() if resume else None
+        if checkpoint:
+            state = checkpoint['state']
+            positions = checkpoint['positions']
+            self.event_offset = checkpoint['event_offset']
+            logger.info(f"Resuming replay at event offset {self.event_offset}")
+        else:
+            # Initialize empty state
+            state = {
+                'portfolio': {},
+                'cash_usdt': 0.0,
+                'realized_pnl': 0.0,
+                'total_fees': 0.0,
+                'trades': [],
+                'config_hash': None,
+                'events_processed': 0
+            }
+            positions = {}
+            self.event_offset = 0
 
-        # Replay events one by one
-        for event in events:
+        # Replay events one by one, in timestamp order across all files
+        for event, path, next_offset in self.iter_events(positions):
+            positions[path] = next_offset
+            self.event_offset += 1
             try:
                 self._process_event(event, state)
                 state['events_processed'] += 1
             except Exception as e:
                 logger.warning(f"Failed to process event {event.get('event')}: {e}")
 
+            if self.checkpoint_path and self.event_offset % self.checkpoint_every == 0:
+                self.save_checkpoint(state, positions)
+
+        if self.checkpoint_path:
+            self.save_checkpoint(state, positions)
+
         logger.info(
             f"Replay complete: {state['events_processed']} events processed, "
             f"{len(state['trades'])} trades, "
@@ -113,6 +346,42 @@ class SessionReplay:
 
         return state
 
+    def save_checkpoint(self, state: Dict, positions: Dict[str, int]):
+        """Atomically write replay state, event offset and per-file positions"""
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'event_offset': self.event_offset,
+            'positions': positions,
+            'since': self.since,
+            'until': self.until,
+            'state': state,
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def load_checkpoint(self) -> Optional[Dict]:
+        """
+        Load the checkpoint, if any.
+
+        Raises:
+            ValueError: If a checkpointed file shrank (rotated or truncated)
+        """
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            logger.warning(f"Ignoring checkpoint {self.checkpoint_path} (version mismatch)")
+            return None
+        for path, offset in checkpoint['positions'].items():
+            if path.endswith(".gz"):
+                continue
+            if not os.path.exists(path) or os.path.getsize(path) < offset:
+                raise ValueError(f"Log file changed since checkpoint: {path}")
+        return checkpoint
+
     def _process_event(self, event: Dict, state: Dict):
         """Process a single event and update state"""
         event_type = event.get('event')
@@ -228,54 +497,6 @@ class SessionReplay:
         """Handle config_snapshot event"""
         state['config_hash'] = event.get('config_hash')
 
-    def _load_all_events(self) -> List[Dict]:
-        """
-        Load all events from log files.
-
-        Returns:
-            List of event dicts from all log files
-        """
-        events = []
-
-        # Load decision log (position events)
-        events.extend(self._load_jsonl_file(self.decision_log_path))
-
-        # Load order log (order lifecycle events)
-        events.extend(self._load_jsonl_file(self.order_log_path))
-
-        # Load audit log (ledger entries, reconciliation)
-        if self.audit_log_path:
-            events.extend(self._load_jsonl_file(self.audit_log_path))
-
-        logger.info(f"Loaded {len(events)} total events from log files")
-
-        return events
-
-    def _load_jsonl_file(self, file_path: str) -> List[Dict]:
-        """Load events from a single JSONL file"""
-        events = []
-
-        if not Path(file_path).exists():
-            logger.debug(f"Log file not found: {file_path}")
-            return events
-
-        try:
-            with open(file_path) as f:
-                for line_num, line in enumerate(f, 1):
-                    try:
-                        event = json.loads(line)
-                        events.append(event)
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to parse line {line_num} in {file_path}: {e}")
-                        continue
-
-            logger.debug(f"Loaded {len(events)} events from {file_path}")
-
-        except Exception as e:
-            logger.error(f"Failed to read log file {file_path}: {e}")
-
-        return events
-
     def compare_with_live_state(
         self,
         live_portfolio: Dict,
@@ -357,13 +578,10 @@ class SessionReplay:
         Returns:
             List of timestamped P&L snapshots
         """
-        events = self._load_all_events()
-        events.sort(key=lambda e: e.get('ts_ns', 0))
-
         timeline = []
         cumulative_pnl = 0.0
 
-        for event in events:
+        for event, _, _ in self.iter_events():
             if event.get('event') == 'position_closed':
                 cumulative_pnl += event.get('realized_pnl_usdt', 0.0)
 
@@ -376,3 +594,55 @@ class SessionReplay:
                 })
 
         return timeline
+
+
+def _parse_time(value: str) -> float:
+    """Epoch seconds or ISO-8601 (naive = UTC) to epoch seconds"""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a session from its JSONL logs")
+    parser.add_argument("logs_dir", help="Session logs directory (contains decisions/, orders/, audit/)")
+    parser.add_argument("--since", type=_parse_time, help="Window start (epoch seconds or ISO-8601)")
+    parser.add_argument("--until", type=_parse_time, help="Window end (epoch seconds or ISO-8601)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (written periodically)")
+    parser.add_argument("--checkpoint-every", type=int, default=10000, help="Events between checkpoints")
+    parser.add_argument("--resume", action="store_true", help="Continue from --checkpoint")
+    parser.add_argument("--timeline", action="store_true", help="Print realized PnL timeline instead")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    replay = SessionReplay(
+        decision_log_path=os.path.join(args.logs_dir, "decisions", "decision.jsonl"),
+        order_log_path=os.path.join(args.logs_dir, "orders", "order.jsonl"),
+        audit_log_path=os.path.join(args.logs_dir, "audit", "audit.jsonl"),
+        since=args.since,
+        until=args.until,
+        checkpoint_path=args.checkpoint,
+        checkpoint_every=args.checkpoint_every,
+    )
+    if args.timeline:
+        for point in replay.get_pnl_timeline():
+            print(json.dumps(point))
+        return 0
+
+    state = replay.replay(resume=args.resume)
+    summary = {k: v for k, v in state.items() if k != 'trades'}
+    summary['trades'] = len(state['trades'])
+    summary['event_offset'] = replay.event_offset
+    print(json.dumps(summary, indent=2, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -47,6 +47,7 @@ class RiskLimitChecker:
         self._daily_trade_count = 0
         self._daily_trade_reset_ts = time.time()
         self._daily_pnl_start_budget = portfolio.my_budget
+        self._last_exposure_check = 0.0
 
     def check_limits(self, symbol: str, order_value_usdt: float) -> Tuple[bool, List[Dict[str, Any]]]:
         """
@@ -84,12 +85,19 @@ class RiskLimitChecker:
                 "hit": current_positions >= max_positions
             })
 
+            # Exposure aggregates are maintained incrementally by the portfolio (O(1));
+            # the periodic rescan repairs drift from legacy code writing held_assets directly
+            if getattr(self.config, 'RISK_EXPOSURE_SELF_CHECK', True):
+                now = time.time()
+                if now - self._last_exposure_check >= getattr(self.config, 'RISK_EXPOSURE_SELF_CHECK_INTERVAL_S', 30.0):
+                    self._last_exposure_check = now
+                    self.portfolio.verify_exposure_aggregates()
+            held_exposure = self.portfolio.get_total_exposure_usdt()
+
             # 2. Max Portfolio Exposure Check
             try:
                 # Calculate total exposure including new order
-                total_exposure = order_value_usdt
-                for held_symbol in self.portfolio.held_assets.keys():
-                    total_exposure += self.portfolio.get_symbol_exposure_usdt(held_symbol)
+                total_exposure = order_value_usdt + held_exposure
 
                 total_budget = self.portfolio.my_budget + total_exposure
                 exposure_ratio = total_exposure / total_budget if total_budget > 0 else 0
@@ -109,9 +117,7 @@ class RiskLimitChecker:
                 symbol_exposure = self.portfolio.get_symbol_exposure_usdt(symbol)
                 new_symbol_exposure = symbol_exposure + order_value_usdt
 
-                total_budget = self.portfolio.my_budget
-                for held_symbol in self.portfolio.held_assets.keys():
-                    total_budget += self.portfolio.get_symbol_exposure_usdt(held_symbol)
+                total_budget = self.portfolio.my_budget + held_exposure
 
                 symbol_exposure_ratio = new_symbol_exposure / total_budget if total_budget > 0 else 0
                 max_symbol_exposure_ratio = getattr(self.config, 'MAX_SYMBOL_EXPOSURE_PCT', 0.20)
@@ -14,9 +14,13 @@ New Features:
 import json
 import logging
 import os
-import time
 from collections import deque
-from typing import Deque, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Deque, Dict, Optional, Tuple
+
+from core.clock import Clock, get_clock
+
+if TYPE_CHECKING:
+    from core.state_store import StateStore
 
 logger = logging.getLogger(__name__)
 
@@ -137,11 +141,15 @@ class RollingWindowManager:
     into the market data pipeline for guaranteed updates independent of buy flow.
     """
 
+    STORE_NAMESPACE = "rolling_windows"
+
     def __init__(
         self,
         lookback_s: int,
         persist: bool = False,
-        base_path: str = "state/drop_windows"
+        base_path: str = "state/drop_windows",
+        clock: Optional[Clock] = None,
+        store: Optional["StateStore"] = None
     ) -> None:
         """
         Initialize manager.
@@ -150,18 +158,31 @@ class RollingWindowManager:
             lookback_s: Lookback period for all windows
             persist: Whether to persist windows to disk
             base_path: Base directory for persistence files
+            clock: Time source for staleness checks (default: process-wide core.clock)
+            store: Unified state store (replaces the per-symbol files, which are
+                imported once; windows are derived data and not versioned)
         """
         self.lookback_s = lookback_s
         self.persist = persist
         self.base_path = base_path
         self.windows: Dict[str, RollingWindow] = {}
-
-        if self.persist:
+        self._clock = clock
+        self.store = store if persist else None
+
+        if self.store is not None:
+            self.store.register_namespace(self.STORE_NAMESPACE, history=False)
+            self.store.load(self.STORE_NAMESPACE, legacy=self._read_files)
+            logger.info(f"RollingWindowManager initialized with persistence: {self.store.path}")
+        elif self.persist:
             os.makedirs(self.base_path, exist_ok=True)
             logger.info(f"RollingWindowManager initialized with persistence: {self.base_path}")
         else:
             logger.info("RollingWindowManager initialized (no persistence)")
 
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_clock()
+
     def _path(self, sym: str) -> str:
         """Get file path for symbol's persisted window.
 
@@ -224,6 +245,11 @@ class RollingWindowManager:
         if not rw:
             return
 
+        if self.store is not None:
+            self.store.put(self.STORE_NAMESPACE, symbol,
+                           {"lookback_s": rw.lookback_s, "data": list(rw.q)})
+            return
+
         try:
             path = self._path(symbol)
             tmp_path = f"{path}.tmp"
@@ -258,19 +284,24 @@ class RollingWindowManager:
             return
 
         path = self._path(symbol)
-        if not os.path.exists(path):
+        if self.store is None and not os.path.exists(path):
             return
 
         try:
-            with open(path, 'r') as f:
-                data = json.load(f)
+            if self.store is not None:
+                data = self.store.get(self.STORE_NAMESPACE, symbol)
+                if not data:
+                    return
+            else:
+                with open(path, 'r') as f:
+                    data = json.load(f)
 
             # Create RollingWindow and restore data
             rw = RollingWindow(self.lookback_s)
             window_data = data.get('data', [])
 
             # Filter out stale entries (older than lookback)
-            now = time.time()
+            now = self.clock.time()
             lb = now - self.lookback_s
 
             for ts, price in window_data:
@@ -301,6 +332,21 @@ class RollingWindowManager:
         for sym in self.windows.keys():
             self.save(sym)
 
+    def _read_files(self) -> Dict[str, dict]:
+        """Per-symbol window files by symbol (legacy import into the store)"""
+        windows = {}
+        if not os.path.isdir(self.base_path):
+            return windows
+        for name in os.listdir(self.base_path):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.base_path, name), 'r') as f:
+                    windows[name[:-5].replace("_", "/", 1)] = json.load(f)
+            except Exception as e:
+                logger.debug(f"Failed to read window file {name}: {e}")
+        return windows
+
     def clear(self) -> None:
         """Clear all windows (useful for testing)."""
         self.windows.clear()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Group-Commit SQLite Writer - One Writer Thread per Database
+
+Moves SQLite writes off the calling thread. Operations are queued and the
+writer thread commits everything that arrived within commit_interval_s in a
+single transaction (group commit), so N concurrent writes cost one commit
+instead of N.
+
+- submit() returns a Future that resolves once the transaction containing
+  the operation committed (or raises the operation's exception)
+- sync=True (strict-sync) commits immediately with PRAGMA synchronous=FULL
+  and is meant for writes that must survive power loss before proceeding
+- Each operation runs inside its own SAVEPOINT, a failing operation is
+  rolled back without affecting the rest of the batch
+- The writer connection reuses prepared statements (sqlite3 statement cache)
+
+Usage:
+    writer = GroupCommitWriter("state/ledger.db", name="ledger")
+    fut = writer.execute("INSERT INTO t VALUES (?)", (1,))
+    fut.result()       # durable
+    writer.flush()     # barrier: all previously submitted ops committed
+    writer.close()
+"""
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Applied once on the writer connection
+WRITER_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",          # 8 MB page cache
+    "PRAGMA wal_autocheckpoint=1000",   # pages
+)
+
+_STOP = object()
+
+
+class _Op:
+    __slots__ = ("fn", "sync", "future")
+
+    def __init__(self, fn: Callable[[sqlite3.Connection], Any], sync: bool):
+        self.fn = fn
+        self.sync = sync
+        self.future: Future = Future()
+
+
+class GroupCommitWriter:
+    """
+    Dedicated writer thread batching SQLite operations into group commits.
+
+    Operations are callables receiving the writer connection; they run on
+    the writer thread in submission order.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        name: str = "sqlite",
+        commit_interval_s: float = 0.002,
+        max_batch: int = 512,
+        strict_sync: bool = False,
+        init_statements: Iterable[str] = (),
+    ):
+        """
+        Initialize writer and start its thread.
+
+        Args:
+            db_path: Path to SQLite database file
+            name: Name for the writer thread and logs
+            commit_interval_s: Max time an op waits for others to join its batch
+            max_batch: Max ops per transaction
+            strict_sync: Treat every op as sync=True
+            init_statements: Extra SQL run once on the writer connection (schema)
+        """
+        self.db_path = db_path
+        self.name = name
+        self.commit_interval_s = commit_interval_s
+        self.max_batch = max_batch
+        self.strict_sync = strict_sync
+        self._init_statements = list(init_statements)
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._stats = {"ops": 0, "batches": 0, "failed_ops": 0, "sync_batches": 0,
+                       "max_batch": 0, "commit_s": 0.0}
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        ready: Future = Future()
+        self._thread = threading.Thread(target=self._run, args=(ready,),
+                                        name=f"GroupCommit-{name}", daemon=True)
+        self._thread.start()
+        ready.result()  # surfaces connection / schema errors to the constructor
+        atexit.register(self.close)
+
+    def submit(self, fn: Callable[[sqlite3.Connection], Any], sync: bool = False) -> Future:
+        """Queue fn(conn); the Future resolves with its return value once committed"""
+        op = _Op(fn, sync or self.strict_sync)
+        if self._closed:
+            op.future.set_exception(RuntimeError(f"{self.name} writer is closed"))
+            return op.future
+        self._queue.put(op)
+        return op.future
+
+    def execute(self, sql: str, params: tuple = (), sync: bool = False) -> Future:
+        """Queue one statement; the Future resolves with its rowcount"""
+        return self.submit(lambda db: db.execute(sql, params).rowcount, sync)
+
+    def executemany(self, sql: str, rows: Iterable[tuple], sync: bool = False) -> Future:
+        """Queue one statement over many parameter rows"""
+        rows = list(rows)
+        return self.submit(lambda db: db.executemany(sql, rows).rowcount, sync)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every previously submitted op is committed"""
+        if self._closed:
+            return
+        self.submit(lambda db: None).result(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Commit pending ops and stop the writer thread"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        try:
+            atexit.unregister(self.close)
+        except Exception:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batching statistics"""
+        stats = dict(self._stats)
+        stats["avg_batch"] = stats["ops"] / stats["batches"] if stats["batches"] else 0.0
+        stats["avg_commit_ms"] = stats["commit_s"] / stats["batches"] * 1000.0 if stats["batches"] else 0.0
+        return stats
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly per batch
+        db = sqlite3.connect(self.db_path, isolation_level=None, cached_statements=256)
+        for pragma in WRITER_PRAGMAS:
+            db.execute(pragma)
+        for statement in self._init_statements:
+            db.execute(statement)
+        return db
+
+    def _run(self, ready: Future):
+        try:
+            db = self._connect()
+        except Exception as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+        logger.info(f"Group-commit writer started: {self.db_path}",
+                    extra={'event_type': 'SQLITE_WRITER_START', 'db_path': self.db_path})
+
+        stop = False
+        try:
+            while not stop:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                batch = [item]
+                sync = item.sync
+                deadline = time.monotonic() + self.commit_interval_s
+                # Collect ops arriving within the commit window (sync ops commit at once)
+                while not sync and len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                    sync = item.sync
+                self._commit(db, batch, sync)
+
+            # Drain anything queued before close()
+            pending = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    pending.append(item)
+            if pending:
+                self._commit(db, pending, True)
+        finally:
+            db.close()
+
+    def _commit(self, db: sqlite3.Connection, batch: list, sync: bool):
+        start = time.perf_counter()
+        outcomes = []
+        try:
+            if sync:
+                db.execute("PRAGMA synchronous=FULL")
+            db.execute("BEGIN IMMEDIATE")
+            for op in batch:
+                db.execute("SAVEPOINT op")
+                try:
+                    outcomes.append((op, op.fn(db), None))
+                    db.execute("RELEASE op")
+                except Exception as e:
+                    db.execute("ROLLBACK TO op")
+                    db.execute("RELEASE op")
+                    outcomes.append((op, None, e))
+            db.execute("COMMIT")
+        except Exception as e:
+            logger.error(f"{self.name}: group commit of {len(batch)} ops failed: {e}",
+                         extra={'event_type': 'SQLITE_GROUP_COMMIT_FAILED', 'db_path': self.db_path,
+                                'ops': len(batch), 'error': str(e)})
+            try:
+                if db.in_transaction:
+                    db.execute("ROLLBACK")
+            except Exception:
+                pass
+            outcomes = [(op, None, e) for op in batch]
+        finally:
+            if sync:
+                try:
+                    db.execute("PRAGMA synchronous=NORMAL")
+                except Exception:
+                    pass
+
+        stats = self._stats
+        stats["ops"] += len(batch)
+        stats["batches"] += 1
+        stats["sync_batches"] += int(sync)
+        stats["max_batch"] = max(stats["max_batch"], len(batch))
+        stats["commit_s"] += time.perf_counter() - start
+
+        for op, result, error in outcomes:
+            if error is not None:
+                stats["failed_ops"] += 1
+                op.future.set_exception(error)
+            else:
+                op.future.set_result(result)
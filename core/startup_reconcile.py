@@ -3,13 +3,15 @@
 Startup Reconciliation - Phase 2
 
 Reconciles pending COIDs against exchange state on startup.
-Ensures no duplicate orders after crash/restart.
+Ensures no duplicate orders after crash/restart. With a portfolio, fills
+of orders that completed while the bot was down are applied through the
+BatchReconciler (one trade fetch per symbol).
 
 Usage:
     from core.startup_reconcile import reconcile_pending_coids
 
     # In main.py or startup sequence:
-    reconcile_pending_coids(exchange, symbols=watchlist)
+    reconcile_pending_coids(exchange, symbols=watchlist, portfolio=portfolio)
 """
 
 import logging
@@ -21,7 +23,9 @@ logger = logging.getLogger(__name__)
 def reconcile_pending_coids(
     exchange,
     symbols: Optional[List[str]] = None,
-    enabled: bool = True
+    enabled: bool = True,
+    portfolio=None,
+    telemetry=None
 ) -> dict:
     """
     Reconcile pending COIDs against exchange on startup.
@@ -33,6 +37,8 @@ def reconcile_pending_coids(
         exchange: CCXT exchange instance
         symbols: List of symbols to reconcile (None = all)
         enabled: Enable reconciliation (can be disabled via config)
+        portfolio: PortfolioManager receiving missed fills (None = statuses only)
+        telemetry: JsonlWriter for reconcile audit records (default JsonlWriter())
 
     Returns:
         Dict with reconciliation stats:
@@ -40,6 +46,7 @@ def reconcile_pending_coids(
             'enabled': bool,
             'reconciled_count': int,
             'pending_count': int,
+            'fills_applied': int,
             'errors': List[str]
         }
     """
@@ -49,6 +56,7 @@ def reconcile_pending_coids(
             'enabled': False,
             'reconciled_count': 0,
             'pending_count': 0,
+            'fills_applied': 0,
             'errors': []
         }
 
@@ -77,13 +85,19 @@ def reconcile_pending_coids(
                 'enabled': True,
                 'reconciled_count': 0,
                 'pending_count': 0,
+                'fills_applied': 0,
                 'errors': []
             }
 
         # Reconcile against exchange
         logger.info(f"Reconciling {pending_before} pending COIDs against exchange...")
+        pending_coids = [entry.coid for entry in coid_manager.pending_entries(symbols)]
         reconciled_count = coid_manager.reconcile_with_exchange(exchange, symbols)
 
+        fills_applied = 0
+        if portfolio is not None:
+            fills_applied = _apply_missed_fills(exchange, portfolio, telemetry, coid_manager, pending_coids)
+
         # Get stats after reconciliation
         stats_after = coid_manager.get_stats()
         pending_after = stats_after.get('pending_count', 0)
@@ -93,6 +107,7 @@ def reconcile_pending_coids(
         logger.info(f"  Pending: {pending_after}")
         logger.info(f"  Terminal: {stats_after.get('terminal_count', 0)}")
         logger.info(f"  Reconciled: {reconciled_count}")
+        logger.info(f"  Fills applied: {fills_applied}")
 
         # Cleanup old entries (optional)
         try:
@@ -110,6 +125,7 @@ def reconcile_pending_coids(
             'enabled': True,
             'reconciled_count': reconciled_count,
             'pending_count': pending_after,
+            'fills_applied': fills_applied,
             'errors': []
         }
 
@@ -120,6 +136,7 @@ def reconcile_pending_coids(
             'enabled': False,
             'reconciled_count': 0,
             'pending_count': 0,
+            'fills_applied': 0,
             'errors': [error_msg]
         }
 
@@ -130,10 +147,45 @@ def reconcile_pending_coids(
             'enabled': True,
             'reconciled_count': 0,
             'pending_count': 0,
+            'fills_applied': 0,
             'errors': [error_msg]
         }
 
 
+def _apply_missed_fills(exchange, portfolio, telemetry, coid_manager, coids: List[str]) -> int:
+    """
+    Apply fills of formerly pending orders the exchange reports as (partially) filled.
+
+    Returns:
+        Number of orders whose fills were applied
+    """
+    from core.coid import COIDStatus
+    from services.reconciler import BatchReconciler, ReconcileRequest
+
+    filled = (COIDStatus.FILLED.value, COIDStatus.PARTIALLY_FILLED.value)
+    requests = []
+    for coid in coids:
+        entry = coid_manager.get_entry(coid)
+        if entry and entry.order_id and entry.status in filled:
+            requests.append(ReconcileRequest(entry.symbol, str(entry.order_id), entry.created_ts))
+    if not requests:
+        return 0
+
+    if telemetry is None:
+        from telemetry.jsonl_writer import JsonlWriter
+        telemetry = JsonlWriter()
+
+    reconciler = BatchReconciler(exchange, portfolio, telemetry)
+    try:
+        results = reconciler.reconcile_orders(requests)
+    finally:
+        reconciler.shutdown()
+
+    applied = sum(1 for summary in results.values() if summary is not None)
+    logger.info(f"Applied missed fills of {applied}/{len(requests)} filled orders")
+    return applied
+
+
 def print_coid_summary():
     """
     Print COID manager summary (for debugging/monitoring).
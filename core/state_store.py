@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+Unified State Store - One Crash-Consistent SQLite File for Bot State
+
+Replaces the per-component JSON state files (portfolio sections, FSM
+snapshots, COID store, debounced engine/router state, anchors, rolling
+windows) with namespaced records in a single SQLite database (WAL).
+
+- Components stage changes (put / delete / sync); nothing touches disk
+  until commit()
+- commit() writes everything staged since the last commit as ONE atomic
+  transaction and numbers it as a cycle; the engine opens a cycle with
+  begin_cycle() and commits once per loop iteration, a background timer
+  commits stragglers (autocommit_s) while no engine cycle is open
+- commit(namespaces=...) writes only the staged changes of those
+  namespaces, for components that need their own records durable at once
+  (COID store) without committing other half-finished changes
+- Writes run on the GroupCommitWriter thread (core.sqlite_writer)
+- Startup reads only the live records of a namespace (records table);
+  superseded versions live in the history table
+- Point-in-time recovery: state_at(cycle) rebuilds the state after any
+  retained cycle, restore(cycle) makes it live again (as a new cycle)
+
+Tables:
+    records(ns, key, value, cycle)   live records only
+    history(ns, key, cycle, value)   every version, NULL value = deleted
+                                     (namespaces registered with
+                                     history=False are not versioned)
+    cycles(cycle, ts, changes)       one row per commit
+
+Usage:
+    store = StateStore("state/state.db")
+    held = store.load("portfolio.held", legacy=lambda: load_state("held_assets.json"))
+    store.sync("portfolio.held", held_assets)   # stages changed/removed keys
+    store.put("fsm_snapshots", "BTC/USDT", snapshot)
+    store.commit()                              # one atomic cycle
+    store.commit(namespaces=("coid",), wait=True)  # only the COID records
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from core.sqlite_writer import GroupCommitWriter
+
+logger = logging.getLogger(__name__)
+
+_SEPARATORS = (",", ":")
+
+# Store bookkeeping (legacy imports done)
+_META_NS = "__meta__"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS records ("
+    " ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, cycle INTEGER NOT NULL,"
+    " PRIMARY KEY (ns, key)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS history ("
+    " ns TEXT NOT NULL, key TEXT NOT NULL, cycle INTEGER NOT NULL, value TEXT,"
+    " PRIMARY KEY (ns, key, cycle)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS history_cycle ON history (cycle)",
+    "CREATE TABLE IF NOT EXISTS cycles ("
+    " cycle INTEGER PRIMARY KEY, ts REAL NOT NULL, changes INTEGER NOT NULL)",
+)
+
+_UPSERT = ("INSERT INTO records (ns, key, value, cycle) VALUES (?, ?, ?, ?) "
+           "ON CONFLICT (ns, key) DO UPDATE SET value = excluded.value, cycle = excluded.cycle")
+
+# Latest version of every key as of a cycle
+_STATE_AT = ("SELECT h.ns, h.key, h.value FROM history h "
+             "WHERE h.cycle = (SELECT MAX(cycle) FROM history "
+             "                 WHERE ns = h.ns AND key = h.key AND cycle <= ?)")
+
+# Versions before the cutoff that a later state_at() can no longer need
+_PRUNE_HISTORY = ("DELETE FROM history WHERE cycle < ? AND cycle < "
+                  "(SELECT MAX(h2.cycle) FROM history h2 "
+                  " WHERE h2.ns = history.ns AND h2.key = history.key AND h2.cycle < ?)")
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, separators=_SEPARATORS)
+
+
+class StateStore:
+    """
+    Namespaced key/value state in one SQLite file with per-cycle commits.
+
+    Thread-safe: any thread may stage, commit() snapshots the staged
+    changes under the lock and hands them to the writer thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        history_cycles: int = 5000,
+        autocommit_s: float = 1.0,
+        sync: bool = False,
+        cycle_timeout_s: float = 60.0,
+    ):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file
+            history_cycles: Cycles kept for point-in-time recovery (0 = unlimited)
+            autocommit_s: Commit staged changes older than this (0 = only explicit commits)
+            sync: Commit every cycle with synchronous=FULL (survives power loss)
+            cycle_timeout_s: The timer commits anyway once an engine cycle has
+                been open this long (engine loop failing before its commit)
+        """
+        self.path = path
+        self.history_cycles = history_cycles
+        self.autocommit_s = autocommit_s
+        self.synchronous = sync
+        self.cycle_timeout_s = cycle_timeout_s
+
+        self._writer = GroupCommitWriter(path, name="state_store", init_statements=_SCHEMA)
+        self._read_lock = threading.Lock()
+        self._reader = sqlite3.connect(path, check_same_thread=False)
+        self._reader.execute("PRAGMA busy_timeout=5000")
+
+        self._lock = threading.RLock()
+        # ns -> key -> encoded value (live records as of the staged state)
+        self._encoded: Dict[str, Dict[str, str]] = {}
+        self._pending: Dict[Tuple[str, str], Optional[str]] = {}
+        self._pending_since = 0.0
+        self._cycle_open_since: Optional[float] = None
+        self._no_history: set = set()
+        self._cycle = self._query_one("SELECT COALESCE(MAX(cycle), 0) FROM cycles")
+        self._closed = False
+        self._stats = {"commits": 0, "changes": 0, "failed_commits": 0, "imports": 0}
+
+        self._stop = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        if autocommit_s > 0:
+            self._timer = threading.Thread(target=self._autocommit_loop, name="StateStoreAutocommit", daemon=True)
+            self._timer.start()
+
+        logger.info(f"State store opened: {path} (cycle {self._cycle})",
+                    extra={'event_type': 'STATE_STORE_OPEN', 'path': path, 'cycle': self._cycle})
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def _query_one(self, sql: str, params: tuple = ()):
+        rows = self._query(sql, params)
+        return rows[0][0] if rows else None
+
+    def register_namespace(self, ns: str, history: bool = True):
+        """Configure a namespace (history=False: derived data, not versioned)"""
+        with self._lock:
+            if history:
+                self._no_history.discard(ns)
+            else:
+                self._no_history.add(ns)
+
+    def _ensure_loaded(self, ns: str) -> Dict[str, str]:
+        """Encoded live records of ns (read from disk once, assumes lock is held)"""
+        encoded = self._encoded.get(ns)
+        if encoded is None:
+            encoded = dict(self._query("SELECT key, value FROM records WHERE ns = ?", (ns,)))
+            self._encoded[ns] = encoded
+        return encoded
+
+    def load(self, ns: str, legacy: Optional[Callable[[], Optional[Dict[str, Any]]]] = None) -> Dict[str, Any]:
+        """
+        Live records of a namespace.
+
+        Args:
+            ns: Namespace
+            legacy: Loader of the former state file, used on the first load of
+                an empty namespace (its records are staged for the next commit)
+
+        Returns:
+            key -> value (including staged, uncommitted changes)
+        """
+        with self._lock:
+            encoded = self._ensure_loaded(ns)
+            # Import at most once: a namespace emptied later stays empty
+            if legacy is not None and self.get(_META_NS, ns) is None:
+                self.put(_META_NS, ns, {"imported_at": time.time()})
+            else:
+                legacy = None
+            if not encoded and legacy is not None:
+                try:
+                    data = legacy() or {}
+                except Exception as e:
+                    logger.warning(f"Legacy state import for {ns} failed: {e}")
+                    data = {}
+                if data:
+                    self.sync(ns, data)
+                    self._stats["imports"] += 1
+                    logger.info(f"Imported {len(data)} legacy records into {ns}",
+                                extra={'event_type': 'STATE_STORE_IMPORTED', 'ns': ns, 'records': len(data)})
+            return {key: json.loads(value) for key, value in encoded.items()}
+
+    def get(self, ns: str, key: str, default: Any = None) -> Any:
+        """One live record (including staged changes)"""
+        with self._lock:
+            value = self._ensure_loaded(ns).get(key)
+        return json.loads(value) if value is not None else default
+
+    def keys(self, ns: str) -> List[str]:
+        with self._lock:
+            return list(self._ensure_loaded(ns))
+
+    # ------------------------------------------------------------------
+    # Staging
+    # ------------------------------------------------------------------
+
+    def _stage(self, ns: str, key: str, value: Optional[str]):
+        """Stage one change (assumes lock is held)"""
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending[(ns, key)] = value
+
+    def put(self, ns: str, key: str, value: Any) -> bool:
+        """Stage a record; returns False if it is unchanged"""
+        encoded_value = _encode(value)
+        with self._lock:
+            encoded = self._ensure_loaded(ns)
+            if encoded.get(key) == encoded_value:
+                return False
+            encoded[key] = encoded_value
+            self._stage(ns, key, encoded_value)
+            return True
+
+    def delete(self, ns: str, key: str) -> bool:
+        """Stage a deletion; returns False if the key does not exist"""
+        with self._lock:
+            encoded = self._ensure_loaded(ns)
+            if encoded.pop(key, None) is None:
+                return False
+            self._stage(ns, key, None)
+            return True
+
+    def sync(self, ns: str, mapping: Dict[str, Any]) -> int:
+        """
+        Make the namespace equal to mapping, staging only changed and removed keys.
+
+        Returns:
+            Number of staged changes
+        """
+        fresh = {str(key): _encode(value) for key, value in mapping.items()}
+        changes = 0
+        with self._lock:
+            encoded = self._ensure_loaded(ns)
+            for key in [key for key in encoded if key not in fresh]:
+                del encoded[key]
+                self._stage(ns, key, None)
+                changes += 1
+            for key, value in fresh.items():
+                if encoded.get(key) != value:
+                    encoded[key] = value
+                    self._stage(ns, key, value)
+                    changes += 1
+        return changes
+
+    # ------------------------------------------------------------------
+    # Commit
+    # ------------------------------------------------------------------
+
+    def begin_cycle(self):
+        """Mark an engine cycle as open; the timer leaves its staged changes alone until commit()"""
+        with self._lock:
+            if self._cycle_open_since is None:
+                self._cycle_open_since = time.monotonic()
+
+    def commit(self, wait: bool = False, sync: Optional[bool] = None,
+               namespaces: Optional[Iterable[str]] = None) -> Optional[int]:
+        """
+        Write all staged changes as one atomic cycle.
+
+        Args:
+            wait: Block until the cycle is durable
+            sync: Override the store's synchronous=FULL setting for this cycle
+            namespaces: Commit only these namespaces (and their import markers);
+                other staged changes and an open engine cycle stay pending
+
+        Returns:
+            Cycle number, or None if nothing was staged
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            if namespaces is None:
+                self._cycle_open_since = None
+                changes, self._pending = self._pending, {}
+            else:
+                wanted = set(namespaces)
+                changes = {ns_key: value for ns_key, value in self._pending.items()
+                           if ns_key[0] in wanted or (ns_key[0] == _META_NS and ns_key[1] in wanted)}
+                for ns_key in changes:
+                    del self._pending[ns_key]
+            if not changes:
+                return None
+            self._cycle += 1
+            cycle = self._cycle
+            no_history = set(self._no_history)
+            ts = time.time()
+            prune_before = 0
+            if self.history_cycles and cycle % 100 == 0:
+                prune_before = cycle - self.history_cycles
+            # Submit under the lock: the writer must see cycles in number order,
+            # otherwise an older cycle could overwrite a newer value of the same key
+            future = self._writer.submit(
+                lambda db: self._write_cycle(db, changes, cycle, ts, no_history, prune_before),
+                sync=self.synchronous if sync is None else sync,
+            )
+
+        future.add_done_callback(lambda f: self._on_committed(f, changes, cycle))
+        if wait:
+            try:
+                future.result()
+            except Exception:
+                pass  # logged and re-staged by _on_committed
+        return cycle
+
+    @staticmethod
+    def _write_cycle(db: sqlite3.Connection, changes: Dict[Tuple[str, str], Optional[str]], cycle: int,
+                     ts: float, no_history: Set[str], prune_before: int) -> int:
+        upserts, deletes, versions = [], [], []
+        for (ns, key), value in changes.items():
+            if value is None:
+                deletes.append((ns, key))
+            else:
+                upserts.append((ns, key, value, cycle))
+            if ns not in no_history:
+                versions.append((ns, key, cycle, value))
+        db.execute("INSERT INTO cycles (cycle, ts, changes) VALUES (?, ?, ?)", (cycle, ts, len(changes)))
+        if upserts:
+            db.executemany(_UPSERT, upserts)
+        if deletes:
+            db.executemany("DELETE FROM records WHERE ns = ? AND key = ?", deletes)
+        if versions:
+            db.executemany("INSERT OR REPLACE INTO history (ns, key, cycle, value) VALUES (?, ?, ?, ?)",
+                           versions)
+        if prune_before > 0:
+            db.execute(_PRUNE_HISTORY, (prune_before, prune_before))
+            db.execute("DELETE FROM cycles WHERE cycle < ?", (prune_before,))
+        return cycle
+
+    def _on_committed(self, future: Future, changes: Dict[Tuple[str, str], Optional[str]], cycle: int):
+        error = future.exception()
+        if error is None:
+            self._stats["commits"] += 1
+            self._stats["changes"] += len(changes)
+            return
+        self._stats["failed_commits"] += 1
+        logger.error(f"State store commit of cycle {cycle} failed: {error}",
+                     extra={'event_type': 'STATE_STORE_COMMIT_FAILED', 'cycle': cycle, 'error': str(error)})
+        # Re-stage changes that were not superseded meanwhile
+        with self._lock:
+            if self._closed:
+                return
+            for ns_key, value in changes.items():
+                if ns_key not in self._pending:
+                    self._stage(ns_key[0], ns_key[1], value)
+
+    def _autocommit_loop(self):
+        interval = max(self.autocommit_s / 2.0, 0.05)
+        while not self._stop.wait(interval):
+            now = time.monotonic()
+            with self._lock:
+                due = self._pending and now - self._pending_since >= self.autocommit_s
+                open_s = now - self._cycle_open_since if self._cycle_open_since is not None else None
+            if not due:
+                continue
+            if open_s is not None:
+                if open_s < self.cycle_timeout_s:
+                    continue  # the engine commits this cycle
+                logger.warning(f"Engine cycle open for {open_s:.0f}s, committing staged state",
+                               extra={'event_type': 'STATE_STORE_CYCLE_TIMEOUT', 'open_s': open_s})
+            self.commit()
+
+    def flush(self):
+        """Commit staged changes and wait until everything is durable"""
+        self.commit()
+        self._writer.flush()
+
+    # ------------------------------------------------------------------
+    # Point-in-time recovery
+    # ------------------------------------------------------------------
+
+    def cycles(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent retained cycles (newest first)"""
+        self._writer.flush()
+        rows = self._query("SELECT cycle, ts, changes FROM cycles ORDER BY cycle DESC LIMIT ?", (limit,))
+        return [{"cycle": cycle, "ts": ts, "changes": changes} for cycle, ts, changes in rows]
+
+    def state_at(self, cycle: int) -> Dict[str, Dict[str, Any]]:
+        """
+        Versioned namespaces as they were after a cycle.
+
+        Raises:
+            ValueError: cycle is older than the retained history
+        """
+        self._writer.flush()
+        oldest = self._query_one("SELECT MIN(cycle) FROM cycles")
+        if oldest is None or cycle < oldest - 1:
+            raise ValueError(f"cycle {cycle} is not retained (oldest: {oldest})")
+        state: Dict[str, Dict[str, Any]] = {}
+        for ns, key, value in self._query(_STATE_AT, (cycle,)):
+            if value is not None:
+                state.setdefault(ns, {})[key] = json.loads(value)
+        return state
+
+    def restore(self, cycle: int) -> Optional[int]:
+        """
+        Make the state after cycle live again (written as a new cycle).
+
+        Components read their namespaces at startup, so restore before
+        they are created (or restart the bot afterwards).
+
+        Returns:
+            Cycle number of the restoring commit (None if nothing changed)
+        """
+        target = self.state_at(cycle)
+        with self._lock:
+            namespaces = set(target) | {ns for (ns,) in self._query("SELECT DISTINCT ns FROM history")}
+            namespaces -= self._no_history
+            for ns in namespaces:
+                self.sync(ns, target.get(ns, {}))
+        restored = self.commit(wait=True)
+        logger.warning(f"State store restored to cycle {cycle}",
+                       extra={'event_type': 'STATE_STORE_RESTORED', 'cycle': cycle, 'new_cycle': restored})
+        return restored
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def cycle(self) -> int:
+        """Number of the last committed (or submitted) cycle"""
+        return self._cycle
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cycle"] = self._cycle
+            stats["pending"] = len(self._pending)
+        return stats
+
+    def close(self):
+        """Commit staged changes and close the database"""
+        if self._closed:
+            return
+        self._stop.set()
+        self.commit(wait=True)
+        with self._lock:
+            self._closed = True
+        self._writer.close()
+        with self._read_lock:
+            self._reader.close()
+        logger.info(f"State store closed: {self.path} (cycle {self._cycle})",
+                    extra={'event_type': 'STATE_STORE_CLOSED', 'cycle': self._cycle})
+
+
+class StoreSections:
+    """
+    PortfolioStateJournal-compatible view of store namespaces.
+
+    Section "held" is kept in namespace "<prefix>.held"; the former snapshot
+    file of a section is imported once when its namespace is empty.
+    """
+
+    def __init__(self, store: StateStore, files: Dict[str, str], prefix: str = "portfolio"):
+        self.store = store
+        self.files = dict(files)
+        self.prefix = prefix
+
+    def _ns(self, section: str) -> str:
+        return f"{self.prefix}.{section}"
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        from core.utils import load_state
+        return {section: self.store.load(self._ns(section), legacy=lambda path=path: load_state(path))
+                for section, path in self.files.items()}
+
+    def stage(self, section: str, data: Dict[str, Any], keys: Optional[Iterable[str]] = None):
+        if keys is None:
+            self.store.sync(self._ns(section), data)
+            return
+        for key in keys:
+            if key in data:
+                self.store.put(self._ns(section), key, data[key])
+            else:
+                self.store.delete(self._ns(section), key)
+
+    def flush(self):
+        self.store.commit(wait=True, namespaces=self._namespaces())
+
+    def close(self):
+        self.store.commit(wait=True, namespaces=self._namespaces())
+
+    def _namespaces(self) -> List[str]:
+        return [self._ns(section) for section in self.files]
+
+
+# Global store (None while STATE_STORE_ENABLED is off)
+_store: Optional[StateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_state_store() -> Optional[StateStore]:
+    """Global state store from config, None if disabled"""
+    global _store
+    import config
+    if not getattr(config, 'STATE_STORE_ENABLED', False):
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = StateStore(
+                    getattr(config, 'STATE_STORE_FILE', 'state/state.db'),
+                    history_cycles=getattr(config, 'STATE_STORE_HISTORY_CYCLES', 5000),
+                    autocommit_s=getattr(config, 'STATE_STORE_AUTOCOMMIT_S', 1.0),
+                    sync=getattr(config, 'STATE_STORE_SYNC', False),
+                    cycle_timeout_s=getattr(config, 'STATE_STORE_CYCLE_TIMEOUT_S', 60.0),
+                )
+    return _store
+
+
+def close_state_store():
+    """Close the global store (shutdown, tests)"""
+    global _store
+    with _store_lock:
+        store, _store = _store, None
+    if store is not None:
+        store.close()
+
@@ -6,6 +6,10 @@ Collects state changes in memory and writes to disk at configurable intervals
 (debounced) instead of on every update. Ensures clean persistence on shutdown.
 
 Thread-safe implementation with automatic flush on shutdown.
+
+With a StateStore the state is kept in a store namespace instead of the
+file: writes stage only changed keys, which become durable with the next
+store commit (engine cycle).
 """
 
 import json
@@ -13,7 +17,10 @@ import logging
 import os
 import threading
 import time
-from typing import Any, Callable, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from core.state_store import StateStore
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +48,9 @@ class DebouncedStateWriter:
         file_path: str,
         interval_s: float = 10.0,
         auto_start: bool = True,
-        state_loader: Optional[Callable] = None
+        state_loader: Optional[Callable] = None,
+        store: Optional["StateStore"] = None,
+        namespace: Optional[str] = None
     ):
         """
         Initialize debounced state writer.
@@ -51,6 +60,8 @@ class DebouncedStateWriter:
             interval_s: Write interval in seconds (debounce time)
             auto_start: Start background thread automatically
             state_loader: Optional custom state loader function
+            store: Unified state store (replaces the file, which is imported once)
+            namespace: Store namespace (defaults to the file name without extension)
         """
         self.file_path = file_path
         self.interval_s = interval_s
@@ -62,12 +73,16 @@ class DebouncedStateWriter:
         self._last_write_time = 0.0
         self._write_count = 0
         self._error_count = 0
+        self.store = store
+        self.namespace = namespace or os.path.splitext(os.path.basename(file_path))[0]
 
         # Create parent directory if it doesn't exist
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
         # Load existing state
-        if state_loader:
+        if store is not None:
+            self._state = store.load(self.namespace, legacy=self._load_file)
+        elif state_loader:
             try:
                 self._state = state_loader(file_path) or {}
                 logger.info(f"Loaded {len(self._state)} entries from {file_path}")
@@ -80,6 +95,11 @@ class DebouncedStateWriter:
         if auto_start:
             self.start()
 
+    def _load_file(self) -> Dict[str, Any]:
+        """State file content (legacy import into the store)"""
+        self._load_state()
+        return self._state
+
     def _load_state(self):
         """Load state from disk"""
         try:
@@ -142,6 +162,16 @@ class DebouncedStateWriter:
 
     def _write_state(self):
         """Write state to disk (assumes lock is held)"""
+        if self.store is not None:
+            try:
+                self.store.sync(self.namespace, self._state)
+                self._last_write_time = time.time()
+                self._write_count += 1
+            except Exception as e:
+                self._error_count += 1
+                logger.error(f"Failed to stage state {self.namespace}: {e}")
+            return
+
         try:
             # Create backup of existing file
             if os.path.exists(self.file_path):
@@ -223,6 +253,8 @@ class DebouncedStateWriter:
                 self._write_state()
                 self._dirty = False
                 logger.debug("State flushed to disk")
+        if self.store is not None:
+            self.store.commit(wait=True, namespaces=(self.namespace,))
 
     def shutdown(self):
         """
@@ -245,6 +277,9 @@ class DebouncedStateWriter:
         with self._lock:
             if self._dirty:
                 self._write_state()
+                self._dirty = False
+        if self.store is not None:
+            self.store.commit(wait=True, namespaces=(self.namespace,))
 
         logger.info(
             f"State writer shutdown complete: "
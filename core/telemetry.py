@@ -23,6 +23,10 @@ Usage:
 
     # Get metrics
     stats = tracker.get_statistics()
+
+Statistics come from incrementally maintained windowed aggregates in the
+metrics registry (per symbol and global), so get_statistics() costs
+O(slots * buckets) regardless of history size.
 """
 
 import json
@@ -35,6 +39,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from core.monitoring.registry import BPS_BUCKETS, LATENCY_MS_BUCKETS, MetricsRegistry, get_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -105,7 +111,17 @@ class FillTracker:
     - Symbol-level and global statistics
     """
 
-    def __init__(self, max_history: int = 10000, export_enabled: bool = False, export_dir: Optional[Path] = None):
+    ALL_SYMBOLS = "*"
+
+    def __init__(
+        self,
+        max_history: int = 10000,
+        export_enabled: bool = False,
+        export_dir: Optional[Path] = None,
+        registry: Optional[MetricsRegistry] = None,
+        stats_window_s: float = 86400.0,
+        stats_slot_s: float = 60.0
+    ):
         """
         Initialize fill tracker.
 
@@ -113,10 +129,19 @@ class FillTracker:
             max_history: Maximum number of orders to keep in memory
             export_enabled: Enable JSONL export of telemetry
             export_dir: Directory for telemetry exports
+            registry: Metrics registry for fill aggregates (default: private registry;
+                the global tracker reports into the global registry)
+            stats_window_s: Retention of the windowed aggregates (statistics
+                without window_seconds cover this period)
+            stats_slot_s: Time granularity of windowed aggregates
         """
         self.max_history = max_history
         self.export_enabled = export_enabled
         self.export_dir = export_dir
+        self.registry = registry or MetricsRegistry()
+        self.stats_window_s = stats_window_s
+        self.stats_slot_s = stats_slot_s
+        self._symbols = set()
 
         # Order tracking
         self._orders: Dict[str, OrderTelemetry] = {}
@@ -260,6 +285,7 @@ class FillTracker:
         # Move to history
         self._history.append(telemetry)
         del self._orders[order_id]
+        self._aggregate(telemetry)
 
         # Export to JSONL
         if self.export_enabled and self._export_file:
@@ -293,100 +319,86 @@ class FillTracker:
         if cache_key in self._stats_cache and (time.time() - self._stats_cache_time) < self._stats_cache_ttl:
             return self._stats_cache[cache_key]
 
-        # Filter orders
-        orders = list(self._history)
-
-        if symbol:
-            orders = [o for o in orders if o.symbol == symbol]
-
-        if window_seconds:
-            cutoff_time = time.time() - window_seconds
-            orders = [o for o in orders if o.submit_time >= cutoff_time]
+        scope = symbol or self.ALL_SYMBOLS
+        window = window_seconds or None
+        counts = self._outcomes(scope).counts(window)
+        total_orders = int(counts.get("total", 0))
 
-        if not orders:
+        if total_orders == 0:
             return {
                 "total_orders": 0,
                 "symbol": symbol,
                 "window_seconds": window_seconds
             }
 
-        # Calculate statistics
-        total_orders = len(orders)
-        full_fills = [o for o in orders if o.status == FillStatus.FULL_FILL]
-        partial_fills = [o for o in orders if o.status == FillStatus.PARTIAL_FILL]
-        no_fills = [o for o in orders if o.status == FillStatus.NO_FILL]
-        errors = [o for o in orders if o.status == FillStatus.ERROR]
-
-        # Fill rates
-        full_fill_rate = len(full_fills) / total_orders if total_orders > 0 else 0.0
-        partial_fill_rate = len(partial_fills) / total_orders if total_orders > 0 else 0.0
-        no_fill_rate = len(no_fills) / total_orders if total_orders > 0 else 0.0
-        error_rate = len(errors) / total_orders if total_orders > 0 else 0.0
+        full_fills = int(counts.get(FillStatus.FULL_FILL.value, 0))
+        partial_fills = int(counts.get(FillStatus.PARTIAL_FILL.value, 0))
+        no_fills = int(counts.get(FillStatus.NO_FILL.value, 0))
+        errors = int(counts.get(FillStatus.ERROR.value, 0))
 
         # Latency statistics
-        latencies = [o.latency_ms for o in orders if o.latency_ms is not None]
+        latency = self._histogram(scope, "latency_ms", LATENCY_MS_BUCKETS).window(window)
         latency_stats = {}
-        if latencies:
+        if latency.count:
             latency_stats = {
-                "mean_ms": sum(latencies) / len(latencies),
-                "min_ms": min(latencies),
-                "max_ms": max(latencies),
-                "p50_ms": self._percentile(latencies, 0.5),
-                "p95_ms": self._percentile(latencies, 0.95),
-                "p99_ms": self._percentile(latencies, 0.99)
+                "mean_ms": latency.mean,
+                "min_ms": latency.min,
+                "max_ms": latency.max,
+                "p50_ms": latency.quantile(0.5),
+                "p95_ms": latency.quantile(0.95),
+                "p99_ms": latency.quantile(0.99)
             }
 
         # Slippage statistics (only for filled orders)
-        filled_orders = [o for o in orders if o.status in (FillStatus.FULL_FILL, FillStatus.PARTIAL_FILL) and o.slippage_bps is not None]
+        slippage = self._histogram(scope, "slippage_bps", BPS_BUCKETS).window(window)
         slippage_stats = {}
-        if filled_orders:
-            slippages = [o.slippage_bps for o in filled_orders]
+        if slippage.count:
             slippage_stats = {
-                "mean_bps": sum(slippages) / len(slippages),
-                "min_bps": min(slippages),
-                "max_bps": max(slippages),
-                "p50_bps": self._percentile(slippages, 0.5),
-                "p95_bps": self._percentile(slippages, 0.95)
+                "mean_bps": slippage.mean,
+                "min_bps": slippage.min,
+                "max_bps": slippage.max,
+                "p50_bps": slippage.quantile(0.5),
+                "p95_bps": slippage.quantile(0.95)
             }
 
         # Fee statistics
-        fee_rates = [o.fee_rate_bps for o in orders if o.fee_rate_bps is not None]
+        fees = self._histogram(scope, "fee_rate_bps", BPS_BUCKETS).window(window)
         fee_stats = {}
-        if fee_rates:
+        if fees.count:
             fee_stats = {
-                "mean_bps": sum(fee_rates) / len(fee_rates),
-                "min_bps": min(fee_rates),
-                "max_bps": max(fee_rates)
+                "mean_bps": fees.mean,
+                "min_bps": fees.min,
+                "max_bps": fees.max
             }
 
         # Side breakdown
-        buy_orders = [o for o in orders if o.side == OrderSide.BUY]
-        sell_orders = [o for o in orders if o.side == OrderSide.SELL]
+        buy_count = int(counts.get("buy", 0))
+        sell_count = int(counts.get("sell", 0))
 
         stats = {
             "total_orders": total_orders,
             "symbol": symbol,
             "window_seconds": window_seconds,
             "fill_rates": {
-                "full_fill": full_fill_rate,
-                "partial_fill": partial_fill_rate,
-                "no_fill": no_fill_rate,
-                "error": error_rate
+                "full_fill": full_fills / total_orders,
+                "partial_fill": partial_fills / total_orders,
+                "no_fill": no_fills / total_orders,
+                "error": errors / total_orders
             },
             "counts": {
-                "full_fills": len(full_fills),
-                "partial_fills": len(partial_fills),
-                "no_fills": len(no_fills),
-                "errors": len(errors)
+                "full_fills": full_fills,
+                "partial_fills": partial_fills,
+                "no_fills": no_fills,
+                "errors": errors
             },
             "latency": latency_stats,
             "slippage": slippage_stats,
             "fees": fee_stats,
             "side_breakdown": {
-                "buy_count": len(buy_orders),
-                "sell_count": len(sell_orders),
-                "buy_full_fill_rate": len([o for o in buy_orders if o.status == FillStatus.FULL_FILL]) / len(buy_orders) if buy_orders else 0.0,
-                "sell_full_fill_rate": len([o for o in sell_orders if o.status == FillStatus.FULL_FILL]) / len(sell_orders) if sell_orders else 0.0
+                "buy_count": buy_count,
+                "sell_count": sell_count,
+                "buy_full_fill_rate": counts.get("buy_full", 0) / buy_count if buy_count else 0.0,
+                "sell_full_fill_rate": counts.get("sell_full", 0) / sell_count if sell_count else 0.0
             }
         }
 
@@ -398,7 +410,7 @@ class FillTracker:
 
     def get_symbol_statistics(self) -> Dict[str, Dict[str, Any]]:
         """Get statistics broken down by symbol."""
-        symbols = set(o.symbol for o in self._history)
+        symbols = set(self._symbols)
         return {symbol: self.get_statistics(symbol=symbol) for symbol in symbols}
 
     def get_recent_orders(self, limit: int = 100, symbol: Optional[str] = None) -> List[OrderTelemetry]:
@@ -422,10 +434,48 @@ class FillTracker:
     def clear_history(self):
         """Clear order history (keeps pending orders)."""
         self._history.clear()
+        self.registry.unregister_prefix("fills.")
+        self._symbols.clear()
         self._stats_cache.clear()
         self._stats_cache_time = 0
         logger.info("Fill telemetry history cleared")
 
+    # ------------------------------------------------------------------
+    # Windowed aggregates
+    # ------------------------------------------------------------------
+
+    def _outcomes(self, scope: str):
+        return self.registry.windowed_counter(
+            f"fills.{scope}.outcomes", window_s=self.stats_window_s, slot_s=self.stats_slot_s
+        )
+
+    def _histogram(self, scope: str, metric: str, bounds):
+        return self.registry.windowed_histogram(
+            f"fills.{scope}.{metric}", window_s=self.stats_window_s, slot_s=self.stats_slot_s, bounds=bounds
+        )
+
+    def _aggregate(self, telemetry: OrderTelemetry):
+        """Fold a completed order into the global and per-symbol aggregates"""
+        ts = telemetry.submit_time
+        side = "buy" if telemetry.side == OrderSide.BUY else "sell"
+        full = telemetry.status == FillStatus.FULL_FILL
+        filled = telemetry.status in (FillStatus.FULL_FILL, FillStatus.PARTIAL_FILL)
+        self._symbols.add(telemetry.symbol)
+
+        for scope in (self.ALL_SYMBOLS, telemetry.symbol):
+            outcomes = self._outcomes(scope)
+            outcomes.inc("total", timestamp=ts)
+            outcomes.inc(telemetry.status.value, timestamp=ts)
+            outcomes.inc(side, timestamp=ts)
+            if full:
+                outcomes.inc(f"{side}_full", timestamp=ts)
+            if telemetry.latency_ms is not None:
+                self._histogram(scope, "latency_ms", LATENCY_MS_BUCKETS).observe(telemetry.latency_ms, ts)
+            if filled and telemetry.slippage_bps is not None:
+                self._histogram(scope, "slippage_bps", BPS_BUCKETS).observe(telemetry.slippage_bps, ts)
+            if telemetry.fee_rate_bps is not None:
+                self._histogram(scope, "fee_rate_bps", BPS_BUCKETS).observe(telemetry.fee_rate_bps, ts)
+
     @staticmethod
     def _percentile(data: List[float], p: float) -> float:
         """Calculate percentile."""
@@ -461,7 +511,8 @@ def get_fill_tracker(
         _fill_tracker = FillTracker(
             max_history=max_history,
             export_enabled=export_enabled,
-            export_dir=export_dir
+            export_dir=export_dir,
+            registry=get_registry()
         )
         logger.info("Fill tracker initialized (Phase 9)")
     return _fill_tracker
@@ -6,7 +6,16 @@ import threading
 import time
 from collections import deque
 from dataclasses import asdict, dataclass
-from typing import Callable, Dict, List, Tuple, Union
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from core.monitoring.registry import (
+    BPS_BUCKETS,
+    DEFAULT_BUCKETS,
+    LATENCY_MS_BUCKETS,
+    WindowedCounter,
+    WindowedHistogram,
+    get_registry,
+)
 
 
 @dataclass
@@ -73,12 +82,39 @@ class MarketHealthMetrics:
     market_breadth: float       # -1 to +1
 
 class RollingStats:
-    """Rolling Statistiken für Performance-Tracking"""
+    """
+    Rolling Statistiken für Performance-Tracking.
 
-    def __init__(self, maxlen: int = 1000):
+    Rohdaten bleiben (begrenzt) in einer deque für get_recent(); Statistiken
+    und Zählungen kommen aus einem WindowedHistogram der Metrics-Registry und
+    kosten O(slots * buckets) statt O(history).
+    """
+
+    def __init__(self, maxlen: int = 1000, value_key: str = "value", window_s: float = 3600.0,
+                 slot_s: float = 10.0, bounds: Sequence[float] = DEFAULT_BUCKETS,
+                 name: Optional[str] = None):
         self.maxlen = maxlen
+        self.value_key = value_key
         self.data = deque(maxlen=maxlen)
         self.lock = threading.RLock()
+        if name:
+            registry = get_registry()
+            self.window = registry.windowed_histogram(name, window_s=window_s, slot_s=slot_s, bounds=bounds)
+            self.events = registry.windowed_counter(f"{name}.events", window_s=window_s, slot_s=slot_s)
+        else:
+            self.window = WindowedHistogram(window_s=window_s, slot_s=slot_s, bounds=bounds)
+            self.events = WindowedCounter(window_s=window_s, slot_s=slot_s)
+
+    def _numeric(self, value: Union[float, Dict]) -> Optional[float]:
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            return value
+        if isinstance(value, dict):
+            inner = value.get(self.value_key)
+            if isinstance(inner, (int, float)) and not isinstance(inner, bool):
+                return inner
+        return None
 
     def add(self, value: Union[float, Dict], timestamp: float = None):
         """Fügt Datenpunkt hinzu"""
@@ -87,39 +123,36 @@ class RollingStats:
 
         with self.lock:
             self.data.append({"value": value, "timestamp": timestamp})
+        self.events.inc("total", timestamp=timestamp)
+        numeric = self._numeric(value)
+        if numeric is not None:
+            self.window.observe(numeric, timestamp)
 
     def get_recent(self, seconds: float) -> List:
-        """Gibt Daten der letzten X Sekunden zurück"""
+        """Gibt Daten der letzten X Sekunden zurück (Rohdaten, O(history))"""
         cutoff = time.time() - seconds
         with self.lock:
             return [item for item in self.data if item["timestamp"] >= cutoff]
 
-    def get_stats(self, seconds: float = 3600) -> Dict:
-        """Berechnet Statistiken für Zeitfenster"""
-        recent = self.get_recent(seconds)
-
-        if not recent:
-            return {"count": 0}
-
-        values = []
-        for item in recent:
-            if isinstance(item["value"], (int, float)):
-                values.append(item["value"])
-            elif isinstance(item["value"], dict) and "value" in item["value"]:
-                values.append(item["value"]["value"])
+    def count(self, seconds: float = 3600) -> int:
+        """Anzahl Datenpunkte im Zeitfenster (aus dem Slot-Ring)"""
+        return int(self.events.total("total", seconds))
 
-        if not values:
-            return {"count": len(recent)}
+    def get_stats(self, seconds: float = 3600) -> Dict:
+        """Berechnet Statistiken für Zeitfenster (Bucket-basiert)"""
+        hist = self.window.window(seconds)
+        if hist.count == 0:
+            return {"count": self.count(seconds)}
 
         return {
-            "count": len(values),
-            "mean": statistics.mean(values),
-            "median": statistics.median(values),
-            "min": min(values),
-            "max": max(values),
-            "std": statistics.stdev(values) if len(values) > 1 else 0,
-            "p90": statistics.quantiles(values, n=10)[8] if len(values) >= 10 else max(values),
-            "p95": statistics.quantiles(values, n=20)[18] if len(values) >= 20 else max(values)
+            "count": hist.count,
+            "mean": hist.mean,
+            "median": hist.quantile(0.5),
+            "min": hist.min,
+            "max": hist.max,
+            "std": hist.std,
+            "p90": hist.quantile(0.9) if hist.count >= 10 else hist.max,
+            "p95": hist.quantile(0.95) if hist.count >= 20 else hist.max
         }
 
 class TelemetryAggregator:
@@ -132,11 +165,12 @@ class TelemetryAggregator:
         self.lock = threading.RLock()
 
         # Core data streams
-        self.fills = RollingStats(maxlen=500)
-        self.slippage = RollingStats(maxlen=500)
-        self.api_latencies = RollingStats(maxlen=200)
-        self.errors = RollingStats(maxlen=100)
-        self.retries = RollingStats(maxlen=100)
+        self.fills = RollingStats(maxlen=500, value_key="notional", name="heartbeat.fill_notional")
+        self.slippage = RollingStats(maxlen=500, bounds=BPS_BUCKETS, name="heartbeat.slippage_bp")
+        self.api_latencies = RollingStats(maxlen=200, value_key="latency_ms", bounds=LATENCY_MS_BUCKETS,
+                                          name="heartbeat.api_latency_ms")
+        self.errors = RollingStats(maxlen=100, name="heartbeat.errors")
+        self.retries = RollingStats(maxlen=100, name="heartbeat.retries")
 
         # Session tracking
         self.session_start = time.time()
@@ -268,11 +302,10 @@ class TelemetryAggregator:
 
         with self.lock:
             # Fill statistics
-            fills_1h = self.fills.get_recent(3600)
-            fills_5m = self.fills.get_recent(300)
-
-            fill_sizes = [f["value"]["notional"] for f in fills_1h if isinstance(f["value"], dict)]
-            avg_fill_size = statistics.mean(fill_sizes) if fill_sizes else 0.0
+            fill_stats_1h = self.fills.get_stats(3600)
+            fills_1h_count = self.fills.count(3600)
+            fills_5m_count = self.fills.count(300)
+            avg_fill_size = fill_stats_1h.get("mean", 0.0)
 
             # Slippage statistics
             slippage_stats_1h = self.slippage.get_stats(3600)
@@ -285,8 +318,8 @@ class TelemetryAggregator:
             latency_stats = self.api_latencies.get_stats(600)  # 10 minutes
 
             # Error rates
-            errors_1h = len(self.errors.get_recent(3600))
-            retries_1h = len(self.retries.get_recent(3600))
+            errors_1h = self.errors.count(3600)
+            retries_1h = self.retries.count(3600)
 
             # Portfolio metrics
             gross_exposure = sum(abs(pos.get("notional", 0)) for pos in self.current_positions.values())
@@ -321,8 +354,8 @@ class TelemetryAggregator:
                 session_drawdown_peak=self.session_peak_drawdown,
 
                 # Activity
-                fills_last_hour=len(fills_1h),
-                fills_last_5min=len(fills_5m),
+                fills_last_hour=fills_1h_count,
+                fills_last_5min=fills_5m_count,
                 avg_fill_size_quote=avg_fill_size,
 
                 # Execution
@@ -31,6 +31,7 @@ from core.logging.debug_tracer import trace_function, trace_step
 from core.logging.logger import JsonlLogger
 
 # P1: Debounced State Writer for Intent Persistence
+from core.state_store import close_state_store, get_state_store
 from core.state_writer import DebouncedStateWriter
 
 # PnL and Telemetry System
@@ -395,7 +396,8 @@ class TradingEngine:
             self._engine_state_writer = DebouncedStateWriter(
                 file_path=config.ENGINE_TRANSIENT_STATE_FILE,
                 interval_s=config.STATE_PERSIST_INTERVAL_S,
-                auto_start=True
+                auto_start=True,
+                store=get_state_store()
             )
 
             # Recover existing state
@@ -754,6 +756,19 @@ class TradingEngine:
             except Exception as e:
                 logger.error(f"Failed to persist state on shutdown: {e}")
 
+        # Reconciliation worker pool (only exists after a batch reconcile)
+        if self.reconciler:
+            self.reconciler.shutdown()
+
+        # Unified state store: commit staged changes and close
+        try:
+            if get_state_store() is not None and hasattr(self.portfolio, 'save_state'):
+                self.portfolio.save_state()
+            close_state_store()
+        except Exception as e:
+            logger.error(f"Failed to close state store: {e}",
+                         extra={'event_type': 'STATE_STORE_CLOSE_FAILED'})
+
         # Print final statistics
         self.monitoring.log_final_statistics(self.session_digest, self.positions, self.pnl_service)
 
@@ -783,6 +798,11 @@ class TradingEngine:
                     co = self.shutdown_coordinator
                     co.beat("engine_cycle_start")
 
+                    # State Store: the autocommit timer holds off until step 10 commits this cycle
+                    state_store = get_state_store()
+                    if state_store is not None:
+                        state_store.begin_cycle()
+
                     # Heartbeat every 10 cycles
                     if loop_counter % 10 == 0:
                         logger.info(f"💓 Engine heartbeat #{loop_counter} - Active: {len(self.positions)} positions, {len(self.topcoins)} symbols",
@@ -959,6 +979,10 @@ class TradingEngine:
                         guard_stats_maybe_summarize(force=False)
                         co.beat("after_guard_stats")
 
+                    # 10. State Store: commit all changes of this cycle atomically
+                    if state_store is not None:
+                        state_store.commit()
+
                     # Rate limiting
                     time.sleep(0.5)
 
@@ -1163,6 +1187,7 @@ class TradingEngine:
 
             with self._lock:
                 before = len(self.drop_snapshot_store)
+                marked_symbols, marked_prices = [], []
 
                 for snap in snapshots:
                     # Validate snapshot version
@@ -1196,10 +1221,15 @@ class TradingEngine:
                         # Track last snapshot timestamp
                         self._last_snapshot_ts = entry['ts']
 
-                        # NEW: Mark portfolio price for PnL calculation
-                        last_price = snap.get("price", {}).get("last")
+                        # Collect last prices for one bulk mark of the portfolio
+                        last_price = price_data.get("last")
                         if last_price:
-                            self.portfolio.mark_price(symbol, last_price)
+                            marked_symbols.append(symbol)
+                            marked_prices.append(last_price)
+
+                # Mark all positions of this cycle in one pass (consistent valuation)
+                if marked_symbols:
+                    self.portfolio.mark_prices(marked_symbols, marked_prices)
 
                 after = len(self.drop_snapshot_store)
                 logger.debug("ON_SNAPSHOTS", extra={"recv": len(snapshots), "store_before": before, "store_after": after})
@@ -1555,9 +1585,10 @@ class TradingEngine:
     def _calculate_current_equity(self) -> float:
         """Calculate current portfolio equity"""
         try:
+            from services.portfolio_display import current_unrealized_pnl
             usdt_balance = self.portfolio.get_balance("USDT")
             pnl_summary = self.pnl_tracker.get_total_pnl()
-            return usdt_balance + pnl_summary.get("unrealized", 0.0)
+            return usdt_balance + current_unrealized_pnl(self.portfolio, pnl_summary)
         except Exception as e:
             logger.warning(f"Equity calculation failed: {e}")
             return self.portfolio.get_balance("USDT")
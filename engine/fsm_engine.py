@@ -9,7 +9,7 @@ import logging
 import sys
 import threading
 import time
-from datetime import datetime, timezone
+from datetime import timezone
 from typing import Any, Dict, Optional
 
 # Config
@@ -62,6 +62,7 @@ def _release_budget_with_retry(portfolio, quote_amount: float, symbol: str, reas
     return False
 
 from adapters.exchange import ExchangeAdapter as ExchangeAdapterClass
+from core.clock import Clock, get_clock
 from core.fsm.fsm_events import EventContext, FSMEvent
 from core.fsm.fsm_machine import FSMachine
 from core.fsm.partial_fills import PartialFillHandler
@@ -69,6 +70,7 @@ from core.fsm.phases import Phase
 from core.fsm.portfolio_transaction import get_portfolio_transaction, init_portfolio_transaction
 from core.fsm.recovery import recover_fsm_states_on_startup
 from core.fsm.snapshot import SnapshotManager
+from core.state_store import get_state_store
 
 # Core FSM - Table-Driven Architecture
 from core.fsm.state import CoinState
@@ -115,9 +117,16 @@ class FSMTradingEngine:
          → EXIT_EVAL → PLACE_SELL → WAIT_SELL_FILL → POST_TRADE → COOLDOWN → IDLE
     """
 
-    def __init__(self, exchange, portfolio, orderbookprovider, telegram=None, watchlist=None):
-        """Initialize FSM Trading Engine with all services."""
+    def __init__(self, exchange, portfolio, orderbookprovider, telegram=None, watchlist=None, clock=None):
+        """
+        Initialize FSM Trading Engine with all services.
+
+        Args:
+            clock: core.clock.Clock for timestamps, timeouts and loop pacing
+                (default: process-wide core.clock, resolved at call time)
+        """
         logger.info("Initializing FSM Trading Engine...")
+        self._clock = clock
 
         # Core Dependencies
         self.exchange = exchange
@@ -174,9 +183,9 @@ class FSMTradingEngine:
 
         # Table-Driven FSM Components
         self.fsm = FSMachine()
-        self.timeout_manager = TimeoutManager()
+        self.timeout_manager = TimeoutManager(clock=clock)
         self.partial_fill_handler = PartialFillHandler()
-        self.snapshot_manager = SnapshotManager()
+        self.snapshot_manager = SnapshotManager(store=get_state_store())
 
         # Initialize portfolio transaction (needs portfolio and pnl_service)
         init_portfolio_transaction(self.portfolio, self.pnl_service, self.snapshot_manager)
@@ -192,7 +201,7 @@ class FSMTradingEngine:
 
         # Statistics
         self.stats = {
-            "start_time": time.time(),
+            "start_time": self.clock.time(),
             "total_cycles": 0,
             "total_buys": 0,
             "total_sells": 0,
@@ -220,6 +229,10 @@ class FSMTradingEngine:
 
         logger.info(f"FSM Engine initialized: {len(self.watchlist)} symbols")
 
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_clock()
+
     def _initialize_services(self):
         """Initialize all trading services."""
         # Exchange Adapter
@@ -239,7 +252,8 @@ class FSMTradingEngine:
             ticker_cache_ttl=getattr(config, 'TICKER_CACHE_TTL', 5.0),
             max_cache_size=1000,
             enable_drop_tracking=True,
-            event_bus=self.event_bus
+            event_bus=self.event_bus,
+            clock=self._clock
         )
 
         # Buy Signal Service
@@ -247,7 +261,8 @@ class FSMTradingEngine:
             drop_trigger_value=config.DROP_TRIGGER_VALUE,
             drop_trigger_mode=config.DROP_TRIGGER_MODE,
             drop_trigger_lookback_min=config.DROP_TRIGGER_LOOKBACK_MIN,
-            enable_minutely_audit=getattr(config, 'ENABLE_DROP_TRIGGER_MINUTELY', False)
+            enable_minutely_audit=getattr(config, 'ENABLE_DROP_TRIGGER_MINUTELY', False),
+            clock=self._clock
         )
 
         # Drop Snapshot Store (for V9_3 integration)
@@ -326,7 +341,7 @@ class FSMTradingEngine:
         ctx = EventContext(
             event=None,  # Will be set by _emit_event
             symbol=symbol,
-            timestamp=time.time(),
+            timestamp=self.clock.time(),
             order_id=st.order_id or "",
             decision_id=st.decision_id or "",
             data={
@@ -458,9 +473,10 @@ class FSMTradingEngine:
             return
 
         import time
-        now = time.time()
+        now = self.clock.time()
 
         symbols_stored = 0
+        marked_symbols, marked_prices = [], []
         for snapshot in snapshots:
             if isinstance(snapshot, dict) and 'symbol' in snapshot:
                 symbol = snapshot['symbol']
@@ -469,6 +485,14 @@ class FSMTradingEngine:
                     'ts': now
                 }
                 symbols_stored += 1
+                last_price = (snapshot.get('price') or {}).get('last')
+                if last_price:
+                    marked_symbols.append(symbol)
+                    marked_prices.append(last_price)
+
+        # One valuation of all positions per market-data cycle
+        if marked_symbols:
+            self.portfolio.mark_prices(marked_symbols, marked_prices)
 
         _debug_write(f"[EVENT_BUS] Stored {symbols_stored} snapshots. Total store size: {len(self.drop_snapshot_store)}\n")
         sys.stdout.flush()
@@ -493,7 +517,7 @@ class FSMTradingEngine:
             # Initialize drop anchor if configured
             if getattr(config, 'USE_DROP_ANCHOR', False) and ctx.price > 0:
                 st.anchor_price = ctx.price
-                st.anchor_ts = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+                st.anchor_ts = self.clock.now(timezone.utc).isoformat().replace("+00:00", "Z")
                 self.portfolio.set_drop_anchor(st.symbol, ctx.price, st.anchor_ts)
 
             # Emit WARMUP_COMPLETED event
@@ -722,7 +746,7 @@ class FSMTradingEngine:
             logger.info(f"[DROP_DETECTED] {st.symbol}: Drop detected! Mode={signal_context.get('mode')}, Drop%={signal_context.get('drop_pct', 0)*100:.2f}%, Price={ctx.price}")
             st.signal = f"DROP_MODE_{signal_context.get('mode', '?')}"
             if st.fsm_data:
-                st.fsm_data.signal_detected_at = time.time()
+                st.fsm_data.signal_detected_at = self.clock.time()
                 st.fsm_data.signal_type = st.signal
 
             # P2-3: Log signal check step (TRIGGERED)
@@ -799,7 +823,7 @@ class FSMTradingEngine:
             # This prevents duplicate orders for the same symbol within cooldown period.
             if hasattr(st, 'cooldown_until') and st.cooldown_until:
                 import time
-                remaining_cooldown = st.cooldown_until - time.time()
+                remaining_cooldown = st.cooldown_until - self.clock.time()
                 if remaining_cooldown > 0:
                     logger.warning(
                         f"[COOLDOWN_RACE_BLOCKED] {st.symbol} entered cooldown before PLACE_BUY "
@@ -868,7 +892,7 @@ class FSMTradingEngine:
                         "intent": "buy",
                         "decision_id": st.decision_id,
                         "price": ctx.price,
-                        "timestamp": time.time()
+                        "timestamp": self.clock.time()
                     }
                 )
                 budget_reserved = True  # Mark as successfully reserved
@@ -1027,7 +1051,7 @@ class FSMTradingEngine:
             if result.success and result.order_id and str(result.order_id).strip():
                 st.order_id = result.order_id
                 st.client_order_id = intent_id  # Use intent_id as client order id
-                st.order_placed_ts = time.time()
+                st.order_placed_ts = self.clock.time()
 
                 # UI EVENT: ORDER_SUBMITTED (for dashboard)
                 try:
@@ -1060,7 +1084,7 @@ class FSMTradingEngine:
                     st.fsm_data.buy_order = OrderContext(
                         order_id=result.order_id,
                         client_order_id=intent_id,
-                        placed_at=time.time(),
+                        placed_at=self.clock.time(),
                         target_qty=amount,
                         status="pending"
                     )
@@ -1177,7 +1201,7 @@ class FSMTradingEngine:
 
                     if st.wait_fill_retry_count <= 3:
                         logger.warning(f"[WAIT_FILL_RETRY] {st.symbol} retry {st.wait_fill_retry_count}/3")
-                        time.sleep(0.25)  # Brief pause before next tick
+                        self.clock.sleep(0.25)  # Brief pause before next tick
                         return
                     else:
                         # All retries exhausted - ABORT with BUY_ABORTED event
@@ -1206,7 +1230,7 @@ class FSMTradingEngine:
                     logger.error(f"[WAIT_FILL] {st.symbol} aborting after repeated fetch_order failures")
                     self._emit_event(st, FSMEvent.BUY_ABORTED, ctx)
                 else:
-                    time.sleep(0.1)
+                    self.clock.sleep(0.1)
                 return
 
             if not isinstance(order, dict):
@@ -1232,7 +1256,7 @@ class FSMTradingEngine:
 
             # Check total timeout
             if st.order_placed_ts > 0:
-                elapsed = time.time() - st.order_placed_ts
+                elapsed = self.clock.time() - st.order_placed_ts
                 if elapsed > WAIT_FILL_TIMEOUT_S:
                     logger.warning(f"[WAIT_FILL] {st.symbol} TIMEOUT after {elapsed:.1f}s - canceling order {st.order_id}")
                     try:
@@ -1261,12 +1285,12 @@ class FSMTradingEngine:
                 if status == "partial" and 0 < filled < amount:
                     # Track when partial fill started
                     if not hasattr(st, 'partial_fill_started_at'):
-                        st.partial_fill_started_at = time.time()
+                        st.partial_fill_started_at = self.clock.time()
                         st.partial_fill_qty = filled
                         logger.info(f"[WAIT_FILL] {st.symbol} PARTIAL: {filled:.6f}/{amount:.6f}")
                     else:
                         # Check if partial fill is stuck
-                        partial_age = time.time() - st.partial_fill_started_at
+                        partial_age = self.clock.time() - st.partial_fill_started_at
                         if partial_age > PARTIAL_MAX_AGE_S:
                             logger.warning(f"[WAIT_FILL] {st.symbol} PARTIAL STUCK for {partial_age:.1f}s - canceling order {st.order_id}")
                             try:
@@ -1347,7 +1371,7 @@ class FSMTradingEngine:
                     # Update portfolio and state directly - snapshot manager handles persistence
                     st.amount = final_qty
                     st.entry_price = final_price
-                    st.entry_ts = time.time()
+                    st.entry_ts = self.clock.time()
                     st.entry_fee_per_unit = (final_fee / final_qty) if final_qty > 0 else 0
 
                     self.portfolio.add_held_asset(st.symbol, {
@@ -1547,14 +1571,14 @@ class FSMTradingEngine:
             exit_decision = self.exit_engine.choose_exit(
                 coin_state=st,
                 current_price=ctx.price,
-                current_time=time.time()
+                current_time=self.clock.time()
             )
 
             if exit_decision:
                 st.exit_reason = exit_decision.reason
                 if st.fsm_data:
                     st.fsm_data.exit_signal = exit_decision.reason
-                    st.fsm_data.exit_detected_at = time.time()
+                    st.fsm_data.exit_detected_at = self.clock.time()
                     st.fsm_data.exit_price = exit_decision.price  # Fixed: was exit_price, should be price
 
                 # Emit appropriate event based on exit rule
@@ -1606,7 +1630,7 @@ class FSMTradingEngine:
             if order and order.get("id"):
                 st.order_id = order["id"]
                 st.client_order_id = client_order_id
-                st.order_placed_ts = time.time()
+                st.order_placed_ts = self.clock.time()
 
                 # UI EVENT: ORDER_SUBMITTED (for dashboard - sell side)
                 try:
@@ -1625,7 +1649,7 @@ class FSMTradingEngine:
                     st.fsm_data.sell_order = OrderContext(
                         order_id=order["id"],
                         client_order_id=client_order_id,
-                        placed_at=time.time(),
+                        placed_at=self.clock.time(),
                         target_qty=st.amount,
                         status="pending"
                     )
@@ -1794,7 +1818,7 @@ class FSMTradingEngine:
                     pnl_pct=((avg_exit_price - st.entry_price) / st.entry_price * 100) if st.entry_price > 0 else 0.0,
                     exit_reason=st.exit_reason,
                     decision_id=st.decision_id,
-                    duration_seconds=time.time() - st.entry_ts if st.entry_ts > 0 else 0.0
+                    duration_seconds=self.clock.time() - st.entry_ts if st.entry_ts > 0 else 0.0
                 )
             except Exception as e:
                 logger.debug(f"Failed to log trade_close: {e}")
@@ -1866,9 +1890,9 @@ class FSMTradingEngine:
 
             # Set cooldown
             cooldown_minutes = getattr(config, 'SYMBOL_COOLDOWN_MINUTES', 15)
-            st.cooldown_until = time.time() + (cooldown_minutes * 60)
+            st.cooldown_until = self.clock.time() + (cooldown_minutes * 60)
             if st.fsm_data:
-                st.fsm_data.cooldown_started_at = time.time()
+                st.fsm_data.cooldown_started_at = self.clock.time()
 
             # Clear position data
             st.amount = 0.0
@@ -1894,12 +1918,12 @@ class FSMTradingEngine:
                     st.order_id = None
                     st.retry_count = 0
                     cooldown_minutes = getattr(config, 'SYMBOL_COOLDOWN_MINUTES', 15)
-                    st.cooldown_until = time.time() + (cooldown_minutes * 60)
+                    st.cooldown_until = self.clock.time() + (cooldown_minutes * 60)
 
                     # Force transition to COOLDOWN (bypassing POST_TRADE -> TRADE_COMPLETE issue)
                     st.phase = Phase.COOLDOWN
                     if st.fsm_data:
-                        st.fsm_data.cooldown_started_at = time.time()
+                        st.fsm_data.cooldown_started_at = self.clock.time()
 
                     logger.info(f"{st.symbol}: Forced transition to COOLDOWN after order fetch failures")
                     return  # Exit without emitting event to avoid "Invalid transition" error
@@ -1912,19 +1936,19 @@ class FSMTradingEngine:
                 logger.error(f"Post trade error {st.symbol}: {e}")
                 st.amount = 0.0
                 st.retry_count = 0
-                st.cooldown_until = time.time() + (15 * 60)
+                st.cooldown_until = self.clock.time() + (15 * 60)
 
                 # Force transition to COOLDOWN
                 st.phase = Phase.COOLDOWN
                 if st.fsm_data:
-                    st.fsm_data.cooldown_started_at = time.time()
+                    st.fsm_data.cooldown_started_at = self.clock.time()
                 return
 
     def _process_error(self, st: CoinState, ctx: EventContext):
         """ERROR: Exponential backoff recovery."""
         backoff_seconds = min(300, 10 * (2 ** min(st.error_count, 5)))
 
-        if st.ts_ms == 0 or (time.time() - st.ts_ms / 1000.0) > backoff_seconds:
+        if st.ts_ms == 0 or (self.clock.time() - st.ts_ms / 1000.0) > backoff_seconds:
             # Cleanup
             if st.has_position():
                 try:
@@ -1967,7 +1991,7 @@ class FSMTradingEngine:
         # DEBUGGING FIX (P2): Increased from 3s to 10s to ensure cache is fully populated
         _debug_write("[FSM_ENGINE.START] Waiting for market data warmup (10s)...\n")
         sys.stdout.flush()
-        time.sleep(10.0)
+        self.clock.sleep(10.0)
         _debug_write("[FSM_ENGINE.START] Market data warmup complete\n")
         sys.stdout.flush()
 
@@ -1988,6 +2012,7 @@ class FSMTradingEngine:
         if self.main_thread and self.main_thread.is_alive():
             self.main_thread.join(timeout=10.0)
 
+        self.reconciler.shutdown()
         self.phase_logger.close()
         logger.info("FSM Trading Engine stopped")
 
@@ -2002,76 +2027,14 @@ class FSMTradingEngine:
             _debug_write(f"[FSM_ENGINE._main_loop] Starting main loop (running={self.running})\n")
             sys.stdout.flush()
             while self.running:
-                _debug_write(f"[FSM_ENGINE._main_loop] Cycle #{self.cycle_count + 1} starting...\n")
-                sys.stdout.flush()
-                cycle_start = time.time()
-                self.cycle_count += 1
-
-                # Tick timeouts first (cooldowns, order timeouts)
-                _debug_write(f"[FSM_ENGINE._main_loop] Ticking timeouts...\n")
-                sys.stdout.flush()
-                self._tick_timeouts()
-
-                # CRITICAL FIX: Active drop scanner (mirrors Legacy engine behavior)
-                # Runs every 6 cycles (~3 seconds) to actively scan for buy signals
-                # This is what Legacy engine does - FSM was missing this active scan!
-                _debug_write(f"[DEBUG] Cycle {self.cycle_count} mod 6 = {self.cycle_count % 6}\n")
-                sys.stdout.flush()
-                if self.cycle_count % 6 == 0:
-                    _debug_write(f"[FSM_ENGINE._main_loop] ⚡ ACTIVE SCANNER TRIGGERED (Cycle #{self.cycle_count})\n")
-                    sys.stdout.flush()
-                    try:
-                        self._scan_for_drops()
-                    except Exception as e:
-                        logger.error(f"[ACTIVE_SCAN] Scanner failed: {e}", exc_info=True)
-                        _debug_write(f"[ERROR] Scanner failed: {e}\n")
-                        sys.stdout.flush()
-
-                # P1-2: Reconciler sync every 60 cycles (~2 minutes)
-                if self.cycle_count % 60 == 0:
-                    try:
-                        report = self.reconciler.sync(self.states)
-                        if report.desyncs_found > 0:
-                            logger.warning(f"Reconciler found {report.desyncs_found} desyncs, {report.corrections_made} corrections made")
-                    except Exception as e:
-                        logger.debug(f"Reconciler sync failed: {e}")
-
-                # Heartbeat every 10 cycles
-                if self.cycle_count % 10 == 0:
-                    active = len([s for s in self.states.values() if s.phase not in [Phase.IDLE, Phase.WARMUP]])
-                    positions = len([s for s in self.states.values() if s.phase == Phase.POSITION])
-                    logger.info(f"💓 FSM Cycle #{self.cycle_count} - {len(self.states)} symbols | Active: {active} | Positions: {positions}")
-
-                # Process all symbols with event-based FSM
-                _debug_write(f"[FSM_ENGINE._main_loop] Processing {len(self.watchlist)} symbols...\n")
-                sys.stdout.flush()
-                for i, symbol in enumerate(self.watchlist.keys()):
-                    try:
-                        if i == 0:  # Only log first symbol to reduce noise
-                            _debug_write(f"[FSM_ENGINE._main_loop] Building context for {symbol}...\n")
-                            sys.stdout.flush()
-                        md = self._build_context(symbol)
-                        if i == 0:
-                            _debug_write(f"[FSM_ENGINE._main_loop] Context built with price={md.get('price', 'MISSING')}, processing {symbol}...\n")
-                            sys.stdout.flush()
-                        self._process_symbol(symbol, md)
-                    except Exception as e:
-                        logger.error(f"Error processing {symbol}: {e}")
-                        self.stats["total_errors"] += 1
-                        _debug_write(f"[FSM_ENGINE._main_loop] ERROR processing {symbol}: {e}\n")
-                        sys.stdout.flush()
-
-                # Update stuck metrics every 5 cycles
-                if self.cycle_count % 5 == 0:
-                    self._update_stuck_metrics()
-
-                self.stats["total_cycles"] += 1
+                cycle_start = self.clock.time()
+                self.run_cycle()
 
                 # Rate limiting (500ms target)
-                cycle_time = time.time() - cycle_start
+                cycle_time = self.clock.time() - cycle_start
                 sleep_time = max(0.0, 0.5 - cycle_time)
                 if sleep_time > 0:
-                    time.sleep(sleep_time)
+                    self.clock.sleep(sleep_time)
 
         except Exception as fatal_e:
             logger.error(f"Fatal error in FSM main loop: {fatal_e}", exc_info=True)
@@ -2079,10 +2042,83 @@ class FSMTradingEngine:
         finally:
             logger.info("FSM main loop ended")
 
+    def run_cycle(self):
+        """
+        Run one engine cycle: timeouts, periodic scans/reconciliation and
+        FSM processing of every watchlist symbol.
+
+        Called by _main_loop every 500ms; backtests call it directly to
+        drive the engine without threads.
+        """
+        import sys
+        _debug_write(f"[FSM_ENGINE.run_cycle] Cycle #{self.cycle_count + 1} starting...\n")
+        sys.stdout.flush()
+        self.cycle_count += 1
+
+        # Tick timeouts first (cooldowns, order timeouts)
+        _debug_write(f"[FSM_ENGINE.run_cycle] Ticking timeouts...\n")
+        sys.stdout.flush()
+        self._tick_timeouts()
+
+        # CRITICAL FIX: Active drop scanner (mirrors Legacy engine behavior)
+        # Runs every 6 cycles (~3 seconds) to actively scan for buy signals
+        # This is what Legacy engine does - FSM was missing this active scan!
+        _debug_write(f"[DEBUG] Cycle {self.cycle_count} mod 6 = {self.cycle_count % 6}\n")
+        sys.stdout.flush()
+        if self.cycle_count % 6 == 0:
+            _debug_write(f"[FSM_ENGINE.run_cycle] ⚡ ACTIVE SCANNER TRIGGERED (Cycle #{self.cycle_count})\n")
+            sys.stdout.flush()
+            try:
+                self._scan_for_drops()
+            except Exception as e:
+                logger.error(f"[ACTIVE_SCAN] Scanner failed: {e}", exc_info=True)
+                _debug_write(f"[ERROR] Scanner failed: {e}\n")
+                sys.stdout.flush()
+
+        # P1-2: Reconciler sync every 60 cycles (~2 minutes)
+        if self.cycle_count % 60 == 0:
+            try:
+                report = self.reconciler.sync(self.states)
+                if report.desyncs_found > 0:
+                    logger.warning(f"Reconciler found {report.desyncs_found} desyncs, {report.corrections_made} corrections made")
+            except Exception as e:
+                logger.debug(f"Reconciler sync failed: {e}")
+
+        # Heartbeat every 10 cycles
+        if self.cycle_count % 10 == 0:
+            active = len([s for s in self.states.values() if s.phase not in [Phase.IDLE, Phase.WARMUP]])
+            positions = len([s for s in self.states.values() if s.phase == Phase.POSITION])
+            logger.info(f"💓 FSM Cycle #{self.cycle_count} - {len(self.states)} symbols | Active: {active} | Positions: {positions}")
+
+        # Process all symbols with event-based FSM
+        _debug_write(f"[FSM_ENGINE.run_cycle] Processing {len(self.watchlist)} symbols...\n")
+        sys.stdout.flush()
+        for i, symbol in enumerate(self.watchlist.keys()):
+            try:
+                if i == 0:  # Only log first symbol to reduce noise
+                    _debug_write(f"[FSM_ENGINE.run_cycle] Building context for {symbol}...\n")
+                    sys.stdout.flush()
+                md = self._build_context(symbol)
+                if i == 0:
+                    _debug_write(f"[FSM_ENGINE.run_cycle] Context built with price={md.get('price', 'MISSING')}, processing {symbol}...\n")
+                    sys.stdout.flush()
+                self._process_symbol(symbol, md)
+            except Exception as e:
+                logger.error(f"Error processing {symbol}: {e}")
+                self.stats["total_errors"] += 1
+                _debug_write(f"[FSM_ENGINE.run_cycle] ERROR processing {symbol}: {e}\n")
+                sys.stdout.flush()
+
+        # Update stuck metrics every 5 cycles
+        if self.cycle_count % 5 == 0:
+            self._update_stuck_metrics()
+
+        self.stats["total_cycles"] += 1
+
     def _build_context(self, symbol: str) -> Dict[str, Any]:
         """Build context dict with current market data."""
         import sys
-        ctx = {"symbol": symbol, "timestamp": time.time()}
+        ctx = {"symbol": symbol, "timestamp": self.clock.time()}
 
         try:
             # Get current price from market data service
@@ -2123,7 +2159,7 @@ class FSMTradingEngine:
 
             # STALENESS CHECK: Force fresh fetch if ticker is too old (> 10 seconds)
             if ticker and hasattr(ticker, 'timestamp') and ticker.timestamp:
-                age_seconds = (time.time() * 1000 - ticker.timestamp) / 1000.0
+                age_seconds = (self.clock.time() * 1000 - ticker.timestamp) / 1000.0
                 if age_seconds > 10.0:
                     logger.warning(
                         f"{symbol}: Ticker is {age_seconds:.1f}s old - may use stale data",
@@ -2247,14 +2283,14 @@ class FSMTradingEngine:
                     # Store signal info
                     st.signal = f"DROP_MODE_{mode}"
                     if st.fsm_data:
-                        st.fsm_data.signal_detected_at = time.time()
+                        st.fsm_data.signal_detected_at = self.clock.time()
                         st.fsm_data.signal_type = st.signal
 
                     # Force transition to ENTRY_EVAL by emitting SLOT_AVAILABLE
                     ctx = EventContext(
                         event=FSMEvent.SLOT_AVAILABLE,
                         symbol=symbol,
-                        timestamp=time.time(),
+                        timestamp=self.clock.time(),
                         price=price,
                         data={
                             "price": price,
@@ -2293,7 +2329,7 @@ class FSMTradingEngine:
             **self.stats,
             "total_symbols": len(self.states),
             "active_positions": len([s for s in self.states.values() if s.phase == Phase.POSITION]),
-            "uptime_seconds": time.time() - self.stats["start_time"],
+            "uptime_seconds": self.clock.time() - self.stats["start_time"],
         }
 
     def is_running(self) -> bool:
@@ -2315,7 +2351,7 @@ class FSMTradingEngine:
     def get_stuck_symbols(self, threshold_seconds: float = 60.0) -> list:
         """Get stuck symbols (in non-idle phases for too long)."""
         stuck = []
-        now = time.time()
+        now = self.clock.time()
         for symbol, st in self.states.items():
             if st.phase not in [Phase.IDLE, Phase.WARMUP, Phase.COOLDOWN]:
                 if st.ts_ms > 0:
@@ -5,16 +5,17 @@ Exchange Wrapper - Idempotent Order Execution
 Wraps CCXT exchange with:
 - Idempotent order placement via clientOrderId
 - Wait-for-fill polling with timeout
-- Order trades fetching for reconciliation
+- Order trades fetching for reconciliation (per order or per symbol)
 - Error handling and retry logic
 
 This is the ONLY module that should call CCXT directly for order operations.
 """
 
 import logging
-import time
 from typing import Any, Dict, List, Optional
 
+from core.clock import Clock, get_clock
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,14 +30,20 @@ class ExchangeWrapper:
     - Trade fetching for reconciliation
     """
 
-    def __init__(self, ccxt_exchange):
+    def __init__(self, ccxt_exchange, clock: Optional[Clock] = None):
         """
         Initialize exchange wrapper.
 
         Args:
             ccxt_exchange: CCXT exchange instance (e.g., ccxt.binance())
+            clock: Time source for fill polling (default: process-wide core.clock)
         """
         self.ccxt = ccxt_exchange
+        self._clock = clock
+
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_clock()
 
     def create_market_order(
         self,
@@ -158,11 +165,11 @@ class ExchangeWrapper:
             >>> print(result)
             {'status': 'closed', 'filled': 0.001, 'remaining': 0.0}
         """
-        end_time = time.time() + (timeout_ms / 1000.0)
+        end_time = self.clock.time() + (timeout_ms / 1000.0)
         last_status = {"status": "open", "filled": 0.0, "remaining": 0.0}
 
         try:
-            while time.time() < end_time:
+            while self.clock.time() < end_time:
                 try:
                     order = self.ccxt.fetch_order(order_id, symbol)
 
@@ -179,11 +186,11 @@ class ExchangeWrapper:
                         break
 
                     # Poll interval: 200ms
-                    time.sleep(0.2)
+                    self.clock.sleep(0.2)
 
                 except Exception as poll_error:
                     logger.warning(f"Order status poll failed for {order_id}: {poll_error}")
-                    time.sleep(0.2)
+                    self.clock.sleep(0.2)
                     continue
 
         except Exception as e:
@@ -227,6 +234,31 @@ class ExchangeWrapper:
             logger.error(f"fetch_order_trades failed for {order_id}: {e}")
             return []
 
+    def fetch_my_trades(
+        self,
+        symbol: str,
+        since: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch own trades of a symbol (batch reconciliation).
+
+        Args:
+            symbol: Trading pair
+            since: Start timestamp in ms (None = exchange default)
+            limit: Max trades returned
+
+        Returns:
+            List of CCXT trade dicts (with "order" = exchange order ID)
+
+        Raises:
+            Exception: Fetch errors are propagated so callers can fall back
+                to fetch_order_trades
+        """
+        trades = self.ccxt.fetch_my_trades(symbol, since, limit)
+        logger.debug(f"Fetched {len(trades)} trades for {symbol} since {since}")
+        return trades
+
     def fetch_order(
         self,
         symbol: str,
@@ -200,8 +200,21 @@ def setup_exchange():
         logger.warning(f"Zeitabgleich fehlgeschlagen: {e}", extra={'event_type': 'TIME_SYNC_WARN'})
 
     # Force reload, damit symbol->id Mapping fuer Spot fix ist
+    # Mit Market-Metadaten-Cache: Markets sofort aus Datei, Reload im Hintergrund
     try:
-        exchange.load_markets(True)
+        markets_cache = None
+        if getattr(config_module, 'MARKET_METADATA_CACHE', False):
+            from services.market_metadata import MarketMetadataCache
+            markets_cache = MarketMetadataCache(
+                getattr(config_module, 'MARKET_METADATA_FILE', "state/market_metadata.json"),
+                exchange_id=getattr(exchange, 'id', None))
+        max_age_s = getattr(config_module, 'MARKET_METADATA_MAX_AGE_S', 7 * 24 * 3600)
+        if markets_cache and markets_cache.load(max_age_s) and markets_cache.install(exchange):
+            markets_cache.refresh_async(exchange)
+        else:
+            exchange.load_markets(True)
+            if markets_cache:
+                markets_cache.update(exchange.markets)
         logger.info("Markets erfolgreich geladen", extra={'event_type': 'LOAD_MARKETS_SUCCESS'})
 
         # Optional: load_markets Dump für Exchange-Tracing (einmal pro Session)
@@ -447,7 +460,7 @@ def main():
 
             recorder = get_exchange_recorder()
             if recorder.enabled:
-                recording_filename = getattr(config_module, "EXCHANGE_RECORDING_FILENAME", "mexc_api_calls.jsonl")
+                recording_filename = getattr(config_module, "EXCHANGE_RECORDING_FILENAME", "mexc_api_calls.jsonl.gz")
                 recording_path = os.path.join(config_module.SESSION_DIR, "logs", recording_filename)
                 recorder.set_output_path(recording_path)
                 recorder.set_metadata(
@@ -895,6 +908,9 @@ def main():
         # Register shutdown callback for trade cache
         shutdown_coordinator.add_cleanup_callback(shutdown_trade_cache)
 
+        # Flush portfolio state journal and compact it into the snapshot files
+        shutdown_coordinator.add_cleanup_callback(portfolio.close_state)
+
         # Phase 2: Initialize idempotency store for duplicate order prevention
         try:
             from core.idempotency import initialize_idempotency_store
@@ -910,6 +926,8 @@ def main():
                         logger.debug(f"Idempotency cleanup: removed {deleted} old records")
                 except Exception as e:
                     logger.warning(f"Idempotency cleanup failed: {e}")
+                # Commit queued group-commit writes before exit
+                idempotency_store.close()
 
             shutdown_coordinator.add_cleanup_callback(idempotency_cleanup)
         except Exception as idempotency_error:
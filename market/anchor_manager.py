@@ -12,9 +12,13 @@ Manages price anchors for drop-trigger logic with 4 operating modes:
 import json
 import logging
 import os
-import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
+
+from core.clock import Clock, get_clock
+
+if TYPE_CHECKING:
+    from core.state_store import StateStore
 
 logger = logging.getLogger(__name__)
 
@@ -30,14 +34,21 @@ class AnchorManager:
     - Start-drop clamp (anchor >= start_price * (1 - max_drop%))
     """
 
-    def __init__(self, base_path: str = "state/anchors", load_on_start: bool = True):
+    STORE_NAMESPACE = "anchors"
+
+    def __init__(self, base_path: str = "state/anchors", load_on_start: bool = True,
+                 clock: Optional[Clock] = None, store: Optional["StateStore"] = None):
         """
         Initialize AnchorManager.
 
         Args:
             base_path: Directory for anchor persistence (Mode 4 only)
             load_on_start: Whether to load persisted anchors on startup (default: True with TTL check)
+            clock: Time source (default: process-wide core.clock)
+            store: Unified state store (replaces anchors.json, which is imported once)
         """
+        self._clock = clock
+        self.store = store
         self.base_path = base_path
         self.load_on_start = load_on_start
         Path(self.base_path).mkdir(parents=True, exist_ok=True)
@@ -55,6 +66,10 @@ class AnchorManager:
         else:
             logger.info(f"AnchorManager initialized with fresh start (base_path={self.base_path}, persistence disabled on startup)")
 
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_clock()
+
     def note_price(self, symbol: str, price: float, now: float) -> None:
         """
         Track price for anchor calculation.
@@ -211,6 +226,11 @@ class AnchorManager:
         if not self._anchors:
             return
 
+        if self.store is not None:
+            # Only changed anchors are staged, committed with the engine cycle
+            self.store.sync(self.STORE_NAMESPACE, self._anchors)
+            return
+
         path = Path(self.base_path) / "anchors.json"
         tmp_path = path.with_suffix(".json.tmp")
 
@@ -241,18 +261,22 @@ class AnchorManager:
         anchors older than ANCHOR_MAX_AGE_HOURS.
         """
         path = Path(self.base_path) / "anchors.json"
-        if not path.exists():
+        if self.store is None and not path.exists():
             return
 
         try:
-            with path.open("r") as f:
-                loaded_anchors = json.load(f)
+            if self.store is not None:
+                loaded_anchors = self.store.load(self.STORE_NAMESPACE, legacy=self._read_file)
+                path = self.store.path
+            else:
+                with path.open("r") as f:
+                    loaded_anchors = json.load(f)
 
             # Import config for TTL setting
             import config
             max_age_hours = getattr(config, "ANCHOR_MAX_AGE_HOURS", 24)
             max_age_seconds = max_age_hours * 3600
-            now = time.time()
+            now = self.clock.time()
 
             # Filter out stale anchors (older than max_age_hours)
             valid_anchors = {}
@@ -282,6 +306,14 @@ class AnchorManager:
             logger.warning(f"Failed to load anchors: {e}")
             self._anchors = {}
 
+    def _read_file(self) -> Dict[str, Dict[str, float]]:
+        """anchors.json content (legacy import into the store)"""
+        path = Path(self.base_path) / "anchors.json"
+        if not path.exists():
+            return {}
+        with path.open("r") as f:
+            return json.load(f)
+
     def clear(self) -> None:
         """Clear all anchor state (for testing)."""
         self._anchors.clear()
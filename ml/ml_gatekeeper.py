@@ -1,16 +1,19 @@
 # ml_gatekeeper.py
 # V10-Style ML Gatekeeper für intelligente Budget-Skalierung ohne harte Blocks
 
+import itertools
 import pickle
 import threading
 import time
 from collections import defaultdict, deque
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple, Union
 
 import numpy as np
 
+from core.monitoring.registry import Histogram, exponential_buckets
+
 
 class ScalingStrategy(Enum):
     """Verschiedene Scaling-Strategien"""
@@ -92,20 +95,131 @@ class ScalingDecision:
     scaling_reason: str
     model_version: str = "heuristic_v1"
 
+# Feature-Layout: feste Spaltenreihenfolge (alphabetisch, wie bisher sorted(features.keys()))
+FEATURE_NAMES = tuple(sorted((
+    "market_volatility", "market_trend", "volume_anomaly", "market_regime",
+    "symbol_momentum", "relative_strength", "mean_reversion", "liquidity_score",
+    "drawdown", "win_rate", "sharpe", "concentration", "buying_power",
+    "volatility_regime", "trend_strength",
+    "hour_sin", "hour_cos", "day_sin", "day_cos",
+)))
+
+# Normalisierte Features: (Feature, Statistik-Name) je Quelle
+_MARKET_STATS = (("market_volatility", "market_vol"), ("market_trend", "market_trend"),
+                 ("volume_anomaly", "volume_anomaly"))
+_SYMBOL_STATS = (("symbol_momentum", "symbol_momentum"), ("relative_strength", "relative_strength"),
+                 ("mean_reversion", "mean_reversion"), ("liquidity_score", "liquidity"))
+_PORTFOLIO_STATS = (("drawdown", "drawdown"), ("win_rate", "win_rate"), ("sharpe", "sharpe"),
+                    ("concentration", "concentration"), ("buying_power", "buying_power"))
+_REGIME_STATS = (("volatility_regime", "vol_regime"),)
+_NORMALIZED = _MARKET_STATS + _SYMBOL_STATS + _PORTFOLIO_STATS + _REGIME_STATS
+
+_REGIME_SCORES = {"bull": 1.0, "bear": -1.0, "neutral": 0.0, "volatile": -0.5, "unknown": 0.0}
+
+
+class FeatureSchema:
+    """Kompiliertes Feature-Layout: Name -> feste Spalte der Feature-Matrix"""
+
+    def __init__(self, names: Sequence[str]):
+        self.names = tuple(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.size = len(self.names)
+
+    def columns(self, names: Sequence[str]) -> np.ndarray:
+        return np.array([self.index[name] for name in names], dtype=np.intp)
+
+    def vector(self, features: Dict[str, float]) -> np.ndarray:
+        """Feature-Dict -> Zeile (fehlende Features = 0.0)"""
+        return np.array([features.get(name, 0.0) for name in self.names], dtype=np.float64)
+
+    def to_dict(self, row: np.ndarray) -> Dict[str, float]:
+        return dict(zip(self.names, row.tolist()))
+
+
+FEATURE_SCHEMA = FeatureSchema(FEATURE_NAMES)
+
+
+class RunningStats:
+    """Laufende Mittelwerte/Standardabweichungen (Welford) mehrerer Features in NumPy-Arrays"""
+
+    def __init__(self, names: Sequence[str]):
+        self.names = tuple(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+        self.count = np.zeros(n, dtype=np.int64)
+        self.mean = np.zeros(n, dtype=np.float64)
+        self.m2 = np.zeros(n, dtype=np.float64)
+        self.std = np.ones(n, dtype=np.float64)
+
+    def normalize(self, slots: np.ndarray, values: np.ndarray,
+                  clip_range: Tuple[float, float] = (-3.0, 3.0)) -> np.ndarray:
+        """
+        Nimmt values in die Statistiken auf und liefert die geclippten Z-Scores.
+
+        Args:
+            slots: Indizes der Statistiken
+            values: Neue Werte (gleiche Länge)
+        """
+        count = self.count[slots]
+        mean = self.mean[slots]
+        new_count = count + 1
+        delta = values - mean
+        new_mean = mean + delta / new_count
+        seen = count > 0
+        new_m2 = np.where(seen, self.m2[slots] + delta * (values - new_mean), 0.0)
+        var = new_m2 / new_count
+        std = np.where(seen & (var > 0), np.sqrt(np.maximum(var, 0.0)), 1.0)
+        std = np.maximum(std, 0.01)  # Prevent division by zero
+
+        self.count[slots] = new_count
+        self.mean[slots] = new_mean
+        self.m2[slots] = new_m2
+        self.std[slots] = std
+        return np.clip((values - new_mean) / std, clip_range[0], clip_range[1])
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: {"mean": float(self.mean[i]), "std": float(self.std[i]),
+                       "count": int(self.count[i]), "m2": float(self.m2[i])}
+                for i, name in enumerate(self.names) if self.count[i]}
+
+
 class FeatureExtractor:
     """
     Extrahiert Features für ML-basierte Entscheidungen.
     Kann sowohl heuristische als auch ML-basierte Features bereitstellen.
+
+    Features werden direkt in eine vorallokierte Matrix mit festem Layout
+    (FEATURE_SCHEMA) geschrieben; extract_features liefert weiterhin ein Dict.
     """
 
-    def __init__(self):
+    def __init__(self, schema: FeatureSchema = FEATURE_SCHEMA):
         self.lock = threading.RLock()
         self.market_history = deque(maxlen=1000)
         self.symbol_history = defaultdict(lambda: deque(maxlen=500))
         self.portfolio_history = deque(maxlen=1000)
+        self.schema = schema
 
         # Feature normalization parameters
-        self.feature_stats = defaultdict(lambda: {"mean": 0.0, "std": 1.0, "count": 0})
+        self.stats = RunningStats([stat for _, stat in _NORMALIZED])
+        self._stat_columns = np.empty(len(self.stats.names), dtype=np.intp)
+        for feature, stat in _NORMALIZED:
+            self._stat_columns[self.stats.index[stat]] = schema.index[feature]
+        self._market_slots = self._slots(_MARKET_STATS)
+        self._symbol_slots = self._slots(_SYMBOL_STATS)
+        self._portfolio_slots = self._slots(_PORTFOLIO_STATS)
+        self._regime_slots = self._slots(_REGIME_STATS)
+        self._trend_weights: Dict[int, np.ndarray] = {}
+
+        # Vorallokierte Feature-Matrix (wächst bei größeren Batches)
+        self._matrix = np.zeros((64, schema.size), dtype=np.float64)
+
+    def _slots(self, group) -> np.ndarray:
+        return np.array([self.stats.index[stat] for _, stat in group], dtype=np.intp)
+
+    @property
+    def feature_stats(self) -> Dict[str, Dict[str, float]]:
+        """Laufende Normalisierungs-Statistiken je Feature"""
+        return self.stats.as_dict()
 
     def update_market_data(self, market_features: MarketFeatures):
         """Aktualisiert Market-Features"""
@@ -125,14 +239,20 @@ class FeatureExtractor:
             portfolio_features.timestamp = time.time()
             self.portfolio_history.append(portfolio_features)
 
+    @staticmethod
+    def _tail(history: deque, n: int):
+        """Letzte n Einträge ohne Kopie der ganzen Historie"""
+        return itertools.islice(history, len(history) - n, None)
+
     def _calculate_volatility_regime(self, lookback_periods: int = 20) -> Tuple[float, str]:
         """Berechnet Volatility-Regime basierend auf Historie"""
         if len(self.market_history) < lookback_periods:
             return 0.0, "unknown"
 
-        recent_vol = [m.volatility_zscore for m in list(self.market_history)[-lookback_periods:]]
-        avg_vol = np.mean(recent_vol)
-        vol_trend = np.mean(np.diff(recent_vol)) if len(recent_vol) > 1 else 0.0
+        recent_vol = np.fromiter((m.volatility_zscore for m in self._tail(self.market_history, lookback_periods)),
+                                 dtype=np.float64, count=lookback_periods)
+        avg_vol = recent_vol.mean()
+        vol_trend = np.diff(recent_vol).mean() if len(recent_vol) > 1 else 0.0
 
         if avg_vol > 2.0:
             regime = "high_vol"
@@ -150,144 +270,116 @@ class FeatureExtractor:
     def _calculate_trend_strength(self, symbol: str = None, lookback_periods: int = 10) -> float:
         """Berechnet Trend-Stärke für Symbol oder Market"""
         if symbol:
-            if symbol not in self.symbol_history or len(self.symbol_history[symbol]) < lookback_periods:
+            history = self.symbol_history.get(symbol)
+            if history is None or len(history) < lookback_periods:
                 return 0.0
-            recent_data = list(self.symbol_history[symbol])[-lookback_periods:]
-            trend_scores = [d.momentum_score for d in recent_data]
+            trend_scores = [d.momentum_score for d in self._tail(history, lookback_periods)]
         else:
             if len(self.market_history) < lookback_periods:
                 return 0.0
-            recent_data = list(self.market_history)[-lookback_periods:]
-            trend_scores = [d.trend_strength for d in recent_data]
+            trend_scores = [d.trend_strength for d in self._tail(self.market_history, lookback_periods)]
 
         if not trend_scores:
             return 0.0
 
         # Weighted average mit mehr Gewicht auf recent data
-        weights = np.linspace(0.5, 1.0, len(trend_scores))
-        weighted_avg = np.average(trend_scores, weights=weights)
-
-        return float(np.clip(weighted_avg, -1.0, 1.0))
-
-    def _update_feature_stats(self, feature_name: str, value: float):
-        """Aktualisiert laufende Statistiken für Feature-Normalisierung"""
-        stats = self.feature_stats[feature_name]
-        count = stats["count"]
-        old_mean = stats["mean"]
-
-        # Online mean and variance calculation (Welford's algorithm)
-        new_count = count + 1
-        delta = value - old_mean
-        new_mean = old_mean + delta / new_count
-
-        if count > 0:
-            delta2 = value - new_mean
-            new_m2 = stats.get("m2", 0) + delta * delta2
-            new_var = new_m2 / new_count if new_count > 1 else 0
-            new_std = np.sqrt(new_var) if new_var > 0 else 1.0
-        else:
-            new_std = 1.0
+        weights = self._trend_weights.get(lookback_periods)
+        if weights is None:
+            weights = np.linspace(0.5, 1.0, lookback_periods)
+            weights = self._trend_weights.setdefault(lookback_periods, weights / weights.sum())
+        weighted_avg = float(np.dot(trend_scores, weights))
 
-        stats.update({
-            "count": new_count,
-            "mean": new_mean,
-            "std": max(new_std, 0.01),  # Prevent division by zero
-            "m2": stats.get("m2", 0) + delta * (value - new_mean) if count > 0 else 0
-        })
+        return min(max(weighted_avg, -1.0), 1.0)
 
     def _normalize_feature(self, feature_name: str, value: float, clip_range: Tuple[float, float] = (-3, 3)) -> float:
         """Normalisiert Feature zu Z-Score mit Clipping"""
-        self._update_feature_stats(feature_name, value)
-        stats = self.feature_stats[feature_name]
+        slot = np.array([self.stats.index[feature_name]], dtype=np.intp)
+        return float(self.stats.normalize(slot, np.array([value], dtype=np.float64), clip_range)[0])
 
-        z_score = (value - stats["mean"]) / stats["std"]
-        return float(np.clip(z_score, clip_range[0], clip_range[1]))
+    def _matrix_rows(self, n: int) -> np.ndarray:
+        if n > len(self._matrix):
+            self._matrix = np.zeros((max(n, 2 * len(self._matrix)), self.schema.size), dtype=np.float64)
+        rows = self._matrix[:n]
+        rows.fill(0.0)
+        return rows
 
-    def extract_features(self, symbol: str, context: Dict = None) -> Dict[str, float]:
+    def extract_matrix(self, symbols: Sequence[str], context: Dict = None) -> np.ndarray:
         """
-        Extrahiert alle Features für Gatekeeper-Entscheidung.
+        Extrahiert die Features mehrerer Symbole als Matrix (eine Zeile je Symbol).
 
-        Args:
-            symbol: Trading symbol
-            context: Additional context (current price, etc.)
+        Zeilen werden nacheinander normalisiert, die Statistiken entwickeln
+        sich also genau wie bei einzelnen extract_features-Aufrufen.
 
         Returns:
-            Dict mit normalisierten Features
+            View auf die vorallokierte Matrix - nur gültig bis zum nächsten
+            Aufruf (Aufrufer hält self.lock, solange er sie liest)
         """
-        context = context or {}
-        features = {}
-
+        index = self.schema.index
         with self.lock:
-            # Market features
+            rows = self._matrix_rows(len(symbols))
+
+            # Pro Batch konstante Werte
+            raw = np.zeros(len(self.stats.names), dtype=np.float64)
+            shared = [self._regime_slots]
             if self.market_history:
                 latest_market = self.market_history[-1]
-                features["market_volatility"] = self._normalize_feature("market_vol", latest_market.volatility_zscore)
-                features["market_trend"] = self._normalize_feature("market_trend", latest_market.trend_strength)
-                features["volume_anomaly"] = self._normalize_feature("volume_anomaly", latest_market.volume_anomaly)
-
-                # Regime features (categorical -> numeric encoding)
-                regime_score = {
-                    "bull": 1.0, "bear": -1.0, "neutral": 0.0,
-                    "volatile": -0.5, "unknown": 0.0
-                }.get(latest_market.market_regime, 0.0)
-                features["market_regime"] = regime_score
-            else:
-                features.update({
-                    "market_volatility": 0.0,
-                    "market_trend": 0.0,
-                    "volume_anomaly": 0.0,
-                    "market_regime": 0.0
-                })
-
-            # Symbol features
-            if symbol in self.symbol_history and self.symbol_history[symbol]:
-                latest_symbol = self.symbol_history[symbol][-1]
-                features["symbol_momentum"] = self._normalize_feature("symbol_momentum", latest_symbol.momentum_score)
-                features["relative_strength"] = self._normalize_feature("relative_strength", latest_symbol.relative_strength)
-                features["mean_reversion"] = self._normalize_feature("mean_reversion", latest_symbol.mean_reversion)
-                features["liquidity_score"] = self._normalize_feature("liquidity", latest_symbol.liquidity_score)
-            else:
-                features.update({
-                    "symbol_momentum": 0.0,
-                    "relative_strength": 0.0,
-                    "mean_reversion": 0.0,
-                    "liquidity_score": 0.0
-                })
-
-            # Portfolio features
+                raw[self._market_slots] = (latest_market.volatility_zscore, latest_market.trend_strength,
+                                           latest_market.volume_anomaly)
+                rows[:, index["market_regime"]] = _REGIME_SCORES.get(latest_market.market_regime, 0.0)
+                shared.append(self._market_slots)
             if self.portfolio_history:
                 latest_portfolio = self.portfolio_history[-1]
-                features["drawdown"] = self._normalize_feature("drawdown", latest_portfolio.current_drawdown)
-                features["win_rate"] = self._normalize_feature("win_rate", latest_portfolio.win_rate_recent - 0.5)  # Center around 0
-                features["sharpe"] = self._normalize_feature("sharpe", latest_portfolio.sharpe_estimate)
-                features["concentration"] = self._normalize_feature("concentration", latest_portfolio.position_concentration)
-                features["buying_power"] = self._normalize_feature("buying_power", latest_portfolio.available_buying_power - 0.5)
-            else:
-                features.update({
-                    "drawdown": 0.0,
-                    "win_rate": 0.0,
-                    "sharpe": 0.0,
-                    "concentration": 0.0,
-                    "buying_power": 0.0
-                })
+                raw[self._portfolio_slots] = (
+                    latest_portfolio.current_drawdown,
+                    latest_portfolio.win_rate_recent - 0.5,  # Center around 0
+                    latest_portfolio.sharpe_estimate,
+                    latest_portfolio.position_concentration,
+                    latest_portfolio.available_buying_power - 0.5,
+                )
+                shared.append(self._portfolio_slots)
+            raw[self._regime_slots] = self._calculate_volatility_regime()[0]
+            shared_slots = np.concatenate(shared)
+            symbol_slots = np.concatenate((shared_slots, self._symbol_slots))
 
-            # Derived features
-            vol_regime_score, _ = self._calculate_volatility_regime()
-            features["volatility_regime"] = self._normalize_feature("vol_regime", vol_regime_score)
+            # Time-based features
+            now = time.gmtime()
+            rows[:, index["hour_sin"]] = np.sin(2 * np.pi * now.tm_hour / 24)
+            rows[:, index["hour_cos"]] = np.cos(2 * np.pi * now.tm_hour / 24)
+            rows[:, index["day_sin"]] = np.sin(2 * np.pi * now.tm_wday / 7)
+            rows[:, index["day_cos"]] = np.cos(2 * np.pi * now.tm_wday / 7)
+
+            trend_column = index["trend_strength"]
+            for r, symbol in enumerate(symbols):
+                history = self.symbol_history.get(symbol)
+                if history:
+                    latest_symbol = history[-1]
+                    raw[self._symbol_slots] = (latest_symbol.momentum_score, latest_symbol.relative_strength,
+                                               latest_symbol.mean_reversion, latest_symbol.liquidity_score)
+                    slots = symbol_slots
+                else:
+                    slots = shared_slots
+                rows[r, self._stat_columns[slots]] = self.stats.normalize(slots, raw[slots])
+                rows[r, trend_column] = self._calculate_trend_strength(symbol)  # Already normalized
+
+            return rows
 
-            trend_strength = self._calculate_trend_strength(symbol)
-            features["trend_strength"] = trend_strength  # Already normalized
+    def extract_features(self, symbol: str, context: Dict = None) -> Dict[str, float]:
+        """
+        Extrahiert alle Features für Gatekeeper-Entscheidung.
 
-            # Time-based features
-            hour_of_day = time.gmtime().tm_hour
-            features["hour_sin"] = np.sin(2 * np.pi * hour_of_day / 24)
-            features["hour_cos"] = np.cos(2 * np.pi * hour_of_day / 24)
+        Args:
+            symbol: Trading symbol
+            context: Additional context (current price, etc.)
+
+        Returns:
+            Dict mit normalisierten Features
+        """
+        with self.lock:
+            return self.schema.to_dict(self.extract_matrix([symbol], context)[0])
 
-            day_of_week = time.gmtime().tm_wday
-            features["day_sin"] = np.sin(2 * np.pi * day_of_week / 7)
-            features["day_cos"] = np.cos(2 * np.pi * day_of_week / 7)
+# 1µs .. ~650ms
+_LATENCY_US_BUCKETS = exponential_buckets(1.0, 1.25, 60)
 
-            return features
 
 class MLGatekeeper:
     """
@@ -307,6 +399,9 @@ class MLGatekeeper:
         self.decision_history = deque(maxlen=1000)
         self.performance_tracking = defaultdict(list)
 
+        # Latenz je Evaluierung in µs (einzeln / Batch)
+        self.latency_us = {mode: Histogram(_LATENCY_US_BUCKETS) for mode in ("single", "batch")}
+
         # Thread safety
         self.lock = threading.RLock()
 
@@ -367,69 +462,36 @@ class MLGatekeeper:
             print(f"Failed to save model: {e}")
             return False
 
-    def _calculate_heuristic_score(self, features: Dict[str, float]) -> Tuple[float, Dict]:
-        """
-        Berechnet heuristischen Score basierend auf Features.
-
-        Args:
-            features: Extracted features
-
-        Returns:
-            (score, contribution_details)
-        """
-        score = 0.0
-        contributions = {}
-
+    def _heuristic_weight_vector(self) -> np.ndarray:
+        """heuristic_weights im Feature-Layout (unbekannte Features ignoriert)"""
+        index = FEATURE_SCHEMA.index
+        weights = np.zeros(FEATURE_SCHEMA.size, dtype=np.float64)
         for feature_name, weight in self.heuristic_weights.items():
-            if feature_name in features:
-                contribution = features[feature_name] * weight
-                score += contribution
-                contributions[feature_name] = contribution
-
-        # Apply sigmoid to get score between 0 and 1
-        sigmoid_score = 1.0 / (1.0 + np.exp(-score))
+            if feature_name in index:
+                weights[index[feature_name]] = weight
+        return weights
 
-        return float(sigmoid_score), contributions
+    def _heuristic_scores(self, matrix: np.ndarray) -> np.ndarray:
+        """Heuristische Scores aller Zeilen (Sigmoid der gewichteten Summe)"""
+        return 1.0 / (1.0 + np.exp(-(matrix @ self._heuristic_weight_vector())))
 
-    def _calculate_ml_score(self, features: Dict[str, float]) -> Tuple[float, Dict]:
+    def _model_scores(self, matrix: np.ndarray) -> np.ndarray:
         """
-        Berechnet ML-basierten Score.
+        Scores aller Zeilen mit einem Modell-Aufruf.
 
-        Args:
-            features: Extracted features
-
-        Returns:
-            (score, model_details)
+        Fällt bei Modellfehlern auf die Heuristik zurück.
         """
-        if self.model is None:
-            return self._calculate_heuristic_score(features)
-
         try:
-            # Prepare feature vector
-            feature_vector = np.array([features.get(name, 0.0) for name in sorted(features.keys())])
-            feature_vector = feature_vector.reshape(1, -1)
-
-            # Get prediction
             if hasattr(self.model, 'predict_proba'):
                 # Classifier with probability output
-                probabilities = self.model.predict_proba(feature_vector)[0]
-                score = float(probabilities[1] if len(probabilities) > 1 else probabilities[0])
-            else:
-                # Regressor
-                prediction = self.model.predict(feature_vector)[0]
-                score = float(np.clip(prediction, 0.0, 1.0))
-
-            model_details = {
-                "model_type": type(self.model).__name__,
-                "features_used": len(feature_vector[0]),
-                "raw_prediction": score
-            }
-
-            return score, model_details
-
+                probabilities = np.asarray(self.model.predict_proba(matrix))
+                column = 1 if probabilities.shape[1] > 1 else 0
+                return probabilities[:, column].astype(np.float64)
+            # Regressor
+            return np.clip(np.asarray(self.model.predict(matrix), dtype=np.float64), 0.0, 1.0)
         except Exception as e:
             print(f"ML model prediction failed: {e}")
-            return self._calculate_heuristic_score(features)
+            return self._heuristic_scores(matrix)
 
     def _apply_scaling_strategy(self, score: float, confidence: float) -> float:
         """
@@ -496,57 +558,91 @@ class MLGatekeeper:
         Returns:
             ScalingDecision mit allen Details
         """
+        return self._evaluate([symbol], [base_budget], context, "single")[0]
+
+    def evaluate_batch(self, symbols: Sequence[str], base_budgets: Union[float, Sequence[float]],
+                       context: Dict = None) -> List[ScalingDecision]:
+        """
+        Evaluiert mehrere Kandidaten eines Zyklus mit einem Modell-Aufruf.
+
+        Ergebnis entspricht nacheinander ausgeführten evaluate_trade_opportunity-
+        Aufrufen in derselben Reihenfolge.
+
+        Args:
+            symbols: Trading symbols
+            base_budgets: Ein Budget für alle oder eines je Symbol
+            context: Additional context
+
+        Returns:
+            ScalingDecisions in der Reihenfolge von symbols
+        """
+        if isinstance(base_budgets, (int, float)):
+            base_budgets = [base_budgets] * len(symbols)
+        elif len(base_budgets) != len(symbols):
+            raise ValueError("base_budgets must match symbols")
+        if not symbols:
+            return []
+        return self._evaluate(list(symbols), list(base_budgets), context, "batch")
+
+    def _evaluate(self, symbols: List[str], base_budgets: List[float],
+                  context: Dict, mode: str) -> List[ScalingDecision]:
+        started = time.perf_counter()
         timestamp = time.time()
         context = context or {}
+        extractor = self.feature_extractor
 
-        with self.lock:
+        with self.lock, extractor.lock:
             # Extract features
-            features = self.feature_extractor.extract_features(symbol, context)
+            matrix = extractor.extract_matrix(symbols, context)
 
             # Calculate score and confidence
             if self.model is not None:
-                score, score_details = self._calculate_ml_score(features)
-                confidence = min(1.0, len(features) / 12.0)  # Simple confidence based on feature availability
+                scores = self._model_scores(matrix)
+                confidence = min(1.0, FEATURE_SCHEMA.size / 12.0)  # Simple confidence based on feature availability
                 model_version = f"ml_model_{getattr(self.model, '__class__', 'unknown').__name__}"
             else:
-                score, score_details = self._calculate_heuristic_score(features)
+                scores = self._heuristic_scores(matrix)
                 confidence = 0.8  # Higher confidence in heuristic model
                 model_version = "heuristic_v1"
 
-            # Apply scaling strategy
-            multiplier = self._apply_scaling_strategy(score, confidence)
-            scaled_budget = base_budget * multiplier
-
-            # Determine scaling reason
-            if score > 0.7:
-                reason = "high_confidence_positive"
-            elif score > 0.5:
-                reason = "moderate_positive"
-            elif score > 0.3:
-                reason = "slight_positive"
-            else:
-                reason = "defensive_scaling"
-
-            if confidence < self.config.min_confidence:
-                reason += "_low_confidence"
-
-            # Create decision
-            decision = ScalingDecision(
-                timestamp=timestamp,
-                symbol=symbol,
-                base_budget=base_budget,
-                scaled_budget=scaled_budget,
-                multiplier=multiplier,
-                confidence=confidence,
-                features_used=features.copy(),
-                scaling_reason=reason,
-                model_version=model_version
-            )
-
-            # Track decision
-            self.decision_history.append(decision)
-
-            return decision
+            decisions = []
+            for row, symbol, base_budget, score in zip(matrix, symbols, base_budgets, scores.tolist()):
+                # Apply scaling strategy
+                multiplier = self._apply_scaling_strategy(score, confidence)
+                scaled_budget = base_budget * multiplier
+
+                # Determine scaling reason
+                if score > 0.7:
+                    reason = "high_confidence_positive"
+                elif score > 0.5:
+                    reason = "moderate_positive"
+                elif score > 0.3:
+                    reason = "slight_positive"
+                else:
+                    reason = "defensive_scaling"
+
+                if confidence < self.config.min_confidence:
+                    reason += "_low_confidence"
+
+                # Create decision
+                decision = ScalingDecision(
+                    timestamp=timestamp,
+                    symbol=symbol,
+                    base_budget=base_budget,
+                    scaled_budget=scaled_budget,
+                    multiplier=multiplier,
+                    confidence=confidence,
+                    features_used=FEATURE_SCHEMA.to_dict(row),
+                    scaling_reason=reason,
+                    model_version=model_version
+                )
+
+                # Track decision
+                self.decision_history.append(decision)
+                decisions.append(decision)
+
+        self.latency_us[mode].observe((time.perf_counter() - started) * 1e6)
+        return decisions
 
     def update_market_regime(self, volatility_zscore: float, trend_strength: float,
                            regime: str = "neutral", volume_anomaly: float = 0.0):
@@ -612,8 +708,13 @@ class MLGatekeeper:
             reason_counts[decision.scaling_reason] = reason_counts.get(decision.scaling_reason, 0) + 1
 
         stats["scaling_reasons"] = reason_counts
+        stats["latency_us"] = self.get_latency_stats()
         return stats
 
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Latenz-Histogramm je Evaluierungsart (µs)"""
+        return {mode: histogram.stats() for mode, histogram in self.latency_us.items()}
+
 # Global ML Gatekeeper Instance
 _ml_gatekeeper = None
 
@@ -14,7 +14,9 @@ Exchange-Trace-Extractor (kompakt & robust für MEXC/ccxt-Logs)
     * errors.csv  (min_notional/min_qty/precision/insufficient/429 – Beispiele)
     * filtered_exchange_trace.jsonl(.gz) (Originalzeilen gefiltert)
     * summary.json (Statistik)
-Nur Standardbibliothek.
+- Läuft auf dem inkrementellen Log-Index (core/log_index.py): Filter nach
+  Methode/Symbol/Zeitfenster werden als indizierte SQLite-Abfragen ausgeführt,
+  wiederholte Läufe parsen nur neu angehängte Zeilen.
 """
 
 import csv
@@ -29,6 +31,10 @@ from glob import glob
 from pathlib import Path
 from typing import List, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.log_index import SessionLogIndex, stream_name
+
 # =========================
 #           CONFIG
 # =========================
@@ -160,6 +166,16 @@ def expand_inputs(path_or_dir: str) -> List[str]:
         return sorted(files, key=os.path.getmtime)
     return [p]
 
+def open_index(inputs: List[str]) -> SessionLogIndex:
+    """Index über das gemeinsame Elternverzeichnis der Inputs (nur diese Dateien)"""
+    paths = [Path(p).resolve() for p in inputs]
+    root = Path(os.path.commonpath([str(p.parent) for p in paths]))
+    patterns = [str(p.relative_to(root)) for p in paths]
+    index = SessionLogIndex(root, patterns=patterns)
+    added = index.refresh()
+    print(f"[INFO] Log-Index: {added} neue Zeilen indiziert ({index.db_path})")
+    return index
+
 # =========================
 #        Hauptprogramm
 # =========================
@@ -184,20 +200,16 @@ def main():
     t_from = parse_iso_or_epoch(cfg["FROM_ISO"]) if cfg["FROM_ISO"] else None
     t_to   = parse_iso_or_epoch(cfg["TO_ISO"])   if cfg["TO_ISO"]   else None
 
+    index = open_index(inputs)
+    # Der Index kann weitere Dateien desselben Streams kennen (frühere Läufe) -
+    # nur Zeilen aus den angefragten Inputs auswerten
+    streams = sorted({stream_name(p) for p in inputs})
+
     if cfg["LAST_MINUTES"] and not (t_from or t_to):
-        # Ende über alle Inputs
-        last_ts = None
-        for path in inputs:
-            with open_in(path, "r") as f:
-                for line in f:
-                    try:
-                        obj = json.loads(line)
-                        ts = pick_ts(obj)
-                        if ts:
-                            last_ts = ts
-                    except Exception:
-                        continue
-        if last_ts:
+        # Ende über alle Inputs (Index-Aggregat statt Vollscan)
+        _, last_epoch = index.time_range(stream=streams, path=inputs)
+        if last_epoch is not None:
+            last_ts = datetime.fromtimestamp(last_epoch, tz=timezone.utc)
             t_from = last_ts - timedelta(minutes=int(cfg["LAST_MINUTES"]))
             print(f"[INFO] Zeitfenster: last {cfg['LAST_MINUTES']} min → from {t_from.isoformat()}")
         else:
@@ -233,103 +245,110 @@ def main():
     out_lines     = 0
 
     print("[INFO] Filtering gestartet …")
+    rows = index.query(
+        stream=streams,
+        path=inputs,
+        method=sorted(methods) if methods else None,
+        symbol=sorted(sym_whitelist) if sym_whitelist else None,
+        since=t_from.timestamp() if t_from else None,
+        until=t_to.timestamp() if t_to else None,
+        order_by="ingest",
+        raw=True,
+    )
     with open_out(out_jsonl_path, "w", gzip_out) as fout:
-        for in_path in inputs:
-            with open_in(in_path, "r") as fin:
-                for line in fin:
-                    # JSON parse
-                    try:
-                        obj = json.loads(line)
-                    except Exception:
-                        continue
-
-                    ts = pick_ts(obj)
-                    if not in_window(ts):
-                        continue
-
-                    method = norm_method(obj)
-                    if methods and method not in methods:
-                        continue
-
-                    # Symbol extrahieren
-                    symbol = (
-                        obj.get("symbol")
-                        or (obj.get("args") or {}).get("symbol")
-                        or (obj.get("params") or {}).get("symbol")
-                        or obj.get("market")
-                        or obj.get("pair")
-                    )
-                    if not symbol_ok(symbol):
-                        continue
-
-                    # Orderbook-Sampling
-                    if method == "fetch_order_book":
-                        ob_ctr += 1
-                        if ob_ctr % every_ob != 0:
-                            continue
-
-                    # Zeile in gefiltertes jsonl kopieren
-                    fout.write(line)
-                    out_lines += 1
-                    if max_lines and out_lines >= max_lines:
-                        break
-
-                    # --- Stats & Extraktionen ---
-                    method_counts[method] += 1
-                    if symbol: symbol_counts[symbol] += 1
-                    if ts:
-                        if minmax_ts[0] is None or ts < minmax_ts[0]:
-                            minmax_ts[0] = ts
-                        if minmax_ts[1] is None or ts > minmax_ts[1]:
-                            minmax_ts[1] = ts
-
-                    payload = json.dumps(obj, ensure_ascii=False)
-                    for key, pat in MIN_ERR_PATTERNS:
-                        if pat.search(payload):
-                            err_counts[key] += 1
-                            if len(err_examples[key]) < 5:
-                                err_examples[key].append(payload[:800])
-
-                    # Orders
-                    if method in {"create_order","fetch_order","cancel_order","fetch_open_orders"}:
-                        a = obj.get("args") or {}
-                        r = obj.get("resp") or {}
-                        side    = a.get("side")   or r.get("side")
-                        price   = a.get("price")  or r.get("price")
-                        amount  = a.get("amount") or r.get("amount")
-                        cost    = r.get("cost")
-                        oid     = r.get("id") or r.get("orderId") or r.get("clientOrderId") or a.get("clientOrderId")
-                        status  = r.get("status")
-                        if oid: unique_orders.add(oid)
-                        order_rows.append({
-                            "time": ts.isoformat() if ts else "",
-                            "method": method,
-                            "symbol": symbol or "",
-                            "side": side or "",
-                            "price": price if price is not None else "",
-                            "amount": amount if amount is not None else "",
-                            "cost": cost if cost is not None else "",
-                            "order_id": oid or "",
-                            "status": status or ""
-                        })
-
-                    # Ticker
-                    elif method == "fetch_ticker":
-                        r = obj.get("resp") or {}
-                        last = r.get("last", r.get("close"))
-                        bid  = r.get("bid")
-                        ask  = r.get("ask")
-                        ticker_rows.append({
-                            "time": ts.isoformat() if ts else "",
-                            "symbol": symbol or "",
-                            "last": last if last is not None else "",
-                            "bid": bid if bid is not None else "",
-                            "ask": ask if ask is not None else ""
-                        })
-
+        for line in rows:
+            # JSON parse
+            try:
+                obj = json.loads(line)
+            except Exception:
+                continue
+
+            ts = pick_ts(obj)
+            if not in_window(ts):
+                continue
+
+            method = norm_method(obj)
+            if methods and method not in methods:
+                continue
+
+            # Symbol extrahieren
+            symbol = (
+                obj.get("symbol")
+                or (obj.get("args") or {}).get("symbol")
+                or (obj.get("params") or {}).get("symbol")
+                or obj.get("market")
+                or obj.get("pair")
+            )
+            if not symbol_ok(symbol):
+                continue
+
+            # Orderbook-Sampling
+            if method == "fetch_order_book":
+                ob_ctr += 1
+                if ob_ctr % every_ob != 0:
+                    continue
+
+            # Zeile in gefiltertes jsonl kopieren
+            fout.write(line + "\n")
+            out_lines += 1
             if max_lines and out_lines >= max_lines:
                 break
 
+            # --- Stats & Extraktionen ---
+            method_counts[method] += 1
+            if symbol: symbol_counts[symbol] += 1
+            if ts:
+                if minmax_ts[0] is None or ts < minmax_ts[0]:
+                    minmax_ts[0] = ts
+                if minmax_ts[1] is None or ts > minmax_ts[1]:
+                    minmax_ts[1] = ts
+
+            payload = json.dumps(obj, ensure_ascii=False)
+            for key, pat in MIN_ERR_PATTERNS:
+                if pat.search(payload):
+                    err_counts[key] += 1
+                    if len(err_examples[key]) < 5:
+                        err_examples[key].append(payload[:800])
+
+            # Orders
+            if method in {"create_order","fetch_order","cancel_order","fetch_open_orders"}:
+                a = obj.get("args") or {}
+                r = obj.get("resp") or {}
+                side    = a.get("side")   or r.get("side")
+                price   = a.get("price")  or r.get("price")
+                amount  = a.get("amount") or r.get("amount")
+                cost    = r.get("cost")
+                oid     = r.get("id") or r.get("orderId") or r.get("clientOrderId") or a.get("clientOrderId")
+                status  = r.get("status")
+                if oid: unique_orders.add(oid)
+                order_rows.append({
+                    "time": ts.isoformat() if ts else "",
+                    "method": method,
+                    "symbol": symbol or "",
+                    "side": side or "",
+                    "price": price if price is not None else "",
+                    "amount": amount if amount is not None else "",
+                    "cost": cost if cost is not None else "",
+                    "order_id": oid or "",
+                    "status": status or ""
+                })
+
+            # Ticker
+            elif method == "fetch_ticker":
+                r = obj.get("resp") or {}
+                last = r.get("last", r.get("close"))
+                bid  = r.get("bid")
+                ask  = r.get("ask")
+                ticker_rows.append({
+                    "time": ts.isoformat() if ts else "",
+                    "symbol": symbol or "",
+                    "last": last if last is not None else "",
+                    "bid": bid if bid is not None else "",
+                    "ask": ask if ask is not None else ""
+                })
+
+    index.close()
+
     # Fehlerbeispiele in CSV schreiben
     for k, _ in MIN_ERR_PATTERNS:
         for sample in err_examples.get(k, []):
@@ -15,14 +15,21 @@ Query Types:
     guards       - Show guard evaluations (market quality checks)
     orders       - Show order lifecycle events
     performance  - Calculate win rate, PnL, avg trade duration
+
+Queries run on top of the incremental session log index (core/log_index.py):
+the first query of a session ingests its logs, subsequent queries only parse
+lines appended since then.
 """
 
 import argparse
-import json
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.log_index import SessionLogIndex
+
 
 class LogQuery:
     """
@@ -32,18 +39,28 @@ class LogQuery:
     for post-session analysis and debugging.
     """
 
-    def __init__(self, session_dir: Path):
+    def __init__(self, session_dir: Path, index: Optional[SessionLogIndex] = None):
         """
         Initialize log query for session.
 
         Args:
             session_dir: Path to session directory containing logs/
+            index: Optional pre-opened log index (default: index of session_dir/logs)
         """
         self.session_dir = session_dir
         self.decision_log = session_dir / "logs" / "decisions" / "decision.jsonl"
         self.order_log = session_dir / "logs" / "orders" / "order.jsonl"
         self.audit_log = session_dir / "logs" / "audit" / "audit.jsonl"
 
+        if index is None:
+            index = SessionLogIndex(session_dir / "logs")
+            index.refresh()
+        self.index = index
+
+    def _events(self, stream: str, event_type, **filters):
+        """Yield indexed events of one stream in chronological order"""
+        return self.index.query(stream=stream, event_type=event_type, **filters)
+
     def query_trades(self) -> List[Dict]:
         """
         Get all completed trades.
@@ -59,37 +76,31 @@ class LogQuery:
         # Track open positions
         opens = {}
 
-        if not self.decision_log.exists():
-            return trades
-
-        with open(self.decision_log) as f:
-            for line in f:
-                try:
-                    event = json.loads(line)
-
-                    if event.get('event') == 'position_opened':
-                        opens[event['symbol']] = event
-
-                    elif event.get('event') == 'position_closed':
-                        symbol = event['symbol']
-                        if symbol in opens:
-                            open_event = opens[symbol]
-                            trades.append({
-                                'symbol': symbol,
-                                'entry_price': open_event['avg_entry'],
-                                'exit_price': event['exit_price'],
-                                'qty': event['qty_closed'],
-                                'realized_pnl': event['realized_pnl_usdt'],
-                                'realized_pct': event.get('realized_pnl_pct', 0),
-                                'duration_minutes': event.get('duration_minutes'),
-                                'reason': event['reason'],
-                                'opened_at': open_event.get('opened_at'),
-                                'fee_total': event.get('fee_total', 0)
-                            })
-                            del opens[symbol]
-
-                except (json.JSONDecodeError, KeyError):
-                    continue
+        for event in self._events("decision", ["position_opened", "position_closed"]):
+            try:
+                if event.get('event') == 'position_opened':
+                    opens[event['symbol']] = event
+
+                elif event.get('event') == 'position_closed':
+                    symbol = event['symbol']
+                    if symbol in opens:
+                        open_event = opens[symbol]
+                        trades.append({
+                            'symbol': symbol,
+                            'entry_price': open_event['avg_entry'],
+                            'exit_price': event['exit_price'],
+                            'qty': event['qty_closed'],
+                            'realized_pnl': event['realized_pnl_usdt'],
+                            'realized_pct': event.get('realized_pnl_pct', 0),
+                            'duration_minutes': event.get('duration_minutes'),
+                            'reason': event['reason'],
+                            'opened_at': open_event.get('opened_at'),
+                            'fee_total': event.get('fee_total', 0)
+                        })
+                        del opens[symbol]
+
+            except KeyError:
+                continue
 
         return trades
 
@@ -105,20 +116,9 @@ class LogQuery:
         """
         guards = []
 
-        if not self.decision_log.exists():
-            return guards
-
-        with open(self.decision_log) as f:
-            for line in f:
-                try:
-                    event = json.loads(line)
-
-                    if event.get('event') == 'guards_eval':
-                        if symbol is None or event.get('symbol') == symbol:
-                            guards.append(event)
-
-                except (json.JSONDecodeError, KeyError):
-                    continue
+        for event in self._events("decision", "guards_eval", symbol=symbol):
+            if event.get('event') == 'guards_eval':
+                guards.append(event)
 
         return guards
 
@@ -136,23 +136,13 @@ class LogQuery:
         """
         orders = {}  # order_req_id → events
 
-        if not self.order_log.exists():
-            return []
-
-        with open(self.order_log) as f:
-            for line in f:
-                try:
-                    event = json.loads(line)
-
-                    if event.get('event') in ['order_attempt', 'order_ack', 'order_done']:
-                        order_req_id = event.get('order_req_id')
-                        if order_req_id:
-                            if order_req_id not in orders:
-                                orders[order_req_id] = {}
-                            orders[order_req_id][event['event']] = event
-
-                except (json.JSONDecodeError, KeyError):
-                    continue
+        for event in self._events("order", ['order_attempt', 'order_ack', 'order_done']):
+            if event.get('event') in ['order_attempt', 'order_ack', 'order_done']:
+                order_req_id = event.get('order_req_id')
+                if order_req_id:
+                    if order_req_id not in orders:
+                        orders[order_req_id] = {}
+                    orders[order_req_id][event['event']] = event
 
         # Filter by status if specified
         if status:
@@ -210,20 +200,10 @@ class LogQuery:
         """Get risk limit events"""
         risk_events = []
 
-        if not self.decision_log.exists():
-            return risk_events
-
-        with open(self.decision_log) as f:
-            for line in f:
-                try:
-                    event = json.loads(line)
-
-                    if event.get('event') == 'risk_limits_eval':
-                        if not event.get('all_passed'):
-                            risk_events.append(event)
-
-                except (json.JSONDecodeError, KeyError):
-                    continue
+        for event in self._events("decision", "risk_limits_eval"):
+            if event.get('event') == 'risk_limits_eval':
+                if not event.get('all_passed'):
+                    risk_events.append(event)
 
         return risk_events
 
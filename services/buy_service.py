@@ -414,11 +414,9 @@ class BuyService:
             # CRITICAL FIX (P0 Issue #1): Preflight validation with min_notional auto-bump
             # This ensures parity with FSM buy flow and prevents BLESS-type failures
             try:
-                from services.exchange_filters import get_filters
-                from services.order_validation import preflight
+                from services.order_templates import resolve_template
 
-                filters = get_filters(self.exchange, symbol)
-                ok, preflight_result = preflight(symbol, px, qty, filters)
+                ok, preflight_result = resolve_template(self.exchange, symbol).preflight(px, qty)
 
                 if not ok:
                     reason = preflight_result.get('reason', 'preflight_failed')
@@ -600,19 +598,17 @@ def submit_buy(exchange, symbol: str, raw_price: float, raw_amount: float):
         >>> order = submit_buy(exchange, "BTC/USDT", 50000.123, 0.05678)
         >>> order["id"]  # "1234567890"
     """
-    from services.exchange_filters import get_filters
-    from services.order_validation import preflight
-    from services.quantize import q_price, q_amount
+    from services.order_templates import resolve_template
     from core.logging.events import emit
     import logging
 
     logger = logging.getLogger(__name__)
 
-    # 1. Load filters
-    f = get_filters(exchange, symbol)
+    # 1. Load compiled order template
+    tpl = resolve_template(exchange, symbol)
 
     # 2. Pre-flight validation
-    ok, data = preflight(symbol, raw_price, raw_amount, f)
+    ok, data = tpl.preflight(raw_price, raw_amount)
     if not ok:
         emit("buy_aborted", symbol=symbol, detail=data)
         logger.warning(f"[SUBMIT_BUY] {symbol} ABORTED: {data}")
@@ -630,8 +626,8 @@ def submit_buy(exchange, symbol: str, raw_price: float, raw_amount: float):
         logger.warning(f"[SUBMIT_BUY] {symbol} FAILED (attempt 1): {e1}")
 
         # 4. Hard re-quantization retry (single attempt)
-        pr2 = q_price(pr, f["tick_size"])
-        am2 = q_amount(am, f["step_size"])
+        pr2 = tpl.floor_price(pr)
+        am2 = tpl.floor_amount(am)
 
         if pr2 != pr or am2 != am:
             try:
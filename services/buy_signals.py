@@ -13,12 +13,12 @@ Thread-safe implementation with comprehensive logging and audit trail.
 
 import logging
 import threading
-import time
 from collections import deque
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 import config
+from core.clock import Clock, get_clock
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +36,8 @@ class BuySignalService:
                  drop_trigger_mode: int = 4,
                  drop_trigger_lookback_min: int = 60,
                  enable_minutely_audit: bool = True,
-                 history_retention_min: int = 1440):  # 24 hours
+                 history_retention_min: int = 1440,  # 24 hours
+                 clock: Optional[Clock] = None):
         """
         Initialize BuySignalService.
 
@@ -46,12 +47,14 @@ class BuySignalService:
             drop_trigger_lookback_min: Rolling window size in minutes
             enable_minutely_audit: Enable detailed audit logging
             history_retention_min: Price history retention in minutes
+            clock: Time source (default: process-wide core.clock)
         """
         self.drop_trigger_value = drop_trigger_value
         self.drop_trigger_mode = drop_trigger_mode
         self.drop_trigger_lookback_min = drop_trigger_lookback_min
         self.enable_minutely_audit = enable_minutely_audit
         self.history_retention_min = history_retention_min
+        self._clock = clock
 
         # Thread safety
         self._lock = threading.RLock()
@@ -71,6 +74,10 @@ class BuySignalService:
         logger.info(f"BuySignalService initialized: mode={drop_trigger_mode}, "
                    f"trigger={drop_trigger_value}, lookback={drop_trigger_lookback_min}m")
 
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_clock()
+
     def update_price(self, symbol: str, price: float, timestamp: Optional[datetime] = None) -> None:
         """
         Update price history for a symbol.
@@ -81,7 +88,7 @@ class BuySignalService:
             timestamp: Price timestamp (uses current time if None)
         """
         if timestamp is None:
-            timestamp = datetime.utcnow()
+            timestamp = self.clock.utcnow()
 
         with self._lock:
             # Initialize price history if needed
@@ -120,7 +127,7 @@ class BuySignalService:
             symbol: Trading symbol that completed a trade
         """
         with self._lock:
-            self._last_trade_close[symbol] = datetime.utcnow()
+            self._last_trade_close[symbol] = self.clock.utcnow()
             logger.debug(f"Trade completion recorded for {symbol}")
 
     def evaluate_buy_signal(self, symbol: str, current_price: float,
@@ -158,8 +165,8 @@ class BuySignalService:
                     return False, {"reason": "no_snapshot", "error": f"No snapshot found for {symbol}"}
 
                 stale_ttl = getattr(config, 'SNAPSHOT_STALE_TTL_S', 30.0)
-                if snapshot_ts is not None and (time.time() - snapshot_ts) > stale_ttl:
-                    age_s = time.time() - snapshot_ts
+                if snapshot_ts is not None and (self.clock.time() - snapshot_ts) > stale_ttl:
+                    age_s = self.clock.time() - snapshot_ts
                     logger.debug(f"[BUY_SIGNAL] {symbol}: Snapshot is stale ({age_s:.1f}s > {stale_ttl}s)")
                     return False, {"reason": "stale_snapshot", "error": f"Snapshot for {symbol} is stale ({age_s:.1f}s)"}
 
@@ -229,7 +236,7 @@ class BuySignalService:
         """Log detailed trigger audit information (V9_3)."""
         try:
             # Create timestamp rounded to minute for easier analysis
-            ts_minute = datetime.utcnow().replace(second=0, microsecond=0).isoformat() + "Z"
+            ts_minute = self.clock.utcnow().replace(second=0, microsecond=0).isoformat() + "Z"
 
             audit_data = {
                 "event_type": "DROP_TRIGGER_AUDIT",
@@ -269,7 +276,7 @@ class BuySignalService:
                 return drops
 
             stale_ttl = getattr(config, 'SNAPSHOT_STALE_TTL_S', 30.0)
-            now_ts = time.time()
+            now_ts = self.clock.time()
 
             # Iterate over snapshots instead of price history
             for symbol, entry in drop_snapshot_store.items():
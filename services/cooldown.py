@@ -29,6 +29,8 @@ import logging
 import time
 from typing import Dict, List, Optional
 
+from core.clock import Clock, get_clock
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,13 +42,23 @@ class CooldownManager:
     preventing immediate re-entry.
     """
 
-    def __init__(self):
-        """Initialize cooldown manager with empty state"""
+    def __init__(self, clock: Optional[Clock] = None):
+        """
+        Initialize cooldown manager with empty state.
+
+        Args:
+            clock: Time source (default: process-wide core.clock)
+        """
+        self._clock = clock
         # Map: symbol -> cooldown_release_timestamp
         self._cooldowns: Dict[str, float] = {}
 
         logger.info("Cooldown manager initialized")
 
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_clock()
+
     def set(self, symbol: str, duration_s: float) -> None:
         """
         Set cooldown for a symbol.
@@ -55,7 +67,7 @@ class CooldownManager:
             symbol: Trading pair (e.g., "BTC/USDT")
             duration_s: Cooldown duration in seconds
         """
-        release_ts = time.time() + duration_s
+        release_ts = self.clock.time() + duration_s
 
         self._cooldowns[symbol] = release_ts
 
@@ -78,7 +90,7 @@ class CooldownManager:
             return False
 
         release_ts = self._cooldowns[symbol]
-        now = time.time()
+        now = self.clock.time()
 
         # Check if cooldown expired
         if now >= release_ts:
@@ -102,7 +114,7 @@ class CooldownManager:
             return 0.0
 
         release_ts = self._cooldowns[symbol]
-        now = time.time()
+        now = self.clock.time()
 
         remaining = max(0.0, release_ts - now)
 
@@ -151,7 +163,7 @@ class CooldownManager:
         Returns:
             Number of cooldowns removed
         """
-        now = time.time()
+        now = self.clock.time()
 
         expired = [
             symbol for symbol, release_ts in self._cooldowns.items()
@@ -191,7 +203,7 @@ class CooldownManager:
         self.cleanup_expired()
 
         active_symbols = list(self._cooldowns.keys())
-        now = time.time()
+        now = self.clock.time()
 
         # Calculate remaining times
         details = {}
@@ -4,10 +4,12 @@ Börsenfilter - Einheitliche Quelle für tick_size, step_size, min_qty, min_noti
 
 Cacht Filter pro Symbol für Performance.
 Unterstützt MEXC-spezifische Filter und CCXT-Fallbacks.
+Der Cache kann beim Start aus dem Market-Metadaten-Cache vorbefüllt werden
+(prime_cache), geänderte Märkte werden gezielt invalidiert (invalidate).
 """
 
 import logging
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +46,23 @@ def get_filters(exchange, symbol: str) -> dict:
         logger.error(f"Failed to load market {symbol}: {e}")
         return _empty_filters()
 
+    filters = filters_from_market(m)
+    _cache[symbol] = filters
+    logger.debug(f"Loaded filters for {symbol}: {filters}")
+
+    return filters
+
+
+def filters_from_market(m: dict) -> dict:
+    """
+    Leite die Filter aus einem CCXT-Market-Dict ab (ohne Cache).
+
+    Args:
+        m: Market dict (exchange.markets[symbol])
+
+    Returns:
+        Filter-Dict wie get_filters()
+    """
     tick_size = None
     step_size = None
     min_qty = m.get("limits", {}).get("amount", {}).get("min")
@@ -104,18 +123,13 @@ def get_filters(exchange, symbol: str) -> dict:
         else:
             step_size = 0.0
 
-    filters = {
+    return {
         "tick_size": tick_size or 0.0,
         "step_size": step_size or 0.0,
         "min_qty": min_qty,
         "min_notional": min_notional,
     }
 
-    _cache[symbol] = filters
-    logger.debug(f"Loaded filters for {symbol}: {filters}")
-
-    return filters
-
 
 def _empty_filters() -> dict:
     """Return empty filters dict for error fallback."""
@@ -127,6 +141,23 @@ def _empty_filters() -> dict:
     }
 
 
+def cached_filters(symbol: str) -> Optional[dict]:
+    """Gecachte Filter eines Symbols ohne Exchange-Zugriff (None wenn nicht geladen)."""
+    return _cache.get(symbol)
+
+
+def prime_cache(filters: Dict[str, dict]):
+    """Befülle den Cache vorab (z.B. aus dem Market-Metadaten-Cache)."""
+    _cache.update(filters)
+    logger.debug(f"Filter cache primed with {len(filters)} symbols")
+
+
+def invalidate(symbols: Iterable[str]):
+    """Entferne einzelne Symbole aus dem Cache (Marktstruktur geändert)."""
+    for symbol in symbols:
+        _cache.pop(symbol, None)
+
+
 def clear_cache():
     """Clear filter cache (for testing or market structure changes)."""
     global _cache
@@ -281,7 +281,8 @@ class ExitOrderManager:
                         side="sell",
                         amount=context.amount,
                         price=context.current_price,
-                        client_order_id=f"exit_{reason}_{int(time.time())}"
+                        client_order_id=f"exit_{reason}_{int(time.time())}",
+                        sync=True  # durable before placement
                     )
 
                     if existing_order_id:
@@ -857,7 +858,8 @@ class ExitOrderManager:
                         side="sell",
                         amount=amount,
                         price=target_price,
-                        client_order_id=f"{exit_type.lower()}_{int(time.time())}"
+                        client_order_id=f"{exit_type.lower()}_{int(time.time())}",
+                        sync=True  # durable before placement
                     )
 
                     if existing_order_id:
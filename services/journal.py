@@ -11,6 +11,12 @@ Records all completed trades with full lifecycle information:
 Each trade is written as a single JSON line in daily files:
 state/journal/trades_YYYY-MM-DD.jsonl
 
+Daily KPI aggregates are maintained incrementally on append and persisted
+next to the journal together with the byte offset they cover:
+state/journal/kpis_YYYY-MM-DD.json
+A journal tail beyond that offset (crash, external writer) is folded in on
+the next read, so stats never rescan a whole day.
+
 This provides complete audit trail for:
 - Performance analysis
 - Tax reporting
@@ -20,9 +26,12 @@ This provides complete audit trail for:
 import json
 import logging
 import os
+import threading
 import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+from services.trade_kpis import KpiAccumulator
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +52,9 @@ class TradeJournal:
             journal_dir: Directory for journal files
         """
         self.journal_dir = journal_dir
+        self._lock = threading.Lock()
+        # date_str -> (aggregates, journal bytes covered)
+        self._day_kpis: Dict[str, Tuple[KpiAccumulator, int]] = {}
 
         # Ensure journal directory exists
         os.makedirs(self.journal_dir, exist_ok=True)
@@ -64,6 +76,10 @@ class TradeJournal:
 
         return os.path.join(self.journal_dir, f"trades_{date_str}.jsonl")
 
+    def _get_kpi_path(self, date_str: str) -> str:
+        """Path of the persisted KPI aggregates for a day"""
+        return os.path.join(self.journal_dir, f"kpis_{date_str}.json")
+
     def append_trade(
         self,
         symbol: str,
@@ -132,11 +148,16 @@ class TradeJournal:
             }
 
             # Get daily file path
-            journal_path = self._get_daily_path()
+            date_str = datetime.now().strftime("%Y-%m-%d")
+            journal_path = self._get_daily_path(date_str)
 
-            # Append to daily JSONL (atomic write)
-            with open(journal_path, "a") as f:
-                f.write(json.dumps(record) + "\n")
+            with self._lock:
+                # Append to daily JSONL (atomic write)
+                with open(journal_path, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+
+                # Fold the new line into the day aggregates
+                self._refresh_day(date_str)
 
             logger.debug(
                 f"Trade journaled: {symbol} {pnl_pct:+.2f}% "
@@ -178,6 +199,79 @@ class TradeJournal:
             logger.error(f"Trade journal read failed for {date_str}: {e}")
             return []
 
+    def day_kpis(self, date_str: str) -> KpiAccumulator:
+        """
+        Incremental KPI aggregates of a day.
+
+        Args:
+            date_str: Date string in YYYY-MM-DD format
+
+        Returns:
+            KpiAccumulator copy (empty if no trades)
+        """
+        with self._lock:
+            return KpiAccumulator.from_dict(self._refresh_day(date_str).to_dict())
+
+    def _refresh_day(self, date_str: str) -> KpiAccumulator:
+        """Bring the day aggregates up to the journal's end (assumes lock is held)"""
+        journal_path = self._get_daily_path(date_str)
+        try:
+            size = os.path.getsize(journal_path)
+        except OSError:
+            self._day_kpis.pop(date_str, None)
+            return KpiAccumulator()
+
+        cached = self._day_kpis.get(date_str)
+        if cached is None:
+            cached = self._load_day_kpis(date_str)
+        acc, offset = cached
+        if offset == size:
+            self._day_kpis[date_str] = cached
+            return acc
+        if offset > size:
+            # Journal was rewritten: rebuild from scratch
+            acc, offset = KpiAccumulator(), 0
+
+        try:
+            with open(journal_path, "rb") as f:
+                f.seek(offset)
+                tail = f.read(size - offset)
+            # Only complete lines; a partially written last line is picked up later
+            end = tail.rfind(b"\n") + 1
+            for line in tail[:end].splitlines():
+                line = line.strip()
+                if line:
+                    acc.add(json.loads(line))
+            offset += end
+        except (OSError, ValueError) as e:
+            logger.error(f"Trade journal KPI update failed for {date_str}: {e}")
+            return acc
+
+        self._day_kpis[date_str] = (acc, offset)
+        self._save_day_kpis(date_str, acc, offset)
+        return acc
+
+    def _load_day_kpis(self, date_str: str) -> Tuple[KpiAccumulator, int]:
+        try:
+            with open(self._get_kpi_path(date_str), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return KpiAccumulator.from_dict(data["kpis"]), int(data["offset"])
+        except FileNotFoundError:
+            return KpiAccumulator(), 0
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Trade journal KPI file for {date_str} unreadable, rebuilding: {e}")
+            return KpiAccumulator(), 0
+
+    def _save_day_kpis(self, date_str: str, acc: KpiAccumulator, offset: int):
+        path = self._get_kpi_path(date_str)
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"offset": offset, "kpis": acc.to_dict()}, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.error(f"Trade journal KPI save failed for {date_str}: {e}")
+
     def get_stats(self, date_str: Optional[str] = None) -> Dict[str, Any]:
         """
         Get trade statistics for a specific day.
@@ -188,9 +282,9 @@ class TradeJournal:
         Returns:
             Statistics dict with counts, PnL, win rate, etc.
         """
-        trades = self.read_day(date_str or datetime.now().strftime("%Y-%m-%d"))
+        acc = self.day_kpis(date_str or datetime.now().strftime("%Y-%m-%d"))
 
-        if not trades:
+        if acc.count == 0:
             return {
                 "date": date_str,
                 "total_trades": 0,
@@ -202,25 +296,19 @@ class TradeJournal:
                 "net_pnl": 0.0
             }
 
-        # Calculate stats
-        total_trades = len(trades)
-        wins = sum(1 for t in trades if t.get("realized_pnl", 0) > 0)
-        losses = sum(1 for t in trades if t.get("realized_pnl", 0) < 0)
-        total_pnl = sum(t.get("realized_pnl", 0) for t in trades)
-        total_fees = sum(t.get("fees_paid", 0) for t in trades)
-        net_pnl = total_pnl - total_fees
-        win_rate = (wins / total_trades) * 100.0 if total_trades > 0 else 0.0
+        total_trades = acc.count
+        win_rate = (acc.wins / total_trades) * 100.0 if total_trades > 0 else 0.0
 
         return {
             "date": date_str or datetime.now().strftime("%Y-%m-%d"),
             "total_trades": total_trades,
-            "wins": wins,
-            "losses": losses,
+            "wins": acc.wins,
+            "losses": acc.losses,
             "win_rate": win_rate,
-            "total_pnl": total_pnl,
-            "total_fees": total_fees,
-            "net_pnl": net_pnl,
-            "avg_pnl_per_trade": total_pnl / total_trades if total_trades > 0 else 0.0
+            "total_pnl": acc.total_pnl,
+            "total_fees": acc.total_fees,
+            "net_pnl": acc.total_pnl - acc.total_fees,
+            "avg_pnl_per_trade": acc.total_pnl / total_trades if total_trades > 0 else 0.0
         }
 
 
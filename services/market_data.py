@@ -23,6 +23,8 @@ from pathlib import Path
 from threading import RLock
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
+
 # Debug helper - only writes if ENGINE_DEBUG_TRACE is enabled
 def _debug_write(msg: str) -> None:
     """Write debug message to stdout only if ENGINE_DEBUG_TRACE is enabled."""
@@ -32,8 +34,10 @@ def _debug_write(msg: str) -> None:
         sys.stdout.flush()
 
 # Import new pipeline components
+from core.clock import Clock, get_clock
 from core.price_cache import PriceCache
 from core.rolling_windows import RollingWindowManager
+from core.state_store import get_state_store
 from features.engine import compute as compute_features
 from market.anchor_manager import AnchorManager
 from market.snapshot_builder import build as build_snapshot
@@ -228,89 +232,294 @@ class TickerCache:
         self._cache.clear()
 
 
+# OHLCV columns of _OHLCVSeries.values
+_OPEN, _HIGH, _LOW, _CLOSE, _VOLUME = range(5)
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# Price range trackers kept per series (further lookbacks are computed on the view)
+_MAX_RANGE_TRACKERS = 8
+
+
+def _true_ranges(values: np.ndarray) -> np.ndarray:
+    """True range per bar (first bar: high - low)"""
+    high, low, close = values[:, _HIGH], values[:, _LOW], values[:, _CLOSE]
+    tr = high - low
+    if len(values) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)))
+    return tr
+
+
+class _RangeTracker:
+    """Rolling high/low over the last `window` bars (monotonic deques of (abs_index, value))"""
+
+    __slots__ = ("window", "highs", "lows")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.highs: deque = deque()
+        self.lows: deque = deque()
+
+    def push(self, idx: int, high: float, low: float) -> None:
+        highs, lows = self.highs, self.lows
+        expired = idx - self.window
+        if highs and highs[0][0] <= expired:
+            highs.popleft()
+        if lows and lows[0][0] <= expired:
+            lows.popleft()
+        while highs and highs[-1][1] <= high:
+            highs.pop()
+        highs.append((idx, high))
+        while lows and lows[-1][1] >= low:
+            lows.pop()
+        lows.append((idx, low))
+
+    def query(self, first_idx: int) -> Tuple[float, float]:
+        """High/low of bars with abs index >= first_idx"""
+        highs, lows = self.highs, self.lows
+        while highs[0][0] < first_idx:
+            highs.popleft()
+        while lows[0][0] < first_idx:
+            lows.popleft()
+        return highs[0][1], lows[0][1]
+
+
+class _OHLCVSeries:
+    """
+    Bars of one (symbol, timeframe) in preallocated column arrays.
+
+    Live bars occupy [start, end) of the buffers. In-order bars are written
+    at `end` (O(1)); the oldest bar is dropped by advancing `start`. When the
+    buffer is full, live bars move to fresh buffers (amortized O(1), slack of
+    max_bars / 4), so column views handed out earlier are never overwritten.
+    Out-of-order bars are merged in one sort per batch.
+
+    Cumulative true range gives ATR of any period in O(1); rolling high/low
+    trackers are updated on append.
+    """
+
+    __slots__ = ("max_bars", "capacity", "ts", "values", "bars", "cum_tr",
+                 "start", "end", "base", "trackers")
+
+    def __init__(self, max_bars: int):
+        self.max_bars = max(1, max_bars)
+        self.capacity = self.max_bars + max(64, self.max_bars // 4)
+        self._allocate()
+        self.start = 0
+        self.end = 0
+        # abs index of buffer position p = base + p (stable across compaction)
+        self.base = 0
+        self.trackers: Dict[int, _RangeTracker] = {}
+
+    def _allocate(self) -> None:
+        self.ts = np.empty(self.capacity, dtype=np.int64)
+        self.values = np.empty((self.capacity, 5), dtype=np.float64)
+        self.bars = np.empty(self.capacity, dtype=object)
+        self.cum_tr = np.zeros(self.capacity + 1, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def _load(self, ts: np.ndarray, values: np.ndarray, bars: np.ndarray) -> None:
+        """Replace live bars with the given (sorted) ones in fresh buffers"""
+        n = len(ts)
+        self._allocate()
+        self.ts[:n] = ts
+        self.values[:n] = values
+        self.bars[:n] = bars
+        self.cum_tr[0] = 0.0
+        if n:
+            np.cumsum(_true_ranges(self.values[:n]), out=self.cum_tr[1:n + 1])
+        self.start, self.end = 0, n
+
+    def _compact(self) -> None:
+        start, end = self.start, self.end
+        self.base += start
+        self._load(self.ts[start:end], self.values[start:end], self.bars[start:end])
+
+    def append(self, bar: OHLCVBar) -> None:
+        """Append a bar newer than the latest one"""
+        if self.end == self.capacity:
+            self._compact()
+        p = self.end
+        high, low, close = float(bar.high), float(bar.low), float(bar.close)
+        self.ts[p] = bar.timestamp
+        row = self.values[p]
+        row[_OPEN] = bar.open
+        row[_HIGH] = high
+        row[_LOW] = low
+        row[_CLOSE] = close
+        row[_VOLUME] = bar.volume if bar.volume is not None else np.nan
+        self.bars[p] = bar
+
+        tr = high - low
+        if p > self.start:
+            prev_close = self.values[p - 1, _CLOSE]
+            tr = max(tr, abs(high - prev_close), abs(low - prev_close))
+        self.cum_tr[p + 1] = self.cum_tr[p] + tr
+        self.end = p + 1
+
+        for tracker in self.trackers.values():
+            tracker.push(self.base + p, high, low)
+
+        if self.end - self.start > self.max_bars:
+            self.bars[self.start] = None
+            self.start += 1
+
+    def merge(self, bars: List[OHLCVBar]) -> None:
+        """Insert out-of-order bars (existing timestamps win, keep newest max_bars)"""
+        live_ts = self.ts[self.start:self.end]
+        seen = set()
+        fresh = []
+        for bar in bars:
+            if bar.timestamp in seen:
+                continue
+            seen.add(bar.timestamp)
+            i = int(np.searchsorted(live_ts, bar.timestamp))
+            if i < len(live_ts) and live_ts[i] == bar.timestamp:
+                continue
+            fresh.append(bar)
+        if not fresh:
+            return
+
+        new_ts = np.fromiter((b.timestamp for b in fresh), dtype=np.int64, count=len(fresh))
+        new_values = np.array([(b.open, b.high, b.low, b.close, b.volume if b.volume is not None else np.nan)
+                               for b in fresh], dtype=np.float64)
+        new_bars = np.empty(len(fresh), dtype=object)
+        new_bars[:] = fresh
+
+        ts = np.concatenate((live_ts, new_ts))
+        order = np.argsort(ts, kind="stable")[-self.max_bars:]
+        values = np.concatenate((self.values[self.start:self.end], new_values))
+        objs = np.concatenate((self.bars[self.start:self.end], new_bars))
+        self.base += self.end  # positions are renumbered: trackers start over
+        self._load(ts[order], values[order], objs[order])
+        self.trackers.clear()
+
+    def add(self, bars: List[OHLCVBar]) -> None:
+        late = []
+        for bar in bars:
+            if self.end > self.start and bar.timestamp <= self.ts[self.end - 1]:
+                late.append(bar)
+            else:
+                self.append(bar)
+        if late:
+            self.merge(late)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def window(self, limit: Optional[int] = None) -> Tuple[int, int]:
+        """Buffer positions [lo, end) of the last `limit` bars (all if falsy)"""
+        n = self.end - self.start
+        if limit and limit < n:
+            return self.end - max(limit, 0), self.end
+        return self.start, self.end
+
+    def price_range(self, lookback: int) -> Tuple[float, float]:
+        n = self.end - self.start
+        if lookback <= 0 or lookback > self.max_bars:
+            lo, hi = self.window(lookback if lookback > 0 else None)
+            values = self.values[lo:hi]
+            return float(values[:, _HIGH].max()), float(values[:, _LOW].min())
+
+        tracker = self.trackers.get(lookback)
+        if tracker is None:
+            if len(self.trackers) >= _MAX_RANGE_TRACKERS:
+                lo, hi = self.window(lookback)
+                values = self.values[lo:hi]
+                return float(values[:, _HIGH].max()), float(values[:, _LOW].min())
+            tracker = _RangeTracker(lookback)
+            lo, hi = self.window(lookback)
+            for p in range(lo, hi):
+                tracker.push(self.base + p, self.values[p, _HIGH], self.values[p, _LOW])
+            self.trackers[lookback] = tracker
+        first = self.base + self.end - min(lookback, n)
+        high, low = tracker.query(first)
+        return float(high), float(low)
+
+    def atr(self, period: int) -> Optional[float]:
+        if period <= 0 or self.end - self.start < period + 1:
+            return None
+        return float((self.cum_tr[self.end] - self.cum_tr[self.end - period]) / period)
+
+
 class OHLCVHistory:
-    """OHLCV data storage and management"""
+    """OHLCV data storage and management (column arrays per symbol and timeframe)"""
 
     def __init__(self, max_bars_per_symbol: int = 1000):
         self.max_bars_per_symbol = max_bars_per_symbol
-        self._data: Dict[str, Dict[str, deque]] = defaultdict(lambda: defaultdict(deque))
+        self._data: Dict[str, Dict[str, _OHLCVSeries]] = {}
         self._lock = RLock()
 
+    def _series(self, symbol: str, timeframe: str) -> Optional[_OHLCVSeries]:
+        return self._data.get(symbol, {}).get(timeframe)
+
     def add_bars(self, symbol: str, timeframe: str, bars: List[OHLCVBar]) -> None:
         """Add OHLCV bars for symbol and timeframe"""
         with self._lock:
-            symbol_data = self._data[symbol][timeframe]
-
-            for bar in bars:
-                # Check if bar already exists (same timestamp)
-                existing_timestamps = {existing_bar.timestamp for existing_bar in symbol_data}
-                if bar.timestamp not in existing_timestamps:
-                    # Insert in chronological order
-                    inserted = False
-                    for i, existing_bar in enumerate(symbol_data):
-                        if bar.timestamp < existing_bar.timestamp:
-                            symbol_data.insert(i, bar)
-                            inserted = True
-                            break
-
-                    if not inserted:
-                        symbol_data.append(bar)
-
-            # Limit size
-            while len(symbol_data) > self.max_bars_per_symbol:
-                symbol_data.popleft()
+            series = self._series(symbol, timeframe)
+            if series is None:
+                series = _OHLCVSeries(self.max_bars_per_symbol)
+                self._data.setdefault(symbol, {})[timeframe] = series
+            series.add(bars)
 
     def get_bars(self, symbol: str, timeframe: str, limit: Optional[int] = None) -> List[OHLCVBar]:
         """Get OHLCV bars for symbol and timeframe"""
         with self._lock:
-            bars = list(self._data[symbol][timeframe])
-            if limit:
-                return bars[-limit:]
-            return bars
+            series = self._series(symbol, timeframe)
+            if series is None:
+                return []
+            lo, hi = series.window(limit)
+            return series.bars[lo:hi].tolist()
+
+    def get_columns(self, symbol: str, timeframe: str,
+                    limit: Optional[int] = None) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Zero-copy read-only column views of the last `limit` bars.
+
+        Returns:
+            {"timestamp", "open", "high", "low", "close", "volume"} arrays,
+            or None if no bars are stored. Views stay valid (unchanged) after
+            later add_bars calls.
+        """
+        with self._lock:
+            series = self._series(symbol, timeframe)
+            if series is None or not len(series):
+                return None
+            lo, hi = series.window(limit)
+            columns = {"timestamp": series.ts[lo:hi]}
+            values = series.values[lo:hi]
+            for i, name in enumerate(OHLCV_COLUMNS):
+                columns[name] = values[:, i]
+            for view in columns.values():
+                view.flags.writeable = False
+            return columns
 
     def get_latest_bar(self, symbol: str, timeframe: str) -> Optional[OHLCVBar]:
         """Get latest OHLCV bar"""
         with self._lock:
-            bars = self._data[symbol][timeframe]
-            return bars[-1] if bars else None
+            series = self._series(symbol, timeframe)
+            if series is None or not len(series):
+                return None
+            return series.bars[series.end - 1]
 
     def get_price_range(self, symbol: str, timeframe: str, lookback_periods: int) -> Tuple[float, float]:
         """Get high/low range over lookback periods"""
         with self._lock:
-            bars = list(self._data[symbol][timeframe])
-            if not bars:
-                return 0.0, 0.0
-
-            recent_bars = bars[-lookback_periods:] if lookback_periods > 0 else bars
-            if not recent_bars:
+            series = self._series(symbol, timeframe)
+            if series is None or not len(series):
                 return 0.0, 0.0
-
-            high = max(bar.high for bar in recent_bars)
-            low = min(bar.low for bar in recent_bars)
-            return high, low
+            return series.price_range(lookback_periods)
 
     def calculate_atr(self, symbol: str, timeframe: str, period: int = 14) -> Optional[float]:
         """Calculate Average True Range"""
         with self._lock:
-            bars = list(self._data[symbol][timeframe])
-            if len(bars) < period + 1:
+            series = self._series(symbol, timeframe)
+            if series is None:
                 return None
-
-            recent_bars = bars[-(period + 1):]
-            true_ranges = []
-
-            for i in range(1, len(recent_bars)):
-                prev_bar = recent_bars[i - 1]
-                curr_bar = recent_bars[i]
-
-                tr = max(
-                    curr_bar.high - curr_bar.low,
-                    abs(curr_bar.high - prev_bar.close),
-                    abs(curr_bar.low - prev_bar.close)
-                )
-                true_ranges.append(tr)
-
-            return sum(true_ranges) / len(true_ranges) if true_ranges else None
+            return series.atr(period)
 
 
 class MarketDataProvider:
@@ -338,7 +547,8 @@ class MarketDataProvider:
         enable_rate_limiting: bool = True,
         enable_drop_tracking: bool = True,
         event_bus = None,
-        portfolio_provider = None
+        portfolio_provider = None,
+        clock: Optional[Clock] = None
     ):
         """
         Initialize market data provider.
@@ -356,8 +566,10 @@ class MarketDataProvider:
             enable_drop_tracking: Enable RollingWindowManager for drop tracking
             event_bus: Event bus for publishing drop snapshots (optional)
             portfolio_provider: Portfolio instance for priority updates (optional)
+            clock: Time source for snapshots, polling and retries (default: process-wide core.clock)
         """
         self.exchange_adapter = exchange_adapter
+        self._clock = clock
         self.portfolio_provider = portfolio_provider
 
         # Resolve cache configuration from config if not provided
@@ -434,7 +646,7 @@ class MarketDataProvider:
         self._degraded_until: Dict[str, float] = {}
         self._last_success_ts: Dict[str, float] = {}
         self._last_cycle_stats: Dict[str, Any] = {}
-        self._last_health_log_ts = time.time()
+        self._last_health_log_ts = self.clock.time()
         self._error_lock = RLock()
         self._last_fetch_errors: Dict[str, str] = {}
 
@@ -508,9 +720,12 @@ class MarketDataProvider:
             self.rw_manager = RollingWindowManager(
                 lookback_s=lookback_s,
                 persist=persist,
-                base_path=base_path
+                base_path=base_path,
+                clock=clock,
+                store=get_state_store()
             )
-            self.anchor_manager = AnchorManager(base_path=f"{base_path}/anchors")
+            self.anchor_manager = AnchorManager(base_path=f"{base_path}/anchors", clock=clock,
+                                                store=get_state_store())
             self.telemetry = JsonlWriter(base="telemetry")
 
             # V9_3: 4-Stream JSONL Writers (Phase 4)
@@ -571,6 +786,10 @@ class MarketDataProvider:
                 f"persist={persist}, base_path={base_path}"
             )
 
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_clock()
+
     # ------------------------------------------------------------------
     # Helpers for failure/degradation tracking
     # ------------------------------------------------------------------
@@ -688,7 +907,7 @@ class MarketDataProvider:
             # Use cached portfolio symbols for performance
             with self._portfolio_cache_lock:
                 # Check if cache needs refresh
-                current_time = time.time()
+                current_time = self.clock.time()
                 cache_age = current_time - getattr(self, '_portfolio_cache_last_refresh', 0)
 
                 if cache_age > self._portfolio_cache_ttl:
@@ -741,7 +960,7 @@ class MarketDataProvider:
         co = get_shutdown_coordinator()
 
         co.beat(f"get_ticker_enter:{symbol}")
-        start_time = time.time()
+        start_time = self.clock.time()
 
         try:
             with self._lock:
@@ -759,7 +978,7 @@ class MarketDataProvider:
                             # Fresh cache hit
                             co.beat(f"get_ticker_cache_hit:{symbol}")
                             self._statistics['ticker_cache_hits'] += 1
-                            latency_ms = (time.time() - start_time) * 1000
+                            latency_ms = (self.clock.time() - start_time) * 1000
 
                             # Audit log
                             if self.auditor:
@@ -777,7 +996,7 @@ class MarketDataProvider:
                             # (For now, we'll just serve stale immediately and not refresh)
                             co.beat(f"get_ticker_stale_hit:{symbol}")
                             self._statistics['ticker_stale_hits'] += 1
-                            latency_ms = (time.time() - start_time) * 1000
+                            latency_ms = (self.clock.time() - start_time) * 1000
 
                             # Audit log
                             if self.auditor:
@@ -786,7 +1005,7 @@ class MarketDataProvider:
                                     status="STALE",
                                     latency_ms=latency_ms,
                                     source="cache",
-                                    meta={"age_ms": int((time.time() - ticker.timestamp / 1000) * 1000)}
+                                    meta={"age_ms": int((self.clock.time() - ticker.timestamp / 1000) * 1000)}
                                 )
 
                             # Serve stale data immediately
@@ -854,7 +1073,7 @@ class MarketDataProvider:
                     except Exception:
                         logger.debug(f"ticker_cache.store_ticker failed for {symbol}")
 
-                    latency_ms = (time.time() - start_time) * 1000
+                    latency_ms = (self.clock.time() - start_time) * 1000
 
                     # Audit log
                     if self.auditor:
@@ -877,7 +1096,7 @@ class MarketDataProvider:
 
                 except Exception as e:
                     self._statistics['errors'] += 1
-                    latency_ms = (time.time() - start_time) * 1000
+                    latency_ms = (self.clock.time() - start_time) * 1000
 
                     # Audit log error
                     if self.auditor:
@@ -1031,7 +1250,7 @@ class MarketDataProvider:
             TickerData or None if all attempts failed
         """
         import config
-        now = time.time()
+        now = self.clock.time()
 
         # Check if symbol is in backoff period
         with self._lock:
@@ -1074,7 +1293,7 @@ class MarketDataProvider:
                         f"retry {attempt + 1}/{max_attempts} in {backoff:.1f}s"
                     )
 
-                    time.sleep(backoff)
+                    self.clock.sleep(backoff)
                 else:
                     # Final attempt failed
                     logger.warning(
@@ -1110,7 +1329,7 @@ class MarketDataProvider:
                         f"retry {attempt + 1}/{max_attempts} in {backoff:.1f}s"
                     )
 
-                    time.sleep(backoff)
+                    self.clock.sleep(backoff)
                 else:
                     logger.error(
                         f"Ticker fetch failed for {symbol} after {max_attempts} attempts: {e}",
@@ -1204,7 +1423,7 @@ class MarketDataProvider:
         """
         with self._lock:
             self._statistics['ohlcv_requests'] += 1
-            start_time = time.time()
+            start_time = self.clock.time()
 
             try:
                 # Fetch from exchange with rate limiting
@@ -1218,7 +1437,7 @@ class MarketDataProvider:
 
                 # Filter partial candles BEFORE parsing
                 if filter_partial and raw_ohlcv:
-                    now_ms = int(time.time() * 1000)
+                    now_ms = int(self.clock.time() * 1000)
                     raw_ohlcv = filter_closed_candles(raw_ohlcv, timeframe, now_ms)
 
                     removed_count = original_count - len(raw_ohlcv)
@@ -1261,7 +1480,7 @@ class MarketDataProvider:
                     self.ohlcv_history.add_bars(symbol, timeframe, bars)
                     self._statistics['ohlcv_bars_stored'] += len(bars)
 
-                latency_ms = (time.time() - start_time) * 1000
+                latency_ms = (self.clock.time() - start_time) * 1000
 
                 # Audit log
                 if self.auditor:
@@ -1283,7 +1502,7 @@ class MarketDataProvider:
 
             except Exception as e:
                 self._statistics['errors'] += 1
-                latency_ms = (time.time() - start_time) * 1000
+                latency_ms = (self.clock.time() - start_time) * 1000
 
                 # Audit log error
                 if self.auditor:
@@ -1365,7 +1584,7 @@ class MarketDataProvider:
         # Get stale threshold from config (align with anchor stale minutes)
         stale_minutes = getattr(config, 'ANCHOR_STALE_MINUTES', 60)
         stale_threshold_s = stale_minutes * 60
-        now = time.time()
+        now = self.clock.time()
         cutoff_ts = now - stale_threshold_s
 
         logger.info(f"Warm-start will filter ticks older than {stale_minutes} minutes")
@@ -1485,7 +1704,7 @@ class MarketDataProvider:
 
 
         co.beat("md_update_start")
-        now = time.time()
+        now = self.clock.time()
         results = {}
 
         # Check if new pipeline is enabled
@@ -1536,7 +1755,7 @@ class MarketDataProvider:
         tickers: Dict[str, TickerData] = {}
         persist_ticks = getattr(config, 'PERSIST_TICKS', True)
 
-        fetch_start = time.time()
+        fetch_start = self.clock.time()
 
         from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -1566,22 +1785,22 @@ class MarketDataProvider:
             retries_used = 0
             last_error: Optional[Any] = None
             for attempt in range(self.max_retries + 1):
-                fetch_t0 = time.time()
+                fetch_t0 = self.clock.time()
                 recent_error: Optional[str] = None
                 try:
                     ticker = self.get_ticker(symbol, use_cache=False)
                     with self._error_lock:
                         recent_error = self._last_fetch_errors.pop(symbol, None)
-                    fetch_duration_ms = (time.time() - fetch_t0) * 1000
+                    fetch_duration_ms = (self.clock.time() - fetch_t0) * 1000
 
                     if getattr(config, 'MD_DEBUG_PER_COIN', False):
                         log_file = getattr(config, 'MD_DEBUG_LOG_FILE', 'market_data_debug.log')
                         try:
                             with open(log_file, 'a') as f:
                                 if ticker and ticker.last:
-                                    f.write(f"{time.time():.3f} | {symbol:15s} | SUCCESS | price={ticker.last:12.8f} | duration={fetch_duration_ms:6.1f}ms | retries={retries_used}\n")
+                                    f.write(f"{self.clock.time():.3f} | {symbol:15s} | SUCCESS | price={ticker.last:12.8f} | duration={fetch_duration_ms:6.1f}ms | retries={retries_used}\n")
                                 else:
-                                    f.write(f"{time.time():.3f} | {symbol:15s} | NO_DATA | duration={fetch_duration_ms:6.1f}ms | retries={retries_used}\n")
+                                    f.write(f"{self.clock.time():.3f} | {symbol:15s} | NO_DATA | duration={fetch_duration_ms:6.1f}ms | retries={retries_used}\n")
                         except Exception:
                             pass
 
@@ -1595,7 +1814,7 @@ class MarketDataProvider:
                         log_file = getattr(config, 'MD_DEBUG_LOG_FILE', 'market_data_debug.log')
                         try:
                             with open(log_file, 'a') as f:
-                                f.write(f"{time.time():.3f} | {symbol:15s} | ERROR   | error={str(e)[:60]:60s} | retries={retries_used}\n")
+                                f.write(f"{self.clock.time():.3f} | {symbol:15s} | ERROR   | error={str(e)[:60]:60s} | retries={retries_used}\n")
                         except Exception:
                             pass
 
@@ -1604,7 +1823,7 @@ class MarketDataProvider:
 
                 retries_used += 1
                 if self.retry_delay_s > 0:
-                    time.sleep(self.retry_delay_s)
+                    self.clock.sleep(self.retry_delay_s)
 
             error_msg = str(last_error) if last_error is not None else "Ticker missing last price"
             return symbol, None, error_msg, retries_used
@@ -1640,7 +1859,7 @@ class MarketDataProvider:
                         bid = raw.get('bid') or last_price
                         ask = raw.get('ask') or last_price
                         volume = raw.get('baseVolume') or raw.get('volume') or 0
-                        timestamp_ms = raw.get('timestamp') or int(time.time() * 1000)
+                        timestamp_ms = raw.get('timestamp') or int(self.clock.time() * 1000)
 
                         ticker_obj = TickerData(
                             symbol=symbol,
@@ -1699,7 +1918,7 @@ class MarketDataProvider:
                     missing_symbols.extend(missing_chunk)
 
                 if self.batch_delay_s > 0:
-                    time.sleep(self.batch_delay_s)
+                    self.clock.sleep(self.batch_delay_s)
         else:
             missing_symbols = list(symbols_to_query)
 
@@ -1754,11 +1973,11 @@ class MarketDataProvider:
         for sym in original_symbols:
             results.setdefault(sym, False if sym not in degraded_symbols else True)
 
-        fetch_duration = time.time() - fetch_start
+        fetch_duration = self.clock.time() - fetch_start
 
         failure_symbols = [sym for sym in original_symbols if not results.get(sym, False)]
         stats = {
-            'timestamp': time.time(),
+            'timestamp': self.clock.time(),
             'requested': len(original_symbols),
             'queried': len(symbols_to_query),
             'fetched': len(tickers),
@@ -1771,7 +1990,7 @@ class MarketDataProvider:
         }
         self._last_cycle_stats = stats
 
-        now_health = time.time()
+        now_health = self.clock.time()
         if now_health - self._last_health_log_ts >= self.health_log_interval_s:
             top_failures = Counter(self._failure_counts).most_common(self.failure_log_top_n)
             logger.info(
@@ -2051,7 +2270,7 @@ class MarketDataProvider:
         self._thread = None
 
         # Initialize health monitoring attributes
-        self._last_heartbeat = time.time()
+        self._last_heartbeat = self.clock.time()
         self._last_cycle_time = None
         self._last_success_rate = None
 
@@ -2160,7 +2379,6 @@ class MarketDataProvider:
         FIX ACTION 1.3: Implements MD_AUTO_RESTART_ON_CRASH config
         """
         import config
-        import time
 
         restart_count = 0
         max_restarts = getattr(config, 'MD_MAX_AUTO_RESTARTS', 5)
@@ -2220,7 +2438,7 @@ class MarketDataProvider:
                     self.price_cache.buffers.clear()
                     self.price_cache.last.clear()
 
-                time.sleep(restart_delay_s)
+                self.clock.sleep(restart_delay_s)
                 # Loop continues - thread restarts
 
     def _loop(self):
@@ -2298,7 +2516,7 @@ class MarketDataProvider:
                 logger.info(f"MD_BATCH_POLLING disabled: fetching all {len(symbols)} symbols sequentially")
 
             loop_counter = 0
-            last_heartbeat_time = time.time()
+            last_heartbeat_time = self.clock.time()
             heartbeat_interval = getattr(config, 'MD_HEARTBEAT_INTERVAL_CYCLES', 100)
 
             # Performance tracking for health monitoring
@@ -2308,7 +2526,7 @@ class MarketDataProvider:
             while self._running:
                 try:
                     loop_counter += 1
-                    cycle_start = time.time()
+                    cycle_start = self.clock.time()
 
                     # CRITICAL FIX: Add continuous loop logging (not just first 10)
                     # Log every 10th iteration for debugging
@@ -2322,19 +2540,19 @@ class MarketDataProvider:
                     # Process each batch with interval
                     all_results = {}
                     for batch_idx, batch_symbols in enumerate(symbol_batches):
-                        batch_start = time.time()
+                        batch_start = self.clock.time()
 
                         # Add random jitter to spread requests
                         if jitter_ms > 0 and batch_idx > 0:
                             import random
                             jitter = random.randint(0, jitter_ms) / 1000.0
-                            time.sleep(jitter)
+                            self.clock.sleep(jitter)
 
                         # Fetch batch (returns Dict[str, bool] indicating success per symbol)
                         batch_results = self.update_market_data(batch_symbols)
                         all_results.update(batch_results)
 
-                        batch_duration = time.time() - batch_start
+                        batch_duration = self.clock.time() - batch_start
                         batch_success = sum(1 for v in batch_results.values() if v)
 
                         # Log batch progress
@@ -2349,11 +2567,11 @@ class MarketDataProvider:
                         if batch_idx < len(symbol_batches) - 1:
                             batch_sleep = (batch_interval_ms / 1000.0) - batch_duration
                             if batch_sleep > 0:
-                                time.sleep(batch_sleep)
+                                self.clock.sleep(batch_sleep)
 
                     success_count = sum(1 for v in all_results.values() if v)
                     failed_count = sum(1 for v in all_results.values() if not v)
-                    cycle_duration = time.time() - cycle_start
+                    cycle_duration = self.clock.time() - cycle_start
 
 
                     # Per-cycle summary (if per-coin debugging enabled)
@@ -2428,7 +2646,7 @@ class MarketDataProvider:
                     # Store metrics for external monitoring
                     self._last_cycle_time = cycle_duration
                     self._last_success_rate = success_rate
-                    self._last_heartbeat = time.time()
+                    self._last_heartbeat = self.clock.time()
 
                     # Heartbeat logging (every N cycles)
                     if loop_counter % heartbeat_interval == 0:
@@ -2454,7 +2672,7 @@ class MarketDataProvider:
                     # Sleep until next poll cycle (adjust for time already spent)
                     remaining_sleep = poll_s - cycle_duration
                     if remaining_sleep > 0:
-                        time.sleep(remaining_sleep)
+                        self.clock.sleep(remaining_sleep)
                     elif remaining_sleep < -1.0:
                         # Warn if cycle took significantly longer than poll interval
                         # FIX: Add event_type for Dashboard/Monitoring
@@ -2484,7 +2702,7 @@ class MarketDataProvider:
                         extra={'event_type': 'MD_LOOP_CYCLE_ERROR', 'iteration': loop_counter}
                     )
                     # CRITICAL FIX: Don't stop on exceptions, just sleep and continue
-                    time.sleep(poll_s)
+                    self.clock.sleep(poll_s)
 
             # If loop exits normally (self._running became False)
             logger.info(f"Market data loop exited normally after {loop_counter} iterations (_running={self._running})")
@@ -635,15 +635,14 @@ def can_afford(exchange, symbol: str, price: float, budget: float) -> bool:
         >>> can_afford(exchange, "BLESS/USDT", 0.038, 10.0)
         True  # 10 USDT > min_notional (5.0)
     """
-    from services.exchange_filters import get_filters
-    from services.quantize import q_amount
+    from services.order_templates import resolve_template
 
     try:
-        f = get_filters(exchange, symbol)
+        tpl = resolve_template(exchange, symbol)
 
         # Calculate minimum amount needed
-        min_amt = f.get("min_qty") or f.get("step_size") or 0
-        min_notional = f.get("min_notional") or 0
+        min_amt = tpl.min_qty or tpl.step_size or 0
+        min_notional = tpl.min_notional or 0
 
         # If min_notional exists, ensure amount meets it
         if min_notional:
@@ -652,7 +651,7 @@ def can_afford(exchange, symbol: str, price: float, budget: float) -> bool:
             need_amt = min_amt
 
         # Quantize amount to step_size
-        amt_q = q_amount(need_amt, f["step_size"]) if f["step_size"] else need_amt
+        amt_q = tpl.floor_amount(need_amt)
 
         # Check if budget sufficient
         required_budget = price * amt_q
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Market Metadata Cache - Persistent Markets for Fast Startup and Offline Runs
+
+Keeps the result of load_markets (markets, precision, limits, tick/step
+sizes, min notional) in a versioned JSON file. At startup the cache is
+installed into the exchange in milliseconds (ccxt set_markets) and the
+exchange-filter cache is primed; the network load_markets then runs in a
+background thread (serialized with all other calls on the ccxt instance), is diffed against the cached markets and only changed
+symbols are invalidated and reported.
+
+The same file serves as load_markets stand-in for MockExchange and offline
+simulations (MarketMetadataCache.load().markets).
+
+File layout (MARKET_METADATA_FILE):
+    {"version": 1, "exchange": "mexc", "saved_at": 1700000000.0,
+     "markets": {symbol: market}, "filters": {symbol: filters}}
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from services import order_templates
+from services.exchange_filters import filters_from_market, invalidate, prime_cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+# Market fields kept in the cache (raw "info" is reduced to its filters)
+_MARKET_FIELDS = ("id", "symbol", "base", "quote", "baseId", "quoteId", "type", "spot",
+                  "active", "precision", "limits", "taker", "maker")
+# Fields whose change matters for order sizing / validation
+_DIFF_FIELDS = ("active", "precision", "limits")
+
+
+def _compact_market(market: Dict[str, Any]) -> Dict[str, Any]:
+    compact = {key: market[key] for key in _MARKET_FIELDS if key in market}
+    filters = (market.get("info") or {}).get("filters")
+    compact["info"] = {"filters": filters} if filters else {}
+    return compact
+
+
+@dataclass
+class MarketDiff:
+    """Difference between two market snapshots"""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def symbols(self) -> List[str]:
+        return self.added + self.removed + self.changed
+
+
+def diff_markets(old: Dict[str, Any], new: Dict[str, Any]) -> MarketDiff:
+    """Symbols added, removed or with changed active/precision/limits"""
+    diff = MarketDiff(
+        added=sorted(new.keys() - old.keys()),
+        removed=sorted(old.keys() - new.keys()),
+    )
+    for symbol in sorted(old.keys() & new.keys()):
+        before, after = old[symbol], new[symbol]
+        if (any(before.get(key) != after.get(key) for key in _DIFF_FIELDS)
+                or (before.get("info") or {}).get("filters") != (after.get("info") or {}).get("filters")):
+            diff.changed.append(symbol)
+    return diff
+
+
+class MarketMetadataCache:
+    """
+    Versioned on-disk cache of exchange markets.
+
+    Usage:
+        cache = MarketMetadataCache("state/market_metadata.json")
+        if cache.load() and cache.install(exchange):
+            cache.refresh_async(exchange)        # network refresh in background
+        else:
+            exchange.load_markets(True)
+            cache.update(exchange.markets)
+    """
+
+    def __init__(self, path: str, exchange_id: Optional[str] = None):
+        """
+        Args:
+            path: Cache file
+            exchange_id: Exchange the markets belong to (a cache of another exchange is ignored)
+        """
+        self.path = path
+        self.exchange_id = exchange_id
+        self.markets: Dict[str, Dict[str, Any]] = {}
+        self.filters: Dict[str, dict] = {}
+        self.saved_at = 0.0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[MarketDiff], None]] = []
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Load / save
+    # ------------------------------------------------------------------
+
+    def load(self, max_age_s: Optional[float] = None) -> bool:
+        """
+        Read the cache file.
+
+        Args:
+            max_age_s: Treat older caches as missing
+
+        Returns:
+            True if a valid cache was loaded
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Market metadata cache unreadable: {e}",
+                           extra={'event_type': 'MARKET_METADATA_CACHE_INVALID', 'error': str(e)})
+            return False
+
+        if data.get("version") != CACHE_VERSION:
+            logger.info(f"Market metadata cache version {data.get('version')} != {CACHE_VERSION}, ignoring")
+            return False
+        if self.exchange_id and data.get("exchange") not in (None, self.exchange_id):
+            logger.info(f"Market metadata cache is for {data.get('exchange')}, ignoring")
+            return False
+        saved_at = float(data.get("saved_at") or 0.0)
+        if max_age_s is not None and time.time() - saved_at > max_age_s:
+            logger.info(f"Market metadata cache older than {max_age_s:.0f}s, ignoring")
+            return False
+
+        with self._lock:
+            self.markets = data.get("markets") or {}
+            self.filters = data.get("filters") or {}
+            self.saved_at = saved_at
+        return bool(self.markets)
+
+    def _save(self):
+        """Write the cache atomically (assumes lock is held)"""
+        payload = {
+            "version": CACHE_VERSION,
+            "exchange": self.exchange_id,
+            "saved_at": self.saved_at,
+            "markets": self.markets,
+            "filters": self.filters,
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.error(f"Market metadata cache save failed: {e}",
+                         extra={'event_type': 'MARKET_METADATA_SAVE_ERROR', 'error': str(e)})
+
+    # ------------------------------------------------------------------
+    # Exchange integration
+    # ------------------------------------------------------------------
+
+    def install(self, exchange) -> bool:
+        """
+        Install cached markets into exchange and prime the filter cache.
+
+        Uses ccxt set_markets (symbols, ids, currencies); exchanges without
+        it (mocks) get their markets attribute replaced.
+
+        Returns:
+            True if markets were installed
+        """
+        with self._lock:
+            markets = {symbol: dict(market) for symbol, market in self.markets.items()}
+            filters = dict(self.filters)
+        if not markets:
+            return False
+        try:
+            if hasattr(exchange, "set_markets"):
+                exchange.set_markets(markets)
+            else:
+                exchange.markets = markets
+        except Exception as e:
+            logger.warning(f"Installing cached markets failed: {e}",
+                           extra={'event_type': 'MARKET_METADATA_INSTALL_ERROR', 'error': str(e)})
+            return False
+        prime_cache(filters)
+        logger.info(f"Markets loaded from cache: {len(markets)} symbols "
+                    f"(age {time.time() - self.saved_at:.0f}s)",
+                    extra={'event_type': 'MARKET_METADATA_CACHE_LOADED', 'symbols': len(markets)})
+        return True
+
+    def update(self, markets: Dict[str, Any]) -> MarketDiff:
+        """
+        Replace the cached markets with a fresh load_markets result.
+
+        Changed symbols are invalidated in the filter and order template
+        caches, listeners are notified and the file is rewritten only if
+        something changed.
+
+        Returns:
+            MarketDiff against the previous cache content
+        """
+        compact = {symbol: _compact_market(market) for symbol, market in (markets or {}).items()}
+        with self._lock:
+            diff = diff_markets(self.markets, compact)
+            first = not self.markets
+            self.saved_at = time.time()
+            if diff or first:
+                for symbol in diff.removed:
+                    self.filters.pop(symbol, None)
+                for symbol in diff.added + diff.changed:
+                    self.filters[symbol] = filters_from_market(compact[symbol])
+                self.markets = compact
+            self._save()
+            listeners = list(self._listeners)
+
+        if diff and not first:
+            invalidate(diff.symbols())
+            order_templates.invalidate(diff.symbols())
+            prime_cache({symbol: self.filters[symbol] for symbol in diff.added + diff.changed})
+            logger.info(f"Market metadata changed: +{len(diff.added)} -{len(diff.removed)} "
+                        f"~{len(diff.changed)}",
+                        extra={'event_type': 'MARKET_METADATA_CHANGED', 'added': diff.added,
+                               'removed': diff.removed, 'changed': diff.changed})
+            for listener in listeners:
+                try:
+                    listener(diff)
+                except Exception as e:
+                    logger.error(f"Market metadata listener failed: {e}", exc_info=True)
+        return diff
+
+    def add_listener(self, callback: Callable[[MarketDiff], None]):
+        """Call callback(diff) whenever a refresh changes markets"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def refresh(self, exchange) -> Optional[MarketDiff]:
+        """
+        Load markets from the exchange (network) and update the cache.
+
+        The reload runs under the ccxt instance's serialization lock (shared
+        with ExchangeAdapter), so a background refresh never overlaps
+        trading calls on the same instance.
+        """
+        from adapters.exchange import ccxt_serial_lock
+        try:
+            with ccxt_serial_lock(exchange):
+                markets = exchange.load_markets(True)
+        except Exception as e:
+            logger.warning(f"Market metadata refresh failed: {e}",
+                           extra={'event_type': 'MARKET_METADATA_REFRESH_ERROR', 'error': str(e)})
+            return None
+        return self.update(markets if markets else getattr(exchange, "markets", {}))
+
+    def refresh_async(self, exchange) -> threading.Thread:
+        """Run refresh() in a daemon thread; returns the thread"""
+        thread = threading.Thread(target=self.refresh, args=(exchange,),
+                                  name="MarketMetadataRefresh", daemon=True)
+        self._refresh_thread = thread
+        thread.start()
+        return thread
+
+    def get_filters(self, symbol: str) -> Optional[dict]:
+        """Cached filters of symbol"""
+        with self._lock:
+            return self.filters.get(symbol)
+
+
+def load_cached_markets(path: str) -> Dict[str, Dict[str, Any]]:
+    """Markets of a cache file (empty if missing/invalid) - for mocks and offline runs"""
+    cache = MarketMetadataCache(path)
+    return cache.markets if cache.load() else {}
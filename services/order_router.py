@@ -27,6 +27,7 @@ import ccxt
 import config
 
 # P1: State Persistence
+from core.state_store import get_state_store
 from core.state_writer import DebouncedStateWriter
 
 logger = logging.getLogger(__name__)
@@ -885,7 +886,8 @@ class OrderRouter:
             self._meta_state_writer = DebouncedStateWriter(
                 file_path=config.ORDER_ROUTER_META_FILE,
                 interval_s=config.STATE_PERSIST_INTERVAL_S,
-                auto_start=True
+                auto_start=True,
+                store=get_state_store()
             )
 
             # Recover existing metadata
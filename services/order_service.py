@@ -24,6 +24,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+from services import order_templates
+
 # Phase 2: Import COID manager
 try:
     from core.coid import COIDStatus, get_coid_manager
@@ -248,8 +250,8 @@ class OrderService:
             logger.warning(f"Generated fallback COID (no decision_id): {coid}")
         # Quantize price and quantity
         try:
-            price = float(self.exchange.price_to_precision(symbol, price))
-            qty = float(self.exchange.amount_to_precision(symbol, qty))
+            price = order_templates.price_to_precision(self.exchange, symbol, price)
+            qty = order_templates.amount_to_precision(self.exchange, symbol, qty)
         except Exception as e:
             logger.error(f"Quantization failed for {symbol}: {e}")
             return OrderResult(
@@ -318,7 +320,7 @@ class OrderService:
             logger.warning(f"Generated fallback COID (no decision_id): {coid}")
         # Quantize quantity
         try:
-            qty = float(self.exchange.amount_to_precision(symbol, qty))
+            qty = order_templates.amount_to_precision(self.exchange, symbol, qty)
         except Exception as e:
             logger.error(f"Quantization failed for {symbol}: {e}")
             return OrderResult(
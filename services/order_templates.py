@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Order Templates - Precompiled Per-Symbol Order Constraints
+
+Tick size, step size, min qty, min notional and fees of a symbol are
+compiled once into an OrderTemplate. Quantization then works on integer
+tick/step counts with precomputed inverses and decimal places instead of
+re-deriving filters, building Decimals or calling the exchange's
+*_to_precision on every submit and ladder step.
+
+Rounding semantics:
+- floor_price / floor_amount: services.quantize (FLOOR, used by preflight)
+- round_price: ccxt price_to_precision (nearest tick)
+- floor_amount also matches ccxt amount_to_precision (TRUNCATE)
+
+Templates are cached per symbol and invalidated when the market metadata
+cache reports changed markets (services.market_metadata).
+"""
+
+import logging
+import math
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import config
+from services.exchange_filters import cached_filters, filters_from_market, get_filters
+
+logger = logging.getLogger(__name__)
+
+# Values within this fraction of a step below the next step count as on it
+# (absorbs float error such as 0.0123 / 0.0001 = 122.99999999999999)
+_STEP_EPS = 1e-9
+
+# Cache: symbol -> template
+_templates: Dict[str, "OrderTemplate"] = {}
+
+
+def _decimals(step: float) -> int:
+    if not step:
+        return 0
+    return max(0, -Decimal(str(step)).normalize().as_tuple().exponent)
+
+
+@dataclass(frozen=True)
+class OrderTemplate:
+    """Compiled constraints of one symbol"""
+    symbol: str
+    tick_size: float
+    step_size: float
+    min_qty: Optional[float]
+    min_notional: Optional[float]
+    maker_fee: float = 0.0
+    taker_fee: float = 0.0
+    # Precomputed in from_filters
+    _inv_tick: float = field(default=0.0, repr=False)
+    _inv_step: float = field(default=0.0, repr=False)
+    _price_decimals: int = field(default=0, repr=False)
+    _amount_decimals: int = field(default=0, repr=False)
+
+    @classmethod
+    def from_filters(cls, symbol: str, f: dict, maker_fee: float = 0.0, taker_fee: float = 0.0) -> "OrderTemplate":
+        """Compile a template from an exchange_filters dict"""
+        tick = float(f.get("tick_size") or 0.0)
+        step = float(f.get("step_size") or 0.0)
+        return cls(
+            symbol=symbol,
+            tick_size=tick,
+            step_size=step,
+            min_qty=f.get("min_qty"),
+            min_notional=f.get("min_notional"),
+            maker_fee=maker_fee,
+            taker_fee=taker_fee,
+            _inv_tick=1.0 / tick if tick else 0.0,
+            _inv_step=1.0 / step if step else 0.0,
+            _price_decimals=_decimals(tick),
+            _amount_decimals=_decimals(step),
+        )
+
+    @property
+    def known(self) -> bool:
+        """True if tick and step size are known (otherwise values pass through)"""
+        return self.tick_size > 0 and self.step_size > 0
+
+    # ------------------------------------------------------------------
+    # Quantization on integer step counts
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _floor_steps(value: float, inv: float) -> int:
+        x = value * inv
+        n = math.floor(x)
+        if x - n > 1.0 - _STEP_EPS:
+            n += 1
+        return n
+
+    def price_ticks(self, price: float) -> int:
+        """Price as whole ticks (floored)"""
+        return self._floor_steps(price, self._inv_tick)
+
+    def floor_price(self, price: float) -> float:
+        """Price floored to the tick size"""
+        if not self.tick_size:
+            return price
+        return round(self._floor_steps(price, self._inv_tick) * self.tick_size, self._price_decimals)
+
+    def round_price(self, price: float) -> float:
+        """Price rounded to the nearest tick (ccxt price_to_precision)"""
+        if not self.tick_size:
+            return price
+        return round(math.floor(price * self._inv_tick + 0.5) * self.tick_size, self._price_decimals)
+
+    def floor_amount(self, amount: float) -> float:
+        """Amount floored to the step size"""
+        if not self.step_size:
+            return amount
+        return round(self._floor_steps(amount, self._inv_step) * self.step_size, self._amount_decimals)
+
+    def fee(self, notional: float, maker: bool = False) -> float:
+        """Expected fee of an order with this notional"""
+        return notional * (self.maker_fee if maker else self.taker_fee)
+
+    # ------------------------------------------------------------------
+    # Validation
+    # ------------------------------------------------------------------
+
+    def check(self, price: Optional[float], amount: float) -> Optional[str]:
+        """
+        Reject reason of already quantized values (None if valid).
+
+        Args:
+            price: Limit price (None for market orders: notional not checked)
+            amount: Order amount
+        """
+        if amount <= 0:
+            return "amount_zero_or_negative"
+        if self.min_qty and amount < self.min_qty:
+            return "min_qty"
+        if price is None:
+            return None
+        if price <= 0:
+            return "price_zero_or_negative"
+        if self.min_notional and price * amount < self.min_notional:
+            return "min_notional"
+        return None
+
+    def preflight(self, price: float, amount: float) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Quantize (FLOOR), check min_qty and bump the amount to min_notional.
+
+        Same contract as services.order_validation.preflight.
+        """
+        symbol = self.symbol
+        qp = self.floor_price(price)
+        qa = self.floor_amount(amount)
+
+        min_qty = self.min_qty
+        if min_qty and qa < min_qty:
+            logger.warning(
+                f"[PRE_FLIGHT] {symbol} FAILED: min_qty violation "
+                f"(need {min_qty}, got {qa})"
+            )
+            return False, {
+                "reason": "min_qty",
+                "need": min_qty,
+                "got": qa
+            }
+
+        min_notional = self.min_notional
+        if min_notional and qp * qa < min_notional:
+            # Try to auto-bump amount to meet min_notional
+            need_amt = min_notional / max(qp, 1e-18)
+            qa2 = self.floor_amount(max(qa, need_amt))
+
+            if qp * qa2 < min_notional:
+                logger.warning(
+                    f"[PRE_FLIGHT] {symbol} FAILED: min_notional violation "
+                    f"(need {min_notional}, got {qp * qa2:.6f} even after bump)"
+                )
+                return False, {
+                    "reason": "min_notional",
+                    "need": min_notional,
+                    "got": qp * qa2
+                }
+
+            logger.info(
+                f"[PRE_FLIGHT] {symbol} AUTO-BUMP: {qa:.6f} → {qa2:.6f} "
+                f"to meet min_notional {min_notional}"
+            )
+            qa = qa2
+
+        logger.info(
+            f"[PRE_FLIGHT] {symbol} PASSED "
+            f"(price={qp:.8f}, amount={qa:.6f}, notional={qp * qa:.2f})"
+        )
+
+        return True, {
+            "price": qp,
+            "amount": qa
+        }
+
+
+def _lookup_market(exchange, symbol: str) -> Optional[dict]:
+    try:
+        return exchange.market(symbol)
+    except Exception:
+        pass
+    markets = getattr(exchange, "markets", None)
+    if isinstance(markets, dict) and symbol in markets:
+        return markets[symbol]
+    getter = getattr(exchange, "get_market_info", None)
+    if getter is not None:
+        try:
+            return getter(symbol) or None
+        except Exception:
+            return None
+    return None
+
+
+def get_template(exchange, symbol: str) -> Optional[OrderTemplate]:
+    """
+    Compiled template of symbol (built on first use).
+
+    Args:
+        exchange: ccxt exchange or adapter with markets
+        symbol: Trading symbol
+
+    Returns:
+        OrderTemplate, or None if the market is unknown
+    """
+    template = _templates.get(symbol)
+    if template is not None:
+        return template
+
+    market = _lookup_market(exchange, symbol)
+    if not market:
+        return None
+    filters = cached_filters(symbol) or filters_from_market(market)
+    taker = market.get("taker")
+    taker = float(taker if taker is not None else getattr(config, 'TAKER_FEE_RATE', 0.001))
+    maker = market.get("maker")
+    maker = float(maker if maker is not None else taker)
+
+    template = OrderTemplate.from_filters(symbol, filters, maker_fee=maker, taker_fee=taker)
+    if not template.known:
+        return None
+    _templates[symbol] = template
+    logger.debug(f"Compiled order template for {symbol}: {template}")
+    return template
+
+
+def resolve_template(exchange, symbol: str) -> OrderTemplate:
+    """
+    Template for preflight-style callers that never need None.
+
+    Unknown markets get an uncached template from get_filters (empty
+    filters pass values through, as preflight always did).
+    """
+    template = get_template(exchange, symbol)
+    if template is not None:
+        return template
+    return OrderTemplate.from_filters(symbol, get_filters(exchange, symbol))
+
+
+def price_to_precision(exchange, symbol: str, price: float) -> float:
+    """Price to exchange precision via template, exchange fallback"""
+    template = get_template(exchange, symbol)
+    if template is not None:
+        return template.round_price(price)
+    return float(exchange.price_to_precision(symbol, price))
+
+
+def amount_to_precision(exchange, symbol: str, amount: float) -> float:
+    """Amount to exchange precision via template, exchange fallback"""
+    template = get_template(exchange, symbol)
+    if template is not None:
+        return template.floor_amount(amount)
+    return float(exchange.amount_to_precision(symbol, amount))
+
+
+def invalidate(symbols: Iterable[str]):
+    """Drop templates of symbols whose market changed"""
+    for symbol in symbols:
+        _templates.pop(symbol, None)
+
+
+def clear_templates():
+    """Drop all templates (for testing or market reloads)"""
+    _templates.clear()
@@ -8,6 +8,8 @@ import threading
 import time
 from typing import Any, Dict, Optional, Tuple
 
+from services import order_templates
+
 logger = logging.getLogger(__name__)
 
 
@@ -125,8 +127,8 @@ class OrderService:
         with self._lock:
             try:
                 # Finale Quantisierung direkt vor Order-Call (wirklich unmittelbar davor)
-                px = float(self.exchange.price_to_precision(symbol, price))
-                qty = float(self.exchange.amount_to_precision(symbol, amount))
+                px = order_templates.price_to_precision(self.exchange, symbol, price)
+                qty = order_templates.amount_to_precision(self.exchange, symbol, amount)
 
                 # Sicherheitsnetz nach der Quantisierung
                 if qty <= 0 or px <= 0:
@@ -214,7 +216,7 @@ class OrderService:
         with self._lock:
             try:
                 # Finale Quantisierung direkt vor Order-Call (wirklich unmittelbar davor)
-                qty = float(self.exchange.amount_to_precision(symbol, amount))
+                qty = order_templates.amount_to_precision(self.exchange, symbol, amount)
 
                 # Sicherheitsnetz nach der Quantisierung
                 if qty <= 0:
@@ -302,8 +304,8 @@ class OrderService:
         with self._lock:
             try:
                 # Finale Quantisierung direkt vor Order-Call (wirklich unmittelbar davor)
-                px = float(self.exchange.price_to_precision(symbol, price))
-                qty = float(self.exchange.amount_to_precision(symbol, amount))
+                px = order_templates.price_to_precision(self.exchange, symbol, price)
+                qty = order_templates.amount_to_precision(self.exchange, symbol, amount)
 
                 # Sicherheitsnetz nach der Quantisierung
                 if qty <= 0 or px <= 0:
@@ -729,11 +731,11 @@ class OrderService:
             (adjusted_amount, adjusted_price)
         """
         try:
-            adjusted_amount = float(self.exchange.amount_to_precision(symbol, amount))
+            adjusted_amount = order_templates.amount_to_precision(self.exchange, symbol, amount)
             adjusted_price = None
 
             if price is not None:
-                adjusted_price = float(self.exchange.price_to_precision(symbol, price))
+                adjusted_price = order_templates.price_to_precision(self.exchange, symbol, price)
 
             return adjusted_amount, adjusted_price
 
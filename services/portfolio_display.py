@@ -49,6 +49,21 @@ def format_pnl_pct_color(pnl_pct: float) -> str:
         return f"{pnl_pct:.2f}%"
 
 
+def current_unrealized_pnl(portfolio_manager, pnl_summary: Dict) -> float:
+    """
+    Unrealized PnL of the portfolio's latest bulk valuation.
+
+    Falls back to the PnL tracker while the position book holds no positions
+    (e.g. portfolio managers without a position book).
+    """
+    valuation_fn = getattr(portfolio_manager, 'valuation', None)
+    if callable(valuation_fn):
+        valuation = valuation_fn()
+        if valuation.symbols:
+            return valuation.unrealized_pnl
+    return pnl_summary.get("unrealized", 0.0)
+
+
 def display_portfolio(
     positions: Dict[str, Dict],
     portfolio_manager,
@@ -74,7 +89,7 @@ def display_portfolio(
         pnl_summary = pnl_tracker.get_total_pnl()
 
         realized_pnl = pnl_summary.get("realized", 0.0)
-        unrealized_pnl = pnl_summary.get("unrealized", 0.0)
+        unrealized_pnl = current_unrealized_pnl(portfolio_manager, pnl_summary)
         total_fees = pnl_summary.get("fees", 0.0)
         net_pnl = pnl_summary.get("net_after_fees", 0.0)
 
@@ -190,7 +205,7 @@ def display_compact_portfolio(
         usdt_balance = portfolio_manager.get_balance("USDT")
         pnl_summary = pnl_tracker.get_total_pnl()
 
-        unrealized_pnl = pnl_summary.get("unrealized", 0.0)
+        unrealized_pnl = current_unrealized_pnl(portfolio_manager, pnl_summary)
         net_pnl = pnl_summary.get("net_after_fees", 0.0)
 
         equity = usdt_balance + unrealized_pnl
@@ -9,6 +9,9 @@ Responsibilities:
 - Fetch trades for completed orders from exchange
 - Pass trades to Portfolio for position reconciliation
 - Log all reconciliation events for audit trail
+- Batch reconciliation: one fetch_my_trades per symbol over a time window,
+  trades matched to many orders locally, symbols processed on a bounded
+  worker pool with recently submitted orders first (BatchReconciler)
 
 NOT Responsible For:
 - Trading decisions (handled by Decision layer)
@@ -17,11 +20,28 @@ NOT Responsible For:
 """
 
 import logging
+import threading
 import time
-from typing import Any, Dict, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.portfolio.locks import get_symbol_lock
 
 logger = logging.getLogger(__name__)
 
+# Trades of this order could not be fetched - its fill state is unknown
+FETCH_FAILED = object()
+
+
+@dataclass
+class ReconcileRequest:
+    """One order to reconcile"""
+    symbol: str
+    order_id: str
+    submitted_ts: float = 0.0  # order placement time (priority + fetch window)
+
 
 class Reconciler:
     """
@@ -44,9 +64,26 @@ class Reconciler:
         self.ex = exchange
         self.pf = portfolio
         self.tl = telemetry
+        self._batch: Optional["BatchReconciler"] = None
 
         logger.info("Reconciler initialized")
 
+    def reconcile_orders(self, requests: Iterable[ReconcileRequest]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Reconcile many orders in one batch (see BatchReconciler).
+
+        Returns:
+            order_id -> apply_fills summary (None if no trades / failed)
+        """
+        if self._batch is None:
+            self._batch = BatchReconciler(self.ex, self.pf, self.tl)
+        return self._batch.reconcile_orders(requests)
+
+    def shutdown(self):
+        """Stop the batch reconciler's worker pool, if one was started"""
+        if self._batch is not None:
+            self._batch.shutdown()
+
     def reconcile_order(self, symbol: str, order_id: str) -> Optional[Dict[str, Any]]:
         """
         Reconcile a specific order by fetching its trades and applying fills.
@@ -114,3 +151,215 @@ class Reconciler:
             )
 
             return None
+
+
+class BatchReconciler:
+    """
+    Reconciles many orders with one trade fetch per symbol.
+
+    Process per batch:
+    1. Group requests by symbol, newest submitted order first
+    2. Per symbol (on a bounded worker pool): fetch_my_trades since the
+       oldest order minus window_s and match trades to orders by order id
+    3. Orders without a match fall back to fetch_order_trades (window
+       truncated by the trade limit, or exchange without fetch_my_trades);
+       an order whose fallback fetch raises is reported as fetch_failed
+    4. Apply all fills of the symbol in one portfolio transaction, oldest
+       order first, so position averages follow execution order; a failing
+       order rolls back the symbol's batch (portfolios without
+       transaction() fall back to the symbol lock)
+    """
+
+    def __init__(
+        self,
+        exchange,
+        portfolio,
+        telemetry,
+        max_workers: Optional[int] = None,
+        window_s: Optional[float] = None,
+        trade_limit: Optional[int] = None,
+    ):
+        """
+        Initialize batch reconciler.
+
+        Args:
+            exchange: Exchange adapter with fetch_my_trades / fetch_order_trades
+            portfolio: PortfolioManager with apply_fills method
+            telemetry: JsonlWriter for audit logging
+            max_workers: Symbols reconciled concurrently (config RECONCILE_MAX_WORKERS)
+            window_s: Trade window before the oldest order (config RECONCILE_TRADE_WINDOW_S)
+            trade_limit: Trades per fetch (config RECONCILE_TRADE_LIMIT)
+        """
+        import config
+
+        self.ex = exchange
+        self.pf = portfolio
+        self.tl = telemetry
+        self.max_workers = max_workers or getattr(config, 'RECONCILE_MAX_WORKERS', 4)
+        self.window_s = window_s if window_s is not None else getattr(config, 'RECONCILE_TRADE_WINDOW_S', 300)
+        self.trade_limit = trade_limit or getattr(config, 'RECONCILE_TRADE_LIMIT', 200)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Reconcile")
+        self._stats_lock = threading.Lock()
+        self._stats = {"batches": 0, "orders": 0, "symbol_fetches": 0, "fallback_fetches": 0,
+                       "applied": 0, "no_trades": 0, "fetch_failed": 0, "errors": 0}
+
+        logger.info(f"BatchReconciler initialized (workers={self.max_workers}, window={self.window_s}s)")
+
+    def reconcile_orders(self, requests: Iterable[ReconcileRequest]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Reconcile a batch of orders.
+
+        Args:
+            requests: Orders to reconcile
+
+        Returns:
+            order_id -> apply_fills summary (None if no trades / failed)
+        """
+        by_symbol: Dict[str, List[ReconcileRequest]] = defaultdict(list)
+        for request in requests:
+            by_symbol[request.symbol].append(request)
+        if not by_symbol:
+            return {}
+
+        # Executor queue is FIFO: submit symbols with the most recent order first
+        ordered = sorted(by_symbol.items(), key=lambda item: max(r.submitted_ts for r in item[1]), reverse=True)
+        futures = [self._pool.submit(self._reconcile_symbol, symbol, batch) for symbol, batch in ordered]
+
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for (symbol, batch), future in zip(ordered, futures):
+            try:
+                results.update(future.result())
+            except Exception as e:
+                logger.error(f"Batch reconciliation failed for {symbol}: {e}", exc_info=True)
+                results.update({r.order_id: None for r in batch})
+
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["orders"] += len(results)
+        return results
+
+    def _fetch_trades(self, symbol: str, batch: List[ReconcileRequest]) -> Dict[str, Any]:
+        """Trades of the batch's orders, keyed by order id (FETCH_FAILED if every fetch for it raised)"""
+        wanted = {str(r.order_id) for r in batch}
+        matched: Dict[str, Any] = defaultdict(list)
+        complete = False
+
+        fetch_my_trades = getattr(self.ex, "fetch_my_trades", None)
+        if fetch_my_trades is not None:
+            submitted = [r.submitted_ts for r in batch if r.submitted_ts]
+            since = int((min(submitted) - self.window_s) * 1000) if submitted else None
+            try:
+                trades = fetch_my_trades(symbol, since=since, limit=self.trade_limit) or []
+                with self._stats_lock:
+                    self._stats["symbol_fetches"] += 1
+                for trade in trades:
+                    order_id = str(trade.get("order"))
+                    if order_id in wanted:
+                        matched[order_id].append(trade)
+                # A full page may have cut off trades of the window
+                complete = len(trades) < self.trade_limit
+            except Exception as e:
+                logger.warning(f"fetch_my_trades failed for {symbol}, falling back per order: {e}")
+
+        if complete:
+            return matched  # unmatched orders have no trades yet
+
+        for order_id in wanted:
+            try:
+                trades = self.ex.fetch_order_trades(symbol, order_id) or []
+            except Exception as e:
+                logger.warning(f"fetch_order_trades failed for {symbol} order {order_id}: {e}")
+                matched[order_id] = FETCH_FAILED
+                continue
+            with self._stats_lock:
+                self._stats["fallback_fetches"] += 1
+            if trades:
+                matched[order_id] = trades
+        return matched
+
+    def _reconcile_symbol(self, symbol: str, batch: List[ReconcileRequest]) -> Dict[str, Optional[Dict[str, Any]]]:
+        trades_by_order = self._fetch_trades(symbol, batch)
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        # Unknown fill state: not applied, the other orders of the symbol still are
+        for order_id in [oid for oid, trades in trades_by_order.items() if trades is FETCH_FAILED]:
+            del trades_by_order[order_id]
+            self.tl.write("reconcile", {
+                "symbol": symbol,
+                "order_id": order_id,
+                "event": "fetch_failed",
+                "batch_size": len(batch),
+                "timestamp": time.time()
+            })
+            results[order_id] = None
+            self._count("fetch_failed")
+
+        applied = []
+        try:
+            with self._transaction(symbol):
+                for request in sorted(batch, key=lambda r: r.submitted_ts):
+                    order_id = str(request.order_id)
+                    trades = trades_by_order.get(order_id)
+                    if trades:
+                        applied.append((order_id, trades, self.pf.apply_fills(symbol, trades)))
+        except Exception as e:
+            logger.error(f"Reconciliation failed for {symbol}, batch rolled back: {e}", exc_info=True)
+            for order_id in trades_by_order:
+                self.tl.write("reconcile", {
+                    "symbol": symbol,
+                    "order_id": order_id,
+                    "event": "error",
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                    "batch_size": len(batch),
+                    "timestamp": time.time()
+                })
+                self._count("errors")
+            return {str(r.order_id): None for r in batch}
+
+        for request in batch:
+            order_id = str(request.order_id)
+            if order_id not in trades_by_order and order_id not in results:
+                self.tl.write("reconcile", {
+                    "symbol": symbol,
+                    "order_id": order_id,
+                    "event": "no_trades",
+                    "batch_size": len(batch),
+                    "timestamp": time.time()
+                })
+                results[order_id] = None
+                self._count("no_trades")
+        for order_id, trades, summary in applied:
+            self.tl.write("reconcile", {
+                "symbol": symbol,
+                "order_id": order_id,
+                "event": "applied",
+                "fills_count": len(trades),
+                "batch_size": len(batch),
+                "summary": summary,
+                "timestamp": time.time()
+            })
+            results[order_id] = summary
+            self._count("applied")
+
+        logger.info(f"Reconciled {len(batch)} orders for {symbol}: "
+                    f"{sum(1 for v in results.values() if v is not None)} applied")
+        return results
+
+    def _transaction(self, symbol: str):
+        """Portfolio transaction, symbol lock for portfolios without one"""
+        transaction = getattr(self.pf, "transaction", None)
+        return transaction() if transaction is not None else get_symbol_lock(symbol)
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batch reconciliation counters"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def shutdown(self):
+        """Stop the worker pool (waits for running symbol batches)"""
+        self._pool.shutdown(wait=True)
@@ -7,7 +7,11 @@ Generates daily summary reports from trade journal:
 - Total PnL, fees, net PnL
 - Best/worst trades
 - Average trade duration
-- Per-exit-reason breakdown
+- Per-exit-reason and per-symbol breakdown, win/loss streaks
+
+KPIs come from the journal's incremental per-day aggregates
+(services.trade_kpis), so a day is never re-read; ranges merge the
+per-day aggregates.
 
 Rollups are saved as JSON files:
 state/rollups/rollup_YYYY-MM-DD.json
@@ -21,19 +25,39 @@ This provides daily performance snapshots for:
 import json
 import logging
 import os
-from datetime import datetime
-from typing import Any, Dict, Optional
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
 
 from services.journal import get_trade_journal
+from services.trade_kpis import KpiAccumulator
 
 logger = logging.getLogger(__name__)
 
 
+def compute_trade_kpis(trades: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute KPIs for a list of closed trades (trade journal records).
+
+    Used by the backtest sweep runner; the daily rollup reads the
+    journal's incremental per-day aggregates instead.
+
+    Args:
+        trades: Non-empty list of dicts with realized_pnl, fees_paid,
+            realized_pnl_pct, duration_m, exit_reason and symbol
+
+    Returns:
+        Dict with trade counts, win rate, PnL, best/worst, duration,
+        exit reason / symbol breakdown and streaks
+    """
+    return KpiAccumulator.from_trades(trades).kpis()
+
+
 class DailyRollup:
     """
     Daily KPI aggregation from trade journal.
 
-    Reads daily trades and computes comprehensive statistics.
+    Reads the journal's per-day aggregates and computes comprehensive
+    statistics for single days and date ranges.
     """
 
     def __init__(self, rollup_dir: str = "state/rollups"):
@@ -76,101 +100,51 @@ class DailyRollup:
         if date_str is None:
             date_str = datetime.now().strftime("%Y-%m-%d")
 
-        # Read trades for the day
-        trades = self.journal.read_day(date_str)
+        # Incremental aggregates of the day
+        acc = self.journal.day_kpis(date_str)
 
-        if not trades:
+        if acc.count == 0:
             return {
                 "date": date_str,
                 "total_trades": 0,
                 "summary": "No trades for this date"
             }
 
-        # Basic counts
-        total_trades = len(trades)
-        wins = [t for t in trades if t.get("realized_pnl", 0) > 0]
-        losses = [t for t in trades if t.get("realized_pnl", 0) < 0]
-        breakeven = [t for t in trades if t.get("realized_pnl", 0) == 0]
-
-        win_count = len(wins)
-        loss_count = len(losses)
-        breakeven_count = len(breakeven)
-
-        # Win rate
-        win_rate = (win_count / total_trades) * 100.0 if total_trades > 0 else 0.0
-
-        # PnL metrics
-        total_pnl = sum(t.get("realized_pnl", 0) for t in trades)
-        total_fees = sum(t.get("fees_paid", 0) for t in trades)
-        net_pnl = total_pnl - total_fees
-
-        # Best/worst trades
-        best_trade = max(trades, key=lambda t: t.get("realized_pnl", 0))
-        worst_trade = min(trades, key=lambda t: t.get("realized_pnl", 0))
-
-        # Duration metrics
-        avg_duration_m = sum(t.get("duration_m", 0) for t in trades) / total_trades
-
-        # Per-reason breakdown
-        reason_breakdown = {}
-        for t in trades:
-            reason = t.get("exit_reason", "UNKNOWN")
-            if reason not in reason_breakdown:
-                reason_breakdown[reason] = {
-                    "count": 0,
-                    "total_pnl": 0.0,
-                    "wins": 0,
-                    "losses": 0
-                }
-
-            reason_breakdown[reason]["count"] += 1
-            pnl = t.get("realized_pnl", 0)
-            reason_breakdown[reason]["total_pnl"] += pnl
-
-            if pnl > 0:
-                reason_breakdown[reason]["wins"] += 1
-            elif pnl < 0:
-                reason_breakdown[reason]["losses"] += 1
-
-        # Build complete KPI dict
-        kpis = {
-            "date": date_str,
-            "generated_at": datetime.now().isoformat(),
-
-            # Trade Counts
-            "total_trades": total_trades,
-            "wins": win_count,
-            "losses": loss_count,
-            "breakeven": breakeven_count,
-            "win_rate_pct": round(win_rate, 2),
-
-            # PnL Metrics
-            "total_pnl": round(total_pnl, 2),
-            "total_fees": round(total_fees, 2),
-            "net_pnl": round(net_pnl, 2),
-            "avg_pnl_per_trade": round(total_pnl / total_trades, 2) if total_trades > 0 else 0.0,
-
-            # Best/Worst
-            "best_trade": {
-                "symbol": best_trade.get("symbol"),
-                "pnl": round(best_trade.get("realized_pnl", 0), 2),
-                "pnl_pct": round(best_trade.get("realized_pnl_pct", 0), 2)
-            },
-            "worst_trade": {
-                "symbol": worst_trade.get("symbol"),
-                "pnl": round(worst_trade.get("realized_pnl", 0), 2),
-                "pnl_pct": round(worst_trade.get("realized_pnl_pct", 0), 2)
-            },
-
-            # Duration
-            "avg_duration_minutes": round(avg_duration_m, 2),
-
-            # Exit Reason Breakdown
-            "exit_reasons": reason_breakdown
-        }
-
+        kpis = {"date": date_str, "generated_at": datetime.now().isoformat()}
+        kpis.update(acc.kpis())
         return kpis
 
+    def compute_range_kpis(self, start_date: str, end_date: str) -> Dict[str, Any]:
+        """
+        Compute KPIs over a date range by merging per-day aggregates.
+
+        Args:
+            start_date: First day (YYYY-MM-DD, inclusive)
+            end_date: Last day (YYYY-MM-DD, inclusive)
+
+        Returns:
+            Dict with statistics of all trades in the range
+        """
+        day = date.fromisoformat(start_date)
+        last = date.fromisoformat(end_date)
+        acc = KpiAccumulator()
+        days_with_trades = 0
+        while day <= last:
+            day_acc = self.journal.day_kpis(day.isoformat())
+            if day_acc.count:
+                acc.merge(day_acc)
+                days_with_trades += 1
+            day += timedelta(days=1)
+
+        result = {"start_date": start_date, "end_date": end_date, "days_with_trades": days_with_trades}
+        if acc.count == 0:
+            result.update({"total_trades": 0, "summary": "No trades in this range"})
+            return result
+
+        result["generated_at"] = datetime.now().isoformat()
+        result.update(acc.kpis())
+        return result
+
     def rollup_daily(self, date_str: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Compute and save daily rollup to JSON file.
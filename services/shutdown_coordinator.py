@@ -658,6 +658,23 @@ def get_shutdown_coordinator(**kwargs) -> ShutdownCoordinator:
     return _global_coordinator
 
 
+def reset_shutdown_coordinator() -> None:
+    """
+    Stop the global coordinator's heartbeat thread and drop the instance.
+
+    For tests and embedded runs (backtests) that must release the
+    non-daemon heartbeat thread without running the full shutdown sequence.
+    """
+    global _global_coordinator
+    coordinator, _global_coordinator = _global_coordinator, None
+    if coordinator is None:
+        return
+    coordinator._shutdown_event.set()
+    thread = coordinator._heartbeat_thread
+    if thread and thread.is_alive() and thread is not threading.current_thread():
+        thread.join(timeout=2.0)
+
+
 def request_emergency_shutdown(reason: str, initiator: str = "unknown") -> None:
     """Request emergency shutdown via global coordinator"""
     coordinator = get_shutdown_coordinator()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Trade KPIs - Incremental Aggregates over Closed Trades
+
+KpiAccumulator keeps running sums, counts, best/worst, streaks and
+per-symbol / per-exit-reason aggregates of trade journal records. It is
+updated once per trade (add), serialized next to the daily journal file
+(to_dict / from_dict) and merged across days (merge), so KPIs never need
+the trade list itself.
+
+kpis() produces the same fields as the former list-based computation in
+services.rollup.compute_trade_kpis, plus streaks and per-symbol totals.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+_STREAK_FIELDS = ("lead_sign", "lead_len", "trail_sign", "trail_len", "max_win_streak", "max_loss_streak")
+
+
+def _sign(pnl: float) -> int:
+    return 1 if pnl > 0 else (-1 if pnl < 0 else 0)
+
+
+class KpiAccumulator:
+    """
+    Running KPI aggregates of closed trades.
+
+    Usage:
+        acc = KpiAccumulator()
+        for trade in trades:
+            acc.add(trade)
+        acc.kpis()
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.wins = 0
+        self.losses = 0
+        self.breakeven = 0
+        self.total_pnl = 0.0
+        self.total_fees = 0.0
+        self.total_duration_m = 0.0
+        self.best: Optional[Dict[str, Any]] = None
+        self.worst: Optional[Dict[str, Any]] = None
+        # Streaks: leading/trailing run (sign, length) make merges exact
+        self.lead_sign = 0
+        self.lead_len = 0
+        self.trail_sign = 0
+        self.trail_len = 0
+        self.max_win_streak = 0
+        self.max_loss_streak = 0
+        self.reasons: Dict[str, Dict[str, Any]] = {}
+        self.symbols: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, trade: Dict[str, Any]) -> None:
+        """Fold one trade journal record into the aggregates"""
+        pnl = trade.get("realized_pnl", 0)
+        fees = trade.get("fees_paid", 0)
+        sign = _sign(pnl)
+
+        self.count += 1
+        if sign > 0:
+            self.wins += 1
+        elif sign < 0:
+            self.losses += 1
+        else:
+            self.breakeven += 1
+        self.total_pnl += pnl
+        self.total_fees += fees
+        self.total_duration_m += trade.get("duration_m", 0)
+
+        # Strict comparison keeps the first trade on ties (like max()/min())
+        extreme = {"symbol": trade.get("symbol"), "pnl": pnl, "pnl_pct": trade.get("realized_pnl_pct", 0)}
+        if self.best is None or pnl > self.best["pnl"]:
+            self.best = extreme
+        if self.worst is None or pnl < self.worst["pnl"]:
+            self.worst = extreme
+
+        self._add_streak(sign)
+
+        reason = self.reasons.setdefault(trade.get("exit_reason", "UNKNOWN"),
+                                         {"count": 0, "total_pnl": 0.0, "wins": 0, "losses": 0})
+        reason["count"] += 1
+        reason["total_pnl"] += pnl
+        if sign > 0:
+            reason["wins"] += 1
+        elif sign < 0:
+            reason["losses"] += 1
+
+        symbol = self.symbols.setdefault(trade.get("symbol"),
+                                         {"count": 0, "total_pnl": 0.0, "total_fees": 0.0, "wins": 0, "losses": 0})
+        symbol["count"] += 1
+        symbol["total_pnl"] += pnl
+        symbol["total_fees"] += fees
+        if sign > 0:
+            symbol["wins"] += 1
+        elif sign < 0:
+            symbol["losses"] += 1
+
+    def _add_streak(self, sign: int):
+        """Extend the runs with the latest trade (breakeven breaks every streak)"""
+        if self.count == 1:
+            self.lead_sign, self.lead_len = sign, 1
+        elif sign != 0 and sign == self.lead_sign and self.lead_len == self.count - 1:
+            self.lead_len += 1
+        if sign != 0 and sign == self.trail_sign:
+            self.trail_len += 1
+        else:
+            self.trail_sign, self.trail_len = sign, 1
+        if self.trail_sign > 0:
+            self.max_win_streak = max(self.max_win_streak, self.trail_len)
+        elif self.trail_sign < 0:
+            self.max_loss_streak = max(self.max_loss_streak, self.trail_len)
+
+    def merge(self, other: "KpiAccumulator") -> "KpiAccumulator":
+        """Fold the aggregates of a later period into this one"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.__dict__.update(KpiAccumulator.from_dict(other.to_dict()).__dict__)
+            return self
+
+        whole_self = self.lead_len == self.count
+        if other.lead_sign != 0 and other.lead_sign == self.trail_sign:
+            joined = self.trail_len + other.lead_len
+            if other.lead_sign > 0:
+                self.max_win_streak = max(self.max_win_streak, joined)
+            else:
+                self.max_loss_streak = max(self.max_loss_streak, joined)
+            if whole_self:
+                self.lead_len = joined
+            if other.trail_len == other.count:
+                self.trail_len = joined
+            else:
+                self.trail_sign, self.trail_len = other.trail_sign, other.trail_len
+        else:
+            self.trail_sign, self.trail_len = other.trail_sign, other.trail_len
+        self.max_win_streak = max(self.max_win_streak, other.max_win_streak)
+        self.max_loss_streak = max(self.max_loss_streak, other.max_loss_streak)
+
+        self.count += other.count
+        self.wins += other.wins
+        self.losses += other.losses
+        self.breakeven += other.breakeven
+        self.total_pnl += other.total_pnl
+        self.total_fees += other.total_fees
+        self.total_duration_m += other.total_duration_m
+        if other.best["pnl"] > self.best["pnl"]:
+            self.best = dict(other.best)
+        if other.worst["pnl"] < self.worst["pnl"]:
+            self.worst = dict(other.worst)
+        for target, source in ((self.reasons, other.reasons), (self.symbols, other.symbols)):
+            for key, values in source.items():
+                entry = target.setdefault(key, dict.fromkeys(values, 0))
+                for field, value in values.items():
+                    entry[field] += value
+        return self
+
+    @classmethod
+    def from_trades(cls, trades: Iterable[Dict[str, Any]]) -> "KpiAccumulator":
+        acc = cls()
+        for trade in trades:
+            acc.add(trade)
+        return acc
+
+    def kpis(self) -> Dict[str, Any]:
+        """KPI dict (rounded for reports); requires at least one trade"""
+        total_trades = self.count
+        win_rate = (self.wins / total_trades) * 100.0 if total_trades > 0 else 0.0
+
+        return {
+            # Trade Counts
+            "total_trades": total_trades,
+            "wins": self.wins,
+            "losses": self.losses,
+            "breakeven": self.breakeven,
+            "win_rate_pct": round(win_rate, 2),
+
+            # PnL Metrics
+            "total_pnl": round(self.total_pnl, 2),
+            "total_fees": round(self.total_fees, 2),
+            "net_pnl": round(self.total_pnl - self.total_fees, 2),
+            "avg_pnl_per_trade": round(self.total_pnl / total_trades, 2) if total_trades > 0 else 0.0,
+
+            # Best/Worst
+            "best_trade": {
+                "symbol": self.best["symbol"],
+                "pnl": round(self.best["pnl"], 2),
+                "pnl_pct": round(self.best["pnl_pct"], 2)
+            },
+            "worst_trade": {
+                "symbol": self.worst["symbol"],
+                "pnl": round(self.worst["pnl"], 2),
+                "pnl_pct": round(self.worst["pnl_pct"], 2)
+            },
+
+            # Duration
+            "avg_duration_minutes": round(self.total_duration_m / total_trades, 2),
+
+            # Exit Reason Breakdown
+            "exit_reasons": {reason: dict(values) for reason, values in self.reasons.items()},
+
+            # Streaks
+            "max_win_streak": self.max_win_streak,
+            "max_loss_streak": self.max_loss_streak,
+            "current_streak": self.trail_len * self.trail_sign,
+
+            # Per-Symbol Breakdown
+            "symbols": {
+                symbol: {field: round(value, 2) if isinstance(value, float) else value
+                         for field, value in values.items()}
+                for symbol, values in self.symbols.items()
+            }
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "wins": self.wins,
+            "losses": self.losses,
+            "breakeven": self.breakeven,
+            "total_pnl": self.total_pnl,
+            "total_fees": self.total_fees,
+            "total_duration_m": self.total_duration_m,
+            "best": self.best,
+            "worst": self.worst,
+            "streaks": {field: getattr(self, field) for field in _STREAK_FIELDS},
+            "reasons": self.reasons,
+            "symbols": self.symbols,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KpiAccumulator":
+        acc = cls()
+        for field in ("count", "wins", "losses", "breakeven", "total_pnl", "total_fees", "total_duration_m"):
+            setattr(acc, field, data.get(field, 0))
+        acc.best = dict(data["best"]) if data.get("best") else None
+        acc.worst = dict(data["worst"]) if data.get("worst") else None
+        for field, value in data.get("streaks", {}).items():
+            if field in _STREAK_FIELDS:
+                setattr(acc, field, value)
+        acc.reasons = {k: dict(v) for k, v in data.get("reasons", {}).items()}
+        acc.symbols = {k: dict(v) for k, v in data.get("symbols", {}).items()}
+        return acc
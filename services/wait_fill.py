@@ -7,9 +7,9 @@ Kein Start ohne order_id.
 """
 
 import logging
-import time
 from typing import Optional, Dict, Any
 
+from core.clock import Clock, get_clock
 from core.logging.events import emit
 
 logger = logging.getLogger(__name__)
@@ -23,7 +23,8 @@ PARTIAL_MAX_AGE_S = 10
 def wait_for_fill(
     exchange,
     symbol: str,
-    order_id: str
+    order_id: str,
+    clock: Optional[Clock] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Warte auf Order-Fill mit Timeout und Cancel-Policy.
@@ -32,6 +33,7 @@ def wait_for_fill(
         exchange: CCXT exchange instance
         symbol: Trading symbol
         order_id: Order ID (MUST NOT BE None)
+        clock: Time source for timeouts and polling (default: process-wide core.clock)
 
     Returns:
         Order dict if filled, None if canceled/timeout
@@ -53,17 +55,18 @@ def wait_for_fill(
         logger.error(f"[WAIT_FILL] {symbol} ABORTED: no order_id")
         return None
 
-    t0 = time.time()
+    clock = clock or get_clock()
+    t0 = clock.time()
     last_partial = None
 
     logger.info(f"[WAIT_FILL] {symbol} order_id={order_id} waiting...")
 
-    while time.time() - t0 < WAIT_FILL_TIMEOUT_S:
+    while clock.time() - t0 < WAIT_FILL_TIMEOUT_S:
         try:
             o = exchange.fetch_order(order_id, symbol)
         except Exception as e:
             logger.warning(f"[WAIT_FILL] {symbol} fetch_order error: {e}")
-            time.sleep(POLL_INTERVAL_S)
+            clock.sleep(POLL_INTERVAL_S)
             continue
 
         st = o.get("status", "")
@@ -85,10 +88,10 @@ def wait_for_fill(
         # Partial fill: Track age and cancel if stuck
         if 0 < filled < amount:
             if last_partial is None:
-                last_partial = time.time()
+                last_partial = clock.time()
                 emit("buy_partial", symbol=symbol, order_id=order_id, filled=filled, amount=amount)
                 logger.info(f"[WAIT_FILL] {symbol} PARTIAL: {filled:.6f}/{amount:.6f}")
-            elif time.time() - last_partial > PARTIAL_MAX_AGE_S:
+            elif clock.time() - last_partial > PARTIAL_MAX_AGE_S:
                 # Cancel stuck partial fill
                 logger.warning(f"[WAIT_FILL] {symbol} PARTIAL TIMEOUT: canceling")
                 try:
@@ -98,7 +101,7 @@ def wait_for_fill(
                 emit("order_canceled", symbol=symbol, order_id=order_id, status="partial_timeout")
                 return None
 
-        time.sleep(POLL_INTERVAL_S)
+        clock.sleep(POLL_INTERVAL_S)
 
     # Timeout: Cancel order
     logger.warning(f"[WAIT_FILL] {symbol} TIMEOUT: canceling after {WAIT_FILL_TIMEOUT_S}s")
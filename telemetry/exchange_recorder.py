@@ -5,22 +5,38 @@ Exchange Recorder – zentraler Mitschnitt aller CCXT/MEXC-Aufrufe.
 Ermöglicht:
 * vollständiges Tracking aller Exchange-Methoden (inkl. Dauer & Fehler)
 * Export der Aufrufe als JSONL für spätere Mock-/Replay-Szenarien
+  (telemetry.exchange_replay.ReplayExchange)
 * thread-sichere Nutzung während des Bot-Laufs
+
+Streaming:
+* Jeder Aufruf wird im aufrufenden Thread sofort zu einer JSON-Zeile
+  serialisiert (Snapshot ohne deepcopy, außerhalb des Recorder-Locks) und
+  in eine begrenzte Queue gelegt.
+* Ein Hintergrund-Writer schreibt die Zeilen gebündelt auf Disk; Pfade mit
+  ".gz" werden als Folge vollständiger gzip-Member geschrieben, so dass die
+  Datei nach jedem Batch lesbar bleibt (Crash verliert höchstens einen Batch).
+* Aufrufe vor set_output_path() warten in der Queue; ist sie voll, werden
+  Einträge verworfen und gezählt statt den Trading-Thread zu blockieren.
 """
 
 from __future__ import annotations
 
-import copy
+import gzip
 import json
 import logging
 import os
+import queue
 import threading
 import time
+import zlib
 from functools import wraps
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_PENDING = 100_000
+DEFAULT_FLUSH_INTERVAL_S = 1.0
+
 
 def _json_serialiser(obj: Any) -> Any:
     """Fallback-Serialisierer für JSON dumps."""
@@ -29,27 +45,53 @@ def _json_serialiser(obj: Any) -> Any:
     return repr(obj)
 
 
-def _safe_clone(value: Any) -> Any:
-    """Versucht, den übergebenen Wert JSON-kompatibel zu kopieren."""
+def _dumps(entry: Dict[str, Any]) -> str:
+    return json.dumps(entry, ensure_ascii=False, default=_json_serialiser)
+
+
+def iter_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Liest einen Mitschnitt (JSONL oder JSONL.gz) zeilenweise.
+
+    Ein abgeschnittenes Dateiende (Crash während des Schreibens) wird
+    toleriert: alle vollständigen Zeilen davor werden geliefert.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
     try:
-        return copy.deepcopy(value)
-    except Exception:
-        try:
-            return json.loads(json.dumps(value, default=_json_serialiser))
-        except Exception:
-            return repr(value)
+        with opener(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except (EOFError, zlib.error, gzip.BadGzipFile) as exc:
+        logger.warning("ExchangeCallRecorder: %s endet unvollständig (%s)", path, exc)
 
 
 class ExchangeCallRecorder:
-    """Thread-sicherer Recorder für Exchange-Aufrufe."""
+    """Thread-sicherer Recorder für Exchange-Aufrufe mit Hintergrund-Writer."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        flush_interval_s: float = DEFAULT_FLUSH_INTERVAL_S,
+    ) -> None:
+        """
+        Args:
+            max_pending: Maximale Anzahl ungeschriebener Einträge (Queue-Größe)
+            flush_interval_s: Maximales Alter eines Batches bevor er geschrieben wird
+        """
         self._enabled = False
-        self._records: List[Dict[str, Any]] = []
         self._lock = threading.RLock()
         self._output_path: Optional[str] = None
         self._metadata: Dict[str, Any] = {}
         self._counter = 0
+        self._written = 0
+        self._dropped = 0
+        self._flush_interval_s = flush_interval_s
+        # (JSON-Zeile, ist Aufruf-Record) - gezählt wird beim Einreihen, nicht am Zeilentext
+        self._queue: "queue.Queue[Tuple[str, bool]]" = queue.Queue(maxsize=max_pending)
+        self._writer: Optional[threading.Thread] = None
 
     # ------------------------------------------------------------------ #
     # State
@@ -58,6 +100,10 @@ class ExchangeCallRecorder:
     def enabled(self) -> bool:
         return self._enabled
 
+    @property
+    def output_path(self) -> Optional[str]:
+        return self._output_path
+
     def enable(self) -> None:
         with self._lock:
             self._enabled = True
@@ -69,9 +115,25 @@ class ExchangeCallRecorder:
             logger.info("ExchangeCallRecorder disabled")
 
     def clear(self) -> None:
+        """Verwirft noch nicht geschriebene Einträge und setzt die Zähler zurück."""
         with self._lock:
-            self._records.clear()
+            while True:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except queue.Empty:
+                    break
             self._counter = 0
+            self._dropped = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "recorded": self._counter,
+            "written": self._written,
+            "pending": self._queue.qsize(),
+            "dropped": self._dropped,
+            "path": self._output_path,
+        }
 
     # ------------------------------------------------------------------ #
     # Recording
@@ -96,8 +158,8 @@ class ExchangeCallRecorder:
             "thread": threading.current_thread().name,
             "method": method,
             "duration_ms": round(duration_s * 1000.0, 3),
-            "args": _safe_clone(args),
-            "kwargs": _safe_clone(kwargs),
+            "args": args,
+            "kwargs": kwargs,
         }
 
         if error is not None:
@@ -106,12 +168,28 @@ class ExchangeCallRecorder:
                 "message": str(error)
             }
         else:
-            entry["result"] = _safe_clone(result)
+            entry["result"] = result
 
         with self._lock:
             self._counter += 1
             entry["id"] = self._counter
-            self._records.append(entry)
+        # Serialisierung großer Ergebnisse (Orderbücher, Markets) blockiert andere Threads nicht
+        try:
+            line = _dumps(entry)
+        except Exception:
+            entry["result"] = repr(result)
+            line = _dumps(entry)
+        self._enqueue(line, is_call=True)
+
+    def _enqueue(self, line: str, is_call: bool = False) -> None:
+        try:
+            self._queue.put_nowait((line, is_call))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+                dropped = self._dropped
+            if dropped == 1 or dropped % 1000 == 0:
+                logger.warning("ExchangeCallRecorder: Queue voll, %s Einträge verworfen", dropped)
 
     # ------------------------------------------------------------------ #
     # Metadata & Export
@@ -119,41 +197,76 @@ class ExchangeCallRecorder:
     def set_metadata(self, **metadata: Any) -> None:
         with self._lock:
             self._metadata.update(metadata)
+            self._enqueue(_dumps({"type": "metadata", "data": dict(self._metadata)}))
 
     def set_output_path(self, path: str) -> None:
+        """Setzt das Ziel und startet den Hintergrund-Writer."""
         with self._lock:
+            if self._output_path and self._output_path != path:
+                self.flush_to_disk()
             self._output_path = path
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="ExchangeRecorderWriter", daemon=True
+                )
+                self._writer.start()
 
     def get_records(self) -> List[Dict[str, Any]]:
-        with self._lock:
-            return copy.deepcopy(self._records)
-
-    def flush_to_disk(self) -> None:
-        with self._lock:
-            path = self._output_path
-            if not path:
-                logger.debug("ExchangeCallRecorder.flush_to_disk: Kein Zielpfad gesetzt, überspringe.")
-                return
-
-            records = list(self._records)
-            metadata = dict(self._metadata)
-
-        if not records:
-            logger.debug("ExchangeCallRecorder.flush_to_disk: Keine Aufzeichnungen vorhanden.")
-            return
-
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        try:
-            with open(path, "w", encoding="utf-8") as fh:
-                if metadata:
-                    fh.write(json.dumps({"type": "metadata", "data": metadata}, ensure_ascii=False, default=_json_serialiser))
-                    fh.write("\n")
-                for entry in records:
-                    fh.write(json.dumps(entry, ensure_ascii=False, default=_json_serialiser))
-                    fh.write("\n")
-            logger.info("ExchangeCallRecorder: %s Einträge nach %s geschrieben", len(records), path)
-        except Exception as exc:
-            logger.error("ExchangeCallRecorder: Schreiben nach %s fehlgeschlagen: %s", path, exc)
+        """Alle bisher aufgezeichneten Aufrufe (liest den Mitschnitt von Disk)."""
+        self.flush_to_disk()
+        if not self._output_path or not os.path.exists(self._output_path):
+            return []
+        return [r for r in iter_records(self._output_path) if r.get("type") == "call"]
+
+    def flush_to_disk(self, timeout: float = 10.0) -> bool:
+        """
+        Wartet, bis alle eingereihten Einträge geschrieben sind.
+
+        Returns:
+            True wenn die Queue geleert wurde, False bei Timeout oder ohne Zielpfad
+        """
+        if not self._output_path or self._writer is None:
+            logger.debug("ExchangeCallRecorder.flush_to_disk: Kein Zielpfad gesetzt, überspringe.")
+            return False
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                logger.warning("ExchangeCallRecorder: Flush-Timeout (%s ausstehend)", self._queue.qsize())
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _writer_loop(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=self._flush_interval_s)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.monotonic() + self._flush_interval_s
+            while len(batch) < 5000:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except Exception as exc:
+                logger.error("ExchangeCallRecorder: Schreiben nach %s fehlgeschlagen: %s", self._output_path, exc)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, batch: List[Tuple[str, bool]]) -> None:
+        path = self._output_path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = ("\n".join(line for line, _ in batch) + "\n").encode("utf-8")
+        with open(path, "ab") as fh:
+            # Jeder Batch ist ein vollständiges gzip-Member -> Datei bleibt lesbar
+            fh.write(gzip.compress(data) if path.endswith(".gz") else data)
+        self._written += sum(1 for _, is_call in batch if is_call)
 
 
 class RecordingExchangeProxy:
@@ -233,6 +346,7 @@ def activate_exchange_recording(exchange: Any) -> Any:
     recorder = get_exchange_recorder()
     if not recorder.enabled:
         recorder.enable()
+        recorder.set_metadata(exchange_id=getattr(exchange, "id", None))
 
     if isinstance(exchange, RecordingExchangeProxy):
         return exchange
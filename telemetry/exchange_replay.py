@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Replay Exchange - bedient Exchange-Aufrufe aus einem Recorder-Mitschnitt.
+
+Key Features:
+- Implementiert ExchangeInterface; unbekannte CCXT-Methoden werden über
+  __getattr__ ebenfalls aus dem Mitschnitt bedient (Drop-in für ccxt.mexc)
+- Antworten pro (Methode, normalisierte Argumente) in Aufnahme-Reihenfolge;
+  nach Erschöpfung wird die letzte Antwort wiederholt
+- Fallback-Stufen: exakte Argumente -> gleiches Symbol -> gleiche Methode
+- Aufgezeichnete Fehler werden als CCXT-Exception erneut geworfen
+- Timing "recorded" (aufgezeichnete Dauer auf der injizierbaren Clock)
+  oder "instant"
+
+Usage:
+    from telemetry.exchange_replay import ReplayExchange
+
+    exchange = ReplayExchange("sessions/<id>/logs/mexc_api_calls.jsonl.gz")
+    ticker = exchange.fetch_ticker("BTC/USDT")
+    print(exchange.stats)
+"""
+
+import json
+import logging
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from adapters.exchange import ExchangeInterface
+from core.clock import Clock, get_clock
+from telemetry.exchange_recorder import iter_records
+
+try:
+    import ccxt
+except ImportError:  # pragma: no cover - ccxt is a hard dependency of the bot
+    ccxt = None
+
+logger = logging.getLogger(__name__)
+
+TIMING_MODES = ("recorded", "instant")
+
+# Werte, die sich zwischen Aufnahme und Replay zwangsläufig unterscheiden
+VOLATILE_KEYS = frozenset({
+    "clientOrderId", "newClientOrderId", "client_order_id", "timestamp", "nonce", "recvWindow",
+})
+
+
+class ReplayMiss(LookupError):
+    """Für einen Aufruf existiert keine aufgezeichnete Antwort."""
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def call_key(method: str, args: Iterable[Any], kwargs: Dict[str, Any]) -> str:
+    """
+    Stabiler Lookup-Schlüssel für einen Aufruf.
+
+    Argumente werden per JSON-Roundtrip normalisiert (Tuple == Liste wie im
+    Mitschnitt), volatile Felder wie Client-Order-IDs werden entfernt.
+    """
+    payload = json.loads(json.dumps([list(args), kwargs], default=repr))
+    return json.dumps([method, _normalize(payload)], sort_keys=True)
+
+
+def _symbol_of(args: Iterable[Any], kwargs: Dict[str, Any]) -> Optional[str]:
+    symbol = kwargs.get("symbol")
+    if symbol is None:
+        symbol = next((a for a in args if isinstance(a, str) and "/" in a), None)
+    return symbol
+
+
+class ReplayExchange(ExchangeInterface):
+    """Exchange, der aufgezeichnete Antworten statt echter API-Calls liefert."""
+
+    def __init__(
+        self,
+        records: Union[str, Iterable[Dict[str, Any]]],
+        timing: str = "instant",
+        clock: Optional[Clock] = None,
+    ):
+        """
+        Args:
+            records: Pfad zum Mitschnitt (.jsonl / .jsonl.gz) oder Records
+            timing: "recorded" (aufgezeichnete Dauer abwarten) oder "instant"
+            clock: Clock für das Warten im Modus "recorded" (Default: globale Clock)
+
+        Raises:
+            ValueError: Bei unbekanntem Timing-Modus
+        """
+        if timing not in TIMING_MODES:
+            raise ValueError(f"timing must be one of {TIMING_MODES}, got {timing!r}")
+        self.timing = timing
+        self._clock = clock
+        self.metadata: Dict[str, Any] = {}
+        self.stats = {"calls": 0, "hits": 0, "repeats": 0, "fallbacks": 0, "misses": 0}
+
+        self._by_key: Dict[str, Deque[Dict]] = defaultdict(deque)
+        self._by_symbol: Dict[Tuple[str, Optional[str]], Deque[Dict]] = defaultdict(deque)
+        self._by_method: Dict[str, Deque[Dict]] = defaultdict(deque)
+        self._last: Dict[str, Dict] = {}
+        self._served: set = set()
+
+        if isinstance(records, str):
+            records = iter_records(records)
+        for record in records:
+            if record.get("type") == "metadata":
+                self.metadata.update(record.get("data") or {})
+            elif record.get("type") == "call":
+                self._index(record)
+
+        self.id = self.metadata.get("exchange_id") or "replay"
+        self.markets: Dict[str, Any] = {}
+        loaded = self._by_method.get("load_markets")
+        if loaded and "result" in loaded[-1]:
+            self.markets = loaded[-1]["result"] or {}
+
+    @property
+    def clock(self) -> Clock:
+        return self._clock or get_clock()
+
+    def _index(self, record: Dict[str, Any]) -> None:
+        method = record["method"]
+        args, kwargs = record.get("args") or [], record.get("kwargs") or {}
+        self._by_key[call_key(method, args, kwargs)].append(record)
+        self._by_symbol[(method, _symbol_of(args, kwargs))].append(record)
+        self._by_method[method].append(record)
+
+    # ------------------------------------------------------------------ #
+    # Lookup
+    # ------------------------------------------------------------------ #
+    def replay_call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Liefert die aufgezeichnete Antwort für einen Aufruf.
+
+        Raises:
+            ReplayMiss: Wenn die Methode nie aufgezeichnet wurde
+            Exception: Der aufgezeichnete Fehler (als CCXT-Exception)
+        """
+        self.stats["calls"] += 1
+        key = call_key(method, args, kwargs)
+        record = self._take(key, self._by_key.get(key))
+        if record is None:
+            scoped = (method, _symbol_of(args, kwargs))
+            record = self._take(str(scoped), self._by_symbol.get(scoped))
+            if record is None:
+                record = self._take(method, self._by_method.get(method))
+            if record is None:
+                self.stats["misses"] += 1
+                raise ReplayMiss(f"no recorded response for {method}{tuple(args)} {kwargs or ''}")
+            self.stats["fallbacks"] += 1
+            logger.debug("ReplayExchange: fallback for %s%s", method, tuple(args))
+        else:
+            self.stats["hits"] += 1
+
+        if self.timing == "recorded":
+            self.clock.sleep(float(record.get("duration_ms") or 0.0) / 1000.0)
+
+        error = record.get("error")
+        if error:
+            raise self._exception(error)
+        return record.get("result")
+
+    def _take(self, key: str, pending: Optional[Deque[Dict]]) -> Optional[Dict]:
+        # Ein Record steckt in allen drei Indizes, wird aber nur einmal verbraucht
+        while pending:
+            record = pending.popleft()
+            if id(record) in self._served:
+                continue
+            self._served.add(id(record))
+            self._last[key] = record
+            return record
+        if key in self._last:
+            self.stats["repeats"] += 1
+            return self._last[key]
+        return None
+
+    @staticmethod
+    def _exception(error: Dict[str, Any]) -> Exception:
+        exc_type = getattr(ccxt, error.get("type", ""), None) if ccxt else None
+        if not (isinstance(exc_type, type) and issubclass(exc_type, Exception)):
+            exc_type = Exception
+        return exc_type(error.get("message", ""))
+
+    def __getattr__(self, item: str) -> Any:
+        if item.startswith("_") or item not in self.__dict__.get("_by_method", {}):
+            raise AttributeError(item)
+        return lambda *args, **kwargs: self.replay_call(item, *args, **kwargs)
+
+    # ------------------------------------------------------------------ #
+    # ExchangeInterface
+    # ------------------------------------------------------------------ #
+    def fetch_ticker(self, symbol: str) -> Dict[str, Any]:
+        return self.replay_call("fetch_ticker", symbol)
+
+    def fetch_tickers(self, symbols: Optional[List[str]] = None) -> Dict[str, Any]:
+        return self.replay_call("fetch_tickers", *([symbols] if symbols is not None else []))
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = 100, since: Optional[int] = None) -> List[List]:
+        return self.replay_call("fetch_ohlcv", symbol, timeframe, since, limit)
+
+    def fetch_order_book(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
+        return self.replay_call("fetch_order_book", symbol, limit)
+
+    def create_limit_order(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: float,
+        time_in_force: str = "GTC",
+        client_order_id: Optional[str] = None,
+        post_only: bool = False
+    ) -> Dict[str, Any]:
+        params = {"timeInForce": time_in_force}
+        if post_only:
+            params["postOnly"] = True
+        return self.replay_call("create_order", symbol, "limit", side, amount, price, params)
+
+    def create_market_order(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        time_in_force: str = "IOC",
+        client_order_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return self.replay_call("create_order", symbol, "market", side, amount, None, {"timeInForce": time_in_force})
+
+    def cancel_order(self, order_id: str, symbol: str) -> Dict[str, Any]:
+        return self.replay_call("cancel_order", order_id, symbol)
+
+    def fetch_order(self, order_id: str, symbol: str) -> Dict[str, Any]:
+        return self.replay_call("fetch_order", order_id, symbol)
+
+    def fetch_my_trades(self, symbol: str, since: Optional[int] = None, limit: int = 100, params: Dict = None) -> List[Dict]:
+        return self.replay_call("fetch_my_trades", symbol, since, limit)
+
+    def fetch_open_orders(self, symbol: str = None) -> List[Dict]:
+        return self.replay_call("fetch_open_orders", *([symbol] if symbol else []))
+
+    def fetch_orders(self, symbol: str = None, since: Optional[int] = None, limit: int = 100) -> List[Dict]:
+        return self.replay_call("fetch_orders", symbol, since, limit)
+
+    def fetch_closed_orders(self, symbol: str = None, since: Optional[int] = None, limit: int = 100) -> List[Dict]:
+        return self.replay_call("fetch_closed_orders", symbol, since, limit)
+
+    def fetch_balance(self) -> Dict[str, Any]:
+        return self.replay_call("fetch_balance")
+
+    def load_markets(self, reload: bool = False) -> Dict[str, Any]:
+        markets = self.replay_call("load_markets", *([reload] if reload else []))
+        if markets:
+            self.markets = markets
+        return markets
+
+    def amount_to_precision(self, symbol: str, amount: float) -> Union[str, float]:
+        return self.replay_call("amount_to_precision", symbol, amount)
+
+    def price_to_precision(self, symbol: str, price: float) -> Union[str, float]:
+        return self.replay_call("price_to_precision", symbol, price)
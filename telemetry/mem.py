@@ -41,7 +41,8 @@ def rss_mb() -> float:
             from services.memory_manager import get_memory_manager
             memory_manager = get_memory_manager()
             memory_info = memory_manager.get_memory_status()
-            return memory_info.get('current_memory', {}).get('rss_mb', 0.0)
+            current = memory_info.get('current_memory', {})
+            return current.get('rss_mb', current.get('process_mb', 0.0))
         except (ImportError, Exception):
             # Fallback to direct psutil
             return _proc.memory_info().rss / (1024 * 1024)
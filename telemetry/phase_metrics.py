@@ -1,7 +1,9 @@
 """
 Phase Metrics for Prometheus
 
-Exposes FSM metrics for monitoring and alerting.
+Exposes FSM metrics for monitoring and alerting. Values are recorded in the
+shared MetricsRegistry and mirrored to Prometheus when prometheus_client is
+installed.
 
 Metrics:
 - phase_changes_total: Counter of phase transitions
@@ -14,64 +16,116 @@ Metrics:
 import logging
 import time
 
-from prometheus_client import Counter, Gauge, Histogram, start_http_server
-
 from core.fsm.phases import Phase
 from core.fsm.state import CoinState
+from core.monitoring.registry import DURATION_S_BUCKETS, get_registry
 
 logger = logging.getLogger(__name__)
 
+# Prometheus export is optional - values always live in the metrics registry
+try:
+    from prometheus_client import Counter, Gauge, Histogram, start_http_server
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+
+class _MirroredChild:
+    """Labelled child that updates the registry metric and its Prometheus twin"""
+
+    __slots__ = ("_local", "_prom")
+
+    def __init__(self, local, prom):
+        self._local = local
+        self._prom = prom
+
+    def inc(self, amount: float = 1.0):
+        self._local.inc(amount)
+        if self._prom is not None:
+            self._prom.inc(amount)
+
+    def set(self, value: float):
+        self._local.set(value)
+        if self._prom is not None:
+            self._prom.set(value)
+
+    def observe(self, value: float):
+        self._local.observe(value)
+        if self._prom is not None:
+            self._prom.observe(value)
+
+    @property
+    def value(self) -> float:
+        return self._local.value
+
+
+class _MirroredMetric:
+    """Registry metric family with an optional Prometheus mirror (same .labels() API)"""
+
+    def __init__(self, family, prom_factory):
+        self.family = family
+        self._prom = prom_factory() if PROMETHEUS_AVAILABLE else None
+        self._children = {}
+
+    def labels(self, **labels):
+        key = tuple(sorted(labels.items()))
+        child = self._children.get(key)
+        if child is None:
+            prom = self._prom.labels(**labels) if self._prom is not None else None
+            child = self._children.setdefault(key, _MirroredChild(self.family.labels(**labels), prom))
+        return child
+
+
+_registry = get_registry()
+
 
 # ========== Metrics Definitions ==========
 
 # Phase Change Counter
-phase_changes = Counter(
-    "phase_changes_total",
-    "Total number of phase transitions",
-    ["symbol", "phase"]
+phase_changes = _MirroredMetric(
+    _registry.counter("phase_changes_total", labelnames=("symbol", "phase")),
+    lambda: Counter("phase_changes_total", "Total number of phase transitions", ["symbol", "phase"])
 )
 
 # Current Phase Code (Gauge for Graphing)
-phase_code = Gauge(
-    "phase_code",
-    "Current phase as numeric code (for graphing)",
-    ["symbol"]
+phase_code = _MirroredMetric(
+    _registry.gauge("phase_code", labelnames=("symbol",)),
+    lambda: Gauge("phase_code", "Current phase as numeric code (for graphing)", ["symbol"])
 )
 
 # Phase Duration Histogram
-phase_duration_seconds = Histogram(
-    "phase_duration_seconds",
-    "Time spent in each phase (seconds)",
-    ["phase"],
-    buckets=(0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, float("inf"))
+phase_duration_seconds = _MirroredMetric(
+    _registry.histogram("phase_duration_seconds", bounds=DURATION_S_BUCKETS, labelnames=("phase",)),
+    lambda: Histogram(
+        "phase_duration_seconds",
+        "Time spent in each phase (seconds)",
+        ["phase"],
+        buckets=DURATION_S_BUCKETS + (float("inf"),)
+    )
 )
 
 # Stuck Phase Gauge (for Alerts)
-stuck_in_phase_seconds = Gauge(
-    "stuck_in_phase_seconds",
-    "Time currently stuck in phase (seconds)",
-    ["symbol", "phase"]
+stuck_in_phase_seconds = _MirroredMetric(
+    _registry.gauge("stuck_in_phase_seconds", labelnames=("symbol", "phase")),
+    lambda: Gauge("stuck_in_phase_seconds", "Time currently stuck in phase (seconds)", ["symbol", "phase"])
 )
 
 # Phase Error Counter
-phase_errors_total = Counter(
-    "phase_errors_total",
-    "Total number of errors by phase",
-    ["symbol", "phase", "error_type"]
+phase_errors_total = _MirroredMetric(
+    _registry.counter("phase_errors_total", labelnames=("symbol", "phase", "error_type")),
+    lambda: Counter("phase_errors_total", "Total number of errors by phase", ["symbol", "phase", "error_type"])
 )
 
 # Phase Entry Counter (for success rate calculation)
-phase_entries_total = Counter(
-    "phase_entries_total",
-    "Total number of entries into each phase",
-    ["phase"]
+phase_entries_total = _MirroredMetric(
+    _registry.counter("phase_entries_total", labelnames=("phase",)),
+    lambda: Counter("phase_entries_total", "Total number of entries into each phase", ["phase"])
 )
 
 # Phase Exit Counter (for success rate calculation)
-phase_exits_total = Counter(
-    "phase_exits_total",
-    "Total number of exits from each phase",
-    ["phase", "outcome"]  # outcome: success, error, timeout
+phase_exits_total = _MirroredMetric(
+    _registry.counter("phase_exits_total", labelnames=("phase", "outcome")),  # outcome: success, error, timeout
+    lambda: Counter("phase_exits_total", "Total number of exits from each phase", ["phase", "outcome"])
 )
 
 
@@ -104,6 +158,9 @@ def start_metrics_server(port: int = 8000):
 
     Metrics available at: http://localhost:8000/metrics
     """
+    if not PROMETHEUS_AVAILABLE:
+        logger.warning("prometheus_client not installed - metrics server not started")
+        return
     try:
         start_http_server(port)
         logger.info(f"Prometheus metrics server started on port {port}")
@@ -253,9 +310,8 @@ def get_phase_success_rate(phase: Phase) -> float:
         Success rate (0.0 - 1.0)
     """
     try:
-        # Get metrics from Prometheus client
-        entries = phase_entries_total.labels(phase=phase.value)._value.get() or 0
-        successes = phase_exits_total.labels(phase=phase.value, outcome="success")._value.get() or 0
+        entries = phase_entries_total.labels(phase=phase.value).value
+        successes = phase_exits_total.labels(phase=phase.value, outcome="success").value
 
         if entries == 0:
             return 0.0
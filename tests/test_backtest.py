@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Tests for the tick replay backtest: tick sources, simulated exchange and runner.
+"""
+
+import json
+import math
+import os
+import tempfile
+import time
+
+import pytest
+
+from backtest.clock import SimulatedClock, simulated_time
+from backtest.exchange import InsufficientBalance, SimulatedExchange
+from backtest.ticks import TickSource, convert_ticks_to_npy
+from core import clock as core_clock
+
+T0 = 1_760_000_000.0
+
+
+def write_ticks(ticks_dir, prices_by_symbol, step=2.0):
+    """Write MarketDataProvider-style tick JSONL files"""
+    os.makedirs(ticks_dir, exist_ok=True)
+    for symbol, prices in prices_by_symbol.items():
+        path = os.path.join(ticks_dir, f"tick_{symbol.replace('/', '_')}_20251009.jsonl")
+        with open(path, "w") as f:
+            for i, price in enumerate(prices):
+                f.write(json.dumps({
+                    "ts": T0 + i * step, "symbol": symbol, "last": price,
+                    "bid": price * 0.9999, "ask": price * 1.0001, "volume": 1e6, "spread_bps": 2.0,
+                }) + "\n")
+
+
+def drop_and_recover(p0, n=1000):
+    """Flat, -4% drop, +8% recovery, flat"""
+    prices = []
+    for i in range(n):
+        if i < 300:
+            prices.append(p0)
+        elif i < 400:
+            prices.append(p0 * (1 - 0.04 * (i - 300) / 100))
+        elif i < 600:
+            prices.append(p0 * 0.96 * (1 + 0.08 * (i - 400) / 200))
+        else:
+            prices.append(p0 * 0.96 * 1.08)
+    return prices
+
+
+class TestTickSource:
+    """Recorded tick discovery and frame merging"""
+
+    def test_frames_merge_symbols_by_timestamp(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_ticks(os.path.join(tmpdir, "ticks"), {"BTC/USDT": [1.0, 2.0, 3.0], "ETH/USDT": [10.0, 20.0]})
+            source = TickSource(tmpdir)
+
+            frames = list(source.frames())
+            assert source.symbols == ["BTC/USDT", "ETH/USDT"]
+            assert [ts for ts, _ in frames] == [T0, T0 + 2, T0 + 4]
+            assert sorted(t["symbol"] for t in frames[0][1]) == ["BTC/USDT", "ETH/USDT"]
+            assert [t["symbol"] for t in frames[2][1]] == ["BTC/USDT"]
+
+    def test_npy_conversion_replays_identically(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ticks_dir = os.path.join(tmpdir, "ticks")
+            write_ticks(ticks_dir, {"BTC/USDT": [1.0, 2.0, 3.0], "ETH/USDT": [10.0, 20.0]})
+            npy_dir = os.path.join(tmpdir, "npy")
+            assert convert_ticks_to_npy(ticks_dir, npy_dir) == {"BTC/USDT": 3, "ETH/USDT": 2}
+
+            jsonl = TickSource(ticks_dir, start_ts=T0 + 1)
+            binary = TickSource(npy_dir, start_ts=T0 + 1)
+            assert binary.format == "npy"
+            strip = lambda frames: [(ts, sorted((t["symbol"], t["last"]) for t in ticks)) for ts, ticks in frames]
+            assert strip(binary.frames()) == strip(jsonl.frames())
+
+
+class TestSimulatedClock:
+    def test_patches_and_restores_time(self):
+        real_time = time.time
+        clock = SimulatedClock(start=T0)
+        with simulated_time(clock):
+            assert time.time() == T0
+            time.sleep(5)
+            assert time.time() == T0 + 5
+            clock.advance_to(T0 + 1)  # never backwards
+            assert time.time() == T0 + 5
+        assert time.time is real_time
+
+
+class TestSimulatedExchange:
+    """Fill model: quotes, latency, partial fills, fees, balances"""
+
+    def make_exchange(self, **kwargs):
+        clock = core_clock.SimulatedClock(start=T0)
+        exchange = SimulatedExchange(initial_balance=1000.0, fee_rate=0.001, clock=clock, **kwargs)
+        exchange.set_quote("BTC/USDT", 100.0, bid=99.0, ask=101.0)
+        return exchange, clock
+
+    def test_buy_fills_at_ask_and_charges_fee(self):
+        exchange, _ = self.make_exchange()
+        order = exchange.create_order("BTC/USDT", "limit", "buy", 2.0, 102.0, {"timeInForce": "IOC"})
+
+        assert order["status"] == "closed"
+        assert order["average"] == 101.0
+        assert order["fee"]["cost"] == pytest.approx(0.202)
+        balance = exchange.fetch_balance()
+        assert balance["BTC"]["free"] == 2.0
+        assert balance["USDT"]["free"] == pytest.approx(1000.0 - 202.0 - 0.202)
+
+    def test_latency_delays_fill_until_fetch(self):
+        exchange, clock = self.make_exchange(latency_s=0.5)
+        order = exchange.create_order("BTC/USDT", "limit", "buy", 1.0, 102.0, {"timeInForce": "IOC"})
+        assert order["status"] == "open"
+
+        clock.advance(0.5)
+        assert exchange.fetch_order(order["id"], "BTC/USDT")["status"] == "closed"
+
+    def test_partial_fill_ioc_cancels_remainder_gtc_rests(self):
+        exchange, _ = self.make_exchange(partial_fill_ratio=0.25)
+        ioc = exchange.create_order("BTC/USDT", "limit", "buy", 4.0, 102.0, {"timeInForce": "IOC"})
+        assert ioc["status"] == "canceled"
+        assert ioc["filled"] == 1.0
+
+        gtc = exchange.create_order("BTC/USDT", "limit", "sell", 1.0, 100.0, {"timeInForce": "GTC"})
+        assert gtc["status"] == "open" and gtc["filled"] == 0.0
+        # Bid moves through the limit: one pass per quote update
+        for _ in range(4):
+            exchange.set_quote("BTC/USDT", 100.5, bid=100.0, ask=101.0)
+        assert exchange.fetch_order(gtc["id"])["status"] == "closed"
+
+    def test_insufficient_balance_rejected(self):
+        exchange, _ = self.make_exchange()
+        with pytest.raises(InsufficientBalance):
+            exchange.create_order("BTC/USDT", "market", "buy", 100.0)
+        with pytest.raises(InsufficientBalance):
+            exchange.create_order("BTC/USDT", "market", "sell", 1.0)
+
+
+class TestBacktestRunner:
+    """End-to-end replay through FSMTradingEngine"""
+
+    def test_drop_triggers_round_trip_faster_than_real_time(self):
+        from backtest.runner import BacktestRunner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_ticks(os.path.join(tmpdir, "data", "ticks"), {
+                "BTC/USDT": drop_and_recover(50000.0),
+                "ETH/USDT": drop_and_recover(3000.0),
+            })
+            cwd = os.getcwd()
+            result = BacktestRunner(
+                os.path.join(tmpdir, "data"), os.path.join(tmpdir, "work"),
+                initial_balance=1000.0, latency_s=0.2,
+            ).run()
+
+            assert os.getcwd() == cwd
+            assert result.frames == 1000
+            assert result.simulated_s > 1900
+            assert result.speedup > 10
+            sides = {t["side"] for t in result.trades}
+            assert "buy" in sides
+            assert result.fees_paid > 0
+            assert result.engine_stats["total_buys"] >= 1
+
+
+class TestLoadGen:
+    """Synthetic market load generator"""
+
+    def test_flash_drop_dips_then_recovers(self):
+        from backtest.loadgen import LoadProfile, SyntheticMarket
+
+        profile = LoadProfile(symbols=20, tick_hz=5.0, volatility_per_min=0.0,
+                              flash_drops_per_hour=6.0, flash_drop_pct=5.0, seed=1)
+        market = SyntheticMarket(profile, start_ts=T0)
+        base = {t["symbol"]: t["last"] for t in market.ticks()}
+        # 20 symbols at 6/h: one drop every ~30s, first expected well within 10 minutes
+        while not market.flash_drops and market.ts < T0 + 600.0:
+            market.advance_to(market.ts + 1.0)
+        assert market.flash_drops
+        symbol, onset = market.flash_drops[0]
+        assert market.active_drop(symbol) == onset
+
+        def ratio():
+            tick = next(t for t in market.ticks() if t["symbol"] == symbol)
+            assert tick["bid"] < tick["last"] < tick["ask"]
+            return tick["last"] / base[symbol]
+
+        market.advance_to(onset + profile.flash_drop_s + market._dt)
+        assert 0.95 - 1e-9 <= ratio() < 0.96
+        market.advance_to(onset + profile.flash_drop_s + profile.flash_recovery_s + market._dt)
+        assert market.active_drop(symbol) is None
+        assert ratio() == pytest.approx(1.0)
+
+    def test_fault_injection_raises_rate_limit_and_timeouts(self):
+        from ccxt import RateLimitExceeded, RequestTimeout
+
+        from backtest.loadgen import LoadGenExchange, LoadProfile, SyntheticMarket
+
+        clock = SimulatedClock(start=T0)
+        profile = LoadProfile(symbols=3, timeout_rate=1.0, timeout_s=7.0)
+        exchange = LoadGenExchange(SyntheticMarket(profile, T0), clock=clock)
+        exchange.faults_enabled = True
+        with simulated_time(clock):
+            with pytest.raises(RequestTimeout):
+                exchange.fetch_ticker("S0000/USDT")
+            assert clock.time() == T0 + 7.0
+            exchange.profile.timeout_rate = 0.0
+            assert len(exchange.fetch_tickers()) == 3
+            assert exchange.fault_stats["calls"] == 2
+
+            exchange._burst_until = clock.time() + 1.0
+            with pytest.raises(RateLimitExceeded):
+                exchange.fetch_balance()
+        assert exchange.fault_stats["rate_limited"] == 1
+
+    def test_simulated_soak_reports_cycle_and_decision_metrics(self):
+        from backtest.loadgen import LoadHarness, LoadProfile
+
+        profile = LoadProfile(symbols=10, tick_hz=2.0, volatility_per_min=0.0,
+                              flash_drops_per_hour=120.0, flash_drop_pct=6.0, latency_ms=20.0, seed=3)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report = LoadHarness(profile, tmpdir, duration_s=300.0, realtime=False,
+                                 config_overrides={"MD_POLL_MS": 1000}).run()
+
+        # Injected latency matches the lognormal profile and is slept on the simulated clock,
+        # so it stretches the 0.5s cycles: cycles * 0.5s + latency covers the 300s run
+        faults = report.faults
+        assert faults["timeouts"] == 0 and faults["rate_limited"] == 0
+        mean_latency_s = profile.latency_ms / 1000.0 * math.exp(profile.latency_sigma ** 2 / 2)
+        assert faults["latency_s"] == pytest.approx(faults["calls"] * mean_latency_s, rel=0.25)
+        assert report.cycles == math.ceil((300.0 - faults["latency_s"]) / 0.5)
+        assert report.cycle_ms["count"] == report.cycles
+        assert report.md_poll_ms["count"] == 300
+        assert report.flash_drops > 0
+        assert report.faults["calls"] > 0
+        assert report.decision_latency_s["count"] >= 1
+        assert "memory_growth_mb" in report.to_dict()
+
+
+class TestSweep:
+    """Parallel parameter sweep with checkpointing"""
+
+    def test_round_trips_feed_rollup_kpis(self):
+        from backtest.runner import round_trips
+        from services.rollup import compute_trade_kpis
+
+        def fill(side, amount, price, ts):
+            return {"symbol": "BTC/USDT", "side": side, "amount": amount, "price": price,
+                    "cost": amount * price, "fee": {"cost": 0.1}, "timestamp": ts}
+
+        trips = round_trips([
+            fill("buy", 1.0, 100.0, 0), fill("sell", 0.5, 110.0, 60_000), fill("sell", 0.5, 110.0, 120_000),
+            fill("buy", 1.0, 100.0, 180_000), fill("sell", 1.0, 90.0, 240_000),
+            fill("buy", 1.0, 100.0, 300_000),  # still open
+        ])
+        assert [t["realized_pnl"] for t in trips] == [10.0, -10.0]
+        assert trips[0]["duration_m"] == 2.0
+        kpis = compute_trade_kpis(trips)
+        assert kpis["total_trades"] == 2 and kpis["win_rate_pct"] == 50.0
+        assert kpis["net_pnl"] == pytest.approx(-0.5)
+
+    def test_grid_expansion_and_unknown_names(self):
+        from backtest.sweep import SweepRunner, config_id, expand_grid, with_aliases
+
+        configs = expand_grid({"DROP_TRIGGER_VALUE": [0.98, 0.99], "MAX_TRADES": [1, 3]})
+        assert len(configs) == 4
+        assert config_id({"a": 1, "b": 2}) == config_id({"b": 2, "a": 1})
+        assert with_aliases({"MAX_TRADES": 5})["MAX_CONCURRENT_POSITIONS"] == 5
+        with pytest.raises(ValueError):
+            SweepRunner("unused", "unused", [{"NOT_A_CONFIG_NAME": 1}])
+
+    def test_parallel_sweep_resumes_from_checkpoint(self):
+        from backtest.sweep import RESULTS_TABLE, SweepRunner, expand_grid
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_ticks(os.path.join(tmpdir, "data", "ticks"), {"BTC/USDT": drop_and_recover(50000.0, n=700)})
+            out_dir = os.path.join(tmpdir, "sweep")
+            configs = expand_grid({"DROP_TRIGGER_VALUE": [0.985, 0.9]})
+
+            sweep = SweepRunner(os.path.join(tmpdir, "data"), out_dir, configs[:1],
+                                max_workers=2, initial_balance=1000.0)
+            assert len(sweep.run()) == 1
+            assert os.listdir(os.path.join(out_dir, "ticks_npy")) == ["BTC_USDT.npy"]
+
+            sweep = SweepRunner(os.path.join(tmpdir, "data"), out_dir, configs,
+                                max_workers=2, initial_balance=1000.0)
+            rows = sweep.run()
+            assert sweep.executed == 1
+            by_trigger = {r["overrides"]["DROP_TRIGGER_VALUE"]: r for r in rows}
+            assert by_trigger[0.985]["fills"] > 0
+            assert by_trigger[0.9]["fills"] == 0  # -10% never reached
+            with open(os.path.join(out_dir, RESULTS_TABLE)) as f:
+                assert len(f.readlines()) == 3
+
+
+    def test_partial_tick_conversion_is_rebuilt(self):
+        from backtest.sweep import TICKS_MANIFEST_FILE, SweepRunner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_ticks(os.path.join(tmpdir, "data", "ticks"),
+                        {"BTC/USDT": drop_and_recover(50000.0, n=50), "ETH/USDT": drop_and_recover(3000.0, n=40)})
+            out_dir = os.path.join(tmpdir, "sweep")
+            sweep = SweepRunner(os.path.join(tmpdir, "data"), out_dir, [])
+            npy_dir = sweep.prepare_ticks()
+            manifest_path = os.path.join(out_dir, TICKS_MANIFEST_FILE)
+            mtime = os.path.getmtime(manifest_path)
+            assert sweep.prepare_ticks() == npy_dir and os.path.getmtime(manifest_path) == mtime
+
+            # Crash during conversion: one array written, no manifest yet
+            os.remove(manifest_path)
+            os.remove(os.path.join(npy_dir, "ETH_USDT.npy"))
+            sweep.prepare_ticks()
+            assert sorted(os.listdir(npy_dir)) == ["BTC_USDT.npy", "ETH_USDT.npy"]
+            with open(manifest_path) as f:
+                assert json.load(f)["ticks"] == {"BTC/USDT": 50, "ETH/USDT": 40}
+
+
+class TestDropScreener:
+    """Vectorized anchor/trigger path against the scalar services"""
+
+    def random_walk(self, n=800, seed=7):
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        ts = T0 + np.cumsum(rng.choice([1.0, 2.0, 5.0], n))
+        ts[n // 2:] += 4000.0  # gap beyond ANCHOR_STALE_MINUTES
+        last = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.004, n)))
+        return ts, last
+
+    def test_rolling_max_matches_brute_force(self):
+        import numpy as np
+
+        from backtest.screener import rolling_max
+
+        ts, last = self.random_walk(300)
+        expected = [last[:i + 1][ts[:i + 1] >= ts[i] - 60].max() for i in range(len(ts))]
+        assert np.array_equal(rolling_max(ts, last, 60), expected)
+
+    @pytest.mark.parametrize("buy_mode", ["RAW", "PREDICTIVE"])
+    def test_matches_scalar_path_tick_for_tick(self, buy_mode):
+        import numpy as np
+
+        import config
+        from backtest.runner import _overrides
+        from backtest.screener import anchor_series, scalar_screen, trigger_hits
+
+        ts, last = self.random_walk()
+        with _overrides(config, {"BUY_MODE": buy_mode}):
+            for mode in (1, 2, 3, 4):
+                anchors, hits = scalar_screen("BTC/USDT", ts, last, mode, 0.99)
+                vec_anchors = anchor_series(ts, last, mode)
+                assert np.array_equal(anchors, vec_anchors), mode
+                assert np.array_equal(hits, trigger_hits(last, vec_anchors, [0.99])[0]), mode
+                assert hits.any()
+
+    def test_screen_counts_trigger_events(self):
+        from backtest.screener import screen_drop_triggers
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            write_ticks(os.path.join(tmpdir, "ticks"), {
+                "BTC/USDT": drop_and_recover(50000.0),
+                "ETH/USDT": [3000.0] * 1000,
+            })
+            arrays = TickSource(tmpdir).arrays()
+            rows = screen_drop_triggers(arrays, [1, 2], [0.985, 0.9], buy_mode="RAW")
+
+            by_key = {(r["mode"], r["trigger_value"]): r for r in rows}
+            assert by_key[(1, 0.985)]["triggers"] == 1
+            assert by_key[(1, 0.985)]["by_symbol"] == {"BTC/USDT": 1}
+            assert by_key[(1, 0.985)]["hit_ticks"] > 100
+            assert by_key[(1, 0.9)]["triggers"] == 0
+            # Rolling-high anchor follows the decline down, so the -1.5% zone is left again
+            assert by_key[(2, 0.985)]["hit_ticks"] < by_key[(1, 0.985)]["hit_ticks"]
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the hot-path benchmark suite: measurement, artifacts and regression compare.
+"""
+
+import os
+import tempfile
+import threading
+
+import pytest
+
+from bench.hotpaths import BENCHMARKS
+from bench.runner import compare, load, main, measure, run_suite, save
+
+
+def _doc(**medians):
+    return {"results": {name: {"median_ns": ns} for name, ns in medians.items()}}
+
+
+class TestMeasure:
+    def test_calibrates_loops_and_reports_ns_per_op(self):
+        calls = []
+        result = measure("noop", lambda: calls.append(1), ops=10, repeat=3, min_time_s=0.001)
+
+        assert result.loops >= 1
+        assert len(result.samples_ns) == 3
+        assert result.median_ns > 0
+        assert len(calls) > 3 * result.loops
+
+
+class TestCompare:
+    def test_flags_only_slowdowns_beyond_threshold(self):
+        baseline = _doc(a=100.0, b=100.0, c=100.0)
+        current = _doc(a=109.0, b=125.0, c=50.0, new=10.0)
+
+        regressions = compare(baseline, current, threshold=0.10)
+        assert [r.name for r in regressions] == ["b"]
+        assert regressions[0].change == pytest.approx(0.25)
+
+    def test_cli_exit_code_signals_regression(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = save(_doc(a=100.0), os.path.join(tmpdir, "base"))
+            slow = save(_doc(a=150.0), os.path.join(tmpdir, "slow.json"))
+
+            assert load(os.path.dirname(base)) == _doc(a=100.0)
+            assert main(["compare", str(base), str(slow)]) == 1
+            assert main(["compare", str(base), str(slow), "--threshold", "0.6"]) == 0
+
+
+class TestHotPaths:
+    def test_all_hot_paths_registered(self):
+        assert {
+            "market_data.update_market_data", "rolling_window.add", "anchor_manager.compute_anchor",
+            "snapshot_builder.build", "event_bus.publish", "fsm.process_event",
+            "fsm_snapshot.save_snapshot", "jsonl_writer.append", "portfolio.apply_fills",
+            "buy_signals.evaluate_buy_signal",
+        } <= set(BENCHMARKS)
+
+    def test_suite_runs_against_real_classes(self):
+        cwd = os.getcwd()
+        document = run_suite(repeat=1, min_time_s=0.0)
+
+        assert os.getcwd() == cwd
+        assert set(document["results"]) == set(BENCHMARKS)
+        assert all(r["median_ns"] > 0 for r in document["results"].values())
+
+    def test_suite_leaves_no_state_files_or_threads(self):
+        import config
+
+        watched = [config.STATE_FILE_HELD, config.STATE_FILE_OPEN_BUYS, config.DROP_ANCHORS_FILE]
+        before = {path: os.path.getmtime(path) if os.path.exists(path) else None for path in watched}
+        run_suite(["portfolio.apply_fills", "market_data.update_market_data"], repeat=1, min_time_s=0.0)
+
+        assert {path: os.path.getmtime(path) if os.path.exists(path) else None for path in watched} == before
+        assert "ShutdownHeartbeatLogger" not in {t.name for t in threading.enumerate()}
+
+    def test_unknown_benchmark_rejected(self):
+        with pytest.raises(ValueError):
+            run_suite(["nope"])
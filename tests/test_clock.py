@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the injectable clock and the components reading time through it.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import pytest
+
+from core.clock import Clock, RealClock, SimulatedClock, StepClock, get_clock, use_clock
+
+T0 = 1_700_000_000.0
+
+
+class TestClocks:
+    """Clock implementations"""
+
+    def test_simulated_sleep_is_instant(self):
+        clock = SimulatedClock(start=T0)
+        started = time.perf_counter()
+        clock.sleep(3600)
+        assert clock.time() == T0 + 3600
+        assert clock.monotonic() == 3600
+        assert time.perf_counter() - started < 0.1
+
+    def test_step_clock_moves_only_on_step(self):
+        clock = StepClock(start=T0, step_s=0.5)
+        clock.sleep(10)
+        assert clock.time() == T0
+        clock.step(4)
+        assert clock.time() == T0 + 2.0
+        assert clock.steps == 4
+
+    def test_utcnow_follows_clock(self):
+        clock = SimulatedClock(start=0)
+        assert clock.utcnow().isoformat() == "1970-01-01T00:00:00"
+
+    def test_clock_interface_is_abstract(self):
+        class Partial(Clock):
+            def time(self):
+                return T0
+
+        with pytest.raises(TypeError):
+            Clock()
+        with pytest.raises(TypeError):
+            Partial()
+
+    def test_use_clock_restores_default(self):
+        clock = SimulatedClock(start=T0)
+        with use_clock(clock):
+            assert get_clock() is clock
+        assert isinstance(get_clock(), RealClock)
+
+
+class TestClockAwareComponents:
+    """Hour-long scenarios run instantly on a simulated clock"""
+
+    def test_position_ttl_timeout(self):
+        from core.fsm.fsm_events import FSMEvent
+        from core.fsm.phases import Phase
+        from core.fsm.state import CoinState
+        from core.fsm.state_data import StateData
+        from core.fsm.timeouts import TimeoutManager
+
+        clock = SimulatedClock(start=T0)
+        manager = TimeoutManager(clock=clock)
+        st = CoinState(symbol="BTC/USDT", phase=Phase.POSITION, entry_ts=T0)
+        st.fsm_data = StateData()
+
+        assert manager.check_all_timeouts("BTC/USDT", st) == []
+        clock.sleep((manager.position_ttl_min + 1) * 60)
+        events = manager.check_all_timeouts("BTC/USDT", st)
+        assert [e.event for e in events] == [FSMEvent.EXIT_SIGNAL_TIMEOUT]
+        assert events[0].timestamp == clock.time()
+
+    def test_cooldown_manager_uses_default_clock_lazily(self):
+        from services.cooldown import CooldownManager
+
+        cooldowns = CooldownManager()  # created before the clock is installed
+        clock = SimulatedClock(start=T0)
+        with use_clock(clock):
+            cooldowns.set("BTC/USDT", 900)
+            clock.sleep(899)
+            assert cooldowns.is_active("BTC/USDT")
+            clock.sleep(2)
+            assert not cooldowns.is_active("BTC/USDT")
+
+    def test_wait_for_fill_times_out_in_virtual_time(self):
+        from services.wait_fill import WAIT_FILL_TIMEOUT_S, wait_for_fill
+
+        class OpenOrderExchange:
+            canceled = False
+
+            def fetch_order(self, order_id, symbol):
+                return {"status": "open", "filled": 0.0, "amount": 1.0}
+
+            def cancel_order(self, order_id, symbol):
+                self.canceled = True
+
+        clock = SimulatedClock(start=T0)
+        exchange = OpenOrderExchange()
+        started = time.perf_counter()
+        assert wait_for_fill(exchange, "BTC/USDT", "1", clock=clock) is None
+        assert exchange.canceled
+        assert clock.time() >= T0 + WAIT_FILL_TIMEOUT_S
+        assert time.perf_counter() - started < 1.0
+
+    def test_rolling_window_load_filters_by_clock(self):
+        from core.rolling_windows import RollingWindowManager
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, "BTC_USDT.json"), "w") as f:
+                json.dump({"data": [[T0 - 7200, 1.0], [T0 - 60, 2.0]]}, f)
+
+            manager = RollingWindowManager(3600, persist=True, base_path=tmpdir, clock=SimulatedClock(start=T0))
+            manager.load("BTC/USDT")
+            assert list(manager.windows["BTC/USDT"].q) == [(T0 - 60, 2.0)]
+
+    def test_buy_signal_trade_close_uses_clock(self):
+        from services.buy_signals import BuySignalService
+
+        service = BuySignalService(enable_minutely_audit=False, clock=SimulatedClock(start=T0))
+        service.on_trade_completed("BTC/USDT")
+        assert service._last_trade_close["BTC/USDT"].isoformat() == "2023-11-14T22:13:20"
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for ui/view_model.py
+
+Tests incremental top-N drop selection and per-panel dirty tracking.
+"""
+
+from core.events import EventBus
+from ui.view_model import DashboardViewModel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _snap(symbol, drop_pct, last=1.0):
+    return {
+        "v": 1,
+        "symbol": symbol,
+        "price": {"last": last},
+        "liquidity": {"spread_pct": 0.1},
+        "windows": {"anchor": 2.0, "drop_pct": drop_pct},
+    }
+
+
+class TestDashboardViewModel:
+    """Test DashboardViewModel"""
+
+    def test_top_n_matches_full_sort_with_btc_pinned(self):
+        vm = DashboardViewModel(top_n=5, clock=FakeClock())
+        snaps = [_snap(f"C{i}/USDT", -(i * 7 % 23)) for i in range(200)] + [_snap("BTC/USDT", -0.1)]
+        vm.on_snapshots(snaps)
+
+        drops = vm.get_drop_data()
+        expected = sorted((s for s in snaps if s["symbol"] != "BTC/USDT"),
+                          key=lambda s: s["windows"]["drop_pct"])[:4]
+
+        assert drops[0]["symbol"] == "BTC/USDT"
+        assert [d["drop_pct"] for d in drops[1:]] == [s["windows"]["drop_pct"] for s in expected]
+
+    def test_snapshots_via_event_bus_mark_drops_dirty(self):
+        bus = EventBus()
+        vm = DashboardViewModel(clock=FakeClock())
+        vm.attach(bus)
+
+        vm.get_drop_data()
+        vm.mark_clean("drops")
+        assert not vm.is_dirty("drops")
+
+        bus.publish("market.snapshots", [_snap("ETH/USDT", -3.0)])
+        assert vm.is_dirty("drops")
+        assert vm.get_drop_data()[0]["symbol"] == "ETH/USDT"
+
+        vm.detach()
+        assert bus.get_subscriber_count("market.snapshots") == 0
+
+    def test_stale_symbols_excluded(self):
+        clock = FakeClock()
+        vm = DashboardViewModel(stale_ttl_s=30.0, clock=clock)
+        vm.on_snapshots([_snap("OLD/USDT", -5.0)])
+        clock.now += 60
+        vm.on_snapshots([_snap("NEW/USDT", -1.0)])
+
+        assert [d["symbol"] for d in vm.get_drop_data()] == ["NEW/USDT"]
+        assert vm.get_stale_symbols() == ["OLD/USDT"]
+
+    def test_portfolio_dirty_only_for_watched_symbols(self):
+        clock = FakeClock()
+        vm = DashboardViewModel(portfolio_refresh_s=5.0, clock=clock)
+        vm.watch_symbols(["ETH/USDT"])
+        vm.mark_clean("portfolio")
+
+        vm.on_snapshots([_snap("XRP/USDT", -1.0)])
+        assert not vm.is_dirty("portfolio")
+
+        vm.on_snapshots([_snap("ETH/USDT", -1.0)])
+        assert vm.is_dirty("portfolio")
+        vm.mark_clean("portfolio")
+
+        clock.now += 5.0
+        assert vm.is_dirty("portfolio")
+
+    def test_mark_dirty_events_and_fsm(self):
+        vm = DashboardViewModel(clock=FakeClock())
+        for panel in ("events", "fsm"):
+            vm.mark_clean(panel)
+            assert not vm.is_dirty(panel)
+
+        vm.mark_dirty("fsm")
+        assert vm.is_dirty("fsm")
+        assert not vm.is_dirty("events")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Tests for telemetry/exchange_recorder.py and telemetry/exchange_replay.py
+
+Tests the streaming recorder (background writer, gzip members, bounded queue)
+and serving recorded responses through ReplayExchange.
+"""
+
+import gzip
+import os
+import tempfile
+import threading
+
+import ccxt
+import pytest
+
+from core.clock import SimulatedClock
+from telemetry.exchange_recorder import ExchangeCallRecorder, RecordingExchangeProxy, iter_records
+from telemetry.exchange_replay import ReplayExchange, ReplayMiss
+
+
+class _FakeCcxt:
+    """Minimal ccxt-like exchange"""
+
+    id = "fake"
+
+    def __init__(self):
+        self.price = 100.0
+
+    def fetch_ticker(self, symbol):
+        self.price += 1.0
+        return {"symbol": symbol, "last": self.price}
+
+    def create_order(self, symbol, type, side, amount, price=None, params=None):
+        return {"id": f"o-{amount}", "symbol": symbol, "side": side, "status": "open"}
+
+    def fetch_order(self, order_id, symbol):
+        raise ccxt.OrderNotFound(f"{order_id} not found")
+
+
+def _record_session(path, calls=3):
+    recorder = ExchangeCallRecorder(flush_interval_s=0.05)
+    recorder.enable()
+    exchange = RecordingExchangeProxy(_FakeCcxt(), recorder)
+    exchange.fetch_ticker("BTC/USDT")  # recorded before the path is known
+    recorder.set_output_path(path)
+    recorder.set_metadata(exchange_id="fake")
+    for _ in range(calls - 1):
+        exchange.fetch_ticker("BTC/USDT")
+    exchange.create_order("BTC/USDT", "limit", "buy", 1.5, 99.0, {"clientOrderId": "abc"})
+    with pytest.raises(ccxt.OrderNotFound):
+        exchange.fetch_order("x1", "BTC/USDT")
+    assert recorder.flush_to_disk()
+    return recorder
+
+
+class TestStreamingRecorder:
+    """Background writer and on-disk format"""
+
+    def test_gzip_stream_contains_all_calls(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "logs", "calls.jsonl.gz")
+            recorder = _record_session(path)
+
+            records = recorder.get_records()
+            assert [r["method"] for r in records] == ["fetch_ticker"] * 3 + ["create_order", "fetch_order"]
+            assert [r["id"] for r in records] == [1, 2, 3, 4, 5]
+            assert records[-1]["error"]["type"] == "OrderNotFound"
+            assert recorder.stats()["written"] == 5 and recorder.stats()["pending"] == 0
+
+    def test_truncated_tail_keeps_complete_batches(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "calls.jsonl.gz")
+            _record_session(path)
+            with open(path, "ab") as fh:
+                fh.write(gzip.compress(b'{"type": "call", "method": "x"}\n')[:15])
+
+            assert len([r for r in iter_records(path) if r["type"] == "call"]) == 5
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        recorder = ExchangeCallRecorder(max_pending=2)
+        recorder.enable()
+        for _ in range(5):
+            recorder.record("fetch_ticker", ("BTC/USDT",), {}, {"last": 1.0}, 0.001, None)
+
+        assert recorder.stats()["dropped"] == 3
+        assert recorder.stats()["pending"] == 2
+
+    def test_result_is_snapshotted_at_call_time(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            recorder = ExchangeCallRecorder(flush_interval_s=0.05)
+            recorder.enable()
+            recorder.set_output_path(os.path.join(tmpdir, "calls.jsonl"))
+            result = {"last": 1.0}
+            recorder.record("fetch_ticker", ("BTC/USDT",), {}, result, 0.001, None)
+            result["last"] = 2.0
+
+            assert recorder.get_records()[0]["result"] == {"last": 1.0}
+
+    def test_serialization_runs_outside_the_lock(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            recorder = ExchangeCallRecorder(flush_interval_s=0.05)
+            recorder.enable()
+            recorder.set_output_path(os.path.join(tmpdir, "calls.jsonl"))
+            contended = []
+
+            def probe():
+                acquired = recorder._lock.acquire(blocking=False)
+                contended.append(not acquired)
+                if acquired:
+                    recorder._lock.release()
+
+            class Payload:
+                def __repr__(self):
+                    thread = threading.Thread(target=probe)
+                    thread.start()
+                    thread.join()
+                    return "payload"
+
+            recorder.record("fetch_order_book", ("BTC/USDT",), {}, {"bids": Payload()}, 0.001, None)
+            recorder.set_metadata(note='{"type": "call"')
+
+            assert contended == [False]
+            assert [r["result"] for r in recorder.get_records()] == [{"bids": "payload"}]
+            assert recorder.stats()["written"] == 1
+
+
+class TestReplayExchange:
+    """Serving recorded responses"""
+
+    def test_replays_in_recorded_order_then_repeats_last(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "calls.jsonl.gz")
+            _record_session(path)
+            exchange = ReplayExchange(path)
+
+            assert exchange.id == "fake"
+            assert [exchange.fetch_ticker("BTC/USDT")["last"] for _ in range(4)] == [101.0, 102.0, 103.0, 103.0]
+            assert exchange.stats["hits"] == 4 and exchange.stats["repeats"] == 1
+
+    def test_order_lookup_ignores_client_order_id_and_reraises_errors(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "calls.jsonl.gz")
+            _record_session(path)
+            exchange = ReplayExchange(path)
+
+            order = exchange.create_order("BTC/USDT", "limit", "buy", 1.5, 99.0, {"clientOrderId": "other"})
+            assert order["id"] == "o-1.5" and exchange.stats["fallbacks"] == 0
+            with pytest.raises(ccxt.OrderNotFound):
+                exchange.fetch_order("x1", "BTC/USDT")
+            with pytest.raises(ReplayMiss):
+                exchange.fetch_balance()
+
+    def test_fallback_by_symbol_for_unseen_arguments(self):
+        records = [
+            {"type": "call", "method": "fetch_order_book", "args": ["ETH/USDT", 20], "kwargs": {},
+             "duration_ms": 10.0, "result": {"symbol": "ETH/USDT"}},
+            {"type": "call", "method": "fetch_order_book", "args": ["BTC/USDT", 20], "kwargs": {},
+             "duration_ms": 10.0, "result": {"symbol": "BTC/USDT"}},
+        ]
+        exchange = ReplayExchange(records)
+
+        assert exchange.fetch_order_book("BTC/USDT", limit=5)["symbol"] == "BTC/USDT"
+        assert exchange.stats["fallbacks"] == 1
+
+    def test_recorded_timing_advances_clock(self):
+        records = [{"type": "call", "method": "fetch_balance", "args": [], "kwargs": {},
+                    "duration_ms": 250.0, "result": {"USDT": {"free": 10.0}}}]
+        clock = SimulatedClock(start=1000.0)
+
+        ReplayExchange(records, timing="recorded", clock=clock).fetch_balance()
+        assert clock.time() == pytest.approx(1000.25)
+
+        with pytest.raises(ValueError):
+            ReplayExchange(records, timing="fast")
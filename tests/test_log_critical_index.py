@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Tests for core/logging/critical_index.py
+
+Tests write-time critical event sidecars, retention decisions and
+background compression.
+"""
+
+import glob
+import gzip
+import json
+import logging
+import os
+import tempfile
+
+from core.logger_factory import CriticalIndexingGzTimedHandler, JsonlFormatter, log_event
+from core.logging.critical_index import (
+    CompressionPool,
+    CriticalIndexingRotatingFileHandler,
+    has_critical_events,
+    iter_indexed_lines,
+    shutdown_compression_pool,
+    sidecar_path,
+)
+from core.logging.log_manager import LogManager
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps({"message": record.getMessage(), "event_type": getattr(record, "event_type", "")})
+
+
+def _make_logger(path, name, **kwargs):
+    handler = CriticalIndexingRotatingFileHandler(path, encoding="utf-8", delay=True, **kwargs)
+    handler.setFormatter(_JsonFormatter())
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger, handler
+
+
+class TestCriticalIndexingHandler:
+    """Test sidecar maintenance while writing"""
+
+    def test_sidecar_records_offsets_of_critical_events(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bot.jsonl")
+            logger, handler = _make_logger(path, "crit_test_offsets")
+
+            logger.info("heartbeat", extra={"event_type": "HEARTBEAT"})
+            logger.info("filled", extra={"event_type": "ORDER_FILLED"})
+            logger.info("tick", extra={"event_type": "TICK"})
+            handler.close()
+
+            assert has_critical_events(path) is True
+            lines = list(iter_indexed_lines(path))
+            assert len(lines) == 1
+            assert json.loads(lines[0][1])["event_type"] == "ORDER_FILLED"
+
+    def test_empty_sidecar_marks_file_without_critical_events(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bot.jsonl")
+            logger, handler = _make_logger(path, "crit_test_empty")
+
+            logger.info("tick", extra={"event_type": "TICK"})
+            handler.close()
+
+            assert has_critical_events(path) is False
+            assert has_critical_events(os.path.join(tmpdir, "legacy.jsonl")) is None
+
+    def test_rollover_rotates_sidecar(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bot.jsonl")
+            logger, handler = _make_logger(path, "crit_test_rollover", maxBytes=200, backupCount=10)
+
+            logger.info("start", extra={"event_type": "ENGINE_START"})
+            for i in range(20):
+                logger.info(f"tick {i}", extra={"event_type": "TICK"})
+            logger.info("stop", extra={"event_type": "ENGINE_STOP"})
+            handler.close()
+
+            files = [path] + [f"{path}.{i}" for i in range(1, 11) if os.path.exists(f"{path}.{i}")]
+            assert len(files) > 2
+            for log_file in files:
+                with open(log_file) as f:
+                    content = f.read()
+                expected = "ENGINE_START" in content or "ENGINE_STOP" in content
+                assert has_critical_events(log_file) is expected
+
+
+    def test_existing_unindexed_file_is_indexed_on_open(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bot.jsonl")
+            with open(path, "w") as f:
+                f.write(json.dumps({"event_type": "TICK", "message": "tick"}) + "\n")
+                f.write(json.dumps({"event_type": "ORDER_FILLED", "message": "filled"}) + "\n")
+            logger, handler = _make_logger(path, "crit_test_legacy")
+
+            logger.info("tick", extra={"event_type": "TICK"})
+            logger.info("stop", extra={"event_type": "ENGINE_STOP"})
+            handler.close()
+
+            events = [json.loads(line)["event_type"] for _, line in iter_indexed_lines(path)]
+            assert events == ["ORDER_FILLED", "ENGINE_STOP"]
+
+
+class TestTimedStreams:
+    """Test sidecars on the daily decision/order/audit streams"""
+
+    def test_lowercase_events_indexed_and_sidecar_follows_rotation(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "order.jsonl")
+            handler = CriticalIndexingGzTimedHandler(path, when="midnight", backupCount=3, utc=True, encoding="utf-8")
+            handler.setFormatter(JsonlFormatter())
+            logger = logging.getLogger("crit_test_timed")
+            logger.handlers = [handler]
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+
+            log_event(logger, "order_attempt", symbol="BTC/USDT")
+            log_event(logger, "order_filled", symbol="BTC/USDT")
+            assert [json.loads(line)["event"] for _, line in iter_indexed_lines(path)] == ["order_filled"]
+
+            handler.doRollover()
+            shutdown_compression_pool()
+            log_event(logger, "order_attempt", symbol="ETH/USDT")
+            handler.close()
+
+            rotated = glob.glob(os.path.join(tmpdir, "order.jsonl.*.gz"))
+            assert len(rotated) == 1
+            assert has_critical_events(rotated[0]) is True
+            assert has_critical_events(path) is False
+
+
+class TestRetentionUsesSidecar:
+    """Test that LogManager decides from the sidecar"""
+
+    def test_indexed_file_is_not_scanned(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "old.jsonl")
+            # File content would match, but the (empty) sidecar is authoritative
+            with open(path, "w") as f:
+                f.write(json.dumps({"event_type": "ORDER_FILLED"}) + "\n")
+            open(sidecar_path(path), "w").close()
+
+            manager = LogManager(base_log_dir=tmpdir)
+            assert manager._contains_critical_events(path) is False
+
+            manager._cleanup_session_logs(tmpdir, cutoff_time=float("inf"))
+            assert not os.path.exists(path)
+            assert not os.path.exists(sidecar_path(path))
+
+
+class TestCompressionPool:
+    """Test background gzip compression"""
+
+    def test_compresses_and_moves_sidecar(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "rotated.jsonl")
+            with open(path, "w") as f:
+                f.write('{"a": 1}\n')
+            with open(sidecar_path(path), "w") as f:
+                f.write('{"o":0,"t":"ERROR"}\n')
+
+            pool = CompressionPool(max_workers=1)
+            try:
+                pool.submit(path).result(timeout=30)
+            finally:
+                pool.shutdown()
+
+            assert not os.path.exists(path)
+            with gzip.open(path + ".gz", "rt") as f:
+                assert json.loads(f.readline()) == {"a": 1}
+            assert has_critical_events(path + ".gz") is True
+
+    def test_full_queue_compresses_inline(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = [os.path.join(tmpdir, f"rotated{i}.jsonl") for i in range(2)]
+            for path in paths:
+                with open(path, "w") as f:
+                    f.write('{"a": 1}\n')
+            open(sidecar_path(paths[1]), "w").close()
+
+            done = []
+            pool = CompressionPool(max_workers=1, max_pending=1)
+            try:
+                first = pool.submit(paths[0])
+                second = pool.submit(paths[1], on_done=lambda src, dst: done.append(dst))
+                # Second submission did not wait for a free slot
+                assert second.done() and done == [paths[1] + ".gz"]
+                first.result(timeout=30)
+            finally:
+                pool.shutdown()
+
+            assert not any(os.path.exists(path) for path in paths)
+            assert has_critical_events(paths[1] + ".gz") is False
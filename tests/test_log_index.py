@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for core/log_index.py
+
+Tests incremental ingestion, rotation handling and indexed queries.
+"""
+
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+from core.log_index import SessionLogIndex, stream_name
+
+
+def _write(path: Path, events, mode="a"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, mode) as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+class TestStreamName:
+    """Test stream name derivation"""
+
+    def test_plain_and_rotated_names(self):
+        assert stream_name("logs/decisions/decision.jsonl") == "decision"
+        assert stream_name("exchange_trace_20250928_102159.jsonl.gz") == "exchange_trace"
+
+
+class TestSessionLogIndex:
+    """Test SessionLogIndex ingestion and queries"""
+
+    def test_incremental_refresh_only_ingests_new_lines(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "decisions" / "decision.jsonl"
+            _write(log, [
+                {"ts_ns": 1_000_000_000_000_000_000, "event": "guards_eval", "symbol": "BTC/USDT"},
+                {"ts_ns": 1_000_000_001_000_000_000, "event": "position_opened", "symbol": "ETH/USDT"},
+            ])
+
+            with SessionLogIndex(tmpdir) as index:
+                assert index.refresh() == 2
+                assert index.refresh() == 0
+
+                _write(log, [{"ts_ns": 1_000_000_002_000_000_000, "event": "guards_eval", "symbol": "ETH/USDT"}])
+                assert index.refresh() == 1
+                assert index.count() == 3
+
+    def test_partial_line_is_deferred(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "order.jsonl"
+            with open(log, "w") as f:
+                f.write(json.dumps({"event": "order_ack", "order_id": "1"}) + "\n")
+                f.write('{"event": "order_done", "order_')
+
+            with SessionLogIndex(tmpdir) as index:
+                assert index.refresh() == 1
+
+                with open(log, "a") as f:
+                    f.write('id": "1"}\n')
+                assert index.refresh() == 1
+                assert [e["event"] for e in index.query(order_id="1")] == ["order_ack", "order_done"]
+
+    def test_index_persists_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write(Path(tmpdir) / "audit.jsonl", [{"event": "x", "ts": 1.0}, {"event": "y", "ts": 2.0}])
+
+            with SessionLogIndex(tmpdir) as index:
+                assert index.refresh() == 2
+
+            with SessionLogIndex(tmpdir) as index:
+                assert index.refresh() == 0
+                assert index.count(event_type="y") == 1
+
+    def test_truncated_file_is_reindexed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "decision.jsonl"
+            _write(log, [{"event": "a", "ts": 1.0}, {"event": "b", "ts": 2.0}])
+
+            with SessionLogIndex(tmpdir) as index:
+                index.refresh()
+                _write(log, [{"event": "c", "ts": 3.0}], mode="w")
+                index.refresh()
+
+                assert [e["event"] for e in index.query()] == ["c"]
+
+    def test_gzip_files_are_indexed_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gz_path = Path(tmpdir) / "exchange_trace_20250101_000000.jsonl.gz"
+            with gzip.open(gz_path, "wt") as f:
+                f.write(json.dumps({"fn": "fetch_ticker", "symbol": "BTC/USDT", "ts": "2025-01-01T00:00:00Z"}) + "\n")
+                f.write(json.dumps({"fn": "create_order", "args": {"symbol": "ETH/USDT"}, "ts_ms": 1735689601000}) + "\n")
+
+            with SessionLogIndex(tmpdir) as index:
+                assert index.refresh() == 2
+                assert index.refresh() == 0
+
+                orders = list(index.query(stream="exchange_trace", method="create_order"))
+                assert len(orders) == 1
+                assert orders[0]["args"]["symbol"] == "ETH/USDT"
+                assert index.count(symbol="ETH/USDT") == 1
+
+    def test_truncated_gzip_is_skipped_and_retried(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write(Path(tmpdir) / "decision.jsonl", [{"event": "a", "ts": 1.0}])
+            gz_path = Path(tmpdir) / "exchange_trace_20250101_000000.jsonl.gz"
+            data = gzip.compress(b"".join(
+                (json.dumps({"fn": "fetch_ticker", "ts": float(i)}) + "\n").encode() for i in range(200)
+            ))
+            gz_path.write_bytes(data[:len(data) // 2])
+
+            with SessionLogIndex(tmpdir) as index:
+                assert index.refresh() == 1
+                assert index.count(stream="exchange_trace") == 0
+                assert not any(p.endswith(".gz") for p in index.indexed_files())
+
+                gz_path.write_bytes(data)
+                assert index.refresh() == 200
+
+    def test_path_filter_limits_results_to_given_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            old = Path(tmpdir) / "old" / "exchange_trace.jsonl"
+            new = Path(tmpdir) / "new" / "exchange_trace.jsonl"
+            _write(old, [{"fn": "fetch_ticker", "ts": 1.0}])
+            _write(new, [{"fn": "fetch_ticker", "ts": 2.0}])
+
+            with SessionLogIndex(tmpdir) as index:
+                index.refresh()
+
+                assert index.count(stream="exchange_trace") == 2
+                assert [e["ts"] for e in index.query(stream="exchange_trace", path=[str(new)])] == [2.0]
+                assert index.time_range(path=str(old)) == (1.0, 1.0)
+
+    def test_query_filters_and_ordering(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            _write(Path(tmpdir) / "decision.jsonl", [
+                {"ts": 3.0, "event": "guards_eval", "symbol": "BTC/USDT", "decision_id": "d1"},
+                {"ts": 1.0, "event_type": "order_intent", "intent_id": "i1", "symbol": "BTC/USDT"},
+                {"ts": 2.0, "event": "guards_eval", "symbol": "ETH/USDT", "decision_id": "d2"},
+                {"event": "untimed", "symbol": "SOL/USDT"},
+                {"ts": 5.0, "ts_ns": 9_000_000_000, "event": "both_keys"},
+            ])
+
+            with SessionLogIndex(tmpdir) as index:
+                index.refresh()
+
+                assert [e["ts"] for e in index.query(symbol=["BTC/USDT", "ETH/USDT"])] == [1.0, 2.0, 3.0]
+                assert [e["ts"] for e in index.query(descending=True, limit=1)] == [5.0]
+                assert index.count(event_type="guards_eval", symbol="BTC/USDT") == 1
+                assert index.count(event_type="order_intent") == 1
+                assert index.count(decision_id=["d1", "d2"]) == 2
+                # Untimed records stay in time windows (the extract script keeps them too)
+                assert index.count(since=2.0, until=3.0) == 3
+                assert index.count(event_type="both_keys", since=4.0, until=6.0) == 1
+                assert index.time_range() == (1.0, 5.0)
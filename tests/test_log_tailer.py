@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for ui/log_tailer.py
+
+Tests backwards tail reads, incremental offsets and cached discovery.
+"""
+
+import json
+import os
+import tempfile
+
+from ui.log_tailer import LogTailer, read_last_lines
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _append(path, lines):
+    with open(path, "a") as f:
+        for line in lines:
+            f.write(line + "\n")
+
+
+class TestReadLastLines:
+    """Test backwards EOF reads"""
+
+    def test_returns_last_lines_across_blocks(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.log")
+            _append(path, [f"line {i}" for i in range(1000)])
+
+            lines, end = read_last_lines(path, 5, block_size=64)
+            assert lines == [f"line {i}" for i in range(995, 1000)]
+            assert end == os.path.getsize(path)
+
+    def test_partial_trailing_line_excluded(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "a.log")
+            with open(path, "w") as f:
+                f.write("one\ntwo\nthr")
+
+            lines, end = read_last_lines(path, 10)
+            assert lines == ["one", "two"]
+            assert end == len("one\ntwo\n")
+
+
+class TestLogTailer:
+    """Test LogTailer incremental behavior"""
+
+    def test_incremental_tail(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, "logs"))
+            path = os.path.join(tmpdir, "logs", "bot.jsonl")
+            _append(path, [json.dumps({"level": "INFO", "message": f"m{i}"}) for i in range(50)])
+
+            tailer = LogTailer(n_lines=3, base_dir=tmpdir, clock=FakeClock())
+            assert [line.split()[-1] for line in tailer.get_lines()] == ["m47", "m48", "m49"]
+
+            _append(path, [json.dumps({"level": "INFO", "message": "m50"})])
+            assert [line.split()[-1] for line in tailer.get_lines()] == ["m48", "m49", "m50"]
+            assert tailer.current_path == path
+
+    def test_discovery_is_cached_until_interval(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, "logs"))
+            first = os.path.join(tmpdir, "logs", "a.jsonl")
+            second = os.path.join(tmpdir, "logs", "b.jsonl")
+            _append(first, ['{"message": "a"}'])
+
+            clock = FakeClock()
+            tailer = LogTailer(n_lines=5, base_dir=tmpdir, discovery_interval_s=10.0, clock=clock)
+            tailer.get_lines()
+            assert tailer.current_path == first
+
+            _append(second, ['{"message": "b"}'])
+            os.utime(second, (os.path.getmtime(first) + 5,) * 2)
+            tailer.get_lines()
+            assert tailer.current_path == first
+
+            clock.now = 11.0
+            tailer.get_lines()
+            assert tailer.current_path == second
+
+    def test_truncation_resets_tail(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            os.makedirs(os.path.join(tmpdir, "logs"))
+            path = os.path.join(tmpdir, "logs", "trading_bot_1.log")
+            _append(path, ["old 1", "old 2", "old 3"])
+
+            tailer = LogTailer(n_lines=5, base_dir=tmpdir, clock=FakeClock())
+            assert tailer.get_lines() == ["old 1", "old 2", "old 3"]
+
+            with open(path, "w") as f:
+                f.write("new\n")
+            assert tailer.get_lines() == ["new"]
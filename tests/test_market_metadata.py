@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the market metadata cache
+
+Tests the versioned file round trip, installing into ccxt and mocks,
+diffing/invalidation on refresh and use as offline load_markets source.
+"""
+
+import copy
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adapters.exchange import ExchangeAdapter, MockExchange, ccxt_serial_lock
+from services import exchange_filters
+from services.market_metadata import CACHE_VERSION, MarketMetadataCache, load_cached_markets
+
+
+def market(symbol, tick=0.01, step=0.0001, min_cost=5.0):
+    base, quote = symbol.split("/")
+    return {
+        "id": symbol.replace("/", ""), "symbol": symbol, "base": base, "quote": quote,
+        "baseId": base, "quoteId": quote, "type": "spot", "spot": True, "active": True,
+        "precision": {"amount": step, "price": tick},
+        "limits": {"amount": {"min": step, "max": None}, "price": {"min": None, "max": None},
+                   "cost": {"min": min_cost, "max": None}},
+        "info": {"symbol": symbol.replace("/", ""), "status": "1", "filters": []},
+    }
+
+
+MARKETS = {"BTC/USDT": market("BTC/USDT"), "ETH/USDT": market("ETH/USDT", tick=0.01, step=0.001)}
+
+
+class FakeExchange:
+    id = "fake"
+
+    def __init__(self, markets):
+        self.next_markets = markets
+        self.markets = {}
+        self.loads = 0
+
+    def load_markets(self, reload=False):
+        self.loads += 1
+        self.markets = copy.deepcopy(self.next_markets)
+        return self.markets
+
+
+@pytest.fixture
+def cache_path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield str(Path(tmpdir) / "state" / "market_metadata.json")
+
+
+@pytest.fixture(autouse=True)
+def clean_filters():
+    exchange_filters.clear_cache()
+    yield
+    exchange_filters.clear_cache()
+
+
+class TestMarketMetadataCache:
+    def test_round_trip_and_install_into_mock(self, cache_path):
+        MarketMetadataCache(cache_path, exchange_id="fake").update(MARKETS)
+
+        cache = MarketMetadataCache(cache_path, exchange_id="fake")
+        assert cache.load()
+        assert cache.get_filters("ETH/USDT")["step_size"] == 0.001
+        assert "status" not in cache.markets["BTC/USDT"]["info"]
+
+        mock = MockExchange(markets=load_cached_markets(cache_path))
+        assert set(mock.load_markets()) == {"BTC/USDT", "ETH/USDT"}
+        assert mock.amount_to_precision("ETH/USDT", 0.12345) == pytest.approx(0.123)
+
+    def test_version_and_exchange_mismatch_ignored(self, cache_path):
+        MarketMetadataCache(cache_path, exchange_id="fake").update(MARKETS)
+        assert not MarketMetadataCache(cache_path, exchange_id="other").load()
+
+        with open(cache_path, encoding="utf-8") as f:
+            data = json.load(f)
+        data["version"] = CACHE_VERSION + 1
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        assert not MarketMetadataCache(cache_path, exchange_id="fake").load()
+
+    def test_install_into_ccxt(self, cache_path):
+        ccxt = pytest.importorskip("ccxt")
+        MarketMetadataCache(cache_path).update(MARKETS)
+
+        cache = MarketMetadataCache(cache_path)
+        cache.load()
+        exchange = ccxt.mexc()
+        assert cache.install(exchange)
+        assert "BTC/USDT" in exchange.symbols
+        assert exchange.market("BTC/USDT")["id"] == "BTCUSDT"
+        assert exchange_filters._cache["BTC/USDT"]["tick_size"] == 0.01
+
+    def test_refresh_diffs_and_invalidates(self, cache_path):
+        cache = MarketMetadataCache(cache_path, exchange_id="fake")
+        cache.update(MARKETS)
+        exchange_filters.prime_cache({"BTC/USDT": {"stale": True}})
+        events = []
+        cache.add_listener(events.append)
+
+        updated = copy.deepcopy(MARKETS)
+        updated["BTC/USDT"]["precision"]["price"] = 0.1
+        del updated["ETH/USDT"]
+        updated["SOL/USDT"] = market("SOL/USDT")
+        exchange = FakeExchange(updated)
+        cache.refresh_async(exchange).join(5)
+
+        diff = events[0]
+        assert (diff.added, diff.removed, diff.changed) == (["SOL/USDT"], ["ETH/USDT"], ["BTC/USDT"])
+        assert exchange_filters._cache["BTC/USDT"]["tick_size"] == 0.1
+        assert exchange.loads == 1
+
+        # Unchanged refresh: no event
+        assert not cache.refresh(exchange)
+        assert len(events) == 1
+
+    def test_refresh_is_serialized_with_adapter_calls(self, cache_path):
+        exchange = FakeExchange(MARKETS)
+        lock = ccxt_serial_lock(exchange)
+        contended = []
+        load = exchange.load_markets
+
+        def load_markets(reload=False):
+            probe = threading.Thread(target=lambda: contended.append(not lock.acquire(blocking=False)))
+            probe.start()
+            probe.join()
+            return load(reload)
+
+        exchange.load_markets = load_markets
+        MarketMetadataCache(cache_path).refresh(exchange)
+        assert contended == [True]
+        assert ExchangeAdapter(exchange, enable_connection_recovery=False)._http_lock is lock
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for the unified metrics registry and the modules reporting through it.
+"""
+
+import tempfile
+
+import pytest
+
+from core.monitoring.registry import (
+    Histogram,
+    MetricsRegistry,
+    WindowedCounter,
+    WindowedHistogram,
+    exponential_buckets,
+    linear_buckets,
+    signed_buckets,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestHistogram:
+    """Fixed-bucket histogram"""
+
+    def test_exact_aggregates_and_quantile_estimates(self):
+        """count/sum/min/max are exact, quantiles within one bucket width"""
+        hist = Histogram(linear_buckets(1, 1, 100))
+        for value in range(1, 101):
+            hist.observe(value)
+
+        assert hist.count == 100
+        assert hist.sum == 5050
+        assert hist.min == 1 and hist.max == 100
+        assert hist.mean == pytest.approx(50.5)
+        assert abs(hist.quantile(0.5) - 50) <= 1
+        assert abs(hist.quantile(0.95) - 95) <= 1
+        assert hist.std == pytest.approx(29.01, abs=0.01)
+
+    def test_quantiles_clamped_to_observed_range(self):
+        """Sparse data in wide buckets never reports values outside min/max"""
+        hist = Histogram(exponential_buckets(1, 2, 10))
+        for value in (300, 310, 320):
+            hist.observe(value)
+        assert 300 <= hist.quantile(0.01) <= 320
+        assert 300 <= hist.quantile(0.99) <= 320
+
+    def test_signed_buckets_and_overflow(self):
+        """Negative values and values above the last bound are counted"""
+        hist = Histogram(signed_buckets((1, 10)))
+        for value in (-50, -5, 0, 5, 50):
+            hist.observe(value)
+        assert hist.bucket_counts == [1, 1, 1, 0, 1, 1]
+        assert hist.quantile(0.0) == -50
+        assert hist.quantile(1.0) == 50
+
+    def test_merge_requires_same_bounds(self):
+        a = Histogram((1, 2))
+        b = Histogram((1, 2))
+        a.observe(1)
+        b.observe(2)
+        a.merge(b)
+        assert a.count == 2
+        with pytest.raises(ValueError):
+            a.merge(Histogram((1, 3)))
+
+
+class TestWindowedMetrics:
+    """Time-sliced aggregates"""
+
+    def test_window_query_only_merges_recent_slots(self):
+        """Old observations drop out of short windows but stay in long ones"""
+        clock = FakeClock()
+        window = WindowedHistogram(window_s=3600, slot_s=10, bounds=linear_buckets(1, 1, 100), clock=clock)
+        window.observe(90, timestamp=clock.now - 1800)
+        for value in (1, 2, 3):
+            window.observe(value)
+
+        assert window.count(300) == 3
+        assert window.stats(300)["max"] == 3
+        assert window.count(3600) == 4
+        assert window.stats()["max"] == 90
+
+    def test_expired_slots_are_evicted(self):
+        """Slots older than the window are dropped as new slots are created"""
+        clock = FakeClock()
+        window = WindowedHistogram(window_s=60, slot_s=10, clock=clock)
+        window.observe(1.0)
+        clock.now += 3600
+        window.observe(2.0)
+
+        assert len(window._slots) == 1
+        assert window.stats()["count"] == 1
+
+    def test_windowed_counter_per_key(self):
+        clock = FakeClock()
+        counter = WindowedCounter(window_s=600, slot_s=10, clock=clock)
+        counter.inc("error", timestamp=clock.now - 400)
+        counter.inc("error")
+        counter.inc("retry", amount=2)
+
+        assert counter.counts(60) == {"error": 1, "retry": 2}
+        assert counter.total("error", 600) == 2
+
+
+class TestMetricsRegistry:
+    """Get-or-create registry"""
+
+    def test_same_name_returns_same_metric(self):
+        registry = MetricsRegistry()
+        registry.counter("orders").inc()
+        registry.counter("orders").inc(2)
+        assert registry.counter("orders").value == 3
+
+    def test_type_conflict_raises(self):
+        registry = MetricsRegistry()
+        registry.counter("x")
+        with pytest.raises(ValueError):
+            registry.gauge("x")
+
+    def test_labelled_family(self):
+        registry = MetricsRegistry()
+        family = registry.counter("phase_changes_total", labelnames=("symbol", "phase"))
+        family.labels(symbol="BTC/USDT", phase="idle").inc()
+        family.labels(symbol="BTC/USDT", phase="idle").inc()
+
+        assert registry.snapshot()["phase_changes_total"] == {"symbol=BTC/USDT,phase=idle": 2}
+
+    def test_unregister_prefix(self):
+        registry = MetricsRegistry()
+        registry.counter("fills.a")
+        registry.counter("fills.b")
+        registry.counter("other")
+        registry.unregister_prefix("fills.")
+        assert registry.names() == ["other"]
+
+
+class TestReportingModules:
+    """Modules that report through the registry"""
+
+    def test_metrics_collector_summary(self):
+        from core.monitoring.metrics import MetricsCollector
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            collector = MetricsCollector(tmpdir, registry=MetricsRegistry())
+            collector.record_order_sent("BTC/USDT", "BUY")
+            collector.record_order_sent("BTC/USDT", "BUY")
+            collector.record_order_filled("BTC/USDT", "BUY", latency_ms=120.0)
+
+            summary = collector.get_summary()
+            assert summary["counters"]["orders_sent"] == 2
+            assert summary["gauges"]["fill_rate"] == pytest.approx(0.5)
+            assert summary["histograms"]["order_latency_ms"]["count"] == 1
+            assert summary["histograms"]["order_latency_ms"]["max"] == 120.0
+
+    def test_rolling_stats_uses_windowed_aggregates(self):
+        from core.utils.heartbeat_telemetry import RollingStats
+
+        stats = RollingStats(maxlen=5, value_key="latency_ms")
+        for i in range(20):
+            stats.add({"latency_ms": float(i), "endpoint": "x"})
+
+        result = stats.get_stats(600)
+        # Aggregates are not limited by the raw sample deque
+        assert result["count"] == 20
+        assert result["min"] == 0 and result["max"] == 19
+        assert result["mean"] == pytest.approx(9.5)
+        assert len(stats.get_recent(600)) == 5
+        assert stats.count(600) == 20
+
+    def test_fill_tracker_statistics_per_symbol(self):
+        from core.telemetry import FillTracker
+
+        tracker = FillTracker()
+        for i, symbol in enumerate(["BTC/USDT", "BTC/USDT", "ETH/USDT"]):
+            order_id = f"o{i}"
+            tracker.start_order(order_id, symbol, "BUY", 1.0, limit_price=100.0)
+            tracker.record_fill(order_id, filled_qty=1.0, avg_fill_price=100.1, fees_quote=0.1)
+
+        stats = tracker.get_statistics(symbol="BTC/USDT")
+        assert stats["total_orders"] == 2
+        assert stats["side_breakdown"]["buy_full_fill_rate"] == 1.0
+        assert stats["slippage"]["mean_bps"] == pytest.approx(10.0)
+        assert tracker.get_statistics()["total_orders"] == 3
+        assert set(tracker.get_symbol_statistics()) == {"BTC/USDT", "ETH/USDT"}
+
+        tracker.clear_history()
+        assert tracker.get_statistics()["total_orders"] == 0
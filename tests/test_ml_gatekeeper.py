@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for ML gatekeeper inference
+
+Tests the fixed feature layout, NumPy running normalization, batch
+scoring parity with single evaluations and the latency histograms.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.ml_gatekeeper import FEATURE_NAMES, FEATURE_SCHEMA, MLGatekeeper, RunningStats
+
+
+class CountingModel:
+    """Classifier stub recording the matrices it scores"""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, X):
+        self.calls.append(X.copy())
+        p = 1.0 / (1.0 + np.exp(-0.1 * X.sum(axis=1)))
+        return np.column_stack((1.0 - p, p))
+
+
+def feed(gatekeeper, seed):
+    rng = random.Random(seed)
+    gatekeeper.update_market_regime(rng.gauss(0, 1), rng.uniform(-1, 1), "bull", rng.gauss(0, 1))
+    gatekeeper.update_portfolio_state(rng.uniform(0, 0.2), rng.uniform(0.3, 0.7), rng.gauss(0, 1))
+    for i in range(4):
+        for _ in range(12):
+            gatekeeper.update_symbol_metrics(f"S{i}", rng.gauss(0, 1), rng.gauss(0, 1), rng.uniform(0, 1))
+
+
+class TestFeatureLayout:
+    def test_schema_is_sorted_and_complete(self):
+        assert FEATURE_SCHEMA.names == tuple(sorted(FEATURE_NAMES))
+        features = MLGatekeeper().feature_extractor.extract_features("BTC/USDT")
+        assert list(features) == list(FEATURE_NAMES)
+
+    def test_running_stats_match_welford(self):
+        values = [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0]
+        stats = RunningStats(["x"])
+        slot = np.array([0])
+        for i, value in enumerate(values):
+            z = stats.normalize(slot, np.array([value]))[0]
+            seen = values[:i + 1]
+            std = max(float(np.std(seen)), 0.01) if i and np.std(seen) > 0 else 1.0
+            assert z == pytest.approx(np.clip((value - np.mean(seen)) / std, -3, 3))
+        assert stats.as_dict()["x"]["count"] == len(values)
+
+
+class TestBatchScoring:
+    @pytest.mark.parametrize("with_model", [False, True])
+    def test_batch_matches_sequential_evaluations(self, with_model):
+        single, batch = MLGatekeeper(), MLGatekeeper()
+        if with_model:
+            single.model, batch.model = CountingModel(), CountingModel()
+        feed(single, 1)
+        feed(batch, 1)
+        symbols = ["S0", "S1", "UNKNOWN", "S3", "S1"]
+
+        expected = [single.evaluate_trade_opportunity(s, 100.0) for s in symbols]
+        decisions = batch.evaluate_batch(symbols, [100.0, 50.0, 100.0, 100.0, 100.0])
+
+        assert [d.symbol for d in decisions] == symbols
+        for exp, got in zip(expected, decisions):
+            assert got.multiplier == pytest.approx(exp.multiplier)
+            assert got.features_used == pytest.approx(exp.features_used)
+            assert got.scaling_reason == exp.scaling_reason
+        assert decisions[1].scaled_budget == pytest.approx(50.0 * expected[1].multiplier)
+        if with_model:
+            assert len(batch.model.calls) == 1 and batch.model.calls[0].shape == (5, FEATURE_SCHEMA.size)
+
+    def test_model_failure_falls_back_to_heuristic(self):
+        class Broken:
+            def predict(self, X):
+                raise RuntimeError("boom")
+
+        reference, gatekeeper = MLGatekeeper(), MLGatekeeper()
+        feed(reference, 2)
+        feed(gatekeeper, 2)
+        gatekeeper.model = Broken()
+        expected = reference.evaluate_batch(["S0", "S1"], 1.0)
+        decisions = gatekeeper.evaluate_batch(["S0", "S1"], 1.0)
+        assert [d.scaling_reason for d in decisions] == [d.scaling_reason for d in expected]
+        assert decisions[0].model_version == "ml_model_Broken"
+
+    def test_latency_histograms(self):
+        gatekeeper = MLGatekeeper()
+        gatekeeper.evaluate_trade_opportunity("S0", 10.0)
+        gatekeeper.evaluate_batch(["S0", "S1"], 10.0)
+        assert gatekeeper.evaluate_batch([], 10.0) == []
+        latency = gatekeeper.get_performance_stats()["latency_us"]
+        assert latency["single"]["count"] == 1 and latency["batch"]["count"] == 1
+        with pytest.raises(ValueError):
+            gatekeeper.evaluate_batch(["S0", "S1"], [1.0])
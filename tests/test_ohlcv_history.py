@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the array-backed OHLCV history
+
+Compares OHLCVHistory against a straightforward list reference for
+in-order appends, out-of-order/duplicate merges, trimming, ATR and
+price ranges, and checks the zero-copy column views.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.market_data import OHLCVBar, OHLCVHistory
+
+
+def make_bar(ts, rng):
+    close = rng.uniform(90, 110)
+    high = close + rng.uniform(0, 3)
+    low = close - rng.uniform(0, 3)
+    return OHLCVBar(timestamp=ts, open=rng.uniform(low, high), high=high, low=low, close=close,
+                    volume=rng.uniform(0, 1000))
+
+
+class Reference:
+    """Sorted list semantics of the former deque implementation"""
+
+    def __init__(self, max_bars):
+        self.max_bars = max_bars
+        self.bars = []
+
+    def add(self, bars):
+        seen = {b.timestamp for b in self.bars}
+        for bar in bars:
+            if bar.timestamp not in seen:
+                seen.add(bar.timestamp)
+                self.bars.append(bar)
+        self.bars.sort(key=lambda b: b.timestamp)
+        self.bars = self.bars[-self.max_bars:]
+
+    def price_range(self, lookback):
+        bars = self.bars[-lookback:] if lookback > 0 else self.bars
+        return max(b.high for b in bars), min(b.low for b in bars)
+
+    def atr(self, period):
+        if len(self.bars) < period + 1:
+            return None
+        recent = self.bars[-(period + 1):]
+        trs = [max(c.high - c.low, abs(c.high - p.close), abs(c.low - p.close)) for p, c in zip(recent, recent[1:])]
+        return sum(trs) / len(trs) if trs else None
+
+
+class TestOHLCVHistory:
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_matches_reference(self, seed):
+        rng = random.Random(seed)
+        history, ref = OHLCVHistory(max_bars_per_symbol=50), Reference(50)
+        ts = 0
+        for step in range(400):
+            if rng.random() < 0.15:
+                # Backfill batch with old, duplicate and new bars
+                batch = [make_bar(rng.randrange(max(ts - 120, 0), ts + 3) * 60, rng) for _ in range(rng.randint(1, 8))]
+            else:
+                ts += 1
+                batch = [make_bar(ts * 60, rng)]
+            history.add_bars("BTC/USDT", "1m", batch)
+            ref.add(batch)
+
+            assert history.get_bars("BTC/USDT", "1m") == ref.bars
+            for lookback in (0, 1, 20, 60):
+                assert history.get_price_range("BTC/USDT", "1m", lookback) == pytest.approx(ref.price_range(lookback))
+            for period in (1, 14, 49, 50):
+                expected = ref.atr(period)
+                actual = history.calculate_atr("BTC/USDT", "1m", period)
+                assert actual == (None if expected is None else pytest.approx(expected, rel=1e-9))
+
+        assert history.get_bars("BTC/USDT", "1m", limit=5) == ref.bars[-5:]
+        assert history.get_latest_bar("BTC/USDT", "1m") is ref.bars[-1]
+
+    def test_empty_series(self):
+        history = OHLCVHistory()
+        assert history.get_bars("X/USDT", "1m") == []
+        assert history.get_latest_bar("X/USDT", "1m") is None
+        assert history.get_price_range("X/USDT", "1m", 20) == (0.0, 0.0)
+        assert history.calculate_atr("X/USDT", "1m") is None
+        assert history.get_columns("X/USDT", "1m") is None
+
+    def test_column_views_are_stable_and_read_only(self):
+        rng = random.Random(7)
+        history = OHLCVHistory(max_bars_per_symbol=10)
+        history.add_bars("X/USDT", "1m", [make_bar(ts, rng) for ts in range(10)])
+        columns = history.get_columns("X/USDT", "1m", limit=4)
+        closes = columns["close"].copy()
+
+        assert list(columns["timestamp"]) == [6, 7, 8, 9]
+        with pytest.raises(ValueError):
+            columns["close"][0] = 0.0
+
+        # Enough appends to force buffer compaction and an out-of-order merge
+        history.add_bars("X/USDT", "1m", [make_bar(ts, rng) for ts in range(10, 200)])
+        history.add_bars("X/USDT", "1m", [make_bar(195, rng), make_bar(300, rng), make_bar(250, rng)])
+        assert list(columns["close"]) == list(closes)
+        assert list(history.get_columns("X/USDT", "1m")["timestamp"])[-3:] == [199, 250, 300]
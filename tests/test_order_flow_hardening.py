@@ -273,6 +273,7 @@ class TestConsolidatedEntryGuards:
         portfolio.held_assets = {f"SYM{i}/USDT": {} for i in range(10)}  # Max positions
         portfolio.my_budget = 100.0
         portfolio.get_symbol_exposure_usdt = Mock(return_value=10.0)
+        portfolio.get_total_exposure_usdt = Mock(return_value=100.0)
 
         passed, reason, ctx = evaluate_all_entry_guards(
             symbol="NEW/USDT",
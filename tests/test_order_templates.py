@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for precompiled per-symbol order templates
+
+Tests that template quantization matches services.quantize and ccxt,
+the check reasons, preflight parity and caching/invalidation.
+"""
+
+import copy
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from adapters.exchange import MockExchange
+from services import exchange_filters, order_templates
+from services.market_metadata import MarketMetadataCache
+from services.order_templates import OrderTemplate, get_template
+from services.order_validation import preflight
+from services.quantize import q_amount, q_price
+
+FILTERS = {"tick_size": 0.0001, "step_size": 0.01, "min_qty": 0.01, "min_notional": 5.0}
+
+
+def market(symbol, tick=0.01, step=0.0001, min_cost=5.0):
+    base, quote = symbol.split("/")
+    return {
+        "id": symbol.replace("/", ""), "symbol": symbol, "base": base, "quote": quote,
+        "type": "spot", "spot": True, "active": True, "taker": 0.002, "maker": 0.0,
+        "precision": {"amount": step, "price": tick},
+        "limits": {"amount": {"min": step, "max": None}, "cost": {"min": min_cost, "max": None}},
+        "info": {},
+    }
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    exchange_filters.clear_cache()
+    order_templates.clear_templates()
+    yield
+    exchange_filters.clear_cache()
+    order_templates.clear_templates()
+
+
+class TestQuantization:
+    @pytest.mark.parametrize("tick,step", [(0.0001, 0.01), (0.01, 0.0001), (0.5, 1.0), (1e-8, 0.001)])
+    def test_floor_matches_quantize(self, tick, step):
+        tpl = OrderTemplate.from_filters("X/USDT", {"tick_size": tick, "step_size": step})
+        rng = random.Random(11)
+        for _ in range(2000):
+            price = rng.uniform(0, 1000) if tick >= 0.01 else rng.uniform(0, 2)
+            amount = rng.uniform(0, 5000)
+            assert tpl.floor_price(price) == pytest.approx(q_price(price, tick), abs=1e-12)
+            assert tpl.floor_amount(amount) == pytest.approx(q_amount(amount, step), abs=1e-12)
+
+    def test_values_on_step_are_kept(self):
+        tpl = OrderTemplate.from_filters("X/USDT", FILTERS)
+        assert tpl.floor_amount(0.29) == 0.29
+        assert tpl.floor_price(0.0123) == 0.0123
+        assert tpl.price_ticks(0.0123) == 123
+
+    def test_round_price_matches_ccxt(self):
+        ccxt = pytest.importorskip("ccxt")
+        exchange = ccxt.mexc()
+        exchange.set_markets({"X/USDT": market("X/USDT", tick=0.0001, step=0.01)})
+        tpl = OrderTemplate.from_filters("X/USDT", {"tick_size": 0.0001, "step_size": 0.01})
+        rng = random.Random(5)
+        for _ in range(500):
+            price = round(rng.uniform(0.001, 3), 7)
+            amount = round(rng.uniform(0.01, 500), 5)
+            assert tpl.round_price(price) == float(exchange.price_to_precision("X/USDT", price))
+            assert tpl.floor_amount(amount) == float(exchange.amount_to_precision("X/USDT", amount))
+
+    def test_unknown_filters_pass_through(self):
+        tpl = OrderTemplate.from_filters("X/USDT", {})
+        assert not tpl.known
+        assert tpl.floor_price(1.23456) == 1.23456
+        assert tpl.floor_amount(0.123) == 0.123
+
+
+class TestValidation:
+    def test_check_reasons(self):
+        tpl = OrderTemplate.from_filters("X/USDT", FILTERS)
+        assert tpl.check(1.0, 0) == "amount_zero_or_negative"
+        assert tpl.check(1.0, 0.001) == "min_qty"
+        assert tpl.check(0.0, 1.0) == "price_zero_or_negative"
+        assert tpl.check(1.0, 1.0) == "min_notional"
+        assert tpl.check(1.0, 5.0) is None
+        assert tpl.check(None, 1.0) is None
+
+    def test_preflight_parity(self):
+        tpl = OrderTemplate.from_filters("X/USDT", FILTERS)
+        for price, amount in ((0.12345, 100.0), (0.5, 0.005), (0.5, 3.0), (2.0, 1.0)):
+            assert tpl.preflight(price, amount) == preflight("X/USDT", price, amount, FILTERS)
+
+
+class TestTemplateCache:
+    def test_compiled_once_with_fees(self):
+        exchange = MockExchange(markets={"X/USDT": market("X/USDT")})
+        tpl = get_template(exchange, "X/USDT")
+        assert (tpl.tick_size, tpl.step_size, tpl.min_notional) == (0.01, 0.0001, 5.0)
+        assert tpl.fee(100.0) == pytest.approx(0.2)
+        assert tpl.fee(100.0, maker=True) == 0.0
+        assert get_template(exchange, "X/USDT") is tpl
+
+    def test_unknown_market_falls_back_to_exchange(self):
+        exchange = MockExchange(markets={"X/USDT": market("X/USDT")})
+        assert get_template(exchange, "Y/USDT") is None
+        assert order_templates.amount_to_precision(exchange, "Y/USDT", 0.1234567) == pytest.approx(0.123457)
+
+    def test_metadata_update_invalidates(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = MarketMetadataCache(str(Path(tmpdir) / "markets.json"))
+            markets = {"X/USDT": market("X/USDT")}
+            cache.update(markets)
+            exchange = MockExchange(markets=copy.deepcopy(markets))
+            assert get_template(exchange, "X/USDT").tick_size == 0.01
+
+            exchange.markets["X/USDT"]["precision"]["price"] = 0.1
+            cache.update(exchange.markets)
+            assert get_template(exchange, "X/USDT").tick_size == 0.1
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for core/replay.py
+
+Tests the streaming k-way merge, timestamp-index seeking and checkpoint/resume.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+
+from core.replay import SessionReplay, load_ts_index, seek_offset, stream_files
+
+T0_NS = 1_736_640_000_000_000_000
+S = 1_000_000_000
+
+
+def _write(path, events, mode="a"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, mode + "t") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+def _opened(ts, symbol, price=100.0, qty=1.0):
+    return {"ts_ns": ts, "event": "position_opened", "symbol": symbol, "qty": qty,
+            "avg_entry": price, "notional": qty * price, "fee_accum": 0.1}
+
+
+def _closed(ts, symbol, price=110.0, qty=1.0, entry=100.0):
+    return {"ts_ns": ts, "event": "position_closed", "symbol": symbol, "qty_closed": qty,
+            "exit_price": price, "fee_total": 0.1, "realized_pnl_usdt": (price - entry) * qty}
+
+
+def _ledger(ts, debit=0.0, credit=0.0):
+    return {"ts_ns": ts, "event": "ledger_entry", "account": "cash:USDT", "debit": debit, "credit": credit}
+
+
+def _session(tmpdir):
+    return {
+        "decision": os.path.join(tmpdir, "decisions", "decision.jsonl"),
+        "order": os.path.join(tmpdir, "orders", "order.jsonl"),
+        "audit": os.path.join(tmpdir, "audit", "audit.jsonl"),
+    }
+
+
+def _replay(paths, **kwargs):
+    return SessionReplay(paths["decision"], paths["order"], paths["audit"], **kwargs)
+
+
+class TestStreamingMerge:
+    """Streaming replay equals the former load-all-and-sort replay"""
+
+    def test_merges_rotated_gz_parts_in_timestamp_order(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = _session(tmpdir)
+            _write(paths["decision"] + ".2025-01-11.gz", [_opened(T0_NS, "BTC/USDT")])
+            _write(paths["decision"], [_closed(T0_NS + 3 * S, "BTC/USDT"), _opened(T0_NS + 5 * S, "ETH/USDT")])
+            _write(paths["audit"], [_ledger(T0_NS + 1 * S, debit=1000.0), _ledger(T0_NS + 4 * S, credit=5.0)])
+            _write(paths["order"], [{"ts_ns": T0_NS + 2 * S, "event": "order_filled"}])
+            _write(paths["decision"] + ".crit", [])  # sidecars are not log parts
+
+            assert stream_files(paths["decision"]) == [paths["decision"] + ".2025-01-11.gz", paths["decision"]]
+
+            replay = _replay(paths)
+            seen = [event["ts_ns"] for event, _, _ in replay.iter_events()]
+            assert seen == sorted(seen) and len(seen) == 6
+
+            state = replay.replay()
+            assert state["events_processed"] == 6
+            assert state["realized_pnl"] == 10.0
+            assert list(state["portfolio"]) == ["ETH/USDT"]
+            assert [t["symbol"] for t in state["trades"]] == ["BTC/USDT"]
+
+    def test_equal_timestamps_keep_stream_order(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = _session(tmpdir)
+            _write(paths["audit"], [{"ts_ns": T0_NS, "event": "c"}])
+            _write(paths["order"], [{"ts_ns": T0_NS, "event": "b"}])
+            _write(paths["decision"], [{"ts_ns": T0_NS, "event": "a1"}, {"ts_ns": T0_NS, "event": "a2"}])
+
+            assert [e["event"] for e, _, _ in _replay(paths).iter_events()] == ["a1", "a2", "b", "c"]
+
+    def test_partial_trailing_line_is_not_consumed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = _session(tmpdir)
+            _write(paths["decision"], [_opened(T0_NS, "BTC/USDT")])
+            with open(paths["decision"], "a") as f:
+                f.write('{"ts_ns": 1, "event": "posi')
+
+            assert len(list(_replay(paths).iter_events())) == 1
+
+
+class TestTimestampWindow:
+    """since/until with the sparse timestamp index"""
+
+    def _big_session(self, tmpdir, n=3000):
+        paths = _session(tmpdir)
+        _write(paths["audit"], [
+            dict(_ledger(T0_NS + i * S, debit=1.0), pad="x" * 100) for i in range(n)
+        ])
+        return paths
+
+    def test_since_seeks_via_index_and_filters_window(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = self._big_session(tmpdir)
+            since_s = (T0_NS + 2000 * S) / 1e9
+
+            offset = seek_offset(paths["audit"], int(since_s * 1e9))
+            assert offset > 0
+            assert os.path.exists(paths["audit"] + ".tsidx")
+
+            replay = _replay(paths, since=since_s, until=(T0_NS + 2099 * S) / 1e9)
+            events = [e for e, _, _ in replay.iter_events()]
+            assert [e["ts_ns"] for e in events] == [T0_NS + i * S for i in range(2000, 2100)]
+            assert replay.replay()["cash_usdt"] == 100.0
+
+    def test_index_extends_incrementally_for_growing_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = self._big_session(tmpdir)
+            first = load_ts_index(paths["audit"])
+            _write(paths["audit"], [dict(_ledger(T0_NS + i * S), pad="x" * 100) for i in range(3000, 6000)])
+            second = load_ts_index(paths["audit"])
+
+            assert second[:len(first)] == first
+            assert len(second) > len(first)
+            assert second[-1][0] > T0_NS + 3000 * S
+
+
+class TestCheckpointResume:
+    """Checkpoint at an event offset and resume"""
+
+    def test_resume_after_appends_matches_full_replay(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = _session(tmpdir)
+            _write(paths["decision"], [_opened(T0_NS, "BTC/USDT")])
+            _write(paths["audit"], [_ledger(T0_NS + i * S, debit=1.0) for i in range(1, 50)])
+            checkpoint = os.path.join(tmpdir, "replay.ckpt")
+
+            first = _replay(paths, checkpoint_path=checkpoint, checkpoint_every=10)
+            first.replay()
+            assert first.event_offset == 50
+
+            _write(paths["decision"], [_closed(T0_NS + 60 * S, "BTC/USDT")])
+            _write(paths["audit"], [_ledger(T0_NS + 61 * S, debit=5.0)])
+
+            resumed = _replay(paths, checkpoint_path=checkpoint)
+            state = resumed.replay(resume=True)
+            assert resumed.event_offset == 52
+
+            full = _replay(paths).replay()
+            assert state == full
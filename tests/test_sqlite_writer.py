@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for GroupCommitWriter and its users (ledger, idempotency store)
+
+Tests batching, per-op failure isolation, strict-sync commits and that
+readers see queued writes.
+"""
+
+import sqlite3
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.idempotency import IdempotencyStore
+from core.ledger import DoubleEntryLedger
+from core.sqlite_writer import GroupCommitWriter
+
+SCHEMA = ("CREATE TABLE IF NOT EXISTS t (k TEXT PRIMARY KEY, v INTEGER)",)
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+def _count(db_path: Path) -> int:
+    with sqlite3.connect(db_path) as db:
+        return db.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+
+
+class TestGroupCommitWriter:
+    """Batching and failure semantics of the writer thread"""
+
+    def test_concurrent_writes_share_transactions(self, temp_dir):
+        writer = GroupCommitWriter(str(temp_dir / "w.db"), commit_interval_s=0.02, init_statements=SCHEMA)
+        futures = []
+        lock = threading.Lock()
+
+        def produce(n):
+            for i in range(100):
+                fut = writer.execute("INSERT INTO t VALUES (?, ?)", (f"{n}-{i}", i))
+                with lock:
+                    futures.append(fut)
+
+        threads = [threading.Thread(target=produce, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for fut in futures:
+            assert fut.result(5) == 1
+
+        stats = writer.get_stats()
+        writer.close()
+        assert _count(temp_dir / "w.db") == 400
+        assert stats["ops"] == 400
+        assert stats["batches"] < 400
+
+    def test_failing_op_does_not_abort_batch(self, temp_dir):
+        writer = GroupCommitWriter(str(temp_dir / "w.db"), commit_interval_s=0.05, init_statements=SCHEMA)
+        ok1 = writer.execute("INSERT INTO t VALUES ('a', 1)")
+        dup = writer.execute("INSERT INTO t VALUES ('a', 2)")
+        ok2 = writer.execute("INSERT INTO t VALUES ('b', 3)")
+
+        assert ok1.result(5) == 1
+        with pytest.raises(sqlite3.IntegrityError):
+            dup.result(5)
+        assert ok2.result(5) == 1
+        assert writer.get_stats()["failed_ops"] == 1
+        writer.close()
+        assert _count(temp_dir / "w.db") == 2
+
+    def test_sync_op_commits_without_waiting_for_window(self, temp_dir):
+        writer = GroupCommitWriter(str(temp_dir / "w.db"), commit_interval_s=10.0, init_statements=SCHEMA)
+        writer.execute("INSERT INTO t VALUES ('a', 1)", sync=True).result(2)
+        assert _count(temp_dir / "w.db") == 1
+        assert writer.get_stats()["sync_batches"] == 1
+        writer.close()
+
+    def test_close_commits_pending_and_rejects_new(self, temp_dir):
+        writer = GroupCommitWriter(str(temp_dir / "w.db"), commit_interval_s=10.0, init_statements=SCHEMA)
+        pending = writer.execute("INSERT INTO t VALUES ('a', 1)")
+        writer.close()
+        assert pending.result(1) == 1
+        with pytest.raises(RuntimeError):
+            writer.execute("INSERT INTO t VALUES ('b', 2)").result(1)
+
+
+class TestLedgerGroupCommit:
+    """Ledger balances through the writer thread"""
+
+    def test_balances_after_queued_trades(self, temp_dir):
+        ledger = DoubleEntryLedger(str(temp_dir / "ledger.db"), commit_interval_s=0.01)
+        for i in range(20):
+            ledger.record_trade("BTC/USDT", "buy", 0.001, 50000.0, 0.0)
+
+        balances = ledger.get_all_balances()
+        assert balances["cash:USDT"] == pytest.approx(-1000.0)
+        assert balances["asset:BTC/USDT"] == pytest.approx(1000.0)
+        assert ledger.get_writer_stats()["batches"] < 20
+        ledger.close()
+
+    def test_strict_sync_persists_before_return(self, temp_dir):
+        db_path = temp_dir / "ledger.db"
+        ledger = DoubleEntryLedger(str(db_path))
+        ledger.record_trade("BTC/USDT", "buy", 0.001, 50000.0, 0.0, sync=True).result(2)
+        with sqlite3.connect(db_path) as db:
+            assert db.execute("SELECT COUNT(*) FROM ledger_entries").fetchone()[0] > 0
+        ledger.close()
+
+
+class TestIdempotencyGroupCommit:
+    """Duplicate detection must see writes that are not committed yet"""
+
+    def test_duplicate_detected_before_commit(self, temp_dir):
+        store = IdempotencyStore(str(temp_dir / "idem.db"), commit_interval_s=10.0)
+        existing, future = store.register_order_async("req-1", "BTC/USDT", "buy", 0.001, 50000.0)
+        assert existing is None and not future.done()
+        store.update_order_status("req-1", "ex-1", "open")
+
+        assert store.register_order("req-1", "BTC/USDT", "buy", 0.001, 50000.0) == "ex-1"
+        order = store.get_order_by_req_id("req-1")
+        assert order["exchange_order_id"] == "ex-1"
+        assert order["status"] == "open"
+        store.close()
+
+    def test_registration_is_durable_before_return(self, temp_dir):
+        db_path = temp_dir / "idem.db"
+        store = IdempotencyStore(str(db_path), commit_interval_s=10.0)
+        assert store.register_order("req-1", "BTC/USDT", "buy", 0.001) is None
+        with sqlite3.connect(db_path) as db:
+            assert db.execute("SELECT status FROM idempotency_keys").fetchall() == [("pending",)]
+        store.close()
+
+    def test_state_survives_reopen(self, temp_dir):
+        db_path = str(temp_dir / "idem.db")
+        store = IdempotencyStore(db_path)
+        store.register_order("req-1", "BTC/USDT", "buy", 0.001, sync=True)
+        store.update_order_status("req-1", "ex-1", "filled")
+        store.close()
+
+        reopened = IdempotencyStore(db_path)
+        assert reopened.register_order("req-1", "BTC/USDT", "buy", 0.001) == "ex-1"
+        assert reopened.get_stats()["filled"] == 1
+        reopened.close()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the unified SQLite state store
+
+Tests per-cycle atomic commits, diffing, live-only startup reads,
+point-in-time recovery, legacy JSON import, crash consistency and the
+components persisting through the store.
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.coid import COIDManager, COIDStatus
+from core.fsm.phases import Phase
+from core.fsm.snapshot import SnapshotManager
+from core.fsm.state import CoinState
+from core.rolling_windows import RollingWindowManager
+from core.state_store import StateStore, StoreSections
+from core.state_writer import DebouncedStateWriter
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "state" / "state.db")
+
+
+@pytest.fixture
+def store(db_path):
+    s = StateStore(db_path, autocommit_s=0)
+    yield s
+    s.close()
+
+
+def rows(db_path, sql):
+    with sqlite3.connect(db_path) as db:
+        return db.execute(sql).fetchall()
+
+
+class TestCommit:
+    def test_cycle_commits_staged_changes_atomically(self, store, db_path):
+        store.put("a", "x", {"v": 1})
+        store.put("b", "y", [1, 2])
+        assert rows(db_path, "SELECT COUNT(*) FROM records") == [(0,)]
+
+        assert store.commit(wait=True) == 1
+        assert rows(db_path, "SELECT ns, key, cycle FROM records ORDER BY ns") == [("a", "x", 1), ("b", "y", 1)]
+        assert rows(db_path, "SELECT cycle, changes FROM cycles") == [(1, 2)]
+
+    def test_unchanged_values_are_not_staged(self, store):
+        assert store.sync("ns", {"a": 1, "b": 2}) == 2
+        store.commit(wait=True)
+        assert store.sync("ns", {"a": 1, "b": 3}) == 1
+        assert store.sync("ns", {"a": 1}) == 1
+        assert not store.put("ns", "a", 1)
+        assert store.commit(wait=True) == 2
+        assert store.commit(wait=True) is None
+        assert store.load("ns") == {"a": 1}
+
+    def test_reopen_reads_live_records_only(self, db_path):
+        store = StateStore(db_path, autocommit_s=0)
+        for i in range(5):
+            store.put("ns", "k", i)
+            store.put("ns", f"tmp{i}", i)
+            store.delete("ns", f"tmp{i - 1}")
+            store.commit()
+        store.close()
+
+        reopened = StateStore(db_path, autocommit_s=0)
+        assert reopened.load("ns") == {"k": 4, "tmp4": 4}
+        assert reopened.cycle == 5
+        reopened.close()
+
+    def test_uncommitted_changes_are_lost_not_torn(self, db_path):
+        store = StateStore(db_path, autocommit_s=0)
+        store.sync("ns", {"a": 1, "b": 1})
+        store.commit(wait=True)
+        store.sync("ns", {"a": 2, "b": 2})
+        # Crash: writer never receives the staged cycle
+        store._pending.clear()
+        store._writer.close()
+
+        reopened = StateStore(db_path, autocommit_s=0)
+        assert reopened.load("ns") == {"a": 1, "b": 1}
+        reopened.close()
+
+    def test_autocommit(self, db_path):
+        store = StateStore(db_path, autocommit_s=0.05)
+        store.put("ns", "a", 1)
+        store._writer.flush()
+        for _ in range(100):
+            if store.get_stats()["commits"]:
+                break
+            store._stop.wait(0.02)
+        assert store.get_stats()["commits"] == 1
+        store.close()
+
+    def test_namespace_commit_leaves_other_changes_staged(self, store, db_path):
+        store.put("portfolio.held", "BTC/USDT", {"amount": 1.0})
+        store.put("coid", "c1", {"status": "pending"})
+        store.load("coid", legacy=lambda: {})
+        assert store.commit(wait=True, namespaces=("coid",)) == 1
+        assert rows(db_path, "SELECT ns, key FROM records ORDER BY ns") == [("__meta__", "coid"), ("coid", "c1")]
+        assert store.get_stats()["pending"] == 1
+        assert store.commit(wait=True, namespaces=("coid",)) is None
+
+    def test_autocommit_waits_for_open_engine_cycle(self, db_path):
+        store = StateStore(db_path, autocommit_s=0.05, cycle_timeout_s=0.5)
+        store.begin_cycle()
+        store.put("ns", "a", 1)
+        store._stop.wait(0.3)
+        assert store.get_stats()["commits"] == 0
+        for _ in range(100):
+            if store.get_stats()["commits"]:
+                break
+            store._stop.wait(0.02)
+        # Cycle timeout: a loop that never reaches its commit does not hold state forever
+        assert store.get_stats()["commits"] == 1
+        store.close()
+
+    def test_concurrent_commits_reach_writer_in_cycle_order(self, store, db_path):
+        submit = store._writer.submit
+        first_submit = threading.Event()
+
+        def slow_submit(fn, sync=False):
+            if not first_submit.is_set():
+                first_submit.set()
+                store._stop.wait(0.2)  # a second commit races this one
+            return submit(fn, sync)
+
+        store._writer.submit = slow_submit
+        store.put("ns", "a", "old")
+        older = threading.Thread(target=store.commit)
+        older.start()
+        first_submit.wait(1.0)
+        store.put("ns", "a", "new")
+        store.commit()
+        older.join()
+        store._writer.flush()
+
+        assert rows(db_path, "SELECT value, cycle FROM records") == [(json.dumps("new"), 2)]
+
+
+class TestPointInTime:
+    def test_state_at_and_restore(self, store):
+        for i in range(1, 4):
+            store.sync("ns", {"a": i, **({"b": i} if i < 3 else {})})
+            store.commit()
+
+        assert store.state_at(1) == {"ns": {"a": 1, "b": 1}}
+        assert store.state_at(3) == {"ns": {"a": 3}}
+        assert store.restore(2) == 4
+        assert store.load("ns") == {"a": 2, "b": 2}
+
+    def test_pruning_keeps_recoverable_cycles(self, db_path):
+        store = StateStore(db_path, history_cycles=50, autocommit_s=0)
+        store.put("static", "k", "v")
+        for i in range(200):
+            store.put("ns", "counter", i)
+            store.commit()
+        store.flush()
+
+        assert store.state_at(160) == {"static": {"k": "v"}, "ns": {"counter": 159}}
+        assert rows(db_path, "SELECT COUNT(*) FROM history")[0][0] < 120
+        with pytest.raises(ValueError):
+            store.state_at(10)
+        store.close()
+
+    def test_unversioned_namespace(self, store, db_path):
+        store.register_namespace("windows", history=False)
+        store.put("windows", "BTC/USDT", [1, 2])
+        store.commit(wait=True)
+        assert rows(db_path, "SELECT COUNT(*) FROM history") == [(0,)]
+        assert store.load("windows") == {"BTC/USDT": [1, 2]}
+
+
+class TestComponents:
+    def test_legacy_import_once(self, store, tmp_path):
+        held = tmp_path / "held_assets.json"
+        held.write_text(json.dumps({"BTC/USDT": {"amount": 1.0}}))
+        sections = StoreSections(store, {"held": str(held), "open_buys": str(tmp_path / "missing.json")})
+
+        assert sections.load() == {"held": {"BTC/USDT": {"amount": 1.0}}, "open_buys": {}}
+        sections.stage("held", {})
+        sections.flush()
+        assert sections.load()["held"] == {}  # emptied namespace is not re-imported
+        assert store.get_stats()["imports"] == 1
+
+    def test_snapshot_manager(self, store, tmp_path):
+        legacy_dir = tmp_path / "snapshots"
+        legacy_dir.mkdir()
+        (legacy_dir / "ETH_USDT.json").write_text(json.dumps({"symbol": "ETH/USDT", "phase": "POSITION"}))
+
+        manager = SnapshotManager(legacy_dir, store=store)
+        assert manager.load_snapshot("ETH/USDT")["phase"] == "POSITION"
+
+        state = CoinState(symbol="BTC/USDT")
+        state.phase = Phase.POSITION
+        state.amount = 0.5
+        assert manager.save_snapshot("BTC/USDT", state)
+        store.commit(wait=True)
+
+        restored = CoinState(symbol="BTC/USDT")
+        assert SnapshotManager(legacy_dir, store=store).restore_state("BTC/USDT", restored)
+        assert (restored.phase, restored.amount) == (Phase.POSITION, 0.5)
+        assert manager.delete_snapshot("ETH/USDT")
+        assert {s["symbol"] for s in manager.list_all_snapshots()} == {"BTC/USDT"}
+
+    def test_state_writer_and_coid(self, store, tmp_path):
+        writer = DebouncedStateWriter(str(tmp_path / "engine_transient_state.json"), auto_start=False, store=store)
+        writer.update({"intent-1": {"symbol": "BTC/USDT"}})
+        writer.flush()
+        assert store.load("engine_transient_state") == {"intent-1": {"symbol": "BTC/USDT"}}
+
+        coids = COIDManager(str(tmp_path / "coid_kv.json"), state_store=store)
+        coid = coids.next_client_order_id("d1", 0, "buy", "BTC/USDT")
+        assert store.get("coid", coid)["status"] == COIDStatus.PENDING.value
+        coids.update_status(coid, COIDStatus.FILLED, order_id="42")
+        assert COIDManager(str(tmp_path / "coid_kv.json"), state_store=store).get_entry(coid).order_id == "42"
+
+    def test_rolling_windows(self, store, tmp_path):
+        manager = RollingWindowManager(3600, persist=True, base_path=str(tmp_path / "windows"), store=store)
+        now = manager.clock.time()
+        manager.update("BTC/USDT", now, 100.0)
+        manager.update("BTC/USDT", now, 90.0)
+        manager.persist_all()
+        store.commit(wait=True)
+
+        restored = RollingWindowManager(3600, persist=True, base_path=str(tmp_path / "windows"), store=store)
+        restored.load("BTC/USDT")
+        assert restored.view("BTC/USDT") == {"peak": 100.0, "trough": 90.0}
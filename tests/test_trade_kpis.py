@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for incremental trade KPIs (journal aggregates, rollups)
+
+Tests that the incremental aggregates match a full recomputation, that
+range merges keep streaks exact and that a journal tail written outside
+append_trade is picked up.
+"""
+
+import json
+import random
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.journal import TradeJournal
+from services.rollup import DailyRollup
+from services.trade_kpis import KpiAccumulator
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+def make_trade(pnl, symbol="BTC/USDT", reason="target_reached"):
+    return {"symbol": symbol, "realized_pnl": pnl, "fees_paid": 0.1, "realized_pnl_pct": pnl,
+            "duration_m": 5.0, "exit_reason": reason}
+
+
+def streaks(pnls):
+    best = {1: 0, -1: 0}
+    run_sign, run = 0, 0
+    for pnl in pnls:
+        sign = 1 if pnl > 0 else (-1 if pnl < 0 else 0)
+        run = run + 1 if sign and sign == run_sign else 1
+        run_sign = sign
+        if sign:
+            best[sign] = max(best[sign], run)
+    return best[1], best[-1]
+
+
+class TestKpiAccumulator:
+    def test_matches_reference_kpis(self):
+        trades = [make_trade(5.0), make_trade(-2.0, "ETH/USDT", "stop"), make_trade(0.0), make_trade(5.0)]
+        kpis = KpiAccumulator.from_trades(trades).kpis()
+
+        assert kpis["total_trades"] == 4
+        assert (kpis["wins"], kpis["losses"], kpis["breakeven"]) == (2, 1, 1)
+        assert kpis["net_pnl"] == pytest.approx(8.0 - 0.4)
+        assert kpis["best_trade"]["pnl"] == 5.0
+        assert kpis["worst_trade"]["symbol"] == "ETH/USDT"
+        assert kpis["exit_reasons"]["stop"] == {"count": 1, "total_pnl": -2.0, "wins": 0, "losses": 1}
+        assert kpis["symbols"]["BTC/USDT"]["count"] == 3
+        assert kpis["current_streak"] == 1
+
+    def test_merge_keeps_streaks_exact(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            pnls = [rng.choice([-1.0, 0.0, 1.0, 1.0]) for _ in range(rng.randint(1, 30))]
+            merged = KpiAccumulator()
+            cuts = sorted(rng.sample(range(len(pnls) + 1), min(3, len(pnls) + 1)))
+            bounds = [0] + cuts + [len(pnls)]
+            for lo, hi in zip(bounds, bounds[1:]):
+                merged.merge(KpiAccumulator.from_trades(make_trade(p) for p in pnls[lo:hi]))
+
+            whole = KpiAccumulator.from_trades(make_trade(p) for p in pnls)
+            assert (merged.max_win_streak, merged.max_loss_streak) == streaks(pnls)
+            assert merged.kpis() == whole.kpis()
+
+    def test_serialization_round_trip(self):
+        acc = KpiAccumulator.from_trades([make_trade(1.0), make_trade(-1.0)])
+        restored = KpiAccumulator.from_dict(json.loads(json.dumps(acc.to_dict())))
+        assert restored.kpis() == acc.kpis()
+
+
+class TestJournalAggregates:
+    def test_append_maintains_day_aggregates(self, temp_dir):
+        journal = TradeJournal(str(temp_dir))
+        for pnl in (2.0, -1.0, 3.0):
+            journal.append_trade("BTC/USDT", 100.0, 0.0, 100.0 + pnl, 60.0, 1.0, pnl, 0.1, "target_reached")
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        trades = journal.read_day(today)
+        stats = journal.get_stats(today)
+        assert stats["total_trades"] == 3
+        assert stats["total_pnl"] == pytest.approx(sum(t["realized_pnl"] for t in trades))
+        assert journal.day_kpis(today).kpis() == KpiAccumulator.from_trades(trades).kpis()
+        assert (temp_dir / f"kpis_{today}.json").exists()
+
+    def test_external_tail_and_torn_line(self, temp_dir):
+        journal = TradeJournal(str(temp_dir))
+        journal.append_trade("BTC/USDT", 100.0, 0.0, 101.0, 60.0, 1.0, 1.0, 0.1, "target_reached")
+        today = datetime.now().strftime("%Y-%m-%d")
+        with open(temp_dir / f"trades_{today}.jsonl", "a") as f:
+            f.write(json.dumps(make_trade(-4.0)) + "\n")
+            f.write('{"symbol": "ETH/US')
+
+        # Fresh instance: persisted aggregates + tail, torn line ignored
+        assert TradeJournal(str(temp_dir)).day_kpis(today).count == 2
+
+
+class TestRollupRanges:
+    def test_range_merges_days(self, temp_dir):
+        journal = TradeJournal(str(temp_dir / "journal"))
+        for day, pnls in (("2025-01-01", [1.0, 1.0]), ("2025-01-03", [1.0, -2.0])):
+            with open(Path(journal.journal_dir) / f"trades_{day}.jsonl", "w") as f:
+                for pnl in pnls:
+                    f.write(json.dumps(make_trade(pnl)) + "\n")
+
+        rollup = DailyRollup(str(temp_dir / "rollups"))
+        rollup.journal = journal
+        kpis = rollup.compute_range_kpis("2025-01-01", "2025-01-31")
+
+        assert kpis["days_with_trades"] == 2
+        assert kpis["total_trades"] == 4
+        assert kpis["max_win_streak"] == 3
+        assert kpis["total_pnl"] == pytest.approx(1.0)
+        assert rollup.compute_daily_kpis("2025-01-03")["losses"] == 1
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for batched order reconciliation
+
+Tests:
+- One trade fetch per symbol for many orders
+- Per-order fallback when the trade page is full
+- Symbols with the newest orders are processed first
+- Fills of a symbol are applied oldest order first
+- A failing order rolls back the symbol's batch (portfolio transaction)
+- A failing per-order fetch marks only that order as fetch_failed
+- FSMReconciler checks pending orders with one fetch_orders per symbol
+- Startup COID reconciliation applies missed fills through the batch path
+"""
+
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+import core.coid as coid_module
+from core.coid import COIDManager, COIDStatus
+from core.fsm.reconciler import FSMReconciler
+from core.startup_reconcile import reconcile_pending_coids
+from services.reconciler import BatchReconciler, ReconcileRequest
+
+
+class FakeExchange:
+    def __init__(self, trades):
+        self.trades = trades
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch_my_trades(self, symbol, since=None, limit=None):
+        with self._lock:
+            self.calls.append(("fetch_my_trades", symbol))
+        return [t for t in self.trades if t["symbol"] == symbol][:limit]
+
+    def fetch_order_trades(self, symbol, order_id):
+        with self._lock:
+            self.calls.append(("fetch_order_trades", symbol, order_id))
+        return [t for t in self.trades if t["order"] == order_id]
+
+
+class FakePortfolio:
+    def __init__(self):
+        self.applied = []
+
+    def apply_fills(self, symbol, trades):
+        self.applied.append((symbol, trades[0]["order"]))
+        return {"qty_delta": sum(t["amount"] for t in trades)}
+
+
+class FakeTelemetry:
+    def __init__(self):
+        self.events = []
+
+    def write(self, stream, payload):
+        self.events.append(payload)
+
+
+def trade(symbol, order_id, amount=1.0):
+    return {"symbol": symbol, "order": order_id, "amount": amount, "price": 1.0, "side": "buy"}
+
+
+@pytest.fixture
+def parts():
+    exchange = FakeExchange([
+        trade("BTC/USDT", "b1"), trade("BTC/USDT", "b2", 2.0), trade("BTC/USDT", "b2", 3.0),
+        trade("ETH/USDT", "e1"),
+    ])
+    return exchange, FakePortfolio(), FakeTelemetry()
+
+
+class TestBatchReconciler:
+    def test_one_fetch_per_symbol(self, parts):
+        exchange, portfolio, telemetry = parts
+        rec = BatchReconciler(exchange, portfolio, telemetry, max_workers=2, trade_limit=100)
+        results = rec.reconcile_orders([
+            ReconcileRequest("BTC/USDT", "b1", 100.0),
+            ReconcileRequest("BTC/USDT", "b2", 101.0),
+            ReconcileRequest("BTC/USDT", "b3", 102.0),  # not filled yet
+            ReconcileRequest("ETH/USDT", "e1", 100.0),
+        ])
+        rec.shutdown()
+
+        assert sorted(c[1] for c in exchange.calls) == ["BTC/USDT", "ETH/USDT"]
+        assert all(c[0] == "fetch_my_trades" for c in exchange.calls)
+        assert results["b2"] == {"qty_delta": 5.0}
+        assert results["b3"] is None
+        assert rec.get_stats()["applied"] == 3
+
+    def test_full_page_falls_back_per_order(self, parts):
+        exchange, portfolio, telemetry = parts
+        rec = BatchReconciler(exchange, portfolio, telemetry, max_workers=1, trade_limit=2)
+        results = rec.reconcile_orders([ReconcileRequest("BTC/USDT", "b2", 100.0)])
+        rec.shutdown()
+
+        assert ("fetch_order_trades", "BTC/USDT", "b2") in exchange.calls
+        assert results["b2"] == {"qty_delta": 5.0}
+
+    def test_newest_symbol_first_and_oldest_order_first(self, parts):
+        exchange, portfolio, telemetry = parts
+        rec = BatchReconciler(exchange, portfolio, telemetry, max_workers=1, trade_limit=100)
+        rec.reconcile_orders([
+            ReconcileRequest("BTC/USDT", "b2", 50.0),
+            ReconcileRequest("BTC/USDT", "b1", 10.0),
+            ReconcileRequest("ETH/USDT", "e1", 200.0),
+        ])
+        rec.shutdown()
+
+        assert [c[1] for c in exchange.calls] == ["ETH/USDT", "BTC/USDT"]
+        assert portfolio.applied == [("ETH/USDT", "e1"), ("BTC/USDT", "b1"), ("BTC/USDT", "b2")]
+
+    def test_failing_order_rolls_back_symbol_batch(self, parts):
+        class TransactionalPortfolio(FakePortfolio):
+            def __init__(self):
+                super().__init__()
+                self.rolled_back = []
+
+            @contextmanager
+            def transaction(self):
+                start = len(self.applied)
+                try:
+                    yield
+                except Exception:
+                    self.rolled_back.extend(self.applied[start:])
+                    del self.applied[start:]
+                    raise
+
+            def apply_fills(self, symbol, trades):
+                if trades[0]["order"] == "b2":
+                    raise ValueError("bad fill")
+                return super().apply_fills(symbol, trades)
+
+        exchange, _, telemetry = parts
+        portfolio = TransactionalPortfolio()
+        rec = BatchReconciler(exchange, portfolio, telemetry, max_workers=1, trade_limit=100)
+        results = rec.reconcile_orders([
+            ReconcileRequest("BTC/USDT", "b1", 10.0),
+            ReconcileRequest("BTC/USDT", "b2", 20.0),
+            ReconcileRequest("ETH/USDT", "e1", 30.0),
+        ])
+        rec.shutdown()
+
+        assert results == {"b1": None, "b2": None, "e1": {"qty_delta": 1.0}}
+        assert portfolio.rolled_back == [("BTC/USDT", "b1")]
+        assert portfolio.applied == [("ETH/USDT", "e1")]
+        assert rec.get_stats()["errors"] == 2
+
+    def test_failing_order_fetch_is_isolated(self, parts):
+        exchange, portfolio, telemetry = parts
+        fetch_order_trades = exchange.fetch_order_trades
+
+        def flaky(symbol, order_id):
+            if order_id == "b1":
+                raise ConnectionError("timeout")
+            return fetch_order_trades(symbol, order_id)
+
+        exchange.fetch_order_trades = flaky
+        rec = BatchReconciler(exchange, portfolio, telemetry, max_workers=1, trade_limit=1)
+        results = rec.reconcile_orders([
+            ReconcileRequest("BTC/USDT", "b1", 10.0),
+            ReconcileRequest("BTC/USDT", "b2", 20.0),
+        ])
+        rec.shutdown()
+
+        assert results == {"b1": None, "b2": {"qty_delta": 5.0}}
+        assert [(e["order_id"], e["event"]) for e in telemetry.events] == [("b1", "fetch_failed"), ("b2", "applied")]
+        assert rec.get_stats()["fetch_failed"] == 1
+
+
+class TestFSMReconcilerBatch:
+    def test_pending_orders_fetched_per_symbol(self):
+        class Adapter:
+            def __init__(self):
+                self.calls = []
+
+            def fetch_orders(self, symbol=None, since=None, limit=100):
+                self.calls.append(("fetch_orders", symbol))
+                return [{"id": "b1", "status": "closed", "filled": 1.0}]
+
+            def fetch_order(self, order_id, symbol):
+                self.calls.append(("fetch_order", order_id))
+                return None
+
+        adapter = Adapter()
+        reconciler = FSMReconciler(adapter, max_workers=2)
+        states = {
+            "BTC/USDT": SimpleNamespace(amount=0.0, order_id="b1", order_placed_ts=100.0),
+            "ETH/USDT": SimpleNamespace(amount=0.0, order_id="e1", order_placed_ts=90.0),
+        }
+        report = reconciler.sync(states)
+        reconciler.shutdown()
+
+        assert ("fetch_orders", "BTC/USDT") in adapter.calls
+        assert ("fetch_order", "e1") in adapter.calls
+        assert report.missing_fills == 1
+        assert report.orphaned_orders == 1
+
+    def test_failed_fetch_is_not_an_orphan(self):
+        class Adapter:
+            def fetch_orders(self, symbol=None, since=None, limit=100):
+                raise ConnectionError("timeout")
+
+            def fetch_order(self, order_id, symbol):
+                raise ConnectionError("timeout")
+
+        reconciler = FSMReconciler(Adapter(), max_workers=1)
+        report = reconciler.sync({"BTC/USDT": SimpleNamespace(amount=0.0, order_id="b1", order_placed_ts=100.0)})
+        reconciler.shutdown()
+
+        assert report.orphaned_orders == 0
+        assert report.desyncs_found == 0
+
+
+class TestStartupReconcile:
+    def test_missed_fills_applied_in_batch(self, parts, tmp_path, monkeypatch):
+        exchange, portfolio, telemetry = parts
+        statuses = {"b1": "closed", "b2": "open", "e1": "closed"}
+        exchange.fetch_order = lambda order_id, symbol: {"id": order_id, "status": statuses[order_id]}
+
+        manager = COIDManager(str(tmp_path / "coid_kv.json"))
+        for i, (symbol, order_id) in enumerate([("BTC/USDT", "b1"), ("BTC/USDT", "b2"), ("ETH/USDT", "e1")]):
+            coid = manager.next_client_order_id(f"d{i}", 0, "buy", symbol)
+            manager.update_status(coid, COIDStatus.PENDING, order_id=order_id)
+        monkeypatch.setattr(coid_module, "get_coid_manager", lambda: manager)
+
+        result = reconcile_pending_coids(exchange, portfolio=portfolio, telemetry=telemetry)
+
+        assert result["reconciled_count"] == 3 and result["pending_count"] == 1
+        assert result["fills_applied"] == 2
+        assert sorted(portfolio.applied) == [("BTC/USDT", "b1"), ("ETH/USDT", "e1")]
+        assert sum(1 for call in exchange.calls if call[0] == "fetch_my_trades") == 2
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for incrementally maintained exposure aggregates
+
+Tests:
+- Aggregates follow reserve/commit/release, held assets and open buys
+- Total exposure only covers held symbols (RiskLimitChecker scope)
+- Self-check detects and repairs drift from direct dict mutation
+- Settlement sync updates amounts through the portfolio
+- check_limits uses the aggregates
+"""
+
+import sys
+import types
+
+import pytest
+
+import core.portfolio.portfolio as portfolio_module
+from core.portfolio.portfolio import PortfolioManager
+from core.risk_limits import RiskLimitChecker
+from core.utils import SettlementManager
+from trading.settlement import sync_active_order_and_state
+
+
+@pytest.fixture
+def portfolio(tmp_path, monkeypatch):
+    """Portfolio without exchange, state files in tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(portfolio_module, "STATE_FILE_HELD", str(tmp_path / "held_assets.json"))
+    monkeypatch.setattr(portfolio_module, "STATE_FILE_OPEN_BUYS", str(tmp_path / "open_buy_orders.json"))
+    monkeypatch.setattr(portfolio_module, "DROP_ANCHORS_FILE", str(tmp_path / "drop_anchors.json"))
+    pm = PortfolioManager(None, SettlementManager(None), None)
+    pm.my_budget = 1000.0
+    return pm
+
+
+def full_scan_total(pm):
+    return sum(pm._compute_symbol_exposure(s) for s in pm.held_assets)
+
+
+class TestExposureAggregates:
+    def test_reservation_lifecycle(self, portfolio):
+        portfolio.reserve_budget(100.0, symbol="BTC/USDT")
+        assert portfolio.get_symbol_exposure_usdt("BTC/USDT") == pytest.approx(100.0)
+        # Not held yet: not part of the total
+        assert portfolio.get_total_exposure_usdt() == 0.0
+
+        portfolio.commit_budget(60.0, symbol="BTC/USDT")
+        portfolio.add_held_asset("BTC/USDT", {"amount": 0.001, "buy_price": 60000.0})
+        assert portfolio.get_symbol_exposure_usdt("BTC/USDT") == pytest.approx(100.0)
+        assert portfolio.get_total_exposure_usdt() == pytest.approx(100.0)
+
+        portfolio.release_budget(40.0, symbol="BTC/USDT")
+        assert portfolio.get_total_exposure_usdt() == pytest.approx(60.0)
+
+        portfolio.remove_held_asset("BTC/USDT")
+        assert portfolio.get_symbol_exposure_usdt("BTC/USDT") == 0.0
+        assert portfolio.get_total_exposure_usdt() == pytest.approx(0.0)
+
+    def test_open_buys_and_fills_match_full_scan(self, portfolio):
+        portfolio.add_held_asset("ETH/USDT", {"amount": 0.1, "buy_price": 3000.0})
+        portfolio.add_buy_order("ETH/USDT", {"quote": 50.0})
+        portfolio.reserve_budget(30.0, symbol="ETH/USDT")
+        portfolio.apply_fills("ETH/USDT", [
+            {"side": "buy", "amount": 0.01, "price": 3000.0, "fee": {"cost": 0.03, "currency": "USDT"}},
+        ])
+        portfolio.remove_buy_order("ETH/USDT")
+
+        assert portfolio.get_total_exposure_usdt() == pytest.approx(full_scan_total(portfolio))
+        assert portfolio.verify_exposure_aggregates() is True
+
+    def test_self_check_repairs_direct_mutation(self, portfolio):
+        portfolio.add_held_asset("SOL/USDT", {"amount": 1.0, "buy_price": 100.0})
+        portfolio.held_assets["SOL/USDT"]["amount"] = 0.0  # legacy helpers write dicts directly
+
+        assert portfolio.verify_exposure_aggregates() is False
+        assert portfolio.get_total_exposure_usdt() == pytest.approx(0.0)
+        assert portfolio.verify_exposure_aggregates() is True
+
+    def test_settlement_sync_keeps_aggregates(self, portfolio, monkeypatch):
+        class Exchange:
+            def fetch_order(self, order_id, symbol):
+                return {"status": "closed", "filled": 2.0, "average": 110.0, "remaining": 0.0}
+
+        # Trade history writer of the legacy trading package
+        monkeypatch.setitem(sys.modules, "utils", types.SimpleNamespace(save_trade_history=lambda trade: None))
+        portfolio.add_held_asset("SOL/USDT", {"amount": 2.0, "buy_price": 100.0, "active_order_id": "o1"})
+
+        # Legacy callers pass only the dict; writes still go through its owning portfolio
+        status, _ = sync_active_order_and_state(Exchange(), "SOL/USDT", portfolio.held_assets, 0, None)
+
+        assert status == "filled"
+        assert portfolio.held_assets["SOL/USDT"]["amount"] == 0.0
+        assert portfolio.get_total_exposure_usdt() == pytest.approx(0.0)
+        assert portfolio.verify_exposure_aggregates() is True
+
+
+class TestRiskLimitsUseAggregates:
+    def test_check_limits_matches_full_scan(self, portfolio):
+        for i in range(5):
+            portfolio.add_held_asset(f"S{i}/USDT", {"amount": 1.0, "buy_price": 20.0})
+        cfg = types.SimpleNamespace(MAX_PORTFOLIO_EXPOSURE_PCT=0.8, MAX_SYMBOL_EXPOSURE_PCT=0.3,
+                                    RISK_EXPOSURE_SELF_CHECK=True)
+
+        _, checks = RiskLimitChecker(portfolio, cfg).check_limits("S0/USDT", 50.0)
+        by_limit = {c["limit"]: c for c in checks}
+
+        assert by_limit["max_exposure"]["value"] == pytest.approx(150.0 / 1150.0)
+        assert by_limit["max_symbol_exposure"]["value"] == pytest.approx(70.0 / 1100.0)
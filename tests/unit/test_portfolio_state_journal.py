@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the portfolio state journal
+
+Tests:
+- Only changed / removed keys are journaled
+- Dirty keys are compared without re-encoding the rest of the section
+- Crash recovery replays the journal tail over the snapshots
+- Records for a snapshot replaced after the journal header are skipped
+- A torn last line does not break recovery
+- PortfolioManager.save_state persists through the journal
+"""
+
+import json
+
+import pytest
+
+import core.portfolio.portfolio as portfolio_module
+import core.portfolio.state_journal as state_journal
+from core.portfolio.portfolio import PortfolioManager
+from core.portfolio.state_journal import PortfolioStateJournal
+from core.utils import SettlementManager
+
+
+@pytest.fixture
+def files(tmp_path):
+    return {
+        "held": str(tmp_path / "held_assets.json"),
+        "open_buys": str(tmp_path / "open_buy_orders.json"),
+        "anchors": str(tmp_path / "drop_anchors.json"),
+    }
+
+
+def make_journal(tmp_path, files, **kwargs):
+    kwargs.setdefault("interval_s", 60.0)  # writes only on explicit flush
+    return PortfolioStateJournal(files, str(tmp_path / "portfolio_state.journal"), **kwargs)
+
+
+def journal_records(tmp_path):
+    with open(tmp_path / "portfolio_state.journal", encoding="utf-8") as f:
+        return [json.loads(line) for line in f][1:]
+
+
+class TestPortfolioStateJournal:
+    def test_only_changed_keys_are_journaled(self, tmp_path, files):
+        journal = make_journal(tmp_path, files)
+        journal.load()
+        held = {"BTC/USDT": {"amount": 0.1}, "ETH/USDT": {"amount": 1.0}}
+        assert journal.stage("held", held) == 2
+        journal.flush()
+
+        held["ETH/USDT"]["amount"] = 2.0
+        assert journal.stage("held", held) == 1
+        del held["BTC/USDT"]
+        assert journal.stage("held", held) == 1
+        assert journal.stage("held", held) == 0
+        journal.flush()
+
+        records = journal_records(tmp_path)
+        assert records[-1] == {"s": "held", "k": "BTC/USDT", "d": 1}
+        assert records[-2] == {"s": "held", "k": "ETH/USDT", "v": {"amount": 2.0}}
+        assert len(records) == 4
+        journal.close()
+
+        with open(files["held"], encoding="utf-8") as f:
+            assert json.load(f) == {"ETH/USDT": {"amount": 2.0}}
+        assert journal_records(tmp_path) == []
+
+    def test_dirty_keys_only(self, tmp_path, files, monkeypatch):
+        journal = make_journal(tmp_path, files)
+        journal.load()
+        held = {f"S{i}/USDT": {"amount": float(i)} for i in range(100)}
+        journal.stage("held", held)
+
+        encoded = []
+        encode = state_journal._encode
+        monkeypatch.setattr(state_journal, "_encode", lambda value: encoded.append(value) or encode(value))
+        held["S1/USDT"]["amount"] = 10.0
+        held["S2/USDT"]["amount"] = 20.0  # not marked: picked up by the next full diff
+        del held["S3/USDT"]
+        assert journal.stage("held", held, keys={"S1/USDT", "S3/USDT", "S4/USDT"}) == 2
+        assert len(encoded) == 2
+        assert journal.stage("held", held) == 1
+        journal.close()
+
+    def test_crash_recovery_replays_tail(self, tmp_path, files):
+        journal = make_journal(tmp_path, files)
+        journal.load()
+        journal.stage("held", {"BTC/USDT": {"amount": 0.1}})
+        journal.stage("anchors", {"BTC/USDT": {"price": 100.0}})
+        journal.flush()
+        # No close(): snapshots still empty, state lives in the journal only
+
+        recovered = make_journal(tmp_path, files).load()
+        assert recovered["held"] == {"BTC/USDT": {"amount": 0.1}}
+        assert recovered["anchors"] == {"BTC/USDT": {"price": 100.0}}
+        assert recovered["open_buys"] == {}
+
+    def test_replaced_snapshot_is_not_overwritten(self, tmp_path, files):
+        journal = make_journal(tmp_path, files)
+        journal.load()
+        journal.stage("anchors", {"BTC/USDT": {"price": 100.0}})
+        journal.flush()
+
+        # e.g. clear_anchors.py while the bot was down
+        with open(files["anchors"], "w", encoding="utf-8") as f:
+            f.write("{}\n")
+
+        recovered = make_journal(tmp_path, files).load()
+        assert recovered["anchors"] == {}
+
+    def test_torn_last_line_is_ignored(self, tmp_path, files):
+        journal = make_journal(tmp_path, files)
+        journal.load()
+        journal.stage("held", {"BTC/USDT": {"amount": 0.1}})
+        journal.flush()
+        with open(tmp_path / "portfolio_state.journal", "a", encoding="utf-8") as f:
+            f.write('{"s":"held","k":"ETH/USDT","v":{"amo')
+
+        recovered = make_journal(tmp_path, files).load()
+        assert recovered["held"] == {"BTC/USDT": {"amount": 0.1}}
+
+    def test_background_writer_coalesces_bursts(self, tmp_path, files):
+        journal = make_journal(tmp_path, files, interval_s=0.05)
+        journal.load()
+        held = {"BTC/USDT": {"amount": 0.0}}
+        for i in range(100):
+            held["BTC/USDT"]["amount"] = float(i)
+            journal.stage("held", held)
+        journal.close()
+
+        stats = journal.get_stats()
+        assert stats["staged_keys"] == 100
+        assert stats["records"] <= 1
+        with open(files["held"], encoding="utf-8") as f:
+            assert json.load(f) == {"BTC/USDT": {"amount": 99.0}}
+
+
+class TestPortfolioManagerPersistence:
+    @pytest.fixture
+    def make_portfolio(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(portfolio_module, "STATE_FILE_HELD", str(tmp_path / "held_assets.json"))
+        monkeypatch.setattr(portfolio_module, "STATE_FILE_OPEN_BUYS", str(tmp_path / "open_buy_orders.json"))
+        monkeypatch.setattr(portfolio_module, "DROP_ANCHORS_FILE", str(tmp_path / "drop_anchors.json"))
+        return lambda: PortfolioManager(None, SettlementManager(None), None)
+
+    def test_state_survives_restart(self, make_portfolio, tmp_path):
+        pm = make_portfolio()
+        pm.add_held_asset("BTC/USDT", {"amount": 0.001, "buy_price": 60000.0})
+        pm.save_open_buy_order("ETH/USDT", {"order_id": "1", "quote": 50.0})
+        pm.set_drop_anchor("BTC/USDT", 61000.0, "2025-10-01T00:00:00+00:00")
+        pm.close_state()
+
+        with open(tmp_path / "held_assets.json", encoding="utf-8") as f:
+            assert "BTC/USDT" in json.load(f)
+
+        restarted = make_portfolio()
+        assert restarted.held_assets["BTC/USDT"]["amount"] == 0.001
+        assert restarted.open_buy_orders["ETH/USDT"]["order_id"] == "1"
+        assert restarted.drop_anchors["BTC/USDT"]["price"] == 61000.0
+        restarted.close_state()
+
+    def test_mutators_stage_only_their_keys(self, make_portfolio):
+        pm = make_portfolio()
+        for i in range(20):
+            pm.add_held_asset(f"S{i}/USDT", {"amount": 1.0, "buy_price": 10.0})
+
+        staged = []
+        stage = pm._state_journal.stage
+        pm._state_journal.stage = lambda section, entries, keys=None: staged.append((section, keys)) or stage(
+            section, entries, keys=keys)
+        pm.update_held_asset("S3/USDT", {"amount": 2.0})
+        assert ("held", {"S3/USDT", "__dust_ledger__", "__last_buy_time__"}) in staged
+
+        staged.clear()
+        pm.held_assets["S4/USDT"]["amount"] = 5.0  # legacy in-place mutation
+        pm.save_state()
+        assert ("held", None) in staged
+        pm.close_state()
+
+        restarted = make_portfolio()
+        assert restarted.held_assets["S3/USDT"]["amount"] == 2.0
+        assert restarted.held_assets["S4/USDT"]["amount"] == 5.0
+        restarted.close_state()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for portfolio batch transactions
+
+Tests:
+- Fills of several symbols applied in one transaction
+- Persistence, ledger writes and events deferred to commit (once)
+- Rollback restores positions, held assets, reservations and budget
+"""
+
+import threading
+
+import pytest
+
+import core.portfolio.portfolio as portfolio_module
+from core.portfolio.portfolio import PortfolioManager
+from core.utils import SettlementManager
+
+
+@pytest.fixture
+def portfolio(tmp_path, monkeypatch):
+    """Portfolio without exchange, state files in tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(portfolio_module, "STATE_FILE_HELD", str(tmp_path / "held_assets.json"))
+    monkeypatch.setattr(portfolio_module, "STATE_FILE_OPEN_BUYS", str(tmp_path / "open_buy_orders.json"))
+    monkeypatch.setattr(portfolio_module, "DROP_ANCHORS_FILE", str(tmp_path / "drop_anchors.json"))
+    pm = PortfolioManager(None, SettlementManager(None), None)
+    pm.my_budget = 1000.0
+    yield pm
+    pm.close_state()
+
+
+def buy(amount, price):
+    return {"amount": amount, "price": price, "side": "buy", "fee": {"cost": 0.1, "currency": "USDT"}}
+
+
+class TestPortfolioTransaction:
+    def test_batch_defers_side_effects_to_commit(self, portfolio, monkeypatch):
+        ledger, staged = [], []
+        monkeypatch.setattr(portfolio_module, "log_event", lambda event, **kw: ledger.append(event))
+        stage = portfolio._state_journal.stage
+        monkeypatch.setattr(portfolio._state_journal, "stage",
+                            lambda section, data, keys=None: (staged.append(section), stage(section, data, keys)))
+        portfolio.reserve_budget(100.0, symbol="BTC/USDT")
+        ledger.clear()
+
+        with portfolio.transaction():
+            portfolio.apply_fills("BTC/USDT", [buy(0.001, 50000.0), buy(0.001, 51000.0)])
+            portfolio.apply_fills("ETH/USDT", [buy(0.01, 3000.0)])
+            assert portfolio.events == [] and ledger == [] and staged == []
+
+        assert portfolio.positions["BTC/USDT"].qty == pytest.approx(0.002)
+        assert portfolio.valuation().position("ETH/USDT")["qty"] == pytest.approx(0.01)
+        assert [ev["symbol"] for ev in portfolio.events] == ["BTC/USDT", "ETH/USDT"]
+        assert "BUDGET_COMMITTED" in ledger
+        assert staged.count("held") == 1
+        assert portfolio.verify_exposure_aggregates()
+
+    def test_error_rolls_back_whole_batch(self, portfolio):
+        portfolio.apply_fills("BTC/USDT", [buy(0.001, 50000.0)])
+        portfolio.reserve_budget(50.0, symbol="ETH/USDT")
+        btc = portfolio.positions["BTC/USDT"]
+        before = (btc.qty, btc.avg_price, dict(portfolio.held_assets), portfolio.my_budget,
+                  portfolio.reserved_budget, dict(portfolio.reserved_quote), len(portfolio.events))
+
+        with pytest.raises(ValueError):
+            portfolio.apply_fills_batch({
+                "BTC/USDT": [buy(0.002, 52000.0)],
+                "ETH/USDT": [buy(0.01, 3000.0)],
+                "SOL/USDT": [{"amount": "bad", "price": 100.0, "side": "buy"}],
+            })
+
+        assert portfolio.positions["BTC/USDT"] is btc
+        assert (btc.qty, btc.avg_price, dict(portfolio.held_assets), portfolio.my_budget,
+                portfolio.reserved_budget, dict(portfolio.reserved_quote), len(portfolio.events)) == before
+        assert "ETH/USDT" not in portfolio.positions and "SOL/USDT" not in portfolio.positions
+        assert portfolio.valuation().position("ETH/USDT") is None
+        assert portfolio.valuation().position("BTC/USDT")["qty"] == pytest.approx(0.001)
+        assert portfolio.verify_exposure_aggregates()
+
+    def test_nested_transaction_joins_outer(self, portfolio):
+        with portfolio.transaction() as outer:
+            with portfolio.transaction() as inner:
+                portfolio.apply_fills("BTC/USDT", [buy(0.001, 50000.0)])
+            assert inner is outer
+            assert portfolio.events == []
+        assert len(portfolio.events) == 1
+
+    def test_outside_transaction_errors_are_swallowed(self, portfolio):
+        assert portfolio.apply_fills("BTC/USDT", [{"amount": "bad", "price": 1.0}]) == {}
+
+    def test_concurrent_reservation_survives_rollback(self, portfolio):
+        started = threading.Event()
+
+        def reserve():
+            started.set()
+            portfolio.reserve_budget(50.0, symbol="ETH/USDT")
+
+        worker = threading.Thread(target=reserve)
+        with pytest.raises(ValueError):
+            with portfolio.transaction():
+                portfolio.apply_fills("BTC/USDT", [buy(0.001, 50000.0)])
+                worker.start()
+                started.wait(1.0)
+                worker.join(0.1)
+                # reserve_budget waits for the budget lock until the transaction ends
+                assert worker.is_alive()
+                raise ValueError("boom")
+        worker.join(1.0)
+
+        assert portfolio.reserved_budget == pytest.approx(50.0)
+        assert portfolio.reserved_quote["ETH/USDT"] == pytest.approx(50.0)
+        assert portfolio.get_free_usdt() == pytest.approx(950.0)
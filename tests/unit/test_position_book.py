@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit Tests for the array-backed PositionBook
+
+Tests:
+- Bulk marking revalues all positions in one published valuation
+- Unmarked positions are valued at avg price with zero unrealized PnL
+- Swap-remove keeps the remaining slots consistent
+- Published valuations are immutable snapshots
+"""
+
+import math
+
+import pytest
+
+from core.clock import SimulatedClock, use_clock
+from core.portfolio.position_book import PositionBook
+from services.portfolio_display import current_unrealized_pnl
+
+
+@pytest.fixture
+def book():
+    book = PositionBook(capacity=2)
+    book.set_position("BTC/USDT", 0.01, 60000.0)
+    book.set_position("ETH/USDT", 1.0, 3000.0)
+    book.set_position("SOL/USDT", -10.0, 150.0)  # short
+    return book
+
+
+class TestPositionBook:
+    def test_bulk_mark_values_all_positions(self, book):
+        valuation = book.mark_prices(["BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT"],
+                                     [61000.0, 2900.0, 140.0, 0.5], cash=1000.0)
+
+        assert valuation.per_position() == pytest.approx(
+            {"BTC/USDT": 10.0, "ETH/USDT": -100.0, "SOL/USDT": 100.0})
+        assert valuation.unrealized_pnl == pytest.approx(10.0)
+        assert valuation.total_market_value == pytest.approx(610.0 + 2900.0 - 1400.0)
+        assert valuation.equity == pytest.approx(1000.0 + 2110.0)
+
+    def test_unmarked_position_uses_avg_price(self, book):
+        valuation = book.mark_prices(["BTC/USDT"], [61000.0])
+        eth = valuation.position("ETH/USDT")
+        assert eth["last"] is None
+        assert eth["upnl"] == 0.0
+        assert eth["value"] == pytest.approx(3000.0)
+
+    def test_price_of_unbooked_symbol_applies_on_open(self, book):
+        book.mark_prices(["XRP/USDT"], [0.5])
+        book.set_position("XRP/USDT", 100.0, 0.4)
+        assert book.valuation().position("XRP/USDT")["upnl"] == pytest.approx(10.0)
+
+    def test_remove_keeps_other_slots(self, book):
+        book.mark_prices(["BTC/USDT", "ETH/USDT", "SOL/USDT"], [61000.0, 2900.0, 140.0])
+        book.set_position("BTC/USDT", 0.0, 0.0)
+
+        valuation = book.valuation()
+        assert len(book) == 2
+        assert set(valuation.symbols) == {"ETH/USDT", "SOL/USDT"}
+        assert valuation.position("SOL/USDT")["upnl"] == pytest.approx(100.0)
+        assert valuation.position("BTC/USDT") is None
+
+    def test_valuation_is_a_stable_snapshot(self, book):
+        first = book.mark_prices(["BTC/USDT"], [61000.0])
+        second = book.mark_prices(["BTC/USDT"], [59000.0])
+
+        assert second.cycle == first.cycle + 1
+        assert first.position("BTC/USDT")["upnl"] == pytest.approx(10.0)
+        assert second.position("BTC/USDT")["upnl"] == pytest.approx(-10.0)
+        with pytest.raises(ValueError):
+            first.upnl[0] = 0.0
+
+    def test_mark_price_is_lazy(self, book):
+        before = book.valuation()
+        book.mark_price("BTC/USDT", 62000.0)
+        after = book.valuation()
+        assert after.cycle == before.cycle + 1
+        assert not math.isnan(after.position("BTC/USDT")["last"])
+
+    def test_valuation_timestamp_follows_clock(self, book):
+        with use_clock(SimulatedClock(start=1_700_000_000.0)):
+            assert book.mark_prices(["BTC/USDT"], [61000.0]).ts == 1_700_000_000.0
+
+
+class TestPortfolioMarking:
+    @pytest.fixture
+    def portfolio(self, tmp_path, monkeypatch):
+        import core.portfolio.portfolio as portfolio_module
+        from core.portfolio.portfolio import PortfolioManager
+        from core.utils import SettlementManager
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(portfolio_module, "STATE_FILE_HELD", str(tmp_path / "held_assets.json"))
+        monkeypatch.setattr(portfolio_module, "STATE_FILE_OPEN_BUYS", str(tmp_path / "open_buy_orders.json"))
+        monkeypatch.setattr(portfolio_module, "DROP_ANCHORS_FILE", str(tmp_path / "drop_anchors.json"))
+        pm = PortfolioManager(None, SettlementManager(None), None)
+        yield pm
+        pm.close_state()
+
+    def test_fills_and_bulk_marks_match_per_symbol_pnl(self, portfolio):
+        portfolio.apply_fills("BTC/USDT", [{"side": "buy", "amount": 0.01, "price": 60000.0,
+                                            "fee": {"cost": 0.6, "currency": "USDT"}}])
+        portfolio.apply_fills("ETH/USDT", [{"side": "buy", "amount": 1.0, "price": 3000.0,
+                                            "fee": {"cost": 3.0, "currency": "USDT"}}])
+
+        valuation = portfolio.mark_prices(["BTC/USDT", "ETH/USDT"], [61000.0, 2950.0])
+
+        for symbol in ("BTC/USDT", "ETH/USDT"):
+            assert valuation.per_position()[symbol] == pytest.approx(portfolio.unrealized_pnl(symbol))
+        assert valuation.unrealized_pnl == pytest.approx(10.0 - 50.0)
+        assert valuation.cash == portfolio.my_budget
+        assert portfolio.valuation() is valuation
+
+    def test_status_readers_use_valuation(self, portfolio):
+        assert current_unrealized_pnl(portfolio, {"unrealized": 7.0}) == 7.0  # empty book
+        portfolio.apply_fills("BTC/USDT", [{"side": "buy", "amount": 0.01, "price": 60000.0,
+                                            "fee": {"cost": 0.6, "currency": "USDT"}}])
+        portfolio.mark_prices(["BTC/USDT"], [61000.0])
+        assert current_unrealized_pnl(portfolio, {"unrealized": 7.0}) == pytest.approx(10.0)
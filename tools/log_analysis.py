@@ -8,6 +8,9 @@ Usage:
     python tools/log_analysis.py <intent_id>
     python tools/log_analysis.py --recent 10
     python tools/log_analysis.py --latency-report
+
+All lookups go through the incremental session log index (core/log_index.py),
+so repeated queries only parse lines appended since the previous run.
 """
 
 import json
@@ -17,6 +20,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import config
+from core.log_index import SessionLogIndex
 
 # Centralized path constants
 LOG_PATHS = {
@@ -79,6 +83,21 @@ def parse_jsonl_logs(log_dir: Path, pattern: str = "**/*.jsonl") -> List[Dict[st
     return events
 
 
+def open_log_index(log_dir: Path) -> SessionLogIndex:
+    """
+    Open and refresh the log index for a log directory.
+
+    Args:
+        log_dir: Directory to index
+
+    Returns:
+        Up-to-date SessionLogIndex
+    """
+    index = SessionLogIndex(log_dir)
+    index.refresh()
+    return index
+
+
 def trace_intent_flow(intent_id: str, log_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
     """
     Trace complete flow for a specific intent ID.
@@ -95,14 +114,8 @@ def trace_intent_flow(intent_id: str, log_dir: Optional[Path] = None) -> List[Di
 
     print(f"Searching for intent_id={intent_id} in {log_dir}")
 
-    # Parse all logs
-    all_events = parse_jsonl_logs(log_dir)
-
-    # Filter by intent_id
-    intent_events = [
-        event for event in all_events
-        if event.get("intent_id") == intent_id
-    ]
+    with open_log_index(log_dir) as index:
+        intent_events = list(index.query(intent_id=intent_id))
 
     # Sort by timestamp
     intent_events.sort(key=lambda e: e.get("timestamp", e.get("ts", 0)))
@@ -184,14 +197,12 @@ def list_recent_intents(count: int = 10, log_dir: Optional[Path] = None) -> List
     if log_dir is None:
         log_dir = get_latest_session_logs()
 
-    # Parse logs
-    all_events = parse_jsonl_logs(log_dir)
-
-    # Find order_intent events
-    intent_events = [
-        event for event in all_events
-        if event.get("event_type") == "order_intent" or event.get("event_name") == "order_intent"
-    ]
+    # Find order_intent events (newest first)
+    with open_log_index(log_dir) as index:
+        intent_events = [
+            event for event in index.query(event_type="order_intent", descending=True)
+            if event.get("event_type") == "order_intent" or event.get("event_name") == "order_intent"
+        ]
 
     # Sort by timestamp (newest first)
     intent_events.sort(key=lambda e: e.get("timestamp", e.get("ts", 0)), reverse=True)
@@ -245,14 +256,12 @@ def generate_latency_report(log_dir: Optional[Path] = None) -> Dict[str, Any]:
     if log_dir is None:
         log_dir = get_latest_session_logs()
 
-    # Parse logs
-    all_events = parse_jsonl_logs(log_dir)
-
     # Find INTENT_LATENCY events
-    latency_events = [
-        event for event in all_events
-        if event.get("event_type") == "INTENT_LATENCY"
-    ]
+    with open_log_index(log_dir) as index:
+        latency_events = [
+            event for event in index.query(event_type="INTENT_LATENCY")
+            if event.get("event_type") == "INTENT_LATENCY"
+        ]
 
     if not latency_events:
         return {"count": 0, "avg_latency_ms": 0.0, "p95_latency_ms": 0.0}
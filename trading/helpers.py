@@ -15,6 +15,7 @@ import re
 
 from config import DUST_FACTOR, min_order_buffer
 from core.utils import floor_to_step, get_symbol_limits
+from services import order_templates
 
 logger = logging.getLogger(__name__)
 
@@ -80,9 +81,9 @@ def base_currency(symbol: str) -> str:
 
 
 def amount_to_precision(exchange, symbol, amount):
-    """Konvertiert Amount zu Exchange-Präzision"""
+    """Konvertiert Amount zu Exchange-Präzision (Order-Template, sonst Exchange)"""
     try:
-        return float(exchange.amount_to_precision(symbol, amount))
+        return order_templates.amount_to_precision(exchange, symbol, amount)
     except Exception:
         try:
             return float(f"{amount:.8f}")
@@ -91,9 +92,9 @@ def amount_to_precision(exchange, symbol, amount):
 
 
 def price_to_precision(exchange, symbol, price):
-    """Konvertiert Preis zu Exchange-Präzision"""
+    """Konvertiert Preis zu Exchange-Präzision (Order-Template, sonst Exchange)"""
     try:
-        return float(exchange.price_to_precision(symbol, price))
+        return order_templates.price_to_precision(exchange, symbol, price)
     except Exception:
         try:
             return float(f"{price:.8f}")
@@ -843,6 +843,8 @@ def place_ioc_ladder_no_market(exchange, symbol, amount, reference_price,
     remaining = amount
     last_oid = None
     step_count = 0
+    # Min notional hängt nur vom Markt ab - einmal pro Ladder
+    min_cost = compute_min_cost(exchange, symbol)
 
     # 1) IOC-Stufen
     for bps in ioc_price_buffers_bps:
@@ -852,7 +854,6 @@ def place_ioc_ladder_no_market(exchange, symbol, amount, reference_price,
         px  = price_to_precision(exchange, symbol, bid * (1.0 - bps/10000.0))
 
         # Min notional check at this price level
-        min_cost = compute_min_cost(exchange, symbol)
         order_value = remaining * px
         if order_value < min_cost:
             logger.debug(f"IOC ladder skip step {bps}bp for {symbol}: order_value={order_value:.4f} < min_cost={min_cost:.4f}",
@@ -954,6 +955,7 @@ def place_limit_ioc_sell_ladder(exchange, symbol: str, qty: float, best_bid: flo
 
     result = {"filled": 0.0, "avg": None, "fee": 0.0, "orders": []}
     remaining = float(qty)
+    min_cost = compute_min_cost(exchange, symbol)
 
     for step, bps in enumerate(exit_ladder_bps, 1):
         # Preis berechnen
@@ -961,7 +963,6 @@ def place_limit_ioc_sell_ladder(exchange, symbol: str, qty: float, best_bid: flo
         limit = price_to_precision(exchange, symbol, limit)
 
         # Min notional check at this price level
-        min_cost = compute_min_cost(exchange, symbol)
         order_value = remaining * limit
         if order_value < min_cost:
             logger.debug(f"Exit ladder skip step {step} ({bps}bp) for {symbol}: order_value={order_value:.4f} < min_cost={min_cost:.4f}",
@@ -24,6 +24,17 @@ logger = logging.getLogger(__name__)
 _budget_cache = {"value": None, "timestamp": 0.0, "lock": threading.Lock()}
 
 
+def _set_held_amount(held_assets, symbol, amount):
+    """Set the held amount; through the owning portfolio so its exposure aggregates follow"""
+    from core.portfolio.portfolio import portfolio_owning
+
+    portfolio = portfolio_owning(held_assets)
+    if portfolio is not None:
+        portfolio.update_held_asset(symbol, {"amount": amount})
+    else:
+        held_assets[symbol]["amount"] = amount
+
+
 def sync_active_order_and_state(exchange, symbol, held_assets, my_budget, settlement_manager):
     """Update state from currently active order (TP/SL) to reflect partial/filled fills.
        Returns (status, order_dict) where status is one of None/'filled'/'partial'/'open'.
@@ -68,7 +79,7 @@ def sync_active_order_and_state(exchange, symbol, held_assets, my_budget, settle
             perf = None
         # Markiere Asset als vollständig verkauft
         try:
-            held_assets[symbol]["amount"] = 0.0
+            _set_held_amount(held_assets, symbol, 0.0)
         except Exception:
             pass
         logger.info(f"ORDER FILLED (sync) {symbol}: revenue={revenue:.6f} USDT",
@@ -104,7 +115,7 @@ def sync_active_order_and_state(exchange, symbol, held_assets, my_budget, settle
                          extra={"event_type":"BALANCE_DISCREPANCY","symbol":symbol,"expected":remaining,"actual":actual_balance})
             remaining = min(remaining, actual_balance)
 
-        held_assets[symbol]["amount"] = remaining
+        _set_held_amount(held_assets, symbol, remaining)
         logger.warning(f"PARTIAL FILL (sync) {symbol}: remaining={remaining}",
                       extra={"event_type":"PARTIAL_FILL_SYNC","symbol":symbol,"remaining_amount":remaining})
 
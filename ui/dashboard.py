@@ -12,8 +12,8 @@ Provides a comprehensive real-time dashboard with:
 Updates continuously without scrolling using Rich Live.
 """
 
-import glob
 import logging
+import os
 import time
 from collections import deque
 from datetime import datetime, timezone
@@ -36,12 +36,23 @@ try:
 except ImportError:
     RICH_AVAILABLE = False
 
+from ui.log_tailer import LogTailer
+from ui.view_model import DashboardViewModel
+
 logger = logging.getLogger(__name__)
 
 # Global state for debug display
 _show_debug = True  # Show debug footer by default
 _last_symbol = None  # Last snapshot symbol
 _last_price = None   # Last snapshot price
+_view_model = None   # Active DashboardViewModel (set by run_dashboard)
+
+
+def _notify_view_model(*panels: str):
+    """Mark dashboard panels dirty if a view model is active."""
+    vm = _view_model
+    if vm is not None:
+        vm.mark_dirty(*panels)
 
 
 class DashboardEventBus:
@@ -65,6 +76,9 @@ class DashboardEventBus:
             self.events.append(event)
             self.last_event = event
 
+        # Dashboard events are mostly order/position related
+        _notify_view_model("events", "portfolio")
+
         # Log dashboard events for correlation with backend actions
         try:
             import inspect
@@ -132,6 +146,8 @@ def emit_fsm_event(symbol: str, from_phase: str, to_phase: str, event: str):
             'event': event
         })
 
+    _notify_view_model("fsm", "portfolio")
+
 
 def get_recent_fsm_events(n: int = 5) -> List[Dict[str, str]]:
     """Get the N most recent FSM events."""
@@ -168,33 +184,30 @@ def update_snapshot_debug(symbol: str, price: float):
     _last_price = price
 
 
+_log_tailers: Dict[int, LogTailer] = {}
+
+
 def get_log_tail(n_lines: int = 20) -> List[str]:
     """
     Read the last N lines from the most recent JSONL log files.
 
+    Backed by a cached LogTailer per n_lines: file discovery runs on a slow
+    interval and only newly appended bytes are read, so the cost per refresh
+    does not grow with the log size.
+
     Returns:
         List of log lines (may be fewer than n_lines if file is short)
     """
     try:
-        # Get current working directory
-        import json
-        import os
-        cwd = os.getcwd()
-
-        # Try multiple log locations (prioritize JSONL over legacy .log)
-        log_patterns = [
-            os.path.join(cwd, "sessions/*/logs/*.jsonl"),          # Primary: JSONL logs in sessions
-            os.path.join(cwd, "logs/*.jsonl"),                     # Alternative: Root logs folder
-            os.path.join(cwd, "logs/trading_bot_*.log"),           # Legacy: Old .log format
-            os.path.join(cwd, "sessions/*/logs/*.log"),            # Legacy: Session .log
-        ]
-
-        log_files = []
-        for pattern in log_patterns:
-            found = glob.glob(pattern)
-            log_files.extend(found)
-
-        if not log_files:
+        tailer = _log_tailers.get(n_lines)
+        if tailer is None:
+            tailer = _log_tailers[n_lines] = LogTailer(n_lines=n_lines)
+
+        lines = tailer.get_lines()
+        latest_log = tailer.current_path
+
+        if latest_log is None:
+            cwd = os.getcwd()
             return [
                 f"No log files found in {cwd}",
                 "Checked patterns:",
@@ -203,37 +216,7 @@ def get_log_tail(n_lines: int = 20) -> List[str]:
                 f"  {cwd}/logs/trading_bot_*.log",
             ]
 
-        # Get most recent log file
-        latest_log = max(log_files, key=lambda p: Path(p).stat().st_mtime)
-        is_jsonl = latest_log.endswith('.jsonl')
-
-        # Read last N lines
-        with open(latest_log, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = deque(f, maxlen=n_lines)
-            result = [f"[LOG] {Path(latest_log).name} (last {n_lines} lines):"]
-
-            # Format JSONL entries nicely
-            if is_jsonl:
-                for line in lines:
-                    try:
-                        entry = json.loads(line.strip())
-                        timestamp = entry.get('timestamp', entry.get('time', ''))
-                        level = entry.get('level', 'INFO')
-                        message = entry.get('message', entry.get('msg', ''))
-                        event_type = entry.get('event_type', '')
-
-                        if event_type:
-                            formatted = f"{timestamp} [{level}] {event_type}: {message}"
-                        else:
-                            formatted = f"{timestamp} [{level}] {message}"
-                        result.append(formatted[:120])  # Truncate long lines
-                    except json.JSONDecodeError:
-                        result.append(line.strip()[:120])
-            else:
-                # Plain text logs
-                result.extend([line.strip()[:120] for line in lines])
-
-            return result
+        return [f"[LOG] {Path(latest_log).name} (last {n_lines} lines):"] + lines
 
     except Exception as e:
         import traceback
@@ -452,6 +435,46 @@ def get_portfolio_data(portfolio, engine) -> Dict[str, Any]:
     }
 
 
+def _report_stale_snapshots(engine, config_module, stale_symbols: List[str], total_symbols: int):
+    """Expose stale symbols for health monitoring and warn above threshold."""
+    stale_ttl = config_module.SNAPSHOT_STALE_TTL_S
+
+    # Expose stale symbols for health monitoring
+    setattr(engine, '_last_stale_snapshot_symbols', stale_symbols)
+
+    # Log stale snapshot warnings if threshold exceeded
+    stale_threshold = getattr(config_module, 'STALE_SNAPSHOT_WARN_THRESHOLD', 5)
+    if len(stale_symbols) >= stale_threshold:
+        logger.warning(
+            f"STALE_SNAPSHOTS: {len(stale_symbols)} symbols have stale market data (>{stale_ttl}s old)",
+            extra={
+                'event_type': 'STALE_SNAPSHOTS_WARNING',
+                'stale_count': len(stale_symbols),
+                'stale_symbols': stale_symbols[:10],  # First 10
+                'threshold': stale_threshold,
+                'stale_ttl_s': stale_ttl
+            }
+        )
+
+        # Emit health event for monitoring systems
+        try:
+            import logging as log_module
+
+            from core.logger_factory import AUDIT_LOG, log_event
+            log_event(
+                AUDIT_LOG(),
+                "stale_snapshots_health",
+                message=f"Stale snapshot health degradation: {len(stale_symbols)}/{total_symbols} symbols stale",
+                level=log_module.WARNING,
+                stale_count=len(stale_symbols),
+                total_symbols=total_symbols,
+                stale_symbols=stale_symbols[:10],
+                stale_ttl_s=stale_ttl
+            )
+        except Exception as e:
+            logger.debug(f"Failed to emit stale snapshot health event: {e}")
+
+
 def get_drop_data(engine, portfolio, config_module) -> List[Dict[str, Any]]:
     """Collect and calculate top drop data from snapshot store (long-term solution)."""
     global _last_symbol, _last_price
@@ -574,40 +597,7 @@ def get_drop_data(engine, portfolio, config_module) -> List[Dict[str, Any]]:
                     logger.debug(f"Error calculating drop for {symbol}: {e}")
                     continue
 
-        # Expose stale symbols for health monitoring
-        setattr(engine, '_last_stale_snapshot_symbols', stale_symbols)
-
-        # Log stale snapshot warnings if threshold exceeded
-        stale_threshold = getattr(config_module, 'STALE_SNAPSHOT_WARN_THRESHOLD', 5)
-        if len(stale_symbols) >= stale_threshold:
-            logger.warning(
-                f"STALE_SNAPSHOTS: {len(stale_symbols)} symbols have stale market data (>{stale_ttl}s old)",
-                extra={
-                    'event_type': 'STALE_SNAPSHOTS_WARNING',
-                    'stale_count': len(stale_symbols),
-                    'stale_symbols': stale_symbols[:10],  # First 10
-                    'threshold': stale_threshold,
-                    'stale_ttl_s': stale_ttl
-                }
-            )
-
-            # Emit health event for monitoring systems
-            try:
-                import logging as log_module
-
-                from core.logger_factory import AUDIT_LOG, log_event
-                log_event(
-                    AUDIT_LOG(),
-                    "stale_snapshots_health",
-                    message=f"Stale snapshot health degradation: {len(stale_symbols)}/{len(drop_snapshot_store)} symbols stale",
-                    level=log_module.WARNING,
-                    stale_count=len(stale_symbols),
-                    total_symbols=len(drop_snapshot_store),
-                    stale_symbols=stale_symbols[:10],
-                    stale_ttl_s=stale_ttl
-                )
-            except Exception as e:
-                logger.debug(f"Failed to emit stale snapshot health event: {e}")
+        _report_stale_snapshots(engine, config_module, stale_symbols, len(drop_snapshot_store))
 
         if drops:
             first_drop = drops[0]
@@ -644,6 +634,32 @@ def get_drop_data(engine, portfolio, config_module) -> List[Dict[str, Any]]:
     return drops
 
 
+def get_drop_data_from_view_model(vm: DashboardViewModel, engine, config_module) -> List[Dict[str, Any]]:
+    """
+    Collect top drop data from the incremental view model.
+
+    Same output as get_drop_data, but selection happens on a bounded heap that
+    is only recomputed after a new snapshot batch, so cost per refresh does not
+    scale with the number of symbols.
+    """
+    global _last_symbol, _last_price
+    drops: List[Dict[str, Any]] = []
+
+    try:
+        drops = vm.get_drop_data()
+        _report_stale_snapshots(engine, config_module, vm.get_stale_symbols(), vm.symbol_count)
+
+        if drops:
+            price_val = drops[0].get('current_price')
+            if price_val:
+                _last_symbol = drops[0].get('symbol')
+                _last_price = price_val
+    except Exception as e:
+        logger.error(f"Error getting drop data: {e}")
+
+    return drops
+
+
 def get_health_data(engine, config_module) -> Dict[str, Any]:
     """Collect health metrics for footer display."""
     stats = getattr(engine, '_last_market_data_stats', {}) or {}
@@ -1182,6 +1198,16 @@ def run_dashboard(engine, portfolio, config_module):
     # Get shutdown coordinator for clean exit
     shutdown_coordinator = getattr(engine, 'shutdown_coordinator', None)
 
+    # Incremental view model: subscribes to snapshots, tracks per-panel dirty flags
+    global _view_model
+    vm = DashboardViewModel(
+        top_n=10,
+        stale_ttl_s=getattr(config_module, 'SNAPSHOT_STALE_TTL_S', 30.0),
+    )
+    vm.attach(getattr(engine, 'event_bus', None))
+    _view_model = vm
+    portfolio_data = None
+
     logger.info("Starting live dashboard...", extra={'event_type': 'DASHBOARD_START'})
 
     try:
@@ -1193,22 +1219,38 @@ def run_dashboard(engine, portfolio, config_module):
                     break
 
                 try:
-                    # Collect data
+                    # Header (uptime, CPU/RAM) changes every tick - always rebuilt
                     config_data = get_config_data(config_module, start_time)
                     system_resources = get_system_resources()
-                    portfolio_data = get_portfolio_data(portfolio, engine)
-                    drop_data = get_drop_data(engine, portfolio, config_module)
-                    health_data = get_health_data(engine, config_module)
-                    last_event = _event_bus.get_last_event()
 
-                    # Update UI components
+                    # Portfolio: rebuilt on order/FSM events, held-symbol price updates or max age
+                    if portfolio_data is None or vm.is_dirty("portfolio"):
+                        portfolio_data = get_portfolio_data(portfolio, engine)
+                        vm.watch_symbols(p['symbol'] for p in portfolio_data.get('positions', []))
+                        layout["body"].update(make_portfolio_panel(portfolio_data))
+                        vm.mark_clean("portfolio")
+
                     layout["header"].update(make_header_panel(config_data, system_resources, portfolio_data))
-                    layout["side"].update(make_drop_panel(drop_data, config_data, engine))
-                    layout["body"].update(make_portfolio_panel(portfolio_data))
-                    layout["events"].update(make_event_history_panel())
-                    layout["fsm"].update(make_fsm_status_panel())
 
-                    # Update debug panel if enabled
+                    # Drops: only after a new snapshot batch (bounded heap in the view model)
+                    if vm.is_dirty("drops"):
+                        if vm.attached:
+                            drop_data = get_drop_data_from_view_model(vm, engine, config_module)
+                        else:
+                            drop_data = get_drop_data(engine, portfolio, config_module)
+                        layout["side"].update(make_drop_panel(drop_data, config_data, engine))
+                        if vm.attached:
+                            vm.mark_clean("drops")
+
+                    if vm.is_dirty("events"):
+                        layout["events"].update(make_event_history_panel())
+                        vm.mark_clean("events")
+
+                    if vm.is_dirty("fsm"):
+                        layout["fsm"].update(make_fsm_status_panel())
+                        vm.mark_clean("fsm")
+
+                    # Update debug panel if enabled (log tail is incremental)
                     if debug_drops:
                         layout["debug"].update(make_debug_panel())
 
@@ -1232,4 +1274,6 @@ def run_dashboard(engine, portfolio, config_module):
         sys.stdout.write("\033[?1049l")  # Exit alternate screen
         sys.stdout.write("\033[0m")      # Reset all attributes
         sys.stdout.flush()
+        vm.detach()
+        _view_model = None
         logger.info("Dashboard stopped", extra={'event_type': 'DASHBOARD_STOPPED'})
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Log Tailer - Constant-Cost Tail of the Newest Session Log
+
+Used by the dashboard debug panel. The previous implementation globbed all
+log locations, stat'ed every match and read the whole newest file once per
+refresh. LogTailer instead:
+
+- Caches the discovered log file and re-runs discovery on a slow interval
+- Reads the initial tail by seeking backwards from EOF in fixed-size blocks
+- Keeps a read offset afterwards and only parses newly appended lines
+- Bounds the bytes read per refresh, so cost is independent of file size
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Sequence
+
+DEFAULT_LOG_PATTERNS = (
+    "sessions/*/logs/*.jsonl",     # Primary: JSONL logs in sessions
+    "logs/*.jsonl",                # Alternative: Root logs folder
+    "logs/trading_bot_*.log",      # Legacy: Old .log format
+    "sessions/*/logs/*.log",       # Legacy: Session .log
+)
+
+_BLOCK_SIZE = 8192
+_MAX_LINE_CHARS = 120
+
+
+def format_log_line(line: str, is_jsonl: bool) -> str:
+    """Format a raw log line for display (JSONL entries are condensed)"""
+    line = line.strip()
+    if not is_jsonl:
+        return line[:_MAX_LINE_CHARS]
+    try:
+        entry = json.loads(line)
+    except json.JSONDecodeError:
+        return line[:_MAX_LINE_CHARS]
+    if not isinstance(entry, dict):
+        return line[:_MAX_LINE_CHARS]
+
+    timestamp = entry.get('timestamp', entry.get('time', ''))
+    level = entry.get('level', 'INFO')
+    message = entry.get('message', entry.get('msg', ''))
+    event_type = entry.get('event_type', '')
+
+    if event_type:
+        formatted = f"{timestamp} [{level}] {event_type}: {message}"
+    else:
+        formatted = f"{timestamp} [{level}] {message}"
+    return formatted[:_MAX_LINE_CHARS]
+
+
+def read_last_lines(path: str, n_lines: int, block_size: int = _BLOCK_SIZE) -> tuple:
+    """
+    Read the last N complete lines of a file by seeking backwards from EOF.
+
+    Returns:
+        (lines, end_offset) where end_offset is the byte offset after the last
+        complete line (a trailing partial line is excluded)
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        pos = end
+        data = b""
+        # n_lines + 1 newlines guarantee n complete lines (plus a partial tail)
+        while pos > 0 and data.count(b"\n") <= n_lines:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+
+    complete_end = data.rfind(b"\n") + 1
+    body = data[:complete_end]
+    lines = body.split(b"\n")[:-1] if body else []
+    if pos > 0 and lines:
+        # First chunk line may be cut in the middle
+        lines = lines[1:]
+    tail = [raw.decode('utf-8', errors='ignore') for raw in lines[-n_lines:]]
+    return tail, pos + complete_end
+
+
+class LogTailer:
+    """
+    Incremental tail of the most recently modified log file.
+
+    Not tied to the dashboard: any periodic consumer can call get_lines().
+    """
+
+    def __init__(
+        self,
+        n_lines: int = 20,
+        patterns: Sequence[str] = DEFAULT_LOG_PATTERNS,
+        base_dir: Optional[str] = None,
+        discovery_interval_s: float = 10.0,
+        max_read_bytes: int = 256 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize tailer.
+
+        Args:
+            n_lines: Number of lines to keep
+            patterns: Glob patterns (relative to base_dir) to discover log files
+            base_dir: Base directory for patterns (default: cwd at discovery time)
+            discovery_interval_s: Minimum seconds between file discovery runs
+            max_read_bytes: Upper bound of bytes read per refresh; bursts larger
+                than this skip ahead to the tail
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.n_lines = n_lines
+        self.patterns = tuple(patterns)
+        self.base_dir = base_dir
+        self.discovery_interval_s = discovery_interval_s
+        self.max_read_bytes = max_read_bytes
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._path: Optional[str] = None
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._lines: Deque[str] = deque(maxlen=n_lines)
+        self._last_discovery = float("-inf")
+
+    @property
+    def current_path(self) -> Optional[str]:
+        """Currently tailed file (None if no log file discovered yet)"""
+        return self._path
+
+    def _discover(self) -> Optional[str]:
+        base = self.base_dir or os.getcwd()
+        newest = None
+        newest_mtime = -1.0
+        for pattern in self.patterns:
+            for path in glob.glob(os.path.join(base, pattern)):
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    continue
+                if mtime > newest_mtime:
+                    newest, newest_mtime = path, mtime
+        return newest
+
+    def _reset(self, path: Optional[str]):
+        self._path = path
+        self._inode = None
+        self._offset = 0
+        self._lines.clear()
+
+    def _load_tail(self, st: os.stat_result):
+        is_jsonl = self._path.endswith('.jsonl')
+        lines, end = read_last_lines(self._path, self.n_lines)
+        self._lines.clear()
+        self._lines.extend(format_log_line(line, is_jsonl) for line in lines)
+        self._inode = st.st_ino
+        self._offset = end
+
+    def _read_new(self, size: int):
+        if size - self._offset > self.max_read_bytes:
+            # Too far behind: re-seed from the tail instead of parsing the backlog
+            self._load_tail(os.stat(self._path))
+            return
+
+        is_jsonl = self._path.endswith('.jsonl')
+        with open(self._path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+
+        complete_end = data.rfind(b"\n") + 1
+        if complete_end == 0:
+            return
+        # Only the last n lines can survive in the deque - skip formatting the rest
+        new_lines = data[:complete_end].split(b"\n")[:-1][-self.n_lines:]
+        self._lines.extend(
+            format_log_line(raw.decode('utf-8', errors='ignore'), is_jsonl) for raw in new_lines
+        )
+        self._offset += complete_end
+
+    def refresh(self):
+        """Pick up new lines (and run discovery if the interval elapsed)"""
+        with self._lock:
+            now = self._clock()
+            if now - self._last_discovery >= self.discovery_interval_s:
+                self._last_discovery = now
+                path = self._discover()
+                if path != self._path:
+                    self._reset(path)
+
+            if self._path is None:
+                return
+
+            try:
+                st = os.stat(self._path)
+            except OSError:
+                # File vanished (rotation/cleanup) - force rediscovery next call
+                self._reset(None)
+                self._last_discovery = float("-inf")
+                return
+
+            if self._inode is None or st.st_ino != self._inode or st.st_size < self._offset:
+                self._load_tail(st)
+            elif st.st_size > self._offset:
+                self._read_new(st.st_size)
+
+    def get_lines(self) -> List[str]:
+        """Refresh and return the current tail (oldest first)"""
+        self.refresh()
+        with self._lock:
+            return list(self._lines)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Dashboard View Model - Incremental State with Per-Panel Dirty Flags
+
+The dashboard used to rebuild every panel once per second: copy the whole
+snapshot store, sort all symbols, walk positions and re-create Rich tables
+even when nothing changed. DashboardViewModel keeps the derived state
+incrementally instead:
+
+- Subscribes to "market.snapshots" and stores one compact drop record per
+  symbol (O(batch) per market-data cycle)
+- Top-N drops are selected with a bounded heap (heapq.nsmallest) and cached
+  until the next snapshot batch arrives
+- Order/FSM/dashboard events bump per-panel versions; the render loop only
+  rebuilds panels whose version changed
+
+Usage:
+    vm = DashboardViewModel(top_n=10, stale_ttl_s=config.SNAPSHOT_STALE_TTL_S)
+    vm.attach(engine.event_bus)
+
+    if vm.is_dirty("drops"):
+        layout["side"].update(make_drop_panel(vm.get_drop_data(), ...))
+        vm.mark_clean("drops")
+"""
+
+import heapq
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+PANELS = ("drops", "portfolio", "events", "fsm", "debug")
+
+PRIORITY_SYMBOL = "BTC/USDT"
+
+
+def drop_record_from_snapshot(snapshot: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Extract the drop panel record from a versioned MarketSnapshot.
+
+    Returns:
+        Dict with symbol/drop_pct/current_price/anchor/spread_pct or None if
+        the snapshot carries no usable drop data
+    """
+    if not isinstance(snapshot, dict) or snapshot.get('v') != 1:
+        return None
+    windows = snapshot.get('windows') or {}
+    drop_pct = windows.get('drop_pct')
+    if drop_pct is None:
+        return None
+    return {
+        'symbol': snapshot.get('symbol'),
+        'drop_pct': drop_pct,
+        'current_price': (snapshot.get('price') or {}).get('last', 0),
+        # V9_3: Read anchor from snapshot (fallback to peak for compatibility)
+        'anchor': windows.get('anchor') or windows.get('peak', 0),
+        'spread_pct': (snapshot.get('liquidity') or {}).get('spread_pct'),
+    }
+
+
+class DashboardViewModel:
+    """
+    Incrementally maintained dashboard state.
+
+    Writers (event bus callbacks, FSM/order hooks) run on trading threads and
+    only do O(1) work per item under a short lock; the dashboard thread pulls
+    derived views and recomputes them only when their inputs changed.
+    """
+
+    def __init__(
+        self,
+        top_n: int = 10,
+        stale_ttl_s: float = 30.0,
+        portfolio_refresh_s: float = 5.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize view model.
+
+        Args:
+            top_n: Number of drops shown in the drop panel
+            stale_ttl_s: Snapshots older than this are excluded (and reported stale)
+            portfolio_refresh_s: Max age of the portfolio panel without any event
+            clock: Time source (injectable for tests)
+        """
+        self.top_n = top_n
+        self.stale_ttl_s = stale_ttl_s
+        self.portfolio_refresh_s = portfolio_refresh_s
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._received_ts: Dict[str, float] = {}
+        self._watched: Set[str] = set()
+
+        self._versions: Dict[str, int] = {panel: 1 for panel in PANELS}
+        self._rendered: Dict[str, int] = {panel: 0 for panel in PANELS}
+        self._rendered_ts: Dict[str, float] = {panel: float("-inf") for panel in PANELS}
+        # Panels that must refresh periodically even without events (prices age, data goes stale)
+        self._max_age_s: Dict[str, float] = {
+            "portfolio": portfolio_refresh_s,
+            "drops": max(1.0, stale_ttl_s / 2),
+        }
+
+        self._drops_version = -1
+        self._drops_computed_ts = float("-inf")
+        self._top_drops: List[Dict[str, Any]] = []
+        self._stale_symbols: List[str] = []
+
+        self._event_bus = None
+        self.snapshots_received = 0
+
+    # ------------------------------------------------------------------
+    # Subscription / writers
+    # ------------------------------------------------------------------
+
+    def attach(self, event_bus) -> None:
+        """Subscribe to market snapshots on the given EventBus"""
+        if event_bus is None or self._event_bus is not None:
+            return
+        event_bus.subscribe("market.snapshots", self.on_snapshots)
+        self._event_bus = event_bus
+
+    def detach(self) -> None:
+        """Unsubscribe from the EventBus"""
+        if self._event_bus is not None:
+            self._event_bus.unsubscribe("market.snapshots", self.on_snapshots)
+            self._event_bus = None
+
+    @property
+    def attached(self) -> bool:
+        return self._event_bus is not None
+
+    def on_snapshots(self, snapshots: Iterable[Dict[str, Any]]) -> None:
+        """EventBus callback: fold a snapshot batch into the drop records"""
+        if not snapshots:
+            return
+        now = self._clock()
+        touched_watched = False
+        with self._lock:
+            for snapshot in snapshots:
+                symbol = snapshot.get('symbol') if isinstance(snapshot, dict) else None
+                if not symbol:
+                    continue
+                self._received_ts[symbol] = now
+                record = drop_record_from_snapshot(snapshot)
+                if record is None:
+                    self._records.pop(symbol, None)
+                else:
+                    self._records[symbol] = record
+                if symbol in self._watched:
+                    touched_watched = True
+            self.snapshots_received += 1
+            self._versions['drops'] += 1
+            self._versions['debug'] += 1
+            if touched_watched:
+                self._versions['portfolio'] += 1
+
+    def watch_symbols(self, symbols: Iterable[str]) -> None:
+        """Symbols whose price updates make the portfolio panel dirty (held positions)"""
+        symbols = set(symbols)
+        with self._lock:
+            if symbols != self._watched:
+                self._watched = symbols
+                self._versions['portfolio'] += 1
+
+    def mark_dirty(self, *panels: str) -> None:
+        """Bump the version of the given panels (all panels if none given)"""
+        with self._lock:
+            for panel in panels or PANELS:
+                self._versions[panel] = self._versions.get(panel, 0) + 1
+
+    # ------------------------------------------------------------------
+    # Render-side API
+    # ------------------------------------------------------------------
+
+    def is_dirty(self, panel: str) -> bool:
+        """True if the panel changed since it was last marked clean"""
+        max_age = self._max_age_s.get(panel)
+        if max_age is not None and self._clock() - self._rendered_ts[panel] >= max_age:
+            return True
+        with self._lock:
+            return self._versions.get(panel, 0) != self._rendered.get(panel, 0)
+
+    def mark_clean(self, panel: str) -> None:
+        """Record that the panel was rendered at its current version"""
+        with self._lock:
+            self._rendered[panel] = self._versions.get(panel, 0)
+        self._rendered_ts[panel] = self._clock()
+
+    def _recompute_drops(self) -> None:
+        now = self._clock()
+        with self._lock:
+            unchanged = self._drops_version == self._versions['drops']
+            if unchanged and now - self._drops_computed_ts < self._max_age_s['drops']:
+                return
+            version = self._versions['drops']
+            records = list(self._records.values())
+            received = dict(self._received_ts)
+
+        fresh = []
+        stale = []
+        priority = None
+        for record in records:
+            symbol = record['symbol']
+            if now - received.get(symbol, now) > self.stale_ttl_s:
+                stale.append(symbol)
+                continue
+            if symbol == PRIORITY_SYMBOL:
+                priority = record
+            else:
+                fresh.append(record)
+
+        # Bounded heap: O(U log N) instead of sorting the whole universe
+        top = heapq.nsmallest(self.top_n, fresh, key=lambda r: r['drop_pct'])
+        if priority is not None:
+            top = [priority] + top[:max(0, self.top_n - 1)]
+
+        self._top_drops = top
+        self._stale_symbols = stale
+        self._drops_version = version
+        self._drops_computed_ts = now
+
+    def get_drop_data(self) -> List[Dict[str, Any]]:
+        """Top-N drops (BTC/USDT pinned first, then biggest losers)"""
+        self._recompute_drops()
+        return list(self._top_drops)
+
+    def get_stale_symbols(self) -> List[str]:
+        """Symbols whose last snapshot is older than stale_ttl_s"""
+        self._recompute_drops()
+        return list(self._stale_symbols)
+
+    @property
+    def symbol_count(self) -> int:
+        with self._lock:
+            return len(self._received_ts)